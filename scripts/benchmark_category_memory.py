@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Benchmark: resident memory per cached category tree.
+
+Holds several marketplace-sized trees in a fresh process, either as parsed
+JSON dicts (the old MemoryCache value) or as compact array-backed trees
+(api.compact_tree), and reports the RSS growth per tree.
+
+Runs offline against the synthetic tree from benchmark_json_parse.py.
+
+Usage:
+    uv run python scripts/benchmark_category_memory.py [--nodes 17000] [--trees 4]
+"""
+import argparse
+import gc
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from api.compact_tree import CompactCategoryTree
+from benchmark_json_parse import build_synthetic_tree
+
+
+def rss_bytes() -> int:
+    """Current resident set size (Linux)."""
+    with open("/proc/self/statm") as statm:
+        return int(statm.read().split()[1]) * 4096
+
+
+def hold_trees(mode: str, path: str, trees: int) -> None:
+    """Child process: load `trees` copies and print the RSS growth."""
+    raw = Path(path).read_bytes()
+    gc.collect()
+    before = rss_bytes()
+    if mode == "dict":
+        held = [json.loads(raw) for _ in range(trees)]
+    else:
+        # Each marketplace has its own buffer
+        held = [CompactCategoryTree(bytes(bytearray(raw))) for _ in range(trees)]
+    gc.collect()
+    print(rss_bytes() - before)
+    del held
+
+
+def measure(mode: str, path: str, trees: int) -> int:
+    """Run hold_trees in a fresh interpreter."""
+    output = subprocess.run(
+        [sys.executable, __file__, "--child", mode, path, "--trees", str(trees)],
+        check=True, capture_output=True, text=True
+    ).stdout
+    return int(output.strip())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--nodes", type=int, default=17000)
+    parser.add_argument("--trees", type=int, default=4, help="Marketplace trees held at once")
+    parser.add_argument("--child", nargs=2, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        hold_trees(args.child[0], args.child[1], args.trees)
+        return
+
+    tree = build_synthetic_tree(args.nodes)
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = Path(tmp) / "tree.json"
+        compact_path = Path(tmp) / "tree.lct"
+        json_path.write_bytes(json.dumps(tree).encode())
+        compact_path.write_bytes(CompactCategoryTree.from_json(tree).to_bytes())
+
+        before = measure("dict", str(json_path), args.trees) / args.trees
+        after = measure("compact", str(compact_path), args.trees) / args.trees
+
+    mib = 1024 * 1024
+    print(f"Tree: {args.nodes} categories, {args.trees} held")
+    print(f"Parsed JSON dicts: {before / mib:6.1f} MiB RSS per tree")
+    print(f"Compact tree:      {after / mib:6.1f} MiB RSS per tree")
+    print(f"Reduction:         {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Benchmark: offline category suggestions vs the live endpoint.
+
+Scores the local BM25 suggester against a stand-in dataset of queries
+labelled with the categories eBay's getCategorySuggestions returns. Reports
+how many queries are answered locally (the rest fall back to the live API),
+top-1/top-3 agreement on those, and per-query latency.
+
+Usage:
+    uv run python scripts/benchmark_category_suggest.py
+    uv run python scripts/benchmark_category_suggest.py --dataset my_queries.json --min-confidence 0.5
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from api.category_index import CategoryIndex
+from api.category_suggest import DEFAULT_MIN_CONFIDENCE, CategorySuggester
+
+DEFAULT_DATASET = Path(__file__).parent / "fixtures" / "category_suggestions_standin.json"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--dataset", type=Path, default=DEFAULT_DATASET,
+                        help="JSON with 'tree' (getCategoryTree body) and 'queries' [{q, live: [ids]}]")
+    parser.add_argument("--min-confidence", type=float, default=DEFAULT_MIN_CONFIDENCE)
+    parser.add_argument("--top-k", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=200, help="Timing runs per query")
+    args = parser.parse_args()
+
+    dataset = json.loads(args.dataset.read_text())
+    start = time.perf_counter()
+    suggester = CategorySuggester(CategoryIndex(dataset["tree"]))
+    build_ms = (time.perf_counter() - start) * 1000
+
+    answered = top1 = topk = 0
+    latencies = []
+    for case in dataset["queries"]:
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            suggestions = suggester.suggest(case["q"], args.top_k)
+        latencies.append((time.perf_counter() - start) / args.repeat * 1_000_000)
+
+        confident = bool(suggestions) and suggestions[0]["confidence"] >= args.min_confidence
+        local_ids = [suggestion["categoryId"] for suggestion in suggestions]
+        live_ids = case["live"]
+        status = "local" if confident else "live fallback"
+        if confident:
+            answered += 1
+            top1 += local_ids[0] == live_ids[0]
+            topk += bool(set(local_ids) & set(live_ids[:args.top_k]))
+        print(f"{case['q']:<36} {status:<14} local={local_ids[:args.top_k]} live={live_ids[:args.top_k]}")
+
+    total = len(dataset["queries"])
+    latencies.sort()
+    print()
+    print(f"Leaves indexed:        {len(suggester)} (built in {build_ms:.1f} ms)")
+    print(f"Answered locally:      {answered}/{total} ({answered / total:.0%}) at min confidence {args.min_confidence}")
+    if answered:
+        print(f"Top-1 agreement:       {top1}/{answered} ({top1 / answered:.0%}) of local answers")
+        print(f"Top-{args.top_k} overlap:         {topk}/{answered} ({topk / answered:.0%}) of local answers")
+    print(f"Latency per query:     p50 {latencies[len(latencies) // 2]:.1f} us, max {latencies[-1]:.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: parsing a category tree response body.
+
+Compares the old EbayRestClient path (response.text() followed by
+response.json(), i.e. two UTF-8 decodes and a stdlib parse) with the
+single-read path (bytes parsed once by api.json_codec, orjson if installed).
+
+Runs offline against a synthetic tree shaped like getCategoryTree.
+
+Usage:
+    uv run python scripts/benchmark_json_parse.py [--nodes 17000] [--repeat 10]
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from api import json_codec
+
+
+def build_synthetic_tree(nodes: int = 17000, fanout: int = 12) -> dict:
+    """Build a getCategoryTree-shaped response with roughly `nodes` categories."""
+    next_id = 1
+    root = {
+        "category": {"categoryId": "0", "categoryName": "Root"},
+        "categoryTreeNodeLevel": 0,
+        "childCategoryTreeNodes": []
+    }
+    frontier = [(root, 0)]
+    while frontier and next_id < nodes:
+        parent, level = frontier.pop(0)
+        children = parent.setdefault("childCategoryTreeNodes", [])
+        for _ in range(fanout):
+            if next_id >= nodes:
+                break
+            child = {
+                "category": {
+                    "categoryId": str(next_id),
+                    "categoryName": f"Category {next_id} Collectibles & Accessories"
+                },
+                "parentCategoryTreeNodeHref": (
+                    "https://api.ebay.com/commerce/taxonomy/v1/category_tree/0/"
+                    f"get_category_subtree?category_id={parent['category']['categoryId']}"
+                ),
+                "categoryTreeNodeLevel": level + 1,
+                "childCategoryTreeNodes": []
+            }
+            children.append(child)
+            frontier.append((child, level + 1))
+            next_id += 1
+
+    def mark_leaves(node: dict) -> None:
+        if not node["childCategoryTreeNodes"]:
+            del node["childCategoryTreeNodes"]
+            node["leafCategoryTreeNode"] = True
+            return
+        for child in node["childCategoryTreeNodes"]:
+            mark_leaves(child)
+
+    mark_leaves(root)
+    return {
+        "categoryTreeId": "0",
+        "categoryTreeVersion": "130",
+        "rootCategoryNode": root
+    }
+
+
+def old_path(raw: bytes) -> dict:
+    """response.text() then response.json(): decode twice, stdlib parse."""
+    text = raw.decode("utf-8")
+    if text:
+        return json.loads(raw.decode("utf-8"))
+    return {}
+
+
+def new_path(raw: bytes) -> dict:
+    """response.read() then one json_codec.loads on the bytes."""
+    return json_codec.loads(raw) if raw.strip() else {}
+
+
+def best_of(func, raw: bytes, repeat: int) -> float:
+    """Best wall time in milliseconds over `repeat` runs."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(raw)
+        timings.append((time.perf_counter() - start) * 1000)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--nodes", type=int, default=17000, help="Number of categories")
+    parser.add_argument("--repeat", type=int, default=10, help="Runs per measurement")
+    args = parser.parse_args()
+
+    raw = json.dumps(build_synthetic_tree(args.nodes)).encode()
+    assert old_path(raw) == new_path(raw)
+
+    old_ms = best_of(old_path, raw, args.repeat)
+    new_ms = best_of(new_path, raw, args.repeat)
+
+    print(f"Category tree: {args.nodes} nodes, {len(raw) / 1_000_000:.1f} MB")
+    print(f"JSON backend:  {json_codec.JSON_BACKEND}")
+    print(f"text()+json(): {old_ms:8.1f} ms")
+    print(f"read()+loads:  {new_ms:8.1f} ms  ({old_ms / new_ms:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
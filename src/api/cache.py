@@ -4,7 +4,6 @@ Enhanced caching layer for eBay API responses.
 Implements a hybrid caching strategy with Redis and in-memory fallback,
 intelligent TTL management, and cache invalidation patterns.
 """
-import json
 import logging
 from typing import Any, Dict, Optional, Union, List
 from datetime import datetime, timedelta, timezone
@@ -12,6 +11,9 @@ from dataclasses import dataclass, field
 from abc import ABC, abstractmethod
 import asyncio
 import hashlib
+import zlib
+
+from .offload import get_offload_executor
 
 try:
     import redis.asyncio as redis
@@ -157,6 +159,15 @@ class MemoryCache(CacheInterface):
                 return True
             return False
     
+    async def touch(self, key: str, ttl: int) -> bool:
+        """Extend the TTL of an existing entry."""
+        async with self._lock:
+            entry = self._cache.get(key)
+            if entry is None or entry.is_expired():
+                return False
+            entry.expires_at = datetime.now(timezone.utc) + timedelta(seconds=ttl)
+            return True
+    
     async def delete_pattern(self, pattern: str) -> int:
         """Delete keys matching pattern (simple prefix matching)."""
         async with self._lock:
@@ -214,6 +225,7 @@ class RedisCache(CacheInterface):
         self.redis_url = redis_url
         self.key_prefix = key_prefix
         self._client = None
+        self._binary_client = None
         self._lock = asyncio.Lock()
     
     async def _get_client(self):
@@ -228,10 +240,57 @@ class RedisCache(CacheInterface):
                     )
         return self._client
     
+    async def _get_binary_client(self):
+        """Get Redis client that returns raw bytes (for pre-serialized values)."""
+        if self._binary_client is None:
+            async with self._lock:
+                if self._binary_client is None:
+                    self._binary_client = redis.from_url(
+                        self.redis_url,
+                        decode_responses=False,
+                        max_connections=5
+                    )
+        return self._binary_client
+    
     def _make_key(self, key: str) -> str:
         """Add prefix to key."""
         return f"{self.key_prefix}{key}"
     
+    async def get_bytes(self, key: str) -> Optional[bytes]:
+        """Get a raw bytes value (expiry is left to Redis)."""
+        try:
+            client = await self._get_binary_client()
+            return await client.get(self._make_key(key))
+        except Exception as e:
+            logger.warning(f"Redis get_bytes error for key {key}: {e}")
+            return None
+    
+    async def set_bytes(self, key: str, data: bytes, ttl: int) -> bool:
+        """Set a raw bytes value with TTL."""
+        try:
+            client = await self._get_binary_client()
+            await client.setex(self._make_key(key), ttl, data)
+            return True
+        except Exception as e:
+            logger.warning(f"Redis set_bytes error for key {key}: {e}")
+            return False
+    
+    async def touch(self, key: str, ttl: int) -> bool:
+        """Extend the TTL of an existing entry (rewrites its embedded expiry)."""
+        value = await self.get(key)
+        if value is None:
+            return False
+        return await self.set(key, value, ttl)
+    
+    async def touch_bytes(self, key: str, ttl: int) -> bool:
+        """Extend the TTL of an existing raw bytes value."""
+        try:
+            client = await self._get_binary_client()
+            return bool(await client.expire(self._make_key(key), ttl))
+        except Exception as e:
+            logger.warning(f"Redis touch_bytes error for key {key}: {e}")
+            return False
+    
     async def get(self, key: str) -> Optional[Any]:
         """Get value from Redis cache."""
         try:
@@ -242,8 +301,8 @@ class RedisCache(CacheInterface):
             if data is None:
                 return None
             
-            # Parse JSON data
-            entry_data = json.loads(data)
+            # Parse JSON data (off the event loop for large entries)
+            entry_data = await get_offload_executor().loads(data)
             entry = CacheEntry.from_dict(entry_data)
             
             # Check if expired
@@ -266,8 +325,8 @@ class RedisCache(CacheInterface):
             expires_at = datetime.now(timezone.utc) + timedelta(seconds=ttl)
             entry = CacheEntry(value=value, expires_at=expires_at)
             
-            # Serialize entry
-            data = json.dumps(entry.to_dict())
+            # Serialize entry (off the event loop for large entries)
+            data = await get_offload_executor().dumps(entry.to_dict())
             
             # Set with TTL
             await client.setex(prefixed_key, ttl, data)
@@ -329,6 +388,8 @@ class RedisCache(CacheInterface):
         """Close Redis connection."""
         if self._client:
             await self._client.close()
+        if self._binary_client:
+            await self._binary_client.close()
 
 
 class HybridCacheManager:
@@ -368,6 +429,10 @@ class HybridCacheManager:
             return f"hash:{key_hash}"
         return key
     
+    def _memory_ttl(self, ttl: int) -> int:
+        """L1 TTL: at most 1 hour when Redis backs it, the full TTL when memory is the only tier."""
+        return min(ttl, 3600) if self.redis_cache else ttl
+    
     async def get(self, key: str) -> Optional[Any]:
         """
         Get value from cache with L1 -> L2 fallback.
@@ -415,8 +480,7 @@ class HybridCacheManager:
         
         # Set in L1 cache (memory)
         try:
-            memory_ttl = min(ttl, 3600)  # Max 1 hour for memory
-            await self.memory_cache.set(cache_key, value, memory_ttl)
+            await self.memory_cache.set(cache_key, value, self._memory_ttl(ttl))
             success = True
         except Exception as e:
             logger.warning(f"Memory cache set error: {e}")
@@ -436,6 +500,104 @@ class HybridCacheManager:
         
         return success
     
+    async def get_bytes(self, key: str) -> Optional[bytes]:
+        """
+        Get a pre-serialized value with L1 -> L2 fallback.
+        
+        L1 holds the bytes as stored; L2 holds them zlib-compressed.
+        """
+        cache_key = self._make_cache_key(key)
+        
+        try:
+            value = await self.memory_cache.get(cache_key)
+            if value is not None:
+                self.stats.memory_hits += 1
+                return value
+        except Exception as e:
+            logger.warning(f"Memory cache get error: {e}")
+            self.stats.errors += 1
+        
+        if self.redis_cache:
+            try:
+                compressed = await self.redis_cache.get_bytes(cache_key)
+                if compressed is not None:
+                    executor = get_offload_executor()
+                    value = await executor.run(executor.is_large(compressed), zlib.decompress, compressed)
+                    self.stats.redis_hits += 1
+                    
+                    # Backfill L1 cache
+                    await self.memory_cache.set(cache_key, value, 3600)  # 1 hour
+                    return value
+            except Exception as e:
+                logger.warning(f"Redis cache get error: {e}")
+                self.stats.errors += 1
+        
+        self.stats.misses += 1
+        return None
+    
+    async def set_bytes(self, key: str, data: bytes, ttl: int) -> bool:
+        """
+        Store a pre-serialized value in both caches with TTL.
+        
+        The L2 copy is zlib-compressed (large payloads are compressed off
+        the event loop).
+        """
+        cache_key = self._make_cache_key(key)
+        success = False
+        
+        try:
+            await self.memory_cache.set(cache_key, data, self._memory_ttl(ttl))
+            success = True
+        except Exception as e:
+            logger.warning(f"Memory cache set error: {e}")
+            self.stats.errors += 1
+        
+        if self.redis_cache:
+            try:
+                executor = get_offload_executor()
+                compressed = await executor.run(executor.is_large(data), zlib.compress, data, 6)
+                if await self.redis_cache.set_bytes(cache_key, compressed, ttl):
+                    success = True
+            except Exception as e:
+                logger.warning(f"Redis cache set error: {e}")
+                self.stats.errors += 1
+        
+        if success:
+            self.stats.sets += 1
+        
+        return success
+    
+    async def touch(self, key: str, ttl: int, raw_bytes: bool = False) -> bool:
+        """
+        Extend the TTL of an entry in both caches without refetching it.
+        
+        Args:
+            key: Cache key
+            ttl: New TTL in seconds from now
+            raw_bytes: Whether the entry was stored with set_bytes
+        """
+        cache_key = self._make_cache_key(key)
+        success = False
+        
+        try:
+            success = await self.memory_cache.touch(cache_key, self._memory_ttl(ttl))
+        except Exception as e:
+            logger.warning(f"Memory cache touch error: {e}")
+            self.stats.errors += 1
+        
+        if self.redis_cache:
+            try:
+                if raw_bytes:
+                    touched = await self.redis_cache.touch_bytes(cache_key, ttl)
+                else:
+                    touched = await self.redis_cache.touch(cache_key, ttl)
+                success = touched or success
+            except Exception as e:
+                logger.warning(f"Redis cache touch error: {e}")
+                self.stats.errors += 1
+        
+        return success
+    
     async def delete(self, key: str) -> bool:
         """Delete key from all caches."""
         cache_key = self._make_cache_key(key)
@@ -581,9 +743,11 @@ class CacheTTL:
     
     OAUTH_TOKENS = 1800  # 30 minutes
     CATEGORIES = 86400  # 24 hours
+    CATEGORY_TREE = 604800  # 7 days; version re-checked every CATEGORIES
     SHIPPING_RATES = 86400  # 24 hours
     MARKET_TRENDS = 21600  # 6 hours
     SEARCH_RESULTS = 300  # 5 minutes
+    COMPS = 1800  # 30 minutes; loaded comparable sales and listings
     BUSINESS_POLICIES = 86400  # 24 hours
     SELLER_STANDARDS = 3600  # 1 hour
     RATE_TABLES = 86400  # 24 hours
@@ -0,0 +1,247 @@
+"""
+Bulk item aspects for a whole category tree.
+
+eBay's fetch_item_aspects returns one gzipped JSON file with the item
+aspects of every leaf category in a tree. ItemAspectsStreamParser
+decompresses and parses it chunk by chunk, one category at a time, into a
+CategoryAspectsIndex: a single bytes buffer of per-category zlib-compressed
+aspect lists plus an offset table, so lookups are local and a tree's
+aspects cost a fraction of the parsed file in memory.
+"""
+import codecs
+import json
+import logging
+import re
+import struct
+import zlib
+from typing import Any, Dict, List, Optional, Tuple
+
+from . import json_codec
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"LCA1"
+GZIP_MAGIC = b"\x1f\x8b"
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+
+class CategoryAspectsIndex:
+    """Item aspects by leaf category ID, over one compact buffer."""
+
+    def __init__(self, buffer: bytes):
+        if buffer[:4] != MAGIC:
+            raise ValueError("Not a category aspects buffer")
+        length = struct.unpack_from("<I", buffer, 4)[0]
+        self.header: Dict[str, Any] = json.loads(buffer[8:8 + length])
+        self._buffer = buffer
+        self._data_start = 8 + length
+        self._offsets: Dict[str, List[int]] = self.header.pop("categories")
+
+    @classmethod
+    def build(cls, tree_fields: Dict[str, Any], category_aspects: List[Tuple[str, bytes]]) -> "CategoryAspectsIndex":
+        """
+        Pack compressed aspect lists into an index.
+
+        Args:
+            tree_fields: Top-level fields of the bulk file (categoryTreeId, categoryTreeVersion)
+            category_aspects: (category ID, zlib-compressed aspects JSON) pairs
+        """
+        offsets: Dict[str, List[int]] = {}
+        position = 0
+        for category_id, data in category_aspects:
+            offsets[category_id] = [position, len(data)]
+            position += len(data)
+        header = json.dumps({**tree_fields, "categories": offsets}, separators=(",", ":")).encode("utf-8")
+        parts = [MAGIC, struct.pack("<I", len(header)), header]
+        parts.extend(data for _, data in category_aspects)
+        return cls(b"".join(parts))
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def __contains__(self, category_id: str) -> bool:
+        return category_id in self._offsets
+
+    @property
+    def category_tree_id(self) -> Optional[str]:
+        return self.header.get("categoryTreeId")
+
+    @property
+    def version(self) -> Optional[str]:
+        return self.header.get("categoryTreeVersion")
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._buffer)
+
+    def to_bytes(self) -> bytes:
+        return self._buffer
+
+    def get_aspects(self, category_id: str) -> Optional[List[Dict[str, Any]]]:
+        """Get a category's aspects (getItemAspectsForCategory "aspects"), or None."""
+        entry = self._offsets.get(category_id)
+        if entry is None:
+            return None
+        start = self._data_start + entry[0]
+        return json_codec.loads(zlib.decompress(self._buffer[start:start + entry[1]]))
+
+
+class ItemAspectsStreamParser:
+    """
+    Incremental parser from a fetch_item_aspects body to a CategoryAspectsIndex.
+
+    Accepts the gzipped file (detected by its magic bytes) or plain JSON.
+    Each categoryAspects entry is decoded on its own and compressed straight
+    away, so the whole file is never held parsed.
+    """
+
+    def __init__(self):
+        self._inflate = None
+        self._head = b""
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._json = json.JSONDecoder()
+        self._text = ""
+        self._pos = 0
+        self._final = False
+        self._state = "start"
+        self._key: Optional[str] = None
+        self._tree_fields: Dict[str, Any] = {}
+        self._categories: List[Tuple[str, bytes]] = []
+
+    def feed(self, chunk: bytes) -> None:
+        """Decompress and parse the next body chunk."""
+        if self._inflate is None:
+            # Wait for the two magic bytes to pick gzip or plain JSON
+            self._head += chunk
+            if len(self._head) < 2:
+                return
+            chunk, self._head = self._head, b""
+            self._inflate = zlib.decompressobj(16 + zlib.MAX_WBITS) if chunk[:2] == GZIP_MAGIC else False
+        self._feed_text(self._inflate.decompress(chunk) if self._inflate else chunk)
+
+    def close(self) -> CategoryAspectsIndex:
+        """Finish parsing and build the index."""
+        if self._inflate is None:
+            self._inflate = False
+            self._feed_text(self._head)
+        elif self._inflate:
+            self._feed_text(self._inflate.flush())
+        self._final = True
+        self._feed_text(b"")
+        if self._state != "done":
+            raise ValueError("Truncated item aspects file")
+        logger.info(f"Parsed item aspects for {len(self._categories)} categories")
+        return CategoryAspectsIndex.build(self._tree_fields, self._categories)
+
+    def _feed_text(self, data: bytes) -> None:
+        self._text = self._text[self._pos:] + self._decoder.decode(data, final=self._final)
+        self._pos = 0
+        self._parse()
+
+    def _decode_value(self, pos: int) -> Optional[Tuple[Any, int]]:
+        """Decode one JSON value, or None if it may continue in the next chunk."""
+        try:
+            value, end = self._json.raw_decode(self._text, pos)
+        except json.JSONDecodeError:
+            if self._final:
+                raise
+            return None
+        if end >= len(self._text) and not self._final:
+            return None
+        return value, end
+
+    def _add_category(self, entry: Dict[str, Any]) -> None:
+        category_id = (entry.get("category") or {}).get("categoryId")
+        if category_id is not None:
+            self._categories.append((category_id, zlib.compress(json_codec.dumps_bytes(entry.get("aspects") or []))))
+
+    def _parse(self) -> None:
+        text = self._text
+        pos = self._pos
+
+        while True:
+            pos = _WHITESPACE.match(text, pos).end()
+            if pos >= len(text):
+                break
+            char = text[pos]
+            state = self._state
+
+            if state == "start":
+                self._expect(char, "{")
+                pos += 1
+                self._state = "key"
+            elif state == "key":
+                if char == "}":
+                    pos += 1
+                    self._state = "done"
+                    continue
+                decoded = self._decode_value(pos)
+                if decoded is None:
+                    break
+                self._key, pos = decoded
+                self._state = "colon"
+            elif state == "colon":
+                self._expect(char, ":")
+                pos += 1
+                self._state = "value"
+            elif state == "value":
+                if self._key == "categoryAspects" and char == "[":
+                    pos += 1
+                    self._state = "element"
+                    continue
+                decoded = self._decode_value(pos)
+                if decoded is None:
+                    break
+                self._tree_fields[self._key], pos = decoded
+                self._state = "after_value"
+            elif state == "after_value":
+                pos += 1
+                if char == ",":
+                    self._state = "key"
+                else:
+                    self._expect(char, "}")
+                    self._state = "done"
+            elif state in ("element", "after_element"):
+                if char == "]":
+                    pos += 1
+                    self._state = "after_value"
+                elif state == "after_element":
+                    self._expect(char, ",")
+                    pos += 1
+                    self._state = "element"
+                else:
+                    decoded = self._decode_value(pos)
+                    if decoded is None:
+                        break
+                    entry, pos = decoded
+                    self._add_category(entry)
+                    self._state = "after_element"
+            else:
+                raise ValueError(f"Unexpected data after item aspects at offset {pos}")
+
+        self._pos = pos
+
+    @staticmethod
+    def _expect(char: str, expected: str) -> None:
+        if char != expected:
+            raise ValueError(f"Malformed item aspects file: expected {expected!r}, got {char!r}")
+
+
+# Latest aspects index per category tree ID
+_aspect_indexes: Dict[str, CategoryAspectsIndex] = {}
+
+
+def find_aspects_index(category_tree_id: Optional[str], version: Optional[str]) -> Optional[CategoryAspectsIndex]:
+    """Get the loaded aspects index for a tree version, if any."""
+    index = _aspect_indexes.get(category_tree_id)
+    if index is not None and version is not None and index.version == version:
+        return index
+    return None
+
+
+def register_aspects_index(index: CategoryAspectsIndex) -> CategoryAspectsIndex:
+    """Keep an aspects index as the current one for its tree."""
+    if index.category_tree_id is not None and index.version is not None:
+        _aspect_indexes[index.category_tree_id] = index
+    return index
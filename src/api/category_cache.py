@@ -1,29 +1,78 @@
 """
 Simple eBay Category JSON Cache
 
-Just stores raw eBay JSON in cache with TTL. No complex objects or parsing.
+Stores each category tree in cache as a compact array-backed buffer
+(api.compact_tree) rather than nested dicts; the same buffer backs the
+in-process CategoryIndex, so a cached tree costs roughly its encoded size
+in memory. When a snapshot directory is configured the buffer is written
+there instead and memory-mapped (api.category_snapshot), so worker
+processes on one host share a single copy. The tree tools also cache their
+output pre-serialized (full tree and requested subtrees, keyed by tree ID
+and categoryTreeVersion) so repeat calls skip re-encoding the payload.
+Cached trees are refreshed in the background, and only re-downloaded when
+eBay reports a new categoryTreeVersion.
+
+Item aspects for every leaf of a tree come from eBay's fetch_item_aspects
+bulk file (api.category_aspects) and follow the tree's version: they are
+re-downloaded only once the cached tree has moved to a new version.
+Expired-to-replacement category maps (api.category_remap) are cached per
+tree and marketplace for CacheTTL.CATEGORIES.
 """
+import asyncio
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Mapping, Optional
 
 from api.cache import get_cache_manager, CacheTTL
+from api.category_aspects import (
+    CategoryAspectsIndex,
+    ItemAspectsStreamParser,
+    find_aspects_index,
+    register_aspects_index
+)
+from api.category_index import find_category_index, get_category_index
+from api.category_remap import (
+    ExpiredCategoryMap,
+    find_expired_category_map,
+    register_expired_category_map
+)
+from api.category_snapshot import get_category_snapshots
+from api.coalescing import get_request_coalescer
+from api.compact_tree import CompactCategoryTree, CompactTreeStreamParser
+from api import json_codec
+from api.offload import get_offload_executor
 from api.oauth import OAuthManager, OAuthScopes
-from api.rest_client import EbayRestClient
+from api.rest_client import EbayRestClient, RestConfig
+from api.runtime import get_runtime
 
 logger = logging.getLogger(__name__)
 
 
+def _tree_key(category_tree_id: str) -> str:
+    """Cache key for the compact category tree buffer."""
+    return f"CATEGORY_LIST_{category_tree_id}"
+
+
+def _checked_key(category_tree_id: str) -> str:
+    """Cache key marking that the cached tree's version was recently confirmed."""
+    return f"CATEGORY_CHECKED_{category_tree_id}"
+
+
+def _aspects_key(category_tree_id: str) -> str:
+    """Cache key for the compact item aspects buffer."""
+    return f"CATEGORY_ASPECTS_{category_tree_id}"
+
+
 async def get_category_tree_json(
     oauth_manager: OAuthManager,
     rest_client: EbayRestClient,
     category_tree_id: str,
     force_refresh: bool = False
-) -> Dict[str, Any]:
+) -> CompactCategoryTree:
     """
-    Get raw eBay category tree JSON from cache or API.
+    Get an eBay category tree from cache or API.
     
-    Returns the complete raw JSON response from eBay's category tree API.
-    Uses simple cache with 24-hour TTL.
+    Cached trees are re-checked in the background once CacheTTL.CATEGORIES
+    has passed, so only the first request (or force_refresh) downloads.
     
     Args:
         oauth_manager: OAuth manager instance
@@ -32,56 +81,381 @@ async def get_category_tree_json(
         force_refresh: Force refresh from API, bypassing cache
         
     Returns:
-        Complete category tree JSON from eBay API
+        Compact category tree; reads like the raw response and to_json()
+        gives back the complete JSON
     """
     cache_manager = get_cache_manager()
-    cache_key = f"CATEGORY_LIST_{category_tree_id}"
     
     # Try cache first
     if not force_refresh and cache_manager:
-        cached_data = await cache_manager.get(cache_key)
-        if cached_data:
-            logger.debug(f"Using cached category tree JSON for tree ID {category_tree_id}")
-            return cached_data
+        cached_tree = await _load_cached_tree(category_tree_id)
+        if cached_tree is not None:
+            logger.debug(f"Using cached category tree for tree ID {category_tree_id}")
+            if not await cache_manager.get(_checked_key(category_tree_id)):
+                schedule_category_tree_refresh(oauth_manager, rest_client.config, category_tree_id)
+            return cached_tree
+    
+    return await _download_category_tree(rest_client, category_tree_id)
+
+
+async def _load_cached_tree(category_tree_id: str) -> Optional[CompactCategoryTree]:
+    """Open the snapshot or cached tree buffer, reusing the indexed tree when the version matches."""
+    snapshots = get_category_snapshots()
+    if snapshots:
+        version = snapshots.current_version(category_tree_id)
+        index = find_category_index(category_tree_id, version)
+        if index is not None:
+            return index.tree
+        category_tree = snapshots.open(category_tree_id, version) if version else None
+        if category_tree is not None:
+            return get_category_index(category_tree).tree
+    
+    cache_manager = get_cache_manager()
+    data = await cache_manager.get_bytes(_tree_key(category_tree_id)) if cache_manager else None
+    if not data:
+        return None
     
-    # Fetch from eBay API
+    header = CompactCategoryTree.read_header(data)["tree"]
+    index = find_category_index(header.get("categoryTreeId"), header.get("categoryTreeVersion"))
+    if index is not None:
+        return index.tree
+    return get_category_index(CompactCategoryTree(data)).tree
+
+
+async def _download_category_tree(rest_client: EbayRestClient, category_tree_id: str) -> CompactCategoryTree:
+    """Download a full category tree, compact it and cache it."""
     logger.info(f"Fetching fresh category tree from eBay API for tree ID {category_tree_id}")
     
-    # Get complete tree - this is the raw JSON we want
+    # Stream the complete tree straight into the compact builder
     response = await rest_client.get(
         f"/commerce/taxonomy/v1/category_tree/{category_tree_id}",
-        params={}
+        params={},
+        stream_parser=CompactTreeStreamParser
     )
-    category_tree_json = response["body"]
+    executor = get_offload_executor()
+    category_tree = response["body"]
+    if not isinstance(category_tree, CompactCategoryTree):
+        # Clients that hand back parsed JSON (e.g. MockEbayRestClient)
+        category_tree = await executor.run(True, CompactCategoryTree.from_json, category_tree)
+    
+    # Prefer the shared snapshot; keep the buffer in the cache only without one
+    snapshots = get_category_snapshots()
+    snapshotted = False
+    if snapshots and category_tree.version:
+        await executor.run(True, snapshots.write, category_tree)
+        category_tree = snapshots.open(category_tree_id, category_tree.version) or category_tree
+        snapshotted = True
     
-    # Cache the raw JSON for 24 hours
+    cache_manager = get_cache_manager()
     if cache_manager:
-        await cache_manager.set(cache_key, category_tree_json, CacheTTL.CATEGORIES)
-        logger.info(f"Cached category tree JSON for tree ID {category_tree_id}")
+        if not snapshotted:
+            await cache_manager.set_bytes(_tree_key(category_tree_id), category_tree.to_bytes(), CacheTTL.CATEGORY_TREE)
+        await cache_manager.set(_checked_key(category_tree_id), True, CacheTTL.CATEGORIES)
+        logger.info(f"Cached category tree {category_tree_id} ({category_tree.nbytes} bytes compact)")
     
-    return category_tree_json
+    return get_category_index(category_tree).tree
+
+
+async def _fetch_current_version(rest_client: EbayRestClient, marketplace_id: str) -> Optional[str]:
+    """Get the live categoryTreeVersion from the cheap get_default_category_tree_id call."""
+    response = await rest_client.get(
+        "/commerce/taxonomy/v1/get_default_category_tree_id",
+        params={"marketplace_id": marketplace_id},
+        use_cache=False
+    )
+    return response["body"].get("categoryTreeVersion")
 
 
-def find_category_subtree(category_tree_json: Dict[str, Any], category_id: str) -> Optional[Dict[str, Any]]:
+async def refresh_category_tree(rest_client: EbayRestClient, category_tree_id: str) -> bool:
     """
-    Find a specific category and its subtree in the raw JSON.
+    Bring the cached tree up to date, downloading only if its version moved.
+    
+    When the version is unchanged the cached tree, its serialized output and
+    its item aspects get a fresh TTL. When it changed, the new tree is
+    downloaded, indexed and serialized (and its item aspects re-fetched if
+    they were in use) so the next request finds everything ready.
     
-    Simple recursive search through the JSON structure.
+    Args:
+        rest_client: eBay REST client instance
+        category_tree_id: The category tree ID
+        
+    Returns:
+        True if a new tree was downloaded
     """
-    def search_node(node: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-        # Check if this is the category we're looking for
-        category_info = node.get("category", {})
-        if category_info.get("categoryId") == category_id:
-            return node
+    cache_manager = get_cache_manager()
+    cached = await _load_cached_tree(category_tree_id)
+    cached_version = cached.get("categoryTreeVersion") if cached else None
+    marketplaces = (cached or {}).get("applicableMarketplaceIds") or []
+    
+    if cached_version and marketplaces:
+        current_version = await _fetch_current_version(rest_client, marketplaces[0])
+        if current_version == cached_version:
+            snapshots = get_category_snapshots()
+            if snapshots:
+                snapshots.touch(category_tree_id)
+            if cache_manager:
+                await cache_manager.touch(_tree_key(category_tree_id), CacheTTL.CATEGORY_TREE, raw_bytes=True)
+                await cache_manager.touch(
+                    _serialized_key(category_tree_id, cached_version, None),
+                    CacheTTL.CATEGORY_TREE,
+                    raw_bytes=True
+                )
+                await cache_manager.touch(_aspects_key(category_tree_id), CacheTTL.CATEGORY_TREE, raw_bytes=True)
+                await cache_manager.set(_checked_key(category_tree_id), True, CacheTTL.CATEGORIES)
+            logger.info(f"Category tree {category_tree_id} unchanged at v{cached_version}")
+            return False
+        logger.info(f"Category tree {category_tree_id} moved from v{cached_version} to v{current_version}")
+    
+    aspects_in_use = find_aspects_index(category_tree_id, cached_version) is not None
+    category_tree = await _download_category_tree(rest_client, category_tree_id)
+    await cache_serialized_category_json(category_tree, category_tree, category_tree_id)
+    if aspects_in_use:
+        await _fetch_category_aspects(rest_client, category_tree_id, category_tree.version)
+    return True
+
+
+# In-flight background refreshes per category tree ID
+_refresh_tasks: Dict[str, asyncio.Task] = {}
+
+
+def schedule_category_tree_refresh(
+    oauth_manager: OAuthManager,
+    rest_config: RestConfig,
+    category_tree_id: str
+) -> Optional[asyncio.Task]:
+    """
+    Start a background refresh of a category tree unless one is running.
+    
+    The refresh uses its own REST client on the shared runtime session, so it
+    outlives the tool call that triggered it.
+    
+    Returns:
+        The refresh task, or None if one was already running
+    """
+    running = _refresh_tasks.get(category_tree_id)
+    if running is not None and not running.done():
+        return None
+    
+    async def run_refresh() -> None:
+        runtime = get_runtime()
+        rest_client = EbayRestClient(
+            oauth_manager,
+            rest_config,
+            session_provider=runtime.get_session if runtime else None
+        )
+        try:
+            await refresh_category_tree(rest_client, category_tree_id)
+        except Exception as e:
+            logger.warning(f"Background refresh of category tree {category_tree_id} failed: {e}")
+        finally:
+            await rest_client.close()
+            _refresh_tasks.pop(category_tree_id, None)
+    
+    task = asyncio.create_task(run_refresh())
+    _refresh_tasks[category_tree_id] = task
+    return task
+
+
+async def get_category_aspects(
+    oauth_manager: OAuthManager,
+    rest_client: EbayRestClient,
+    category_tree_id: str,
+    force_refresh: bool = False
+) -> CategoryAspectsIndex:
+    """
+    Get the item aspects of every leaf category in a tree, from cache or API.
+    
+    The index is tied to the version of the cached category tree (see
+    get_category_tree_json): it is loaded from cache while its version
+    matches the tree's and re-downloaded from the fetch_item_aspects bulk
+    file once the tree has moved on. Concurrent callers share one download.
+    
+    Args:
+        oauth_manager: OAuth manager instance
+        rest_client: eBay REST client instance
+        category_tree_id: The category tree ID
+        force_refresh: Force a download, bypassing cache
         
-        # Search children
-        for child in node.get("childCategoryTreeNodes", []):
-            result = search_node(child)
-            if result:
-                return result
+    Returns:
+        Aspects index for the tree's current version
+    """
+    category_tree = await get_category_tree_json(oauth_manager, rest_client, category_tree_id)
+    version = category_tree.version
+    
+    if not force_refresh:
+        index = find_aspects_index(category_tree_id, version)
+        if index is not None:
+            return index
+        index = await _load_cached_aspects(category_tree_id, version)
+        if index is not None:
+            return index
+    
+    return await _fetch_category_aspects(rest_client, category_tree_id, version)
+
+
+async def _load_cached_aspects(category_tree_id: str, version: Optional[str]) -> Optional[CategoryAspectsIndex]:
+    """Open the cached aspects buffer if it belongs to the given tree version."""
+    cache_manager = get_cache_manager()
+    data = await cache_manager.get_bytes(_aspects_key(category_tree_id)) if cache_manager and version else None
+    if not data:
+        return None
+    index = CategoryAspectsIndex(data)
+    if index.version != version:
+        logger.info(f"Cached item aspects for tree {category_tree_id} are v{index.version}, tree is v{version}")
+        return None
+    return register_aspects_index(index)
+
+
+async def _fetch_category_aspects(
+    rest_client: EbayRestClient,
+    category_tree_id: str,
+    version: Optional[str]
+) -> CategoryAspectsIndex:
+    """Download the aspects bulk file once for all concurrent callers."""
+    return await get_request_coalescer().run(
+        ("FETCH_ITEM_ASPECTS", category_tree_id, version),
+        lambda: _download_category_aspects(rest_client, category_tree_id)
+    )
+
+
+async def _download_category_aspects(rest_client: EbayRestClient, category_tree_id: str) -> CategoryAspectsIndex:
+    """Stream the gzipped fetch_item_aspects file into an index and cache it."""
+    logger.info(f"Fetching item aspects bulk file from eBay API for tree ID {category_tree_id}")
+    
+    response = await rest_client.get(
+        f"/commerce/taxonomy/v1/category_tree/{category_tree_id}/fetch_item_aspects",
+        params={},
+        stream_parser=ItemAspectsStreamParser
+    )
+    index = response["body"]
+    if not isinstance(index, CategoryAspectsIndex):
+        # Clients that hand back parsed JSON (e.g. MockEbayRestClient)
+        parser = ItemAspectsStreamParser()
+        parser.feed(json_codec.dumps_bytes(index))
+        index = await get_offload_executor().run(True, parser.close)
+    
+    cache_manager = get_cache_manager()
+    if cache_manager and index.version:
+        await cache_manager.set_bytes(_aspects_key(category_tree_id), index.to_bytes(), CacheTTL.CATEGORY_TREE)
+        logger.info(f"Cached item aspects for {len(index)} categories of tree {category_tree_id} ({index.nbytes} bytes)")
+    
+    return register_aspects_index(index)
+
+
+def _expired_key(category_tree_id: str, marketplace_id: str) -> str:
+    """Cache key for a getExpiredCategories response."""
+    return f"CATEGORY_EXPIRED_{category_tree_id}_{marketplace_id}"
+
+
+async def get_expired_category_map(
+    rest_client: EbayRestClient,
+    category_tree_id: str,
+    marketplace_id: str,
+    force_refresh: bool = False
+) -> ExpiredCategoryMap:
+    """
+    Get the expired-to-replacement category map from memory, cache or API.
+    
+    Args:
+        rest_client: eBay REST client instance
+        category_tree_id: The category tree ID
+        marketplace_id: Marketplace the mapping applies to
+        force_refresh: Force refresh from API, bypassing cache
+        
+    Returns:
+        Map over the raw getExpiredCategories response
+    """
+    if not force_refresh:
+        expired_map = find_expired_category_map(category_tree_id, marketplace_id)
+        if expired_map is not None:
+            return expired_map
+    
+    cache_manager = get_cache_manager()
+    key = _expired_key(category_tree_id, marketplace_id)
+    response_body = await cache_manager.get(key) if cache_manager and not force_refresh else None
+    if response_body is None:
+        response = await rest_client.get(
+            f"/commerce/taxonomy/v1/category_tree/{category_tree_id}/get_expired_categories",
+            params={"marketplace_id": marketplace_id}
+        )
+        response_body = response["body"]
+        if cache_manager:
+            await cache_manager.set(key, response_body, CacheTTL.CATEGORIES)
+    
+    return register_expired_category_map(category_tree_id, marketplace_id, ExpiredCategoryMap(response_body))
+
+
+def _serialized_key(category_tree_id: str, version: str, category_id: Optional[str]) -> str:
+    """Cache key for a pre-serialized tree or subtree."""
+    key = f"CATEGORY_JSON_{category_tree_id}_{version}"
+    return f"{key}_{category_id}" if category_id else key
+
+
+async def get_serialized_category_json(
+    category_tree_json: Mapping[str, Any],
+    category_tree_id: str,
+    category_id: Optional[str] = None
+) -> Optional[bytes]:
+    """
+    Get the cached serialized JSON of a category tree or subtree.
+    
+    Args:
+        category_tree_json: Full tree JSON (supplies categoryTreeVersion)
+        category_tree_id: The category tree ID
+        category_id: Subtree root, or None for the full tree
         
+    Returns:
+        UTF-8 JSON bytes, or None on a cache miss
+    """
+    cache_manager = get_cache_manager()
+    version = category_tree_json.get("categoryTreeVersion")
+    if not cache_manager or not version:
         return None
+    return await cache_manager.get_bytes(_serialized_key(category_tree_id, version, category_id))
+
+
+async def cache_serialized_category_json(
+    data: Mapping[str, Any],
+    category_tree_json: Mapping[str, Any],
+    category_tree_id: str,
+    category_id: Optional[str] = None
+) -> bytes:
+    """
+    Serialize a category tree or subtree and cache the bytes.
+    
+    Trees without a categoryTreeVersion are serialized but not cached, since
+    the version is what keeps stale output from being served.
     
-    # Start search from root
-    root_node = category_tree_json.get("rootCategoryNode", {})
-    return search_node(root_node)
\ No newline at end of file
+    Args:
+        data: Tree or subtree to serialize
+        category_tree_json: Full tree JSON (supplies categoryTreeVersion)
+        category_tree_id: The category tree ID
+        category_id: Subtree root, or None for the full tree
+        
+    Returns:
+        UTF-8 JSON bytes
+    """
+    if isinstance(data, CompactCategoryTree):
+        data = data.to_json()
+    executor = get_offload_executor()
+    serialized = await executor.run(executor.is_large(data), json_codec.dumps_bytes, data)
+    
+    cache_manager = get_cache_manager()
+    version = category_tree_json.get("categoryTreeVersion")
+    if cache_manager and version:
+        await cache_manager.set_bytes(
+            _serialized_key(category_tree_id, version, category_id),
+            serialized,
+            CacheTTL.CATEGORY_TREE
+        )
+    return serialized
+
+
+def find_category_subtree(category_tree_json: Mapping[str, Any], category_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Find a specific category and its subtree as raw JSON.
+    
+    Uses the CategoryIndex for this tree version; the subtree is rebuilt
+    from the compact tree.
+    """
+    return get_category_index(category_tree_json).get_node(category_id)
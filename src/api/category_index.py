@@ -0,0 +1,151 @@
+"""
+Indexed in-memory view of an eBay category tree.
+
+Built once per category tree version on top of the compact array-backed
+tree (api.compact_tree), so no per-node dicts are kept. Gives fast node
+lookup, parent, depth, leaf and "is X under Y" checks, and ancestor paths
+for breadcrumbs.
+"""
+import logging
+from typing import Any, Dict, Iterator, List, Mapping, Optional
+
+from .compact_tree import CompactCategoryTree
+
+logger = logging.getLogger(__name__)
+
+PATH_SEPARATOR = " > "
+
+
+class CategoryIndex:
+    """
+    Category-ID lookups over a CompactCategoryTree.
+
+    Accepts either a raw getCategoryTree response (compacted on the way in)
+    or an existing CompactCategoryTree. get_node() rebuilds the raw JSON
+    subtree on demand.
+    """
+
+    def __init__(self, category_tree: Mapping[str, Any]):
+        if not isinstance(category_tree, CompactCategoryTree):
+            category_tree = CompactCategoryTree.from_json(category_tree)
+        self.tree = category_tree
+        self.category_tree_id: Optional[str] = category_tree.category_tree_id
+        self.version: Optional[str] = category_tree.version
+        self.root_id: Optional[str] = category_tree.id_at(0) if category_tree.size else None
+
+    def __len__(self) -> int:
+        return self.tree.size
+
+    def __contains__(self, category_id: str) -> bool:
+        return self.tree.find(category_id) >= 0
+
+    def iter_ids(self) -> Iterator[str]:
+        """Iterate category IDs in preorder."""
+        return (self.tree.id_at(position) for position in range(self.tree.size))
+
+    def get_node(self, category_id: str) -> Optional[Dict[str, Any]]:
+        """Get the raw tree node (the category's subtree), or None."""
+        position = self.tree.find(category_id)
+        return self.tree.node_json(position) if position >= 0 else None
+
+    def get_name(self, category_id: str) -> Optional[str]:
+        """Get the category name."""
+        position = self.tree.find(category_id)
+        return self.tree.name_at(position) if position >= 0 else None
+
+    def get_parent_id(self, category_id: str) -> Optional[str]:
+        """Get the parent category ID (None for the root or unknown IDs)."""
+        position = self.tree.find(category_id)
+        if position < 0 or self.tree.parent_at(position) < 0:
+            return None
+        return self.tree.id_at(self.tree.parent_at(position))
+
+    def get_depth(self, category_id: str) -> Optional[int]:
+        """Get the depth below the root (root is 0)."""
+        position = self.tree.find(category_id)
+        return self.tree.depth_at(position) if position >= 0 else None
+
+    def is_leaf(self, category_id: str) -> bool:
+        """Check whether a category is a leaf (listable) category."""
+        position = self.tree.find(category_id)
+        return position >= 0 and self.tree.is_leaf_at(position)
+
+    def _ancestor_positions(self, position: int) -> List[int]:
+        """Ancestor positions from the top-level category down to the parent."""
+        ancestors = []
+        parent = self.tree.parent_at(position)
+        while parent > 0:
+            ancestors.append(parent)
+            parent = self.tree.parent_at(parent)
+        ancestors.reverse()
+        return ancestors
+
+    def get_path(self, category_id: str) -> Optional[str]:
+        """Get the ancestor path string, e.g. "Electronics > Cell Phones"."""
+        position = self.tree.find(category_id)
+        if position < 0:
+            return None
+        if position == 0:
+            # The root ("Root") is not part of any breadcrumb
+            return ""
+        return PATH_SEPARATOR.join(
+            self.tree.name_at(crumb) for crumb in self._ancestor_positions(position) + [position]
+        )
+
+    def get_ancestor_ids(self, category_id: str) -> List[str]:
+        """Get ancestor IDs from the top-level category down to the parent."""
+        position = self.tree.find(category_id)
+        if position < 0:
+            return []
+        return [self.tree.id_at(ancestor) for ancestor in self._ancestor_positions(position)]
+
+    def get_breadcrumbs(self, category_id: str) -> List[Dict[str, str]]:
+        """Get [{categoryId, categoryName}] from the top-level category to category_id."""
+        position = self.tree.find(category_id)
+        if position <= 0:
+            return []
+        return [
+            {"categoryId": self.tree.id_at(crumb), "categoryName": self.tree.name_at(crumb)}
+            for crumb in self._ancestor_positions(position) + [position]
+        ]
+
+    def is_descendant(self, category_id: str, ancestor_id: str) -> bool:
+        """Check whether category_id is ancestor_id or lies under it."""
+        position = self.tree.find(category_id)
+        start = self.tree.find(ancestor_id)
+        if position < 0 or start < 0:
+            return False
+        return start <= position <= self.tree.subtree_end_at(start)
+
+
+# Latest index per category tree ID
+_indexes: Dict[str, CategoryIndex] = {}
+
+
+def find_category_index(category_tree_id: Optional[str], version: Optional[str]) -> Optional[CategoryIndex]:
+    """Get the already-built index for a tree version, if any."""
+    index = _indexes.get(category_tree_id)
+    if index is not None and version is not None and index.version == version:
+        return index
+    return None
+
+
+def get_category_index(category_tree: Mapping[str, Any]) -> CategoryIndex:
+    """
+    Get the index for a category tree, rebuilding only when its version changes.
+
+    Accepts a raw getCategoryTree response or a CompactCategoryTree. Trees
+    without categoryTreeId/categoryTreeVersion are indexed but not kept.
+    """
+    category_tree_id = category_tree.get("categoryTreeId")
+    version = category_tree.get("categoryTreeVersion")
+
+    index = find_category_index(category_tree_id, version)
+    if index is not None:
+        return index
+
+    index = CategoryIndex(category_tree)
+    if category_tree_id is not None and version is not None:
+        _indexes[category_tree_id] = index
+        logger.info(f"Indexed category tree {category_tree_id} v{version} ({len(index)} categories)")
+    return index
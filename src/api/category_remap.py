@@ -0,0 +1,86 @@
+"""
+Expired category to replacement category mapping.
+
+eBay's getExpiredCategories lists (fromCategoryId, toCategoryId) pairs for
+a tree and marketplace. ExpiredCategoryMap indexes them in a dict and
+follows chains (A expired into B, later B into C), so a whole catalog's
+categories can be remapped in one pass without further API calls.
+"""
+import time
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from .cache import CacheTTL
+
+
+class ExpiredCategoryMap:
+    """Dict index over one getExpiredCategories response."""
+
+    def __init__(self, response: Mapping[str, Any], max_age: int = CacheTTL.CATEGORIES):
+        self.response = response
+        self.loaded_at = time.monotonic()
+        self.max_age = max_age
+        self._replacements: Dict[str, str] = {
+            entry["fromCategoryId"]: entry["toCategoryId"]
+            for entry in response.get("expiredCategories") or []
+            if entry.get("fromCategoryId") and entry.get("toCategoryId")
+        }
+
+    def __len__(self) -> int:
+        return len(self._replacements)
+
+    def __contains__(self, category_id: str) -> bool:
+        return category_id in self._replacements
+
+    @property
+    def is_stale(self) -> bool:
+        return time.monotonic() - self.loaded_at > self.max_age
+
+    def resolve(self, category_id: str) -> Optional[str]:
+        """
+        Get the category that replaces an expired one.
+
+        Returns:
+            The final replacement after following chains, or None if the
+            category has not expired
+        """
+        replacement = self._replacements.get(category_id)
+        if replacement is None:
+            return None
+        seen = {category_id}
+        while replacement in self._replacements and replacement not in seen:
+            seen.add(replacement)
+            replacement = self._replacements[replacement]
+        return replacement
+
+    def remap(self, category_ids: Iterable[str]) -> List[Dict[str, Any]]:
+        """Remap category IDs (duplicates dropped, order kept)."""
+        return [
+            {
+                "categoryId": category_id,
+                "expired": category_id in self._replacements,
+                "replacementCategoryId": self.resolve(category_id)
+            }
+            for category_id in dict.fromkeys(category_ids)
+        ]
+
+
+# Loaded maps per (category tree ID, marketplace ID)
+_expired_maps: Dict[Tuple[str, str], ExpiredCategoryMap] = {}
+
+
+def find_expired_category_map(category_tree_id: str, marketplace_id: str) -> Optional[ExpiredCategoryMap]:
+    """Get the loaded map for a tree and marketplace unless it is stale."""
+    expired_map = _expired_maps.get((category_tree_id, marketplace_id))
+    if expired_map is not None and not expired_map.is_stale:
+        return expired_map
+    return None
+
+
+def register_expired_category_map(
+    category_tree_id: str,
+    marketplace_id: str,
+    expired_map: ExpiredCategoryMap
+) -> ExpiredCategoryMap:
+    """Keep a map as the current one for its tree and marketplace."""
+    _expired_maps[(category_tree_id, marketplace_id)] = expired_map
+    return expired_map
@@ -0,0 +1,162 @@
+"""
+On-disk category tree snapshots shared across worker processes.
+
+Each compact category tree (api.compact_tree) is written once per
+category_tree_id and categoryTreeVersion to a snapshot directory and opened
+with mmap, so every lootly-server process on the host maps the same
+physical pages and starts without downloading or parsing the tree.
+
+Files are written to a temporary name and renamed into place, so readers
+never see a partial snapshot. A small pointer file per tree ID names the
+current version; its modification time is when that version was last
+confirmed against eBay.
+"""
+import logging
+import mmap
+import os
+import re
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional
+
+from .cache import CacheTTL
+from .compact_tree import CompactCategoryTree
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_SUFFIX = ".lct"
+
+_UNSAFE_CHARS = re.compile(r"[^A-Za-z0-9_.-]")
+
+
+def _safe(part: str) -> str:
+    """Make a tree ID or version safe for use in a file name."""
+    return _UNSAFE_CHARS.sub("_", str(part))
+
+
+class CategorySnapshotStore:
+    """Versioned, memory-mapped category tree snapshots in one directory."""
+
+    def __init__(self, directory: str, max_age: int = CacheTTL.CATEGORY_TREE):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_age = max_age
+
+    def snapshot_path(self, category_tree_id: str, version: str) -> Path:
+        """Path of the snapshot for one tree version."""
+        return self.directory / f"category_tree_{_safe(category_tree_id)}_{_safe(version)}{SNAPSHOT_SUFFIX}"
+
+    def _pointer_path(self, category_tree_id: str) -> Path:
+        return self.directory / f"category_tree_{_safe(category_tree_id)}.current"
+
+    def _write_atomic(self, path: Path, data: bytes) -> None:
+        """Write a file under a temporary name, then rename it into place."""
+        fd, tmp_name = tempfile.mkstemp(dir=self.directory, prefix=f".{path.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as tmp:
+                tmp.write(data)
+                tmp.flush()
+                os.fsync(tmp.fileno())
+            os.replace(tmp_name, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_name)
+            except FileNotFoundError:
+                pass
+            raise
+
+    def current_version(self, category_tree_id: str) -> Optional[str]:
+        """Get the current snapshot version, or None if missing or older than max_age."""
+        pointer = self._pointer_path(category_tree_id)
+        try:
+            if time.time() - pointer.stat().st_mtime > self.max_age:
+                return None
+            return pointer.read_text().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def open(self, category_tree_id: str, version: Optional[str] = None) -> Optional[CompactCategoryTree]:
+        """
+        Map a snapshot read-only.
+
+        Args:
+            category_tree_id: The category tree ID
+            version: Tree version, or None for the current one
+
+        Returns:
+            Tree backed by the mapped file, or None if there is no usable snapshot
+        """
+        version = version or self.current_version(category_tree_id)
+        if not version:
+            return None
+
+        path = self.snapshot_path(category_tree_id, version)
+        try:
+            with open(path, "rb") as snapshot:
+                mapped = mmap.mmap(snapshot.fileno(), 0, access=mmap.ACCESS_READ)
+        except (FileNotFoundError, ValueError):
+            # ValueError: empty file
+            return None
+
+        try:
+            tree = CompactCategoryTree(mapped)
+        except (ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable category snapshot {path}: {e}")
+            return None
+        if tree.version != version:
+            logger.warning(f"Ignoring category snapshot {path}: contains version {tree.version}")
+            return None
+        return tree
+
+    def write(self, tree: CompactCategoryTree) -> Path:
+        """
+        Write a tree snapshot and make it the current version.
+
+        Older versions of the same tree are removed; processes still mapping
+        them keep their pages until they let go.
+        """
+        category_tree_id = tree.category_tree_id
+        version = tree.version
+        if category_tree_id is None or version is None:
+            raise ValueError("Only trees with categoryTreeId and categoryTreeVersion can be snapshotted")
+
+        path = self.snapshot_path(category_tree_id, version)
+        self._write_atomic(path, tree.to_bytes())
+        self._write_atomic(self._pointer_path(category_tree_id), version.encode("utf-8"))
+        self._prune(category_tree_id, keep=path)
+        logger.info(f"Wrote category snapshot {path} ({tree.nbytes} bytes)")
+        return path
+
+    def touch(self, category_tree_id: str) -> bool:
+        """Mark the current version as confirmed now."""
+        try:
+            os.utime(self._pointer_path(category_tree_id))
+            return True
+        except FileNotFoundError:
+            return False
+
+    def _prune(self, category_tree_id: str, keep: Path) -> None:
+        """Remove other versions of a tree."""
+        for path in self.directory.glob(f"category_tree_{_safe(category_tree_id)}_*{SNAPSHOT_SUFFIX}"):
+            if path != keep:
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    pass
+
+
+# Global snapshot store; None unless enabled with init_category_snapshots
+category_snapshots: Optional[CategorySnapshotStore] = None
+
+
+def get_category_snapshots() -> Optional[CategorySnapshotStore]:
+    """Get the global category snapshot store."""
+    return category_snapshots
+
+
+def init_category_snapshots(directory: str) -> CategorySnapshotStore:
+    """Initialize the global category snapshot store."""
+    global category_snapshots
+    category_snapshots = CategorySnapshotStore(directory)
+    return category_snapshots
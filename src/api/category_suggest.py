@@ -0,0 +1,212 @@
+"""
+Offline category suggestions over a cached category tree.
+
+An inverted index over leaf category names and their ancestor paths is
+scored with BM25 (name terms weigh more than path terms). Queries are
+answered in-process; callers fall back to eBay's getCategorySuggestions
+when the best match is weak or ambiguous (see CategorySuggester.suggest).
+"""
+import heapq
+import logging
+import math
+import re
+from collections import Counter, defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+from .category_index import CategoryIndex
+
+logger = logging.getLogger(__name__)
+
+# Minimum confidence for answering locally instead of calling eBay
+DEFAULT_MIN_CONFIDENCE = 0.6
+
+NAME_WEIGHT = 1.0
+PATH_WEIGHT = 0.4
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset({"a", "an", "and", "for", "in", "of", "on", "or", "the", "to", "with", "other"})
+
+
+def _stem(token: str) -> str:
+    """Fold simple English plurals ("phones" -> "phone", "batteries" -> "battery")."""
+    if len(token) > 4 and token.endswith("ies"):
+        return token[:-3] + "y"
+    if len(token) > 4 and token.endswith(("ches", "shes", "sses", "xes", "zes")):
+        return token[:-2]
+    if len(token) > 3 and token.endswith("s") and not token.endswith(("ss", "us", "is")):
+        return token[:-1]
+    return token
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase, split on non-alphanumerics, drop stopwords and stem."""
+    return [
+        _stem(token)
+        for token in _TOKEN_RE.findall(text.lower())
+        # Single letters are mostly possessive leftovers ("Men's" -> "men", "s")
+        if token not in _STOPWORDS and (len(token) > 1 or token.isdigit())
+    ]
+
+
+class CategorySuggester:
+    """
+    BM25 suggestion engine over the leaf categories of one tree version.
+
+    Each leaf is a document made of its name (NAME_WEIGHT) and its ancestor
+    path (PATH_WEIGHT).
+    """
+
+    def __init__(self, index: CategoryIndex):
+        self.index = index
+        self.category_tree_id = index.category_tree_id
+        self.version = index.version
+        self._doc_ids: List[str] = []
+        self._doc_lengths: List[float] = []
+        self._postings: Dict[str, List[Tuple[int, float]]] = defaultdict(list)
+        self._build()
+
+    def _build(self) -> None:
+        """Build the inverted index."""
+        category_ids = [category_id for category_id in self.index.iter_ids() if self.index.is_leaf(category_id)]
+        for category_id in category_ids:
+            if category_id == self.index.root_id:
+                continue
+            name = self.index.get_name(category_id)
+            parent_path = self.index.get_path(self.index.get_parent_id(category_id)) or ""
+
+            weights: Dict[str, float] = Counter()
+            for token in tokenize(name):
+                weights[token] += NAME_WEIGHT
+            for token in tokenize(parent_path):
+                weights[token] += PATH_WEIGHT
+            if not weights:
+                continue
+
+            doc = len(self._doc_ids)
+            self._doc_ids.append(category_id)
+            self._doc_lengths.append(sum(weights.values()))
+            for token, weight in weights.items():
+                self._postings[token].append((doc, weight))
+
+        self._avg_length = (sum(self._doc_lengths) / len(self._doc_lengths)) if self._doc_lengths else 1.0
+
+    def __len__(self) -> int:
+        return len(self._doc_ids)
+
+    def _idf(self, token: str) -> float:
+        """BM25 inverse document frequency."""
+        total = len(self._doc_ids)
+        frequency = len(self._postings.get(token, ()))
+        return math.log(1 + (total - frequency + 0.5) / (frequency + 0.5))
+
+    def suggest(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Rank leaf categories for a query.
+
+        Args:
+            query: Free-text item description
+            limit: Maximum suggestions
+
+        Returns:
+            Suggestions ordered by score, each with categoryId, score and
+            confidence. Confidence is the share of the query's known-term IDF
+            weight the category matches, scaled down when the runner-up
+            scores nearly as high. Terms absent from the taxonomy (brands,
+            models, sizes) are ignored; a query with no known terms has no
+            suggestions.
+        """
+        terms = [term for term in dict.fromkeys(tokenize(query)) if term in self._postings]
+        if not terms:
+            return []
+
+        idf = {term: self._idf(term) for term in terms}
+        total_idf = sum(idf.values())
+        scores: Dict[int, float] = defaultdict(float)
+        matched: Dict[int, float] = defaultdict(float)
+
+        for term in terms:
+            for doc, weight in self._postings.get(term, ()):
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * self._doc_lengths[doc] / self._avg_length)
+                scores[doc] += idf[term] * weight * (BM25_K1 + 1) / (weight + norm)
+                matched[doc] += idf[term]
+
+        best = heapq.nlargest(max(limit, 2), scores.items(), key=lambda item: (item[1], -item[0]))
+        top_score = best[0][1]
+        runner_up = best[1][1] if len(best) > 1 else 0.0
+        separation = 0.5 + 0.5 * (top_score - runner_up) / top_score if top_score > 0 else 0.0
+
+        return [
+            {
+                "categoryId": self._doc_ids[doc],
+                "score": round(score, 4),
+                "confidence": round(matched[doc] / total_idf * separation * score / top_score, 4)
+            }
+            for doc, score in best[:limit]
+        ]
+
+    def to_suggestions_response(self, suggestions: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Format suggestions like eBay's getCategorySuggestions response."""
+        results = []
+        for suggestion in suggestions:
+            category_id = suggestion["categoryId"]
+            ancestors = [
+                {
+                    "categoryId": ancestor_id,
+                    "categoryName": self.index.get_name(ancestor_id),
+                    "categoryTreeNodeLevel": self.index.get_depth(ancestor_id)
+                }
+                for ancestor_id in reversed(self.index.get_ancestor_ids(category_id))
+            ]
+            results.append({
+                "category": {
+                    "categoryId": category_id,
+                    "categoryName": self.index.get_name(category_id)
+                },
+                "categoryTreeNodeAncestors": ancestors,
+                "categoryTreeNodeLevel": self.index.get_depth(category_id),
+                "relevancy": str(suggestion["score"])
+            })
+        return {
+            "categorySuggestions": results,
+            "categoryTreeId": self.category_tree_id,
+            "categoryTreeVersion": self.version
+        }
+
+
+# Latest suggester per category tree ID
+_suggesters: Dict[str, CategorySuggester] = {}
+
+
+def get_category_suggester(index: CategoryIndex) -> CategorySuggester:
+    """Get the suggester for an indexed tree, rebuilding only when its version changes."""
+    suggester = _suggesters.get(index.category_tree_id)
+    if suggester is not None and index.version is not None and suggester.version == index.version:
+        return suggester
+
+    suggester = CategorySuggester(index)
+    if index.category_tree_id is not None and index.version is not None:
+        _suggesters[index.category_tree_id] = suggester
+        logger.info(f"Built category suggester for tree {index.category_tree_id} v{index.version} ({len(suggester)} leaves)")
+    return suggester
+
+
+def suggest_categories(
+    index: CategoryIndex,
+    query: str,
+    limit: int = 10,
+    min_confidence: float = DEFAULT_MIN_CONFIDENCE
+) -> Optional[Dict[str, Any]]:
+    """
+    Answer a category suggestion query locally.
+
+    Returns:
+        getCategorySuggestions-shaped response, or None when the best match
+        is below min_confidence and the live API should be used instead
+    """
+    suggester = get_category_suggester(index)
+    suggestions = suggester.suggest(query, limit)
+    if not suggestions or suggestions[0]["confidence"] < min_confidence:
+        return None
+    return suggester.to_suggestions_response(suggestions)
@@ -0,0 +1,166 @@
+"""
+Depth-limited, projected and paginated views of a category tree.
+
+The full tree is 17,000+ categories; most callers only need one branch or a
+few levels. These views walk the compact tree (api.compact_tree) in
+preorder and return either a depth-limited nested tree or flat pages of
+projected rows, resumable with an opaque cursor.
+"""
+import base64
+import json
+from typing import Any, Dict, List, Optional, Sequence
+
+from .compact_tree import CompactCategoryTree
+
+# Row fields available to projections
+CATEGORY_FIELDS = ("id", "parent_id", "name", "leaf", "depth")
+DEFAULT_FIELDS = ("id", "parent_id", "name", "leaf")
+
+DEFAULT_PAGE_SIZE = 500
+MAX_PAGE_SIZE = 5000
+
+
+class CategoryNotFoundError(LookupError):
+    """The requested root category is not in the tree."""
+
+
+def _encode_cursor(version: Optional[str], root_id: str, max_depth: Optional[int], position: int) -> str:
+    """Opaque cursor tying a resume position to the tree version and query."""
+    raw = json.dumps([version, root_id, max_depth, position], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str, version: Optional[str], root_id: str, max_depth: Optional[int]) -> int:
+    """Get the resume position from a cursor made for the same tree version and query."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_version, cursor_root, cursor_depth, position = json.loads(base64.urlsafe_b64decode(padded))
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+    if cursor_version != version:
+        raise ValueError("Cursor is from an older category tree version; start again without a cursor")
+    if cursor_root != root_id or cursor_depth != max_depth or not isinstance(position, int):
+        raise ValueError("Cursor does not match root_category_id/max_depth")
+    return position
+
+
+def _root_position(tree: CompactCategoryTree, root_category_id: Optional[str]) -> int:
+    if not tree.size:
+        raise CategoryNotFoundError("Category tree is empty")
+    if root_category_id is None:
+        return 0
+    position = tree.find(root_category_id)
+    if position < 0:
+        raise CategoryNotFoundError(f"Category {root_category_id} not found in tree")
+    return position
+
+
+def _validate_fields(fields: Optional[Sequence[str]]) -> List[str]:
+    fields = list(fields or DEFAULT_FIELDS)
+    unknown = [field for field in fields if field not in CATEGORY_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown fields {unknown}; choose from {list(CATEGORY_FIELDS)}")
+    return fields
+
+
+def _row(tree: CompactCategoryTree, position: int, fields: Sequence[str]) -> List[Any]:
+    values = []
+    for field in fields:
+        if field == "id":
+            values.append(tree.id_at(position))
+        elif field == "parent_id":
+            parent = tree.parent_at(position)
+            values.append(tree.id_at(parent) if parent >= 0 else None)
+        elif field == "name":
+            values.append(tree.name_at(position))
+        elif field == "leaf":
+            values.append(tree.is_leaf_at(position))
+        else:
+            values.append(tree.depth_at(position))
+    return values
+
+
+def category_tree_view(
+    tree: CompactCategoryTree,
+    root_category_id: Optional[str] = None,
+    max_depth: Optional[int] = None,
+    fields: Optional[Sequence[str]] = None
+) -> Dict[str, Any]:
+    """
+    Nested view of a (sub)tree, optionally depth-limited and projected.
+
+    Without fields the nodes are raw eBay JSON; with fields each node is
+    {field: value, ..., "children": [...]}. Non-leaf nodes at the depth
+    cut-off have no children listed.
+    """
+    position = _root_position(tree, root_category_id)
+    if not fields:
+        return tree.node_json(position, max_depth)
+
+    fields = _validate_fields(fields)
+    built: Dict[int, Dict[str, Any]] = {}
+    for current in tree.iter_subtree(position, max_depth):
+        node = built[current] = dict(zip(fields, _row(tree, current, fields)))
+        if current != position:
+            built[tree.parent_at(current)].setdefault("children", []).append(node)
+    return built[position]
+
+
+def category_rows_view(
+    tree: CompactCategoryTree,
+    root_category_id: Optional[str] = None,
+    max_depth: Optional[int] = None,
+    fields: Optional[Sequence[str]] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None,
+    tabular: bool = False
+) -> Dict[str, Any]:
+    """
+    One page of a (sub)tree as flat rows in preorder.
+
+    Args:
+        tree: Compact category tree
+        root_category_id: Subtree root, None for the whole tree
+        max_depth: Levels below the root to include, None for all
+        fields: Projection from CATEGORY_FIELDS (default id, parent_id, name, leaf)
+        limit: Rows per page, up to MAX_PAGE_SIZE
+        cursor: next_cursor from the previous page
+        tabular: Return {"columns": [...], "rows": [[...]]} instead of one object per row
+
+    Returns:
+        Page with the rows and next_cursor (None on the last page)
+
+    Raises:
+        CategoryNotFoundError: Unknown root category
+        ValueError: Bad fields, limit or cursor
+    """
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        raise ValueError(f"limit must be between 1 and {MAX_PAGE_SIZE}")
+    fields = _validate_fields(fields)
+    position = _root_position(tree, root_category_id)
+    root_id = tree.id_at(position)
+    start = _decode_cursor(cursor, tree.version, root_id, max_depth) if cursor else None
+    if start is not None and not position < start <= tree.subtree_end_at(position):
+        raise ValueError("Invalid cursor")
+
+    rows: List[List[Any]] = []
+    next_cursor = None
+    for current in tree.iter_subtree(position, max_depth, start):
+        if len(rows) == limit:
+            next_cursor = _encode_cursor(tree.version, root_id, max_depth, current)
+            break
+        rows.append(_row(tree, current, fields))
+
+    page: Dict[str, Any] = {
+        "category_tree_id": tree.category_tree_id,
+        "category_tree_version": tree.version,
+        "root_category_id": root_id,
+        "max_depth": max_depth,
+    }
+    if tabular:
+        page["columns"] = fields
+        page["rows"] = rows
+    else:
+        page["categories"] = [dict(zip(fields, row)) for row in rows]
+    page["next_cursor"] = next_cursor
+    return page
@@ -0,0 +1,130 @@
+"""
+Single-flight coalescing of identical in-flight requests.
+
+When several tool calls ask eBay for the same resource at the same moment,
+only the first one goes over the wire; the others await the same in-flight
+future. Only idempotent reads are coalesced - mutating verbs always pass
+through.
+"""
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable, Mapping, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+COALESCABLE_METHODS = frozenset({"GET"})
+
+# Headers that never change what eBay returns for a read
+_IGNORED_KEY_HEADERS = frozenset({"authorization", "accept", "content-type"})
+
+
+def _normalize_params(params: Optional[Mapping[str, Any]]) -> Tuple[Tuple[str, str], ...]:
+    """Sort params and stringify values so equivalent queries share a key."""
+    if not params:
+        return ()
+    return tuple(sorted((str(key), str(value)) for key, value in params.items() if value is not None))
+
+
+def make_request_key(
+    method: str,
+    url: str,
+    params: Optional[Mapping[str, Any]] = None,
+    headers: Optional[Mapping[str, str]] = None,
+    marketplace_id: str = "EBAY_US",
+    scope: str = ""
+) -> Tuple[Hashable, ...]:
+    """
+    Build the coalescing key for a request.
+
+    Args:
+        method: HTTP method
+        url: Full request URL (includes the sandbox/production host)
+        params: Query parameters
+        headers: Caller-supplied headers
+        marketplace_id: Effective X-EBAY-C-MARKETPLACE-ID
+        scope: Credential scope (e.g. client ID) so different credentials never share a response
+
+    Returns:
+        Hashable key; equal keys mean interchangeable responses
+    """
+    extra_headers = tuple(sorted(
+        (name.lower(), str(value))
+        for name, value in (headers or {}).items()
+        if name.lower() not in _IGNORED_KEY_HEADERS and name.lower() != "x-ebay-c-marketplace-id"
+    ))
+    return (method.upper(), url, _normalize_params(params), marketplace_id, extra_headers, scope)
+
+
+class RequestCoalescer:
+    """
+    Shares one in-flight future between concurrent identical requests.
+
+    Callers that join an in-flight request receive the same response object
+    as the leader, so response bodies must be treated as read-only.
+    """
+
+    def __init__(self):
+        self._in_flight: Dict[Tuple[Hashable, ...], asyncio.Future] = {}
+        self.leaders = 0
+        self.coalesced = 0
+
+    async def run(
+        self,
+        key: Tuple[Hashable, ...],
+        fetch: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """
+        Run fetch() once for all concurrent callers with the same key.
+
+        Args:
+            key: Request key from make_request_key
+            fetch: Coroutine factory performing the real request
+
+        Returns:
+            The shared result. Exceptions are propagated to every caller.
+        """
+        in_flight = self._in_flight.get(key)
+        if in_flight is not None and in_flight.get_loop() is asyncio.get_running_loop():
+            self.coalesced += 1
+            logger.debug(f"Coalesced request {key[0]} {key[1]}")
+            # Shield so one caller's cancellation does not cancel the shared request
+            return await asyncio.shield(in_flight)
+
+        task = asyncio.ensure_future(fetch())
+        self._in_flight[key] = task
+        self.leaders += 1
+        try:
+            return await asyncio.shield(task)
+        finally:
+            if task.done() and self._in_flight.get(key) is task:
+                del self._in_flight[key]
+            elif not task.done():
+                task.add_done_callback(lambda _: self._forget(key, task))
+
+    def _forget(self, key: Tuple[Hashable, ...], task: asyncio.Future) -> None:
+        """Drop a finished request from the in-flight table."""
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        if not task.cancelled():
+            # Mark the exception retrieved when every caller has gone away
+            task.exception()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get coalescing statistics."""
+        total = self.leaders + self.coalesced
+        return {
+            "requests_sent": self.leaders,
+            "requests_coalesced": self.coalesced,
+            "in_flight": len(self._in_flight),
+            "coalesce_rate": self.coalesced / total if total else 0.0
+        }
+
+
+# Global coalescer shared by every EbayRestClient in the process
+request_coalescer = RequestCoalescer()
+
+
+def get_request_coalescer() -> RequestCoalescer:
+    """Get the global request coalescer."""
+    return request_coalescer
@@ -0,0 +1,619 @@
+"""
+Compact array-backed category tree.
+
+A getCategoryTree response parsed into Python objects costs a dict, a list
+and several strings per category (tens of MB for a full marketplace tree).
+This module stores the same tree as parallel arrays in preorder (category
+ID, parent position, subtree end, depth, flags, name reference) plus an
+interned UTF-8 string table, all inside one bytes buffer. The buffer is both
+the in-memory representation and the cache value, so the cache and the tree
+share the same memory.
+
+Only the fields eBay sends for every node are stored in arrays; anything
+else is kept losslessly in a small per-node extras table, so node_json()
+rebuilds the original JSON. CompactTreeStreamParser builds the tree
+straight from response body chunks.
+"""
+import codecs
+import json
+import re
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+MAGIC = b"LCT1"
+ROOT_KEY = "rootCategoryNode"
+
+# Node flags
+FLAG_LEAF_KEY = 1      # node had a leafCategoryTreeNode key
+FLAG_LEAF = 2          # ...and it was true
+FLAG_LEVEL = 4         # categoryTreeNodeLevel present and equal to the depth
+FLAG_PARENT_HREF = 8   # parentCategoryTreeNodeHref is href_prefix + parent ID
+
+# (name, typecode, length key) in buffer order; "n" is the node count
+_SECTIONS: Tuple[Tuple[str, str, str], ...] = (
+    ("ids", "q", "n"),
+    ("sorted_ids", "q", "n"),
+    ("sorted_positions", "I", "n"),
+    ("parents", "i", "n"),
+    ("subtree_ends", "I", "n"),
+    ("name_refs", "I", "n"),
+    ("string_offsets", "I", "string_offsets"),
+    ("depths", "H", "n"),
+    ("flags", "B", "n"),
+    ("string_data", "B", "string_bytes"),
+)
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+# Object key and colon, for keys without escapes (all of eBay's); others
+# go through the JSON decoder
+_SIMPLE_KEY = re.compile(r'"([^"\\]*)"[ \t\n\r]*:')
+# A node object with no arrays (so no children) and one level of nesting;
+# possessive quantifiers keep a failed match linear
+_STRING = r'"(?:[^"\\]++|\\.)*+"'
+_LEAF_NODE = re.compile(
+    r'\{(?:[^{}\[\]"]++|' + _STRING + r'|\{(?:[^{}\[\]"]++|' + _STRING + r')*+\})*+\}'
+)
+
+
+def _padding(size: int) -> int:
+    """Bytes needed to align size to 8."""
+    return -size % 8
+
+
+class CompactTreeBuilder:
+    """
+    Incrementally builds a CompactCategoryTree from nodes in preorder.
+
+    Call begin_node() when a node starts, set_field() for each of its JSON
+    fields (in any order, before or after its children) and end_node() once
+    its children are done. Node data goes straight into typed arrays and the
+    string table, so building holds little more than the finished buffer.
+    """
+
+    def __init__(self):
+        self.tree_fields: Dict[str, Any] = {}
+        self._ids = array("q")
+        self._parents = array("i")
+        self._subtree_ends = array("I")
+        self._depths = array("H")
+        self._flags = array("B")
+        self._name_refs = array("I")
+        self._string_refs: Dict[str, int] = {}
+        self._string_offsets = array("I", [0])
+        self._string_data = bytearray()
+        self._href_prefix: Optional[str] = None
+        # Fields that do not fit the arrays, and hrefs seen before their parent's ID
+        self._extras: Dict[int, Dict[str, Any]] = {}
+        self._pending_hrefs: Dict[int, str] = {}
+        self._intern("")
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def _intern(self, text: str) -> int:
+        """Get the string table reference for text, adding it once."""
+        ref = self._string_refs.get(text)
+        if ref is None:
+            ref = self._string_refs[text] = len(self._string_refs)
+            self._string_data += text.encode("utf-8")
+            self._string_offsets.append(len(self._string_data))
+        return ref
+
+    def _extra(self, position: int, key: str, value: Any) -> None:
+        self._extras.setdefault(position, {})[key] = value
+
+    def begin_node(self, parent: int = -1) -> int:
+        """Start a node under the parent position (-1 for the root); returns its position."""
+        position = len(self._ids)
+        self._ids.append(-1)
+        self._parents.append(parent)
+        self._subtree_ends.append(position)
+        self._depths.append(self._depths[parent] + 1 if parent >= 0 else 0)
+        self._flags.append(0)
+        self._name_refs.append(0)
+        return position
+
+    def set_field(self, position: int, key: str, value: Any) -> None:
+        """Record one JSON field of a node (childCategoryTreeNodes is implied by structure)."""
+        if key == "category" and isinstance(value, dict):
+            category_id = value.get("categoryId")
+            if category_id is not None:
+                # eBay category IDs are numeric strings
+                self._ids[position] = int(category_id)
+            self._name_refs[position] = self._intern(value.get("categoryName", ""))
+            if value.keys() - {"categoryId", "categoryName"}:
+                self._extra(position, "category", value)
+        elif key == "categoryTreeNodeLevel":
+            if value == self._depths[position]:
+                self._flags[position] |= FLAG_LEVEL
+            else:
+                self._extra(position, key, value)
+        elif key == "leafCategoryTreeNode":
+            self._flags[position] |= FLAG_LEAF_KEY | (FLAG_LEAF if value else 0)
+        elif key == "parentCategoryTreeNodeHref":
+            parent = self._parents[position]
+            if parent >= 0 and self._ids[parent] >= 0:
+                self._set_href(position, value)
+            else:
+                self._pending_hrefs[position] = value
+        elif key != "childCategoryTreeNodes":
+            self._extra(position, key, value)
+
+    def _set_href(self, position: int, href: str) -> None:
+        """Fold a parent href into the shared prefix; irregular ones become extras."""
+        parent = self._parents[position]
+        parent_id = str(self._ids[parent]) if parent >= 0 else None
+        if self._href_prefix is None and parent_id and href.endswith(parent_id):
+            self._href_prefix = href[:-len(parent_id)]
+        if parent_id is not None and href == f"{self._href_prefix}{parent_id}":
+            self._flags[position] |= FLAG_PARENT_HREF
+        else:
+            self._extra(position, "parentCategoryTreeNodeHref", href)
+
+    def end_node(self, position: int) -> None:
+        """Close a node once all of its descendants have been added."""
+        self._subtree_ends[position] = len(self._ids) - 1
+
+    def add_json(self, node: Dict[str, Any], parent: int = -1) -> None:
+        """Add a raw JSON node and its whole subtree (iteratively)."""
+        stack: List[Tuple[Dict[str, Any], int, bool]] = [(node, parent, False)]
+        while stack:
+            current, parent_position, exiting = stack.pop()
+            if exiting:
+                self.end_node(parent_position)
+                continue
+            if current.get("category", {}).get("categoryId") is None:
+                continue
+
+            position = self.begin_node(parent_position)
+            for key, value in current.items():
+                self.set_field(position, key, value)
+            stack.append((current, position, True))
+            for child in reversed(current.get("childCategoryTreeNodes") or []):
+                stack.append((child, position, False))
+
+    def to_bytes(self) -> bytes:
+        """Encode the tree into the compact buffer format."""
+        if -1 in self._ids:
+            raise ValueError("Every category tree node needs a categoryId")
+        for position, href in sorted(self._pending_hrefs.items()):
+            self._set_href(position, href)
+        self._pending_hrefs.clear()
+
+        order = sorted(range(len(self._ids)), key=self._ids.__getitem__)
+        sections = {
+            "ids": self._ids,
+            "sorted_ids": array("q", (self._ids[position] for position in order)),
+            "sorted_positions": array("I", order),
+            "parents": self._parents,
+            "subtree_ends": self._subtree_ends,
+            "name_refs": self._name_refs,
+            "string_offsets": self._string_offsets,
+            "depths": self._depths,
+            "flags": self._flags,
+            "string_data": self._string_data,
+        }
+        del order
+        header = json.dumps({
+            "byteorder": sys.byteorder,
+            "tree": self.tree_fields,
+            "n": len(self._ids),
+            "string_offsets": len(self._string_offsets),
+            "string_bytes": len(self._string_data),
+            "href_prefix": self._href_prefix,
+            "extras": {str(position): extra for position, extra in self._extras.items()},
+        }, separators=(",", ":")).encode("utf-8")
+
+        parts = [MAGIC, struct.pack("<I", len(header)), header, b"\0" * _padding(8 + len(header))]
+        for name, _, _ in _SECTIONS:
+            data = sections[name]
+            size = len(data) * data.itemsize if isinstance(data, array) else len(data)
+            parts.append(data)
+            parts.append(b"\0" * _padding(size))
+        return b"".join(parts)
+
+    def build(self) -> "CompactCategoryTree":
+        """Encode and open the finished tree."""
+        return CompactCategoryTree(self.to_bytes())
+
+
+class CompactTreeStreamParser:
+    """
+    Incremental parser from getCategoryTree response bytes to a compact tree.
+
+    feed() takes body chunks as they arrive; each node goes straight into a
+    CompactTreeBuilder, so the nested dict for the whole tree never exists.
+    Only the small field values (a category object, a level, an href) are
+    decoded as JSON; the node/children structure is walked here.
+    """
+
+    def __init__(self):
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._json = json.JSONDecoder()
+        self._builder = CompactTreeBuilder()
+        self._text = ""
+        self._pos = 0
+        self._final = False
+        # ("top", -1), ("node", position) or ("children", parent position)
+        self._stack: List[Tuple[str, int]] = []
+        self._state = "start"
+        self._key: Optional[str] = None
+
+    def feed(self, chunk: bytes) -> None:
+        """Parse as much of the body as the chunks so far allow."""
+        self._text = self._text[self._pos:] + self._decoder.decode(chunk)
+        self._pos = 0
+        self._parse()
+
+    def close(self) -> "CompactCategoryTree":
+        """Finish parsing and build the tree."""
+        self._text = self._text[self._pos:] + self._decoder.decode(b"", final=True)
+        self._pos = 0
+        self._final = True
+        self._parse()
+        if self._state != "done":
+            raise ValueError("Truncated category tree response")
+        return self._builder.build()
+
+    def _decode_value(self, text: str, pos: int) -> Optional[Tuple[Any, int]]:
+        """Decode one JSON value, or None if it may continue in the next chunk."""
+        try:
+            value, end = self._json.raw_decode(text, pos)
+        except json.JSONDecodeError:
+            if self._final:
+                raise
+            return None
+        # A number at the end of the buffer may still have more digits coming
+        if end >= len(text) and not self._final:
+            return None
+        return value, end
+
+    def _end_object(self) -> None:
+        """Close the innermost object and pick the state that follows it."""
+        kind, position = self._stack.pop()
+        if kind == "node":
+            self._builder.end_node(position)
+        if not self._stack:
+            self._state = "done"
+        elif self._stack[-1][0] == "children":
+            self._state = "after_element"
+        else:
+            self._state = "after_value"
+
+    def _parse(self) -> None:
+        text = self._text
+        pos = self._pos
+        length = len(text)
+        stack = self._stack
+        builder = self._builder
+
+        while True:
+            pos = _WHITESPACE.match(text, pos).end()
+            if pos >= length:
+                break
+            char = text[pos]
+            state = self._state
+
+            if state == "key":
+                if char == "}":
+                    pos += 1
+                    self._end_object()
+                    continue
+                match = _SIMPLE_KEY.match(text, pos)
+                if match:
+                    self._key, pos = match.group(1), match.end()
+                    self._state = "value"
+                    continue
+                decoded = self._decode_value(text, pos)
+                if decoded is None:
+                    break
+                self._key, pos = decoded
+                self._state = "colon"
+            elif state == "colon":
+                self._expect(char, ":")
+                pos += 1
+                self._state = "value"
+            elif state == "value":
+                kind, position = stack[-1]
+                if kind == "top" and self._key == ROOT_KEY and char == "{":
+                    stack.append(("node", builder.begin_node()))
+                    pos += 1
+                    self._state = "key"
+                elif kind == "node" and self._key == "childCategoryTreeNodes" and char == "[":
+                    stack.append(("children", position))
+                    pos += 1
+                    self._state = "element"
+                else:
+                    decoded = self._decode_value(text, pos)
+                    if decoded is None:
+                        break
+                    value, pos = decoded
+                    if kind == "top":
+                        builder.tree_fields[self._key] = value
+                    else:
+                        builder.set_field(position, self._key, value)
+                    self._state = "after_value"
+            elif state == "after_value":
+                pos += 1
+                if char == ",":
+                    self._state = "key"
+                else:
+                    self._expect(char, "}")
+                    self._end_object()
+            elif state in ("element", "after_element"):
+                pos += 1
+                if char == "]":
+                    stack.pop()
+                    self._state = "after_value"
+                elif state == "after_element":
+                    self._expect(char, ",")
+                    self._state = "element"
+                else:
+                    self._expect(char, "{")
+                    parent = stack[-1][1]
+                    if _LEAF_NODE.match(text, pos - 1):
+                        # Leaf nodes are small: decode them whole
+                        node, pos = self._json.raw_decode(text, pos - 1)
+                        position = builder.begin_node(parent)
+                        for key, value in node.items():
+                            builder.set_field(position, key, value)
+                        builder.end_node(position)
+                        self._state = "after_element"
+                    else:
+                        stack.append(("node", builder.begin_node(parent)))
+                        self._state = "key"
+            elif state == "start":
+                self._expect(char, "{")
+                pos += 1
+                stack.append(("top", -1))
+                self._state = "key"
+            else:
+                raise ValueError(f"Unexpected data after category tree at offset {pos}")
+
+        self._pos = pos
+
+    @staticmethod
+    def _expect(char: str, expected: str) -> None:
+        if char != expected:
+            raise ValueError(f"Malformed category tree response: expected {expected!r}, got {char!r}")
+
+
+class CategoryNode:
+    """Lightweight view of one node of a CompactCategoryTree."""
+
+    __slots__ = ("_tree", "position")
+
+    def __init__(self, tree: "CompactCategoryTree", position: int):
+        self._tree = tree
+        self.position = position
+
+    def __repr__(self) -> str:
+        return f"CategoryNode({self.category_id!r}, {self.name!r})"
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, CategoryNode) and other._tree is self._tree and other.position == self.position
+
+    def __hash__(self) -> int:
+        return hash((id(self._tree), self.position))
+
+    @property
+    def category_id(self) -> str:
+        return self._tree.id_at(self.position)
+
+    @property
+    def name(self) -> str:
+        return self._tree.name_at(self.position)
+
+    @property
+    def depth(self) -> int:
+        return self._tree.depth_at(self.position)
+
+    @property
+    def is_leaf(self) -> bool:
+        return self._tree.is_leaf_at(self.position)
+
+    @property
+    def parent(self) -> Optional["CategoryNode"]:
+        parent = self._tree.parent_at(self.position)
+        return CategoryNode(self._tree, parent) if parent >= 0 else None
+
+    @property
+    def children(self) -> List["CategoryNode"]:
+        return [CategoryNode(self._tree, child) for child in self._tree.children_at(self.position)]
+
+    def to_json(self) -> Dict[str, Any]:
+        """Rebuild this node's subtree as raw eBay JSON."""
+        return self._tree.node_json(self.position)
+
+
+class CompactCategoryTree(Mapping):
+    """
+    Read-only category tree over a compact buffer.
+
+    Behaves like the getCategoryTree response mapping: top-level fields
+    (categoryTreeId, categoryTreeVersion, ...) are read from the header and
+    rootCategoryNode is rebuilt on access. Node queries take preorder
+    positions; find() maps a category ID to its position.
+    """
+
+    def __init__(self, buffer):
+        self._buffer = buffer
+        view = memoryview(buffer)
+        self.header = self.read_header(view)
+        if self.header["byteorder"] != sys.byteorder:
+            raise ValueError("Category tree buffer was written with a different byte order")
+
+        offset = 8 + struct.unpack_from("<I", view, 4)[0]
+        offset += _padding(offset)
+        for name, typecode, length_key in _SECTIONS:
+            size = self.header[length_key] * array(typecode).itemsize
+            section = view[offset:offset + size]
+            setattr(self, f"_{name}", section if typecode == "B" else section.cast(typecode))
+            offset += size + _padding(size)
+
+        self.size = len(self._ids)
+        self._extras: Dict[int, Dict[str, Any]] = {int(k): v for k, v in self.header["extras"].items()}
+        self._href_prefix: Optional[str] = self.header["href_prefix"]
+
+    @staticmethod
+    def read_header(data) -> Dict[str, Any]:
+        """Parse only the header of a compact buffer (cheap version checks)."""
+        view = memoryview(data)
+        if bytes(view[:4]) != MAGIC:
+            raise ValueError("Not a compact category tree buffer")
+        length = struct.unpack_from("<I", view, 4)[0]
+        return json.loads(bytes(view[8:8 + length]))
+
+    @classmethod
+    def from_json(cls, category_tree_json: Dict[str, Any]) -> "CompactCategoryTree":
+        """Build from a raw getCategoryTree response."""
+        builder = CompactTreeBuilder()
+        builder.tree_fields = {key: value for key, value in category_tree_json.items() if key != ROOT_KEY}
+        if category_tree_json.get(ROOT_KEY):
+            builder.add_json(category_tree_json[ROOT_KEY])
+        return builder.build()
+
+    def to_bytes(self) -> bytes:
+        """Get the compact buffer (no copy when backed by bytes)."""
+        return self._buffer if isinstance(self._buffer, bytes) else bytes(self._buffer)
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._buffer)
+
+    @property
+    def category_tree_id(self) -> Optional[str]:
+        return self.header["tree"].get("categoryTreeId")
+
+    @property
+    def version(self) -> Optional[str]:
+        return self.header["tree"].get("categoryTreeVersion")
+
+    # Mapping over the top-level response fields
+
+    def __getitem__(self, key: str) -> Any:
+        if key == ROOT_KEY and self.size:
+            return self.node_json(0)
+        return self.header["tree"][key]
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self.header["tree"]
+        if self.size:
+            yield ROOT_KEY
+
+    def __len__(self) -> int:
+        return len(self.header["tree"]) + (1 if self.size else 0)
+
+    def to_json(self) -> Dict[str, Any]:
+        """Rebuild the full getCategoryTree response."""
+        return dict(self.items())
+
+    # Node queries by preorder position
+
+    def find(self, category_id: str) -> int:
+        """Get the position of a category ID, or -1."""
+        try:
+            key = int(category_id)
+        except (TypeError, ValueError):
+            return -1
+        index = bisect_left(self._sorted_ids, key)
+        if index < self.size and self._sorted_ids[index] == key:
+            return self._sorted_positions[index]
+        return -1
+
+    def node(self, category_id: str) -> Optional[CategoryNode]:
+        """Get a view of a category, or None."""
+        position = self.find(category_id)
+        return CategoryNode(self, position) if position >= 0 else None
+
+    def id_at(self, position: int) -> str:
+        return str(self._ids[position])
+
+    def name_at(self, position: int) -> str:
+        ref = self._name_refs[position]
+        return str(self._string_data[self._string_offsets[ref]:self._string_offsets[ref + 1]], "utf-8")
+
+    def parent_at(self, position: int) -> int:
+        """Parent position, -1 for the root."""
+        return self._parents[position]
+
+    def depth_at(self, position: int) -> int:
+        return self._depths[position]
+
+    def subtree_end_at(self, position: int) -> int:
+        """Last preorder position inside the node's subtree."""
+        return self._subtree_ends[position]
+
+    def is_leaf_at(self, position: int) -> bool:
+        return bool(self._flags[position] & FLAG_LEAF) or self._subtree_ends[position] == position
+
+    def children_at(self, position: int) -> Iterator[int]:
+        """Iterate child positions in order."""
+        child = position + 1
+        end = self._subtree_ends[position]
+        while child <= end:
+            yield child
+            child = self._subtree_ends[child] + 1
+
+    def _node_fields(self, position: int) -> Dict[str, Any]:
+        """Rebuild one node's JSON fields, without children."""
+        flags = self._flags[position]
+        extras = self._extras.get(position, {})
+        fields: Dict[str, Any] = {
+            "category": extras.get("category") or {
+                "categoryId": self.id_at(position),
+                "categoryName": self.name_at(position)
+            }
+        }
+        if flags & FLAG_PARENT_HREF:
+            fields["parentCategoryTreeNodeHref"] = f"{self._href_prefix}{self.id_at(self._parents[position])}"
+        if flags & FLAG_LEVEL:
+            fields["categoryTreeNodeLevel"] = self._depths[position]
+        if flags & FLAG_LEAF_KEY:
+            fields["leafCategoryTreeNode"] = bool(flags & FLAG_LEAF)
+        for key, value in extras.items():
+            if key != "category":
+                fields[key] = value
+        return fields
+
+    def iter_subtree(self, position: int, max_depth: Optional[int] = None, start: Optional[int] = None) -> Iterator[int]:
+        """
+        Iterate subtree positions in preorder.
+
+        Args:
+            position: Subtree root
+            max_depth: Levels below the root to include (0 = root only), None for all
+            start: Resume from this position (inclusive) inside the subtree
+        """
+        end = self._subtree_ends[position]
+        limit = None if max_depth is None else self._depths[position] + max_depth
+        current = position if start is None else start
+        while current <= end:
+            if limit is not None and self._depths[current] > limit:
+                # Skip the whole too-deep subtree
+                current = self._subtree_ends[current] + 1
+                continue
+            yield current
+            current += 1
+
+    def node_json(self, position: int, max_depth: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Rebuild the raw JSON subtree rooted at a position.
+
+        With max_depth, nodes at the cut-off keep their fields but not their
+        children (non-leaf nodes without childCategoryTreeNodes).
+        """
+        positions = (
+            range(position, self._subtree_ends[position] + 1)
+            if max_depth is None else self.iter_subtree(position, max_depth)
+        )
+        built: Dict[int, Dict[str, Any]] = {}
+        for current in positions:
+            fields = built[current] = self._node_fields(current)
+            if current != position:
+                built[self._parents[current]].setdefault("childCategoryTreeNodes", []).append(fields)
+        return built[position]
@@ -0,0 +1,266 @@
+"""
+Comparable sales ("comps") engine for pricing items.
+
+CompsSet loads converted sold items and formatted active listings into
+column arrays once: landed price (item price plus cheapest shipping) sorted
+per condition group. evaluate then prices any number of candidate prices
+in one pass (binary searches against the sorted columns plus quantiles),
+returning price positions, deal scores and a suggested price band rather
+than the raw listings.
+
+Uses NumPy when it is installed (pip install "lootly[comps]") and falls
+back to bisect over sorted lists otherwise.
+"""
+import bisect
+import time
+from typing import Any, Dict, Hashable, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from .cache import CacheTTL
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+COMPS_BACKEND = "numpy" if NUMPY_AVAILABLE else "python"
+
+# Quantiles reported for sold and active comps
+COMPS_QUANTILES = (0.10, 0.25, 0.50, 0.75, 0.90)
+
+# Coarse condition groups that are compared with each other
+CONDITION_GROUPS = ("NEW", "REFURBISHED", "USED", "FOR_PARTS")
+
+
+def condition_group(condition_id: Optional[str] = None, condition: Optional[str] = None) -> Optional[str]:
+    """
+    Map an eBay condition ID or name to a coarse condition group.
+
+    Returns:
+        One of CONDITION_GROUPS, or None when the condition is unknown
+    """
+    if condition_id and condition_id.isdigit():
+        value = int(condition_id)
+        if value < 2000:
+            return "NEW"
+        if value < 2750:
+            return "REFURBISHED"
+        if value < 7000:
+            return "USED"
+        return "FOR_PARTS"
+    text = (condition or "").lower()
+    if not text:
+        return None
+    if "parts" in text:
+        return "FOR_PARTS"
+    if "refurbished" in text:
+        return "REFURBISHED"
+    if "new" in text and "like new" not in text:
+        return "NEW"
+    return "USED"
+
+
+def _landed_listing_price(listing: Mapping[str, Any]) -> Optional[float]:
+    """Listing price plus its cheapest shipping cost."""
+    value = (listing.get("price") or {}).get("value")
+    if value is None:
+        return None
+    shipping_costs = [
+        float(option["shippingCost"]["value"])
+        for option in listing.get("shipping_options") or []
+        if (option.get("shippingCost") or {}).get("value") is not None
+    ]
+    return float(value) + (min(shipping_costs) if shipping_costs else 0.0)
+
+
+def _sorted_column(values: List[float]):
+    if NUMPY_AVAILABLE:
+        return np.sort(np.asarray(values, dtype=np.float64))
+    return sorted(values)
+
+
+def _positions(column, prices: Sequence[float]) -> List[Optional[float]]:
+    """Midpoint percentile rank (0-1) of each price within a sorted column."""
+    count = len(column)
+    if not count:
+        return [None] * len(prices)
+    if NUMPY_AVAILABLE:
+        targets = np.asarray(prices, dtype=np.float64)
+        below = np.searchsorted(column, targets, side="left")
+        at_or_below = np.searchsorted(column, targets, side="right")
+        return ((below + at_or_below) / (2 * count)).tolist()
+    return [
+        (bisect.bisect_left(column, price) + bisect.bisect_right(column, price)) / (2 * count)
+        for price in prices
+    ]
+
+
+def _quantiles(column) -> Optional[Dict[str, float]]:
+    """Linearly interpolated quantiles of a sorted column."""
+    count = len(column)
+    if not count:
+        return None
+    if NUMPY_AVAILABLE:
+        values = np.quantile(column, COMPS_QUANTILES).tolist()
+    else:
+        values = []
+        for q in COMPS_QUANTILES:
+            position = q * (count - 1)
+            low = int(position)
+            high = min(low + 1, count - 1)
+            values.append(column[low] + (column[high] - column[low]) * (position - low))
+    return {f"p{round(q * 100)}": round(value, 2) for q, value in zip(COMPS_QUANTILES, values)}
+
+
+class CompsSet:
+    """Sold and active landed prices by condition group, as sorted columns."""
+
+    def __init__(
+        self,
+        sold: Mapping[Optional[str], List[float]],
+        active: Mapping[Optional[str], List[float]],
+        currency: str = "USD",
+        skipped: int = 0,
+        max_age: int = CacheTTL.COMPS
+    ):
+        self.currency = currency
+        self.skipped = skipped
+        # Whether loading stopped at a page budget before every comp was read
+        self.truncated = False
+        self.loaded_at = time.monotonic()
+        self.max_age = max_age
+        # Columns per condition group, plus None for every condition together
+        self._sold = self._columns(sold)
+        self._active = self._columns(active)
+
+    @staticmethod
+    def _columns(prices: Mapping[Optional[str], List[float]]) -> Dict[Optional[str], Any]:
+        columns = {group: _sorted_column(values) for group, values in prices.items() if group is not None}
+        columns[None] = _sorted_column([price for values in prices.values() for price in values])
+        return columns
+
+    @classmethod
+    def from_records(
+        cls,
+        sales: Iterable[Mapping[str, Any]],
+        listings: Iterable[Mapping[str, Any]],
+        currency: str = "USD"
+    ) -> "CompsSet":
+        """
+        Build from converted sales (_convert_item_sale) and formatted listings
+        (_format_search_response items). Records in another currency or
+        without a price are skipped.
+        """
+        sold: Dict[Optional[str], List[float]] = {}
+        active: Dict[Optional[str], List[float]] = {}
+        skipped = 0
+        for sale in sales:
+            price = sale.get("price") or {}
+            if price.get("value") is None or price.get("currency", currency) != currency:
+                skipped += 1
+                continue
+            group = condition_group(sale.get("condition_id"), sale.get("condition"))
+            sold.setdefault(group, []).append(float(price["value"]))
+        for listing in listings:
+            landed = _landed_listing_price(listing)
+            if landed is None or (listing.get("price") or {}).get("currency", currency) != currency:
+                skipped += 1
+                continue
+            group = condition_group(listing.get("condition_id"), listing.get("condition"))
+            active.setdefault(group, []).append(landed)
+        return cls(sold, active, currency, skipped)
+
+    @property
+    def is_stale(self) -> bool:
+        return time.monotonic() - self.loaded_at > self.max_age
+
+    @property
+    def sold_count(self) -> int:
+        return len(self._sold[None])
+
+    @property
+    def active_count(self) -> int:
+        return len(self._active[None])
+
+    def evaluate(
+        self,
+        prices: Sequence[float],
+        condition: Optional[str] = None,
+        shipping_cost: float = 0.0
+    ) -> Dict[str, Any]:
+        """
+        Position candidate prices against the comps.
+
+        Args:
+            prices: Item prices to evaluate
+            condition: Condition group (CONDITION_GROUPS) to compare within; None for all
+            shipping_cost: Shipping added to each price to compare landed prices
+
+        Returns:
+            Sold and active quantiles, a suggested price band (sold p25-p75,
+            or active when nothing sold), and per price its position among
+            sold and active comps (0-100), deal score (0-100, higher is
+            cheaper than more comps) and verdict
+        """
+        sold = self._sold.get(condition, [])
+        active = self._active.get(condition, [])
+        landed = [price + shipping_cost for price in prices]
+        sold_positions = _positions(sold, landed)
+        active_positions = _positions(active, landed)
+
+        sold_quantiles = _quantiles(sold)
+        active_quantiles = _quantiles(active)
+        reference = sold_quantiles or active_quantiles
+        band = {"low": reference["p25"], "target": reference["p50"], "high": reference["p75"]} if reference else None
+
+        results = []
+        for price, landed_price, sold_position, active_position in zip(prices, landed, sold_positions, active_positions):
+            position = sold_position if sold_position is not None else active_position
+            if band is None:
+                verdict = None
+            elif landed_price < band["low"]:
+                verdict = "below_market"
+            elif landed_price > band["high"]:
+                verdict = "above_market"
+            else:
+                verdict = "within_market"
+            results.append({
+                "price": price,
+                "landed_price": round(landed_price, 2),
+                "sold_position": None if sold_position is None else round(sold_position * 100, 1),
+                "active_position": None if active_position is None else round(active_position * 100, 1),
+                "deal_score": None if position is None else round((1 - position) * 100),
+                "verdict": verdict
+            })
+
+        return {
+            "condition_group": condition,
+            "currency": self.currency,
+            "sold_comps": len(sold),
+            "active_comps": len(active),
+            "sold_quantiles": sold_quantiles,
+            "active_quantiles": active_quantiles,
+            "suggested_price_band": band,
+            "results": results
+        }
+
+
+# Loaded comps per search key, kept for CacheTTL.COMPS
+_comps_sets: Dict[Tuple[Hashable, ...], CompsSet] = {}
+
+
+def find_comps(key: Tuple[Hashable, ...]) -> Optional[CompsSet]:
+    """Get the loaded comps for a search unless they are stale."""
+    comps = _comps_sets.get(key)
+    if comps is not None and not comps.is_stale:
+        return comps
+    return None
+
+
+def register_comps(key: Tuple[Hashable, ...], comps: CompsSet) -> CompsSet:
+    """Keep comps as the current ones for a search, dropping stale ones."""
+    for stale_key in [stale_key for stale_key, loaded in _comps_sets.items() if loaded.is_stale]:
+        del _comps_sets[stale_key]
+    _comps_sets[key] = comps
+    return comps
@@ -0,0 +1,52 @@
+"""
+JSON encoding and decoding for eBay API payloads.
+
+Uses orjson when it is installed (pip install "lootly[fast]") and falls back
+to the standard library otherwise. Both backends accept bytes, so response
+bodies can be parsed straight from the wire without an extra decode step.
+"""
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+# Both orjson.JSONDecodeError and json.JSONDecodeError subclass ValueError
+JSONDecodeError = ValueError
+
+JSON_BACKEND = "orjson" if ORJSON_AVAILABLE else "json"
+
+
+def loads(data: Union[bytes, bytearray, memoryview, str]) -> Any:
+    """
+    Parse a JSON document.
+
+    Args:
+        data: Raw UTF-8 bytes or text
+
+    Raises:
+        ValueError: If data is not valid JSON
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    return json.loads(data)
+
+
+def dumps(obj: Any) -> str:
+    """Serialize obj to a compact JSON string."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+
+
+def dumps_bytes(obj: Any) -> bytes:
+    """Serialize obj to compact UTF-8 JSON bytes."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode()
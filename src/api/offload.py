@@ -0,0 +1,148 @@
+"""
+Off-event-loop JSON and pydantic serialization for large payloads.
+
+Small payloads are (de)serialized inline - a thread hop costs more than the
+work. Payloads above a size threshold (the 17k-node category tree, 200-item
+search pages) run on a small bounded thread pool shared by the REST client,
+the cache layer and the MCP response builders.
+
+A thread pool rather than a process pool: the parsed result would have to be
+pickled back to the loop, which costs about as much as parsing it there.
+"""
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
+
+from . import json_codec
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Raw JSON larger than this is parsed off the loop
+DEFAULT_THRESHOLD_BYTES = 256 * 1024
+
+# Python objects with more containers/values than this are serialized off the loop
+DEFAULT_THRESHOLD_ITEMS = 5000
+
+
+def count_items(obj: Any, limit: int) -> int:
+    """
+    Count values in a JSON-like object, stopping once limit is exceeded.
+
+    The walk is bounded by limit, so sizing a huge tree stays cheap.
+    """
+    count = 0
+    stack = [obj]
+    while stack and count <= limit:
+        value = stack.pop()
+        count += 1
+        if isinstance(value, dict):
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            stack.extend(value)
+    return count
+
+
+class OffloadExecutor:
+    """
+    Size-threshold policy in front of a bounded thread pool.
+
+    Work below the threshold runs inline on the event loop; larger work is
+    submitted to at most max_workers threads so a burst of big payloads
+    cannot starve the pool used by other blocking calls.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 2,
+        threshold_bytes: int = DEFAULT_THRESHOLD_BYTES,
+        threshold_items: int = DEFAULT_THRESHOLD_ITEMS
+    ):
+        self.max_workers = max_workers
+        self.threshold_bytes = threshold_bytes
+        self.threshold_items = threshold_items
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.inline_calls = 0
+        self.offloaded_calls = 0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Create the thread pool on first use."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="lootly-serialize"
+            )
+        return self._executor
+
+    def is_large(self, obj: Any) -> bool:
+        """Check whether a Python object should be serialized off the loop."""
+        if isinstance(obj, (bytes, bytearray, memoryview, str)):
+            return len(obj) >= self.threshold_bytes
+        return count_items(obj, self.threshold_items) > self.threshold_items
+
+    async def run(self, large: bool, func: Callable[..., T], *args: Any) -> T:
+        """
+        Run func(*args) inline or on the pool.
+
+        Args:
+            large: Whether the payload crossed the size threshold
+            func: Blocking serialization function
+            args: Arguments for func
+
+        Returns:
+            The function result
+        """
+        if not large:
+            self.inline_calls += 1
+            return func(*args)
+
+        self.offloaded_calls += 1
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_executor(), func, *args)
+
+    async def loads(self, data: Any) -> Any:
+        """Parse JSON bytes/text, off the loop when larger than threshold_bytes."""
+        return await self.run(len(data) >= self.threshold_bytes, json_codec.loads, data)
+
+    async def dumps(self, obj: Any) -> str:
+        """Serialize obj to JSON, off the loop when it is large."""
+        return await self.run(self.is_large(obj), json_codec.dumps, obj)
+
+    def get_stats(self) -> dict:
+        """Get offload statistics."""
+        return {
+            "inline_calls": self.inline_calls,
+            "offloaded_calls": self.offloaded_calls,
+            "max_workers": self.max_workers,
+            "threshold_bytes": self.threshold_bytes,
+            "threshold_items": self.threshold_items
+        }
+
+    def close(self) -> None:
+        """Shut the thread pool down."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+# Global offload executor shared by the REST client, cache and response builders
+offload_executor: OffloadExecutor = OffloadExecutor()
+
+
+def get_offload_executor() -> OffloadExecutor:
+    """Get the global offload executor."""
+    return offload_executor
+
+
+def init_offload_executor(
+    max_workers: int = 2,
+    threshold_bytes: int = DEFAULT_THRESHOLD_BYTES,
+    threshold_items: int = DEFAULT_THRESHOLD_ITEMS
+) -> OffloadExecutor:
+    """Initialize the global offload executor."""
+    global offload_executor
+    offload_executor.close()
+    offload_executor = OffloadExecutor(max_workers, threshold_bytes, threshold_items)
+    return offload_executor
@@ -0,0 +1,160 @@
+"""
+Concurrent offset pagination for eBay search endpoints.
+
+Search endpoints return at most 200 results per call and no result beyond
+offset 10,000. fetch_pages reads the first page to learn the total, plans
+the remaining pages up to the requested count and that cap, and fetches
+them concurrently (each call still passes the client's rate limiter and
+quota), yielding pages as they arrive. PageMerger collects them, counts
+unique results as they come in and assembles them in offset order,
+dropping duplicate IDs (listings shift between pages while paging).
+"""
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from .rate_limiter import DEFAULT_BURST
+
+logger = logging.getLogger(__name__)
+
+# eBay returns no results past this offset
+MAX_OFFSET = 10000
+MAX_PAGE_SIZE = 200
+
+# Pages in flight at once per paginated search
+DEFAULT_PAGE_CONCURRENCY = 5
+
+# Pages read per paginated search at most. Page budgets for fan-outs are
+# sized against the rate limiter's default burst so that no single tool
+# call can drain it; one search gets a quarter, and tools that run several
+# searches or date windows per call allow a multiple of this
+DEFAULT_MAX_PAGES = DEFAULT_BURST // 4
+
+FetchPage = Callable[[int, int], Awaitable[Dict[str, Any]]]
+
+
+def plan_pages(
+    offset: int,
+    count: int,
+    page_size: int = MAX_PAGE_SIZE,
+    total: Optional[int] = None
+) -> List[Tuple[int, int]]:
+    """
+    Split a result range into (offset, limit) page requests.
+
+    Args:
+        offset: First result wanted
+        count: Number of results wanted
+        page_size: Results per request
+        total: Known result total, to skip pages past the end
+
+    Returns:
+        Page requests, none reaching past MAX_OFFSET
+    """
+    end = min(offset + count, MAX_OFFSET)
+    if total is not None:
+        end = min(end, total)
+    return [(start, min(page_size, end - start)) for start in range(offset, end, page_size)]
+
+
+@dataclass
+class Page:
+    """One fetched page of results."""
+    offset: int
+    items: List[Dict[str, Any]]
+    total: int
+
+
+async def fetch_pages(
+    fetch_page: FetchPage,
+    offset: int,
+    count: int,
+    page_size: int = MAX_PAGE_SIZE,
+    concurrency: int = DEFAULT_PAGE_CONCURRENCY,
+    items_key: str = "itemSummaries",
+    max_pages: int = DEFAULT_MAX_PAGES
+) -> AsyncIterator[Page]:
+    """
+    Fetch a result range page by page, yielding pages as they complete.
+
+    The first page is fetched alone to learn the total; the rest run
+    concurrently, at most `concurrency` at a time. A failing page cancels
+    the remaining ones and re-raises, so callers can keep the pages they
+    already have (e.g. on RateLimitError).
+
+    Args:
+        fetch_page: Coroutine taking (offset, limit) and returning the response body
+        offset: First result wanted
+        count: Number of results wanted
+        page_size: Results per request (at most MAX_PAGE_SIZE)
+        concurrency: Maximum pages in flight
+        items_key: Response field holding the results
+        max_pages: Pages fetched at most; results past them are not read
+    """
+    plan = plan_pages(offset, count, page_size)
+    if not plan:
+        return
+
+    first_offset, first_limit = plan[0]
+    body = await fetch_page(first_offset, first_limit)
+    total = body.get("total", 0)
+    yield Page(first_offset, body.get(items_key) or [], total)
+
+    remaining = plan_pages(first_offset + first_limit, offset + count - first_offset - first_limit, page_size, total)
+    if len(remaining) >= max_pages:
+        logger.info(f"Reading {max_pages} of {len(remaining) + 1} pages")
+        remaining = remaining[:max_pages - 1]
+    if not remaining:
+        return
+    logger.debug(f"Fetching {len(remaining)} more pages of {total} results")
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch(page_offset: int, limit: int) -> Page:
+        async with semaphore:
+            page_body = await fetch_page(page_offset, limit)
+        return Page(page_offset, page_body.get(items_key) or [], page_body.get("total", total))
+
+    tasks = [asyncio.ensure_future(fetch(page_offset, limit)) for page_offset, limit in remaining]
+    try:
+        for next_page in asyncio.as_completed(tasks):
+            yield await next_page
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+@dataclass
+class PageMerger:
+    """Merges pages in offset order, keeping the first result per ID."""
+    id_key: str = "itemId"
+    pages: Dict[int, List[Dict[str, Any]]] = field(default_factory=dict)
+    seen: Set[str] = field(default_factory=set)
+    total: int = 0
+
+    def add(self, page: Page) -> int:
+        """Add a page; returns how many unique results have arrived so far."""
+        self.pages[page.offset] = page.items
+        self.total = max(self.total, page.total)
+        self.seen.update(item[self.id_key] for item in page.items if item.get(self.id_key) is not None)
+        return len(self.seen)
+
+    def items(self) -> List[Dict[str, Any]]:
+        """Unique results in offset order."""
+        merged = []
+        seen: Set[str] = set()
+        for page_offset in sorted(self.pages):
+            for item in self.pages[page_offset]:
+                item_id = item.get(self.id_key)
+                if item_id is not None:
+                    if item_id in seen:
+                        continue
+                    seen.add(item_id)
+                merged.append(item)
+        return merged
+
+    @property
+    def duplicates(self) -> int:
+        return sum(len(items) for items in self.pages.values()) - len(self.items())
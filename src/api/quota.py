@@ -0,0 +1,301 @@
+"""
+Daily API quota enforcement shared across the whole process.
+
+Keeps one call ledger per eBay API family (browse, taxonomy, sell.inventory,
+...) so every tool call and every EbayRestClient draws from the same daily
+budget. When a Redis URL is configured the ledger lives in Redis and uses
+atomic INCR/EXPIRE, so several server replicas share one budget.
+"""
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+
+from .errors import RateLimitError
+
+try:
+    import redis.asyncio as redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    redis = None
+    REDIS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+# Endpoint prefix -> API family. eBay enforces call limits per API, not per app.
+API_FAMILY_PREFIXES = (
+    ("/buy/browse/", "browse"),
+    ("/buy/marketplace_insights/", "marketplace_insights"),
+    ("/commerce/taxonomy/", "taxonomy"),
+    ("/sell/inventory/", "sell.inventory"),
+    ("/sell/account/", "sell.account"),
+    ("/sell/marketing/", "sell.marketing"),
+    ("/sell/analytics/", "sell.analytics"),
+    ("/developer/analytics/", "developer.analytics"),
+)
+
+
+def resolve_api_family(endpoint: str) -> str:
+    """
+    Map an endpoint path to its eBay API family.
+
+    Args:
+        endpoint: API endpoint path (e.g., "/buy/browse/v1/item_summary/search")
+
+    Returns:
+        API family name (e.g., "browse"). Unknown endpoints use their first
+        two path segments joined by a dot.
+    """
+    for prefix, family in API_FAMILY_PREFIXES:
+        if endpoint.startswith(prefix):
+            return family
+
+    segments = [segment for segment in endpoint.split("/") if segment]
+    return ".".join(segments[:2]) or "default"
+
+
+def _quota_day(now: Optional[datetime] = None) -> str:
+    """Get the quota window identifier (UTC calendar day)."""
+    now = now or datetime.now(timezone.utc)
+    return now.strftime("%Y%m%d")
+
+
+def _seconds_until_reset(now: Optional[datetime] = None) -> int:
+    """Get seconds until the quota window resets at UTC midnight."""
+    now = now or datetime.now(timezone.utc)
+    tomorrow = now.replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
+    return max(1, int((tomorrow - now).total_seconds()))
+
+
+class QuotaLedger(ABC):
+    """Interface for quota counter storage."""
+
+    @abstractmethod
+    async def incr(self, key: str, ttl: int) -> int:
+        """Atomically increment a counter and return the new value."""
+        pass
+
+    @abstractmethod
+    async def get(self, key: str) -> int:
+        """Get the current counter value."""
+        pass
+
+
+class MemoryQuotaLedger(QuotaLedger):
+    """In-process quota ledger."""
+
+    def __init__(self):
+        self._counters: Dict[str, int] = {}
+        self._lock = asyncio.Lock()
+
+    async def incr(self, key: str, ttl: int) -> int:
+        """Increment counter. Stale windows are dropped as new ones start."""
+        async with self._lock:
+            if key not in self._counters:
+                family_prefix = key.rsplit(":", 1)[0] + ":"
+                for stale in [k for k in self._counters if k.startswith(family_prefix)]:
+                    del self._counters[stale]
+            self._counters[key] = self._counters.get(key, 0) + 1
+            return self._counters[key]
+
+    async def get(self, key: str) -> int:
+        """Get counter value."""
+        return self._counters.get(key, 0)
+
+
+class RedisQuotaLedger(QuotaLedger):
+    """Redis quota ledger shared by all replicas."""
+
+    def __init__(self, redis_url: str, key_prefix: str = "lootly:quota:"):
+        self.redis_url = redis_url
+        self.key_prefix = key_prefix
+        self._client = None
+        self._lock = asyncio.Lock()
+
+    async def _get_client(self):
+        """Get Redis client with connection pooling."""
+        if self._client is None:
+            async with self._lock:
+                if self._client is None:
+                    self._client = redis.from_url(
+                        self.redis_url,
+                        decode_responses=True,
+                        max_connections=20
+                    )
+        return self._client
+
+    async def incr(self, key: str, ttl: int) -> int:
+        """Atomically increment counter and set its expiry."""
+        client = await self._get_client()
+        prefixed_key = f"{self.key_prefix}{key}"
+
+        async with client.pipeline(transaction=True) as pipe:
+            pipe.incr(prefixed_key)
+            pipe.expire(prefixed_key, ttl)
+            count, _ = await pipe.execute()
+        return int(count)
+
+    async def get(self, key: str) -> int:
+        """Get counter value."""
+        client = await self._get_client()
+        value = await client.get(f"{self.key_prefix}{key}")
+        return int(value) if value else 0
+
+    async def close(self):
+        """Close Redis connection."""
+        if self._client:
+            await self._client.close()
+
+
+class QuotaManager:
+    """
+    Process-wide daily quota enforcement per eBay API family.
+
+    Uses a Redis ledger when available, falling back to an in-memory ledger
+    if Redis is not configured or becomes unreachable.
+    """
+
+    def __init__(
+        self,
+        default_daily_limit: int = 5000,
+        daily_limits: Optional[Dict[str, int]] = None,
+        redis_url: Optional[str] = None
+    ):
+        self.default_daily_limit = default_daily_limit
+        self.daily_limits = dict(daily_limits or {})
+        self.memory_ledger = MemoryQuotaLedger()
+        self.redis_ledger: Optional[RedisQuotaLedger] = None
+
+        if redis_url and REDIS_AVAILABLE:
+            try:
+                self.redis_ledger = RedisQuotaLedger(redis_url)
+                logger.info("Redis quota ledger initialized")
+            except Exception as e:
+                logger.warning(f"Failed to initialize Redis quota ledger: {e}")
+
+        if not self.redis_ledger:
+            logger.info("Using in-memory quota ledger")
+
+    def limit_for(self, family: str) -> int:
+        """Get the daily call limit for an API family."""
+        return self.daily_limits.get(family, self.default_daily_limit)
+
+    def _make_key(self, family: str, now: Optional[datetime] = None) -> str:
+        """Build the ledger key for a family's current window."""
+        return f"{family}:{_quota_day(now)}"
+
+    async def _incr(self, key: str, ttl: int) -> int:
+        """Increment using Redis, falling back to memory on errors."""
+        if self.redis_ledger:
+            try:
+                return await self.redis_ledger.incr(key, ttl)
+            except Exception as e:
+                logger.warning(f"Redis quota incr error for {key}, using memory ledger: {e}")
+        return await self.memory_ledger.incr(key, ttl)
+
+    async def _get(self, key: str) -> int:
+        """Read using Redis, falling back to memory on errors."""
+        if self.redis_ledger:
+            try:
+                return await self.redis_ledger.get(key)
+            except Exception as e:
+                logger.warning(f"Redis quota get error for {key}, using memory ledger: {e}")
+        return await self.memory_ledger.get(key)
+
+    async def acquire(self, family: str) -> int:
+        """
+        Record one call against an API family's daily quota.
+
+        Args:
+            family: API family name (see resolve_api_family)
+
+        Returns:
+            Calls remaining today after this one
+
+        Raises:
+            RateLimitError: If the family's daily quota is exhausted
+        """
+        now = datetime.now(timezone.utc)
+        limit = self.limit_for(family)
+        reset_in = _seconds_until_reset(now)
+
+        count = await self._incr(self._make_key(family, now), reset_in + 3600)
+
+        if count > limit:
+            logger.warning(f"Daily quota exhausted for {family} ({limit} calls). Resets in {reset_in}s.")
+            raise RateLimitError(
+                message=f"Daily eBay API quota exhausted for {family} ({limit} calls)",
+                retry_after=reset_in,
+                limit=limit,
+                remaining=0
+            )
+
+        if count % 100 == 0:
+            logger.info(f"{family} API calls today: {count}/{limit}")
+
+        return limit - count
+
+    async def remaining(self, family: str) -> int:
+        """Get calls remaining today for an API family."""
+        used = await self._get(self._make_key(family))
+        return max(0, self.limit_for(family) - used)
+
+    async def has_headroom(self, family: str, reserve_fraction: float = 0.1) -> bool:
+        """
+        Check whether low-priority work should still run for a family.
+
+        Args:
+            family: API family name
+            reserve_fraction: Share of the daily quota held back for
+                high-priority calls
+
+        Returns:
+            True if more than the reserved share of the quota remains
+        """
+        reserve = int(self.limit_for(family) * reserve_fraction)
+        return await self.remaining(family) > reserve
+
+    async def get_usage(self, family: str) -> Dict[str, Any]:
+        """Get usage statistics for an API family."""
+        limit = self.limit_for(family)
+        used = await self._get(self._make_key(family))
+        return {
+            "api_family": family,
+            "calls_today": used,
+            "calls_limit": limit,
+            "remaining": max(0, limit - used),
+            "percentage_used": (min(used, limit) / limit) * 100 if limit else 100.0,
+            "resets_in_seconds": _seconds_until_reset(),
+            "shared": self.redis_ledger is not None
+        }
+
+    async def close(self):
+        """Close ledger connections."""
+        if self.redis_ledger:
+            await self.redis_ledger.close()
+
+
+# Global quota manager instance
+quota_manager: Optional[QuotaManager] = None
+
+
+def get_quota_manager() -> Optional[QuotaManager]:
+    """Get the global quota manager instance."""
+    return quota_manager
+
+
+def init_quota_manager(
+    default_daily_limit: int = 5000,
+    daily_limits: Optional[Dict[str, int]] = None,
+    redis_url: Optional[str] = None
+) -> QuotaManager:
+    """Initialize the global quota manager."""
+    global quota_manager
+    quota_manager = QuotaManager(
+        default_daily_limit=default_daily_limit,
+        daily_limits=daily_limits,
+        redis_url=redis_url
+    )
+    return quota_manager
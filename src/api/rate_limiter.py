@@ -0,0 +1,292 @@
+"""
+Smoothed per-API-family rate limiting.
+
+A token bucket per eBay API family spreads calls across the quota window
+instead of letting bursts run into 429s. Buckets start from the configured
+daily limits and recalibrate from eBay's rate-limit response headers and the
+Analytics getRateLimits response. When a bucket is empty, callers either fail
+fast with RateLimitError or queue for at most a caller-supplied deadline -
+nothing ever sleeps for hours on the request path.
+"""
+import asyncio
+import logging
+import math
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Mapping, Optional
+
+from .errors import RateLimitError
+
+logger = logging.getLogger(__name__)
+
+
+# Response headers carrying the caller's current allowance
+LIMIT_HEADER = "X-EBAY-C-LIMIT"
+REMAINING_HEADER = "X-EBAY-C-REMAINING"
+RESET_HEADER = "X-EBAY-C-LIMIT-RESET"
+
+# Analytics getRateLimits resource name -> API family (see api.quota)
+ANALYTICS_RESOURCE_FAMILIES = {
+    "buy.browse": "browse",
+    "buy.marketplace.insights": "marketplace_insights",
+    "buy.marketplace_insights": "marketplace_insights",
+    "commerce.taxonomy": "taxonomy",
+    "sell.inventory": "sell.inventory",
+    "sell.account": "sell.account",
+    "sell.marketing": "sell.marketing",
+    "sell.analytics": "sell.analytics",
+}
+
+SECONDS_PER_DAY = 86400
+
+# Bucket sizing for families without a calibrated limit
+DEFAULT_DAILY_LIMIT = 5000
+DEFAULT_BURST_FRACTION = 0.02
+DEFAULT_MIN_BURST = 10
+
+# Burst capacity of a bucket at the default daily limit
+DEFAULT_BURST = max(DEFAULT_MIN_BURST, int(DEFAULT_DAILY_LIMIT * DEFAULT_BURST_FRACTION))
+
+
+class TokenBucket:
+    """
+    Token bucket with continuous refill.
+
+    Tokens can go negative: each waiting caller reserves a token up front and
+    sleeps until the refill covers its reservation, so queued callers are
+    served in order without holding a lock across the sleep.
+    """
+
+    def __init__(self, capacity: float, refill_rate: float):
+        self.capacity = capacity
+        self.refill_rate = refill_rate
+        self.tokens = capacity
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        """Add tokens accrued since the last update."""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.refill_rate)
+        self._updated = now
+
+    def reserve(self, max_wait: float) -> float:
+        """
+        Reserve one token.
+
+        Args:
+            max_wait: Longest acceptable wait in seconds
+
+        Returns:
+            Seconds to wait before the reserved token is available
+
+        Raises:
+            RateLimitError: If the wait would exceed max_wait
+        """
+        self._refill()
+        self.tokens -= 1
+        if self.tokens >= 0:
+            return 0.0
+
+        wait = -self.tokens / self.refill_rate if self.refill_rate > 0 else math.inf
+        if wait > max_wait:
+            self.tokens += 1
+            raise RateLimitError(
+                message="Request rate limit reached",
+                retry_after=math.ceil(wait) if math.isfinite(wait) else None,
+                remaining=0
+            )
+        return wait
+
+    def calibrate(self, remaining: int, window_seconds: float) -> None:
+        """Spread the remaining allowance evenly over the rest of the window."""
+        self._refill()
+        self.refill_rate = max(remaining, 0) / max(window_seconds, 1.0)
+        self.tokens = min(self.tokens, self.capacity, float(remaining))
+
+    def drain(self) -> None:
+        """Empty the bucket (e.g. after eBay answered 429)."""
+        self._refill()
+        self.tokens = min(self.tokens, 0.0)
+
+
+class TokenBucketLimiter:
+    """
+    Token bucket rate limiter keyed by eBay API family.
+
+    Buckets are created on first use with a refill rate of daily_limit / day
+    and a burst capacity of burst_fraction of the daily limit.
+    """
+
+    def __init__(
+        self,
+        default_daily_limit: int = DEFAULT_DAILY_LIMIT,
+        daily_limits: Optional[Dict[str, int]] = None,
+        burst_fraction: float = DEFAULT_BURST_FRACTION,
+        min_burst: int = DEFAULT_MIN_BURST
+    ):
+        self.default_daily_limit = default_daily_limit
+        self.daily_limits = dict(daily_limits or {})
+        self.burst_fraction = burst_fraction
+        self.min_burst = min_burst
+        self._buckets: Dict[str, TokenBucket] = {}
+
+    def _get_bucket(self, family: str) -> TokenBucket:
+        """Get or create the bucket for an API family."""
+        bucket = self._buckets.get(family)
+        if bucket is None:
+            daily_limit = self.daily_limits.get(family, self.default_daily_limit)
+            capacity = max(self.min_burst, int(daily_limit * self.burst_fraction))
+            bucket = TokenBucket(capacity, daily_limit / SECONDS_PER_DAY)
+            self._buckets[family] = bucket
+        return bucket
+
+    async def acquire(self, family: str, max_wait: float = 0.0) -> None:
+        """
+        Take a token for one call to an API family.
+
+        Args:
+            family: API family name (see api.quota.resolve_api_family)
+            max_wait: Seconds the caller is willing to queue. 0 fails fast.
+
+        Raises:
+            RateLimitError: If no token becomes available within max_wait
+        """
+        wait = self._get_bucket(family).reserve(max_wait)
+        if wait > 0:
+            logger.debug(f"Rate limiter queueing {family} call for {wait:.2f}s")
+            await asyncio.sleep(wait)
+
+    def update_from_headers(self, family: str, headers: Mapping[str, str]) -> None:
+        """
+        Recalibrate a family's bucket from eBay rate-limit response headers.
+
+        Headers that are missing or malformed are ignored.
+        """
+        remaining = headers.get(REMAINING_HEADER)
+        reset = headers.get(RESET_HEADER)
+        if remaining is None or reset is None:
+            return
+
+        try:
+            remaining_calls = int(remaining)
+            window_seconds = _parse_reset(reset)
+        except (TypeError, ValueError):
+            logger.debug(f"Ignoring malformed rate limit headers for {family}")
+            return
+
+        limit = headers.get(LIMIT_HEADER)
+        if limit is not None and limit.isdigit():
+            bucket = self._get_bucket(family)
+            bucket.capacity = max(self.min_burst, int(int(limit) * self.burst_fraction))
+
+        self._get_bucket(family).calibrate(remaining_calls, window_seconds)
+
+    def update_from_rate_limits(self, rate_limits_response: Dict[str, Any]) -> int:
+        """
+        Recalibrate buckets from an Analytics getRateLimits response.
+
+        Args:
+            rate_limits_response: Body of GET /developer/analytics/v1_beta/rate_limit/
+
+        Returns:
+            Number of API resources calibrated
+        """
+        calibrated = 0
+        for api in rate_limits_response.get("rateLimits", []):
+            for resource in api.get("resources", []):
+                family = _resource_family(resource.get("name", ""))
+                parsed = []
+                for rate in resource.get("rates", []):
+                    try:
+                        window = float(rate.get("timeWindow", SECONDS_PER_DAY))
+                        parsed.append((
+                            window,
+                            int(rate["limit"]),
+                            int(rate["remaining"]),
+                            _parse_reset(rate["reset"]) if rate.get("reset") else window
+                        ))
+                    except (KeyError, TypeError, ValueError):
+                        continue
+                if not parsed:
+                    continue
+
+                # The longest window sets the sustained rate
+                _, limit, remaining, reset_in = max(parsed)
+                self.daily_limits[family] = limit
+                bucket = self._get_bucket(family)
+                bucket.capacity = max(self.min_burst, int(limit * self.burst_fraction))
+                bucket.calibrate(remaining, reset_in)
+                calibrated += 1
+        return calibrated
+
+    def penalize(self, family: str) -> None:
+        """Drain a family's bucket after eBay rejected a call with 429."""
+        self._get_bucket(family).drain()
+
+    def get_status(self) -> Dict[str, Dict[str, float]]:
+        """Get current bucket levels for all families seen so far."""
+        status = {}
+        for family, bucket in self._buckets.items():
+            bucket._refill()
+            status[family] = {
+                "tokens": round(bucket.tokens, 2),
+                "capacity": bucket.capacity,
+                "refill_per_second": bucket.refill_rate
+            }
+        return status
+
+
+def _parse_reset(value: Any) -> float:
+    """Parse a reset value (seconds or ISO 8601 timestamp) into seconds from now."""
+    if isinstance(value, (int, float)):
+        return float(value)
+    text = str(value).strip()
+    try:
+        return float(text)
+    except ValueError:
+        reset_at = datetime.fromisoformat(text.replace("Z", "+00:00"))
+        return max((reset_at - datetime.now(timezone.utc)).total_seconds(), 1.0)
+
+
+def _resource_family(resource_name: str) -> str:
+    """Map an Analytics resource name (e.g. "buy.browse") to an API family."""
+    return ANALYTICS_RESOURCE_FAMILIES.get(resource_name, resource_name)
+
+
+async def refresh_rate_limits(rest_client, limiter: "TokenBucketLimiter") -> int:
+    """
+    Fetch Analytics getRateLimits and recalibrate the limiter.
+
+    Args:
+        rest_client: EbayRestClient used for the call
+        limiter: Limiter to calibrate
+
+    Returns:
+        Number of API resources calibrated
+    """
+    response = await rest_client.get("/developer/analytics/v1_beta/rate_limit/")
+    calibrated = limiter.update_from_rate_limits(response["body"])
+    logger.info(f"Calibrated rate limits for {calibrated} API resources")
+    return calibrated
+
+
+# Global rate limiter instance
+rate_limiter: Optional[TokenBucketLimiter] = None
+
+
+def get_rate_limiter() -> Optional[TokenBucketLimiter]:
+    """Get the global rate limiter instance."""
+    return rate_limiter
+
+
+def init_rate_limiter(
+    default_daily_limit: int = DEFAULT_DAILY_LIMIT,
+    daily_limits: Optional[Dict[str, int]] = None
+) -> TokenBucketLimiter:
+    """Initialize the global rate limiter."""
+    global rate_limiter
+    rate_limiter = TokenBucketLimiter(
+        default_daily_limit=default_daily_limit,
+        daily_limits=daily_limits
+    )
+    return rate_limiter
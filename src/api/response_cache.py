@@ -0,0 +1,175 @@
+"""
+Read-through HTTP response cache for EbayRestClient.
+
+Successful GET responses are stored in the HybridCacheManager with a TTL
+chosen by endpoint pattern, so repeated tool calls for the same search, item
+or policy within the TTL never reach eBay. Any write (POST/PUT/DELETE) to a
+resource family drops the cached reads of that family.
+
+The cache is opt-in: EbayRestClient only uses it when one is passed in or the
+process-wide instance was initialized (EBAY_HTTP_CACHE=true).
+"""
+import hashlib
+import logging
+import re
+from typing import Any, Dict, List, Mapping, Optional, Pattern, Tuple
+
+from .cache import CacheTTL, HybridCacheManager
+from .coalescing import make_request_key
+
+logger = logging.getLogger(__name__)
+
+
+# First matching pattern wins; endpoints without a match are never cached
+ENDPOINT_TTL_POLICY: List[Tuple[Pattern[str], int]] = [
+    (re.compile(r"^/buy/browse/v1/item_summary/search"), CacheTTL.SEARCH_RESULTS),
+    (re.compile(r"^/buy/browse/v1/item/[^/]+"), CacheTTL.SEARCH_RESULTS),
+    (re.compile(r"^/buy/marketplace_insights/v1_beta/item_sales/search"), CacheTTL.MARKET_TRENDS),
+    (re.compile(r"^/buy/marketing/"), CacheTTL.MARKET_TRENDS),
+    (re.compile(r"^/commerce/taxonomy/v1/get_default_category_tree_id"), CacheTTL.CATEGORIES),
+    # Full trees are cached by api.category_cache; only cache the smaller lookups
+    (re.compile(r"^/commerce/taxonomy/v1/category_tree/[^/]+/.+"), CacheTTL.CATEGORIES),
+    (re.compile(r"^/sell/account/v1/(fulfillment|payment|return)_policy"), CacheTTL.BUSINESS_POLICIES),
+    (re.compile(r"^/sell/account/v1/rate_table"), CacheTTL.RATE_TABLES),
+    (re.compile(r"^/sell/account/v1/(privilege|program)"), CacheTTL.SELLER_STANDARDS),
+    (re.compile(r"^/sell/analytics/v1/seller_standards_profile"), CacheTTL.SELLER_STANDARDS),
+]
+
+# Writes whose path is not under the resource they change
+BULK_WRITE_FAMILIES: Dict[str, List[str]] = {
+    "/sell/inventory/v1/bulk_create_or_replace_inventory_item": [
+        "/sell/inventory/v1/inventory_item"
+    ],
+    "/sell/inventory/v1/bulk_update_price_quantity": [
+        "/sell/inventory/v1/inventory_item",
+        "/sell/inventory/v1/offer"
+    ],
+}
+
+CACHE_KEY_PREFIX = "http"
+
+
+def resolve_ttl(endpoint: str) -> Optional[int]:
+    """Get the cache TTL for an endpoint, or None if it must not be cached."""
+    for pattern, ttl in ENDPOINT_TTL_POLICY:
+        if pattern.match(endpoint):
+            return ttl
+    return None
+
+
+def resolve_resource_family(endpoint: str) -> str:
+    """
+    Map an endpoint to its resource family for invalidation.
+
+    The family is the resource collection path, i.e. the first four path
+    segments: "/sell/account/v1/return_policy/123" -> "/sell/account/v1/return_policy".
+    """
+    segments = [segment for segment in endpoint.split("?", 1)[0].split("/") if segment]
+    return "/" + "/".join(segments[:4])
+
+
+def _family_pattern(family: str) -> str:
+    """Cache key pattern matching every cached read of a resource family."""
+    return f"{CACHE_KEY_PREFIX}:{family}:*"
+
+
+class ResponseCache:
+    """
+    Endpoint-aware read-through cache over HybridCacheManager.
+
+    Keys are "http:<resource family>:<digest>" where the digest covers the
+    host, sorted params, marketplace, caller headers and credential scope.
+    The family stays readable so writes can invalidate by prefix even when
+    the full key would be too long for Redis.
+    """
+
+    def __init__(self, cache_manager: HybridCacheManager):
+        self.cache_manager = cache_manager
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def make_key(
+        self,
+        url: str,
+        endpoint: str,
+        params: Optional[Mapping[str, Any]] = None,
+        headers: Optional[Mapping[str, str]] = None,
+        marketplace_id: str = "EBAY_US",
+        scope: str = ""
+    ) -> str:
+        """
+        Build the canonical cache key for a GET request.
+
+        Args:
+            url: Full request URL (includes the sandbox/production host)
+            endpoint: API endpoint path
+            params: Query parameters
+            headers: Caller-supplied headers
+            marketplace_id: Effective X-EBAY-C-MARKETPLACE-ID
+            scope: Credential scope (e.g. client ID) so sellers never share entries
+
+        Returns:
+            Cache key string
+        """
+        request_key = make_request_key("GET", url, params, headers, marketplace_id)
+        digest = hashlib.sha256(repr((scope, request_key)).encode()).hexdigest()
+        return f"{CACHE_KEY_PREFIX}:{resolve_resource_family(endpoint)}:{digest}"
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Get a cached response ({"body", "headers"}) or None."""
+        response = await self.cache_manager.get(key)
+        if response is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return response
+
+    async def set(self, key: str, response: Dict[str, Any], ttl: int) -> None:
+        """Store a response for ttl seconds."""
+        await self.cache_manager.set(key, response, ttl)
+
+    async def invalidate(self, endpoint: str) -> int:
+        """
+        Drop cached reads of the resource family a write touched.
+
+        Args:
+            endpoint: Endpoint of the POST/PUT/DELETE request
+
+        Returns:
+            Number of cache entries removed
+        """
+        families = BULK_WRITE_FAMILIES.get(endpoint, [resolve_resource_family(endpoint)])
+        deleted = 0
+        for family in families:
+            deleted += await self.cache_manager.delete_pattern(_family_pattern(family))
+        if deleted:
+            self.invalidations += deleted
+            logger.debug(f"Invalidated {deleted} cached responses for {', '.join(families)}")
+        return deleted
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get response cache statistics."""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "hit_rate": self.hits / total if total else 0.0
+        }
+
+
+# Global response cache; None unless enabled with init_response_cache
+response_cache: Optional[ResponseCache] = None
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """Get the global response cache instance."""
+    return response_cache
+
+
+def init_response_cache(cache_manager: HybridCacheManager) -> ResponseCache:
+    """Initialize the global response cache."""
+    global response_cache
+    response_cache = ResponseCache(cache_manager)
+    return response_cache
@@ -7,8 +7,8 @@ with built-in rate limiting, retry logic, and error handling.
 import asyncio
 import time
 import uuid
-from datetime import datetime, timedelta, timezone
-from typing import Optional, Dict, Any, Union
+from datetime import datetime, timezone
+from typing import Optional, Dict, Any, Union, Callable, Awaitable
 import aiohttp
 from pydantic import BaseModel, Field
 import logging
@@ -16,9 +16,19 @@ from contextlib import asynccontextmanager
 import json as jsonpkg
 
 from .oauth import OAuthManager, ConsentRequiredException
+from .quota import QuotaManager, get_quota_manager, resolve_api_family
+from .rate_limiter import RESET_HEADER, TokenBucketLimiter, _parse_reset, get_rate_limiter
+from .errors import EbayApiError
+from . import json_codec
+from .offload import get_offload_executor
+from .coalescing import RequestCoalescer, COALESCABLE_METHODS, get_request_coalescer, make_request_key
+from .response_cache import ResponseCache, get_response_cache, resolve_ttl
 
 logger = logging.getLogger(__name__)
 
+# Chunk size for streamed response bodies
+STREAM_CHUNK_SIZE = 65536
+
 
 class RestConfig(BaseModel):
     """Configuration for REST API client."""
@@ -26,6 +36,7 @@ class RestConfig(BaseModel):
     rate_limit_per_day: int = Field(default=5000, description="API calls per day limit")
     max_retries: int = Field(default=3, description="Maximum retry attempts")
     timeout_seconds: int = Field(default=30, description="Request timeout in seconds")
+    rate_limit_max_wait: float = Field(default=5.0, description="Seconds a call may queue for a rate limit token before failing")
     
     @property
     def base_url(self) -> str:
@@ -34,95 +45,71 @@ class RestConfig(BaseModel):
         return f"https://api.{domain}"
 
 
-class RateLimiter:
-    """
-    Token bucket rate limiter for API calls.
-    
-    Tracks daily API usage and enforces rate limits to prevent
-    exceeding eBay's API quotas.
-    """
-    
-    def __init__(self, calls_per_day: int = 5000):
-        self.calls_per_day = calls_per_day
-        self.window_start = datetime.now(timezone.utc)
-        self.call_count = 0
-        self._lock = asyncio.Lock()
-        
-    async def acquire(self) -> None:
-        """
-        Acquire permission to make an API call.
-        
-        Blocks if daily limit is reached until the next day.
-        """
-        async with self._lock:
-            now = datetime.now(timezone.utc)
-            
-            # Reset counter if new day
-            if now.date() > self.window_start.date():
-                logger.info(f"Rate limiter reset. Previous day used {self.call_count}/{self.calls_per_day} calls")
-                self.window_start = now
-                self.call_count = 0
-            
-            # Check if limit reached
-            if self.call_count >= self.calls_per_day:
-                # Calculate wait time until next day
-                tomorrow = now.replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
-                wait_seconds = (tomorrow - now).total_seconds()
-                
-                logger.warning(
-                    f"Daily rate limit reached ({self.calls_per_day}). "
-                    f"Waiting {wait_seconds:.0f} seconds until reset."
-                )
-                
-                await asyncio.sleep(wait_seconds)
-                
-                # Reset after wait
-                self.window_start = datetime.now(timezone.utc)
-                self.call_count = 0
-            
-            self.call_count += 1
-            
-            if self.call_count % 100 == 0:
-                logger.info(f"API calls today: {self.call_count}/{self.calls_per_day}")
-    
-    def get_usage(self) -> Dict[str, Any]:
-        """Get current usage statistics."""
-        return {
-            "calls_today": self.call_count,
-            "calls_limit": self.calls_per_day,
-            "window_start": self.window_start.isoformat(),
-            "percentage_used": (self.call_count / self.calls_per_day) * 100
-        }
-
-
 class EbayRestClient:
     """
     eBay REST API client with authentication, rate limiting, and retry logic.
     
     Features:
     - Automatic OAuth token management
-    - Rate limiting to prevent quota exceeded errors
+    - Process-wide daily quota per API family to prevent quota exceeded errors
+    - Single-flight coalescing of identical concurrent GET requests
+    - Optional read-through response cache with per-endpoint TTLs
     - Exponential backoff retry for transient failures
     - Comprehensive error handling
     - Request/response logging
     """
     
-    def __init__(self, oauth_manager: OAuthManager, config: Optional[RestConfig] = None):
+    def __init__(
+        self,
+        oauth_manager: OAuthManager,
+        config: Optional[RestConfig] = None,
+        session_provider: Optional[Callable[[], Awaitable[aiohttp.ClientSession]]] = None,
+        quota_manager: Optional[QuotaManager] = None,
+        rate_limiter: Optional[TokenBucketLimiter] = None,
+        coalescer: Optional[RequestCoalescer] = None,
+        response_cache: Optional[ResponseCache] = None
+    ):
         """
         Initialize eBay REST API client.
         
         Args:
             oauth_manager: OAuth manager for token management
             config: REST API configuration
+            session_provider: Coroutine returning a shared, long-lived session
+                (see api.runtime). When set, close() leaves the session open.
+            quota_manager: Daily quota ledger. Defaults to the process-wide
+                manager, or a private one if none was initialized.
+            rate_limiter: Per API family token bucket limiter. Defaults to the
+                process-wide limiter, or a private one if none was initialized.
+            coalescer: Single-flight table for identical GETs. Defaults to the
+                process-wide coalescer.
+            response_cache: Read-through cache for GET responses. Defaults to
+                the process-wide cache; caching is off when none was initialized.
         """
         self.oauth = oauth_manager
         self.config = config or RestConfig()
-        self.rate_limiter = RateLimiter(self.config.rate_limit_per_day)
+        self.quota = (
+            quota_manager
+            or get_quota_manager()
+            or QuotaManager(default_daily_limit=self.config.rate_limit_per_day)
+        )
+        self.rate_limiter = (
+            rate_limiter
+            or get_rate_limiter()
+            or TokenBucketLimiter(default_daily_limit=self.config.rate_limit_per_day)
+        )
+        self.coalescer = coalescer or get_request_coalescer()
+        self.response_cache = response_cache or get_response_cache()
         self._session: Optional[aiohttp.ClientSession] = None
+        self._session_provider = session_provider
         
     @asynccontextmanager
     async def _get_session(self):
         """Get or create aiohttp session with proper cleanup."""
+        if self._session_provider is not None:
+            yield await self._session_provider()
+            return
+        
         if self._session is None:
             timeout = aiohttp.ClientTimeout(total=self.config.timeout_seconds)
             self._session = aiohttp.ClientSession(
@@ -136,7 +123,7 @@ class EbayRestClient:
             raise
     
     async def close(self) -> None:
-        """Close the HTTP session."""
+        """Close the HTTP session (shared sessions are owned by the runtime)."""
         if self._session:
             await self._session.close()
             self._session = None
@@ -147,17 +134,30 @@ class EbayRestClient:
         endpoint: str,
         params: Optional[Dict[str, Any]] = None,
         json: Optional[Dict[str, Any]] = None,
-        headers: Optional[Dict[str, str]] = None
+        headers: Optional[Dict[str, str]] = None,
+        use_cache: bool = True,
+        stream_parser: Optional[Callable[[], Any]] = None
     ) -> Dict[str, Any]:
         """
         Make authenticated API request with retries.
         
+        Identical concurrent GET requests (same endpoint, params, marketplace
+        and headers) share one HTTP call. When a response cache is configured,
+        GETs to cacheable endpoints are served from it within their TTL and
+        writes invalidate the cached reads of the same resource family.
+        Returned bodies may be shared between callers and must not be mutated.
+        
         Args:
             method: HTTP method (GET, POST, PUT, DELETE)
             endpoint: API endpoint path (e.g., "/buy/browse/v1/item/{item_id}")
             params: Query parameters
             json: JSON body for POST/PUT requests
             headers: Additional headers
+            use_cache: Set False to bypass the response cache for this GET
+            stream_parser: Factory for an incremental parser (feed(bytes) and
+                close()); a successful body is fed to it chunk by chunk instead
+                of being buffered, and close() becomes the body. Such requests
+                skip coalescing and the response cache.
             
         Returns:
             Dict containing:
@@ -166,10 +166,60 @@ class EbayRestClient:
             
         Raises:
             EbayApiError: API-specific errors
+            RateLimitError: Rate limit or daily quota for the API family is exhausted
             aiohttp.ClientError: Network errors
         """
-        # Acquire rate limit token
-        await self.rate_limiter.acquire()
+        if stream_parser is not None:
+            return await self._send_request(method, endpoint, params, json, headers, stream_parser)
+        
+        if method.upper() not in COALESCABLE_METHODS:
+            try:
+                return await self._send_request(method, endpoint, params, json, headers)
+            finally:
+                if self.response_cache is not None:
+                    await self.response_cache.invalidate(endpoint)
+        
+        url = f"{self.config.base_url}{endpoint}"
+        merged_headers = {"X-EBAY-C-MARKETPLACE-ID": "EBAY_US", **(headers or {})}
+        marketplace_id = merged_headers["X-EBAY-C-MARKETPLACE-ID"]
+        
+        cache_key = None
+        ttl = resolve_ttl(endpoint) if self.response_cache is not None else None
+        if ttl:
+            cache_key = self.response_cache.make_key(
+                url, endpoint, params, headers, marketplace_id, self._cache_scope()
+            )
+            if use_cache:
+                cached = await self.response_cache.get(cache_key)
+                if cached is not None:
+                    logger.debug(f"Response cache hit for GET {endpoint}")
+                    return cached
+        
+        async def fetch() -> Dict[str, Any]:
+            response = await self._send_request(method, endpoint, params, json, headers)
+            if cache_key is not None:
+                await self.response_cache.set(cache_key, response, ttl)
+            return response
+        
+        key = make_request_key(method, url, params, headers, marketplace_id, self._cache_scope())
+        return await self.coalescer.run(key, fetch)
+    
+    def _cache_scope(self) -> str:
+        """Credential scope for coalescing and response cache keys (one user token per app)."""
+        oauth_config = getattr(self.oauth, "config", None)
+        return str(getattr(oauth_config, "client_id", ""))
+    
+    async def _send_request(
+        self,
+        method: str,
+        endpoint: str,
+        params: Optional[Dict[str, Any]],
+        json: Optional[Dict[str, Any]],
+        headers: Optional[Dict[str, str]],
+        stream_parser: Optional[Callable[[], Any]] = None
+    ) -> Dict[str, Any]:
+        """Send the request to eBay (rate limiting, quota, auth and retries)."""
+        api_family = resolve_api_family(endpoint)
         
         # Get OAuth token from manager
         token = await self.oauth.get_token()
@@ -201,6 +251,12 @@ class EbayRestClient:
         last_error = None
         
         for attempt in range(self.config.max_retries):
+            # Every attempt, retries included, takes a rate limit token and counts
+            # against this API family's daily quota; RateLimitError propagates as is.
+            # Smooth bursts first so a rejected call does not spend daily quota
+            await self.rate_limiter.acquire(api_family, self.config.rate_limit_max_wait)
+            await self.quota.acquire(api_family)
+            
             try:
                 async with self._get_session() as session:
                     start_time = time.time()
@@ -210,10 +266,25 @@ class EbayRestClient:
                         url,
                         params=params,
                         json=json,
-                        headers=default_headers
+                        headers=default_headers,
+                        timeout=aiohttp.ClientTimeout(total=self.config.timeout_seconds)
                     ) as response:
                         response_time = time.time() - start_time
-                        response_text = await response.text()
+                        self.rate_limiter.update_from_headers(api_family, response.headers)
+                        
+                        # Stream a successful body into the parser; a retry starts a fresh one
+                        if stream_parser is not None and response.status in (200, 201):
+                            parser = stream_parser()
+                            async for chunk in response.content.iter_chunked(STREAM_CHUNK_SIZE):
+                                parser.feed(chunk)
+                            logger.debug(f"{method} {url} -> {response.status} streamed ({response_time:.2f}s)")
+                            return {
+                                "body": parser.close(),
+                                "headers": dict(response.headers)
+                            }
+                        
+                        # Read the body once; it is parsed at most once below
+                        raw_body = await response.read()
                         
                         # Log response
                         logger.debug(
@@ -224,8 +295,8 @@ class EbayRestClient:
                         # Handle successful response
                         if response.status in (200, 201, 204):
                             response_body = {}
-                            if response_text:
-                                response_body = await response.json()
+                            if raw_body.strip():
+                                response_body = await get_offload_executor().loads(raw_body)
                             
                             # Always return both body and headers
                             return {
@@ -235,12 +306,12 @@ class EbayRestClient:
                         
                         # Parse error response
                         try:
-                            error_data = await response.json()
-                        except:
-                            error_data = {"message": response_text}
+                            error_data = json_codec.loads(raw_body)
+                        except ValueError:
+                            error_data = {"message": raw_body.decode("utf-8", errors="replace")}
                         
                         # Debug log error response
-                        logger.debug(f"Error response text: {response_text[:500]}")
+                        logger.debug(f"Error response text: {raw_body[:500].decode('utf-8', errors='replace')}")
                         logger.debug(f"Error response headers: {dict(response.headers)}")
                         
                         # Handle specific error cases
@@ -253,16 +324,19 @@ class EbayRestClient:
                                 continue
                         
                         elif response.status == 429:
-                            # Rate limited by eBay
-                            retry_after = int(response.headers.get("X-EBAY-C-LIMIT-RESET", 60))
-                            logger.warning(f"Rate limited by eBay. Waiting {retry_after}s...")
+                            # Rate limited by eBay - stop sending until the bucket refills
+                            self.rate_limiter.penalize(api_family)
+                            try:
+                                retry_after = _parse_reset(response.headers.get(RESET_HEADER, 60))
+                            except ValueError:
+                                retry_after = 60
                             
-                            if attempt < self.config.max_retries - 1:
+                            # Only wait when the reset is within the caller's deadline
+                            if attempt < self.config.max_retries - 1 and retry_after <= self.config.rate_limit_max_wait:
+                                logger.warning(f"Rate limited by eBay. Waiting {retry_after:.0f}s...")
                                 await asyncio.sleep(retry_after)
                                 continue
-                        
-                        # Import here to avoid circular dependency
-                        from .errors import EbayApiError
+                            logger.warning(f"Rate limited by eBay for {api_family}. Reset in {retry_after:.0f}s.")
                         
                         # Raise API error for non-retryable errors
                         raise EbayApiError(
@@ -283,6 +357,10 @@ class EbayRestClient:
                     continue
                     
             except Exception as e:
+                # Fail fast on 429 instead of retrying into the limit again
+                if isinstance(e, EbayApiError) and e.status_code == 429:
+                    raise
+                
                 last_error = e
                 logger.error(f"Unexpected error on attempt {attempt + 1}: {str(e)}")
                 
@@ -334,9 +412,15 @@ class EbayRestClient:
         """Make DELETE request."""
         return await self.request("DELETE", endpoint, **kwargs)
     
-    def get_rate_limit_status(self) -> Dict[str, Any]:
-        """Get current rate limiting status."""
-        return self.rate_limiter.get_usage()
+    async def get_rate_limit_status(self, endpoint: str = "/buy/browse/") -> Dict[str, Any]:
+        """Get current daily quota and token bucket status for the API family of an endpoint."""
+        api_family = resolve_api_family(endpoint)
+        status = await self.quota.get_usage(api_family)
+        status["token_bucket"] = self.rate_limiter.get_status().get(api_family)
+        status["coalescing"] = self.coalescer.get_stats()
+        if self.response_cache is not None:
+            status["response_cache"] = self.response_cache.get_stats()
+        return status
 
 
 class MockEbayRestClient:
@@ -356,7 +440,9 @@ class MockEbayRestClient:
         endpoint: str,
         params: Optional[Dict[str, Any]] = None,
         json: Optional[Dict[str, Any]] = None,
-        headers: Optional[Dict[str, str]] = None
+        headers: Optional[Dict[str, str]] = None,
+        use_cache: bool = True,
+        stream_parser: Optional[Callable[[], Any]] = None
     ) -> Dict[str, Any]:
         """Record request and return mock response."""
         # Record the call
@@ -401,12 +487,13 @@ class MockEbayRestClient:
     async def delete(self, endpoint: str, **kwargs) -> Dict[str, Any]:
         return await self.request("DELETE", endpoint, **kwargs)
     
-    def get_rate_limit_status(self) -> Dict[str, Any]:
+    async def get_rate_limit_status(self, endpoint: str = "/buy/browse/") -> Dict[str, Any]:
         """Mock rate limit status."""
         return {
+            "api_family": resolve_api_family(endpoint),
             "calls_today": len(self.call_history),
             "calls_limit": 5000,
-            "window_start": datetime.now(timezone.utc).isoformat(),
+            "remaining": max(0, 5000 - len(self.call_history)),
             "percentage_used": (len(self.call_history) / 5000) * 100
         }
     
@@ -0,0 +1,139 @@
+"""
+Process-wide eBay API runtime.
+
+Holds the long-lived pieces every tool call needs - one pooled HTTP session
+and one OAuth manager per credential set - so individual tool calls no longer
+pay for a new TCP/TLS handshake and a cold token cache.
+"""
+import asyncio
+import logging
+from typing import Dict, Optional, Tuple
+
+import aiohttp
+from pydantic import BaseModel, Field
+
+from .oauth import OAuthManager, OAuthConfig
+
+logger = logging.getLogger(__name__)
+
+
+class ConnectionPoolConfig(BaseModel):
+    """Tuning for the shared aiohttp connection pool."""
+    limit: int = Field(default=100, description="Maximum simultaneous connections")
+    limit_per_host: int = Field(default=20, description="Maximum simultaneous connections per host")
+    keepalive_timeout: float = Field(default=60.0, description="Seconds an idle connection is kept open")
+    dns_cache_ttl: int = Field(default=300, description="Seconds DNS lookups are cached")
+
+
+class EbayRuntime:
+    """
+    Server-scoped runtime shared by all eBay tools.
+
+    Owns:
+    - A single aiohttp.ClientSession with a tuned TCPConnector (keep-alive,
+      per-host limits, DNS cache), created lazily inside the running loop
+    - One OAuthManager per credential set so tokens stay cached between calls
+
+    The runtime is closed from the server lifespan on shutdown.
+    """
+
+    def __init__(self, pool_config: Optional[ConnectionPoolConfig] = None):
+        self.pool_config = pool_config or ConnectionPoolConfig()
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._session_lock = asyncio.Lock()
+        self._oauth_managers: Dict[Tuple[str, str, bool, str], OAuthManager] = {}
+
+    def _create_session(self) -> aiohttp.ClientSession:
+        """Create the pooled HTTP session."""
+        connector = aiohttp.TCPConnector(
+            limit=self.pool_config.limit,
+            limit_per_host=self.pool_config.limit_per_host,
+            keepalive_timeout=self.pool_config.keepalive_timeout,
+            ttl_dns_cache=self.pool_config.dns_cache_ttl,
+            use_dns_cache=True
+        )
+        return aiohttp.ClientSession(connector=connector, raise_for_status=False)
+
+    async def get_session(self) -> aiohttp.ClientSession:
+        """
+        Get the shared HTTP session, creating it on first use.
+
+        The session is bound to the event loop it was created in, so a new one
+        is created if the running loop changes (e.g. between test cases).
+        """
+        loop = asyncio.get_running_loop()
+        if self._session is not None and not self._session.closed and self._session_loop is loop:
+            return self._session
+
+        if self._session_loop is not loop:
+            # A lock created for another loop cannot be awaited here
+            self._session_lock = asyncio.Lock()
+
+        async with self._session_lock:
+            if self._session is None or self._session.closed or self._session_loop is not loop:
+                if self._session is not None and not self._session.closed:
+                    logger.debug("Event loop changed, replacing shared HTTP session")
+                self._session = self._create_session()
+                self._session_loop = loop
+                logger.info("Created shared eBay HTTP session")
+
+        return self._session
+
+    def get_oauth_manager(self, oauth_config: OAuthConfig) -> OAuthManager:
+        """
+        Get the shared OAuth manager for a credential set.
+
+        Args:
+            oauth_config: OAuth configuration identifying the credentials
+
+        Returns:
+            OAuthManager reused across calls with the same credentials
+        """
+        key = (
+            oauth_config.client_id,
+            oauth_config.client_secret,
+            oauth_config.sandbox,
+            oauth_config.redirect_uri
+        )
+        manager = self._oauth_managers.get(key)
+        if manager is None:
+            manager = OAuthManager(oauth_config)
+            self._oauth_managers[key] = manager
+        return manager
+
+    def get_stats(self) -> Dict[str, object]:
+        """Get runtime statistics."""
+        stats: Dict[str, object] = {
+            "session_open": self._session is not None and not self._session.closed,
+            "oauth_managers": len(self._oauth_managers),
+        }
+        if self._session is not None and not self._session.closed:
+            connector = self._session.connector
+            stats["connection_limit"] = connector.limit if connector else None
+            stats["connection_limit_per_host"] = connector.limit_per_host if connector else None
+        return stats
+
+    async def close(self) -> None:
+        """Close the shared HTTP session."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+            logger.info("Closed shared eBay HTTP session")
+        self._session = None
+        self._session_loop = None
+
+
+# Global runtime instance
+runtime: Optional[EbayRuntime] = None
+
+
+def get_runtime() -> Optional[EbayRuntime]:
+    """Get the global eBay runtime instance."""
+    return runtime
+
+
+def init_runtime(pool_config: Optional[ConnectionPoolConfig] = None) -> EbayRuntime:
+    """Initialize the global eBay runtime."""
+    global runtime
+    runtime = EbayRuntime(pool_config)
+    return runtime
@@ -0,0 +1,279 @@
+"""
+Local sales history store for Marketplace Insights searches.
+
+Marketplace Insights only serves the last 90 days of sales. SalesHistoryStore
+keeps every sale it has seen in one SQLite database under a data directory,
+keyed by search (query, category IDs, filter), so history accumulates past
+that window. Each series remembers the newest lastSoldDate it has stored;
+a refresh asks eBay only for sales from that point on, and inserts ignore
+rows already present. A refresh that stops early advances the series only
+as far as it read every sale, so the next one resumes there. Each refresh
+also records the active listing count, so daily and weekly aggregates can
+report sell-through.
+
+SQLite calls are blocking, so the async wrappers run them on a thread; each
+call opens its own connection, and WAL mode lets several server processes
+on the host share the file.
+"""
+import asyncio
+import json
+import logging
+import sqlite3
+import statistics
+from contextlib import closing
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+
+logger = logging.getLogger(__name__)
+
+DATABASE_NAME = "sales_history.sqlite3"
+
+# Marketplace Insights serves sales from this many days back
+INSIGHTS_WINDOW_DAYS = 90
+
+# Re-read this much before the newest stored sale, for late-indexed sales
+REFRESH_OVERLAP = timedelta(days=1)
+
+# Series refreshed more recently than this are served as stored
+DEFAULT_REFRESH_INTERVAL = 3600
+
+INTERVALS = ("day", "week")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS series (
+    series_key TEXT PRIMARY KEY,
+    q TEXT,
+    category_ids TEXT,
+    filter TEXT,
+    newest_sold_date TEXT,
+    refreshed_at TEXT
+);
+CREATE TABLE IF NOT EXISTS sales (
+    series_key TEXT NOT NULL,
+    item_id TEXT NOT NULL,
+    sold_date TEXT NOT NULL,
+    price REAL NOT NULL,
+    currency TEXT,
+    quantity INTEGER NOT NULL DEFAULT 1,
+    condition_id TEXT,
+    category_id TEXT,
+    PRIMARY KEY (series_key, item_id, sold_date)
+);
+CREATE TABLE IF NOT EXISTS active_counts (
+    series_key TEXT NOT NULL,
+    day TEXT NOT NULL,
+    active_total INTEGER NOT NULL,
+    PRIMARY KEY (series_key, day)
+);
+"""
+
+# Period expressions over an ISO sold date; weeks start on Monday
+_PERIODS = {
+    "day": "date({column})",
+    "week": "date({column}, '-6 days', 'weekday 1')"
+}
+
+
+def series_key(q: Optional[str], category_ids: Optional[str], filter: Optional[str]) -> str:
+    """Stable key for one search."""
+    return json.dumps([q or "", category_ids or "", filter or ""], separators=(",", ":"))
+
+
+def format_filter_date(moment: datetime) -> str:
+    """eBay filter timestamp (UTC, milliseconds)."""
+    return moment.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.") + f"{moment.microsecond // 1000:03d}Z"
+
+
+def parse_date(value: str) -> datetime:
+    """Parse an eBay or ISO timestamp."""
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+class SalesHistoryStore:
+    """Append-only SQLite store of item sales per search."""
+
+    def __init__(self, directory: str, refresh_interval: int = DEFAULT_REFRESH_INTERVAL):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.path = self.directory / DATABASE_NAME
+        self.refresh_interval = refresh_interval
+        with closing(self._connect()) as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path, timeout=30)
+        connection.row_factory = sqlite3.Row
+        return connection
+
+    def get_series(self, key: str) -> Optional[Dict[str, Any]]:
+        """Stored state of a series, or None if it was never refreshed."""
+        with closing(self._connect()) as connection:
+            row = connection.execute("SELECT * FROM series WHERE series_key = ?", (key,)).fetchone()
+        return dict(row) if row else None
+
+    def refresh_start(self, key: str, now: Optional[datetime] = None) -> Optional[str]:
+        """
+        lastSoldDate to fetch a series from.
+
+        Returns:
+            None when the series was refreshed within refresh_interval,
+            otherwise the newest stored sale less REFRESH_OVERLAP (the start
+            of the Marketplace Insights window for a new series)
+        """
+        now = now or datetime.now(timezone.utc)
+        state = self.get_series(key)
+        if state and state["refreshed_at"]:
+            if (now - parse_date(state["refreshed_at"])).total_seconds() < self.refresh_interval:
+                return None
+        window_start = now - timedelta(days=INSIGHTS_WINDOW_DAYS)
+        if state and state["newest_sold_date"]:
+            start = max(parse_date(state["newest_sold_date"]) - REFRESH_OVERLAP, window_start)
+        else:
+            start = window_start
+        return format_filter_date(start)
+
+    def record_refresh(
+        self,
+        key: str,
+        q: Optional[str],
+        category_ids: Optional[str],
+        filter: Optional[str],
+        sales: Iterable[Mapping[str, Any]],
+        active_total: Optional[int] = None,
+        now: Optional[datetime] = None,
+        complete: bool = True,
+        complete_through: Optional[str] = None
+    ) -> int:
+        """
+        Store the sales of one refresh (converted by _convert_item_sale).
+
+        Args:
+            complete: Whether the refresh read every sale since its start;
+                an incomplete one leaves refreshed_at unchanged, so the
+                series stays due
+            complete_through: For an incomplete refresh, the sold date up to
+                which every sale was read (None if none); newest_sold_date
+                does not advance past it
+
+        Returns:
+            Number of sales not stored before
+        """
+        now = now or datetime.now(timezone.utc)
+        rows = [
+            (
+                key,
+                sale["item_id"],
+                sale["sold_date"],
+                sale["price"]["value"],
+                sale["price"].get("currency"),
+                sale.get("quantity_sold") or 1,
+                sale.get("condition_id"),
+                sale.get("category_id")
+            )
+            for sale in sales
+            if sale.get("item_id") and sale.get("sold_date") and sale.get("price")
+        ]
+        with closing(self._connect()) as connection, connection:
+            before = connection.total_changes
+            connection.executemany("INSERT OR IGNORE INTO sales VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            inserted = connection.total_changes - before
+            newest = connection.execute(
+                "SELECT MAX(sold_date) FROM sales WHERE series_key = ?", (key,)
+            ).fetchone()[0]
+            refreshed_at = now.isoformat()
+            if not complete:
+                previous = connection.execute(
+                    "SELECT newest_sold_date, refreshed_at FROM series WHERE series_key = ?", (key,)
+                ).fetchone()
+                previous_newest, refreshed_at = (previous["newest_sold_date"], previous["refreshed_at"]) if previous else (None, None)
+                newest = max(previous_newest or "", min(newest or "", complete_through or "")) or None
+            connection.execute(
+                "INSERT INTO series VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(series_key) DO UPDATE SET newest_sold_date = excluded.newest_sold_date, "
+                "refreshed_at = excluded.refreshed_at",
+                (key, q, category_ids, filter, newest, refreshed_at)
+            )
+            if active_total is not None:
+                connection.execute(
+                    "INSERT OR REPLACE INTO active_counts VALUES (?, ?, ?)",
+                    (key, now.date().isoformat(), active_total)
+                )
+        logger.info(f"Stored {inserted} new of {len(rows)} sales for series {key}")
+        return inserted
+
+    def aggregate(self, key: str, interval: str = "day", since: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Sales aggregated per day or per week (starting Monday).
+
+        Args:
+            key: Series key
+            interval: "day" or "week"
+            since: Earliest sold date to include (ISO date)
+
+        Returns:
+            Per period: sales, units sold, average, median, min and max
+            price, and sell-through (units sold / (units sold + average
+            active listings)) when active counts were recorded
+        """
+        if interval not in INTERVALS:
+            raise ValueError(f"Invalid interval {interval!r}. Must be one of: {', '.join(INTERVALS)}")
+        period = _PERIODS[interval]
+        with closing(self._connect()) as connection:
+            rows = connection.execute(
+                f"SELECT {period.format(column='sold_date')} AS period, price, quantity FROM sales "
+                "WHERE series_key = ? AND sold_date >= ? ORDER BY period",
+                (key, since or "")
+            ).fetchall()
+            active = dict(connection.execute(
+                f"SELECT {period.format(column='day')} AS period, AVG(active_total) FROM active_counts "
+                "WHERE series_key = ? GROUP BY period",
+                (key,)
+            ).fetchall())
+
+        grouped: Dict[str, List[sqlite3.Row]] = {}
+        for row in rows:
+            grouped.setdefault(row["period"], []).append(row)
+
+        periods = []
+        for name, period_rows in grouped.items():
+            prices = [row["price"] for row in period_rows]
+            units = sum(row["quantity"] for row in period_rows)
+            active_listings = active.get(name)
+            periods.append({
+                "period": name,
+                "sales": len(period_rows),
+                "units_sold": units,
+                "average_price": round(sum(prices) / len(prices), 2),
+                "median_price": round(statistics.median(prices), 2),
+                "min_price": round(min(prices), 2),
+                "max_price": round(max(prices), 2),
+                "sell_through": round(units / (units + active_listings), 4) if active_listings is not None else None
+            })
+        return periods
+
+    async def refresh_start_async(self, key: str) -> Optional[str]:
+        return await asyncio.to_thread(self.refresh_start, key)
+
+    async def record_refresh_async(self, *args: Any, **kwargs: Any) -> int:
+        return await asyncio.to_thread(self.record_refresh, *args, **kwargs)
+
+    async def aggregate_async(self, key: str, interval: str = "day", since: Optional[str] = None) -> List[Dict[str, Any]]:
+        return await asyncio.to_thread(self.aggregate, key, interval, since)
+
+
+# Global sales history store; None unless enabled with init_sales_history_store
+sales_history_store: Optional[SalesHistoryStore] = None
+
+
+def get_sales_history_store() -> Optional[SalesHistoryStore]:
+    """Get the global sales history store."""
+    return sales_history_store
+
+
+def init_sales_history_store(directory: str) -> SalesHistoryStore:
+    """Initialize the global sales history store."""
+    global sales_history_store
+    sales_history_store = SalesHistoryStore(directory)
+    return sales_history_store
@@ -0,0 +1,290 @@
+"""
+Streaming price statistics for sold item searches.
+
+SalesStatistics folds sale prices in as pages arrive and keeps only
+aggregates: count, sum, min, max and variance, a QuantileSketch (a merging
+t-digest) for percentiles, log-scale histogram buckets, and running totals
+per condition and per sold day. Memory stays bounded however many sales
+are read, so percentiles can cover a whole result set rather than a page.
+"""
+import bisect
+import math
+from typing import Any, Dict, List, Optional, Tuple
+
+# Quantiles reported for every statistics summary
+REPORTED_QUANTILES = (0.10, 0.25, 0.50, 0.75, 0.90)
+
+# Histogram buckets per factor of ten (edges 1, 1.78, 3.16, 5.62, 10, ...)
+BUCKETS_PER_DECADE = 4
+
+# Tukey fence multiplier for outliers
+OUTLIER_IQR_FACTOR = 1.5
+
+
+class QuantileSketch:
+    """
+    Merging t-digest over a stream of values.
+
+    Values are buffered and periodically merged into at most a few times
+    `compression` centroids. Centroids near the tails stay small, so
+    extreme quantiles remain accurate while the middle is summarized.
+    """
+
+    def __init__(self, compression: int = 100):
+        self.compression = compression
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+        self._means: List[float] = []
+        self._weights: List[float] = []
+        self._buffer: List[float] = []
+
+    def __len__(self) -> int:
+        return self.count
+
+    def add(self, value: float) -> None:
+        """Add one value."""
+        self._buffer.append(value)
+        self.count += 1
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        if len(self._buffer) >= self.compression * 5:
+            self._compress()
+
+    def _compress(self) -> None:
+        """Merge buffered values into the centroids."""
+        if not self._buffer:
+            return
+        points = sorted([*zip(self._means, self._weights), *((value, 1.0) for value in self._buffer)])
+        self._buffer = []
+
+        total = float(self.count)
+        means: List[float] = []
+        weights: List[float] = []
+        mean, weight = points[0]
+        weight_before = 0.0
+        for point_mean, point_weight in points[1:]:
+            merged = weight + point_weight
+            q = (weight_before + merged / 2) / total
+            # Classic t-digest size bound: small near q=0 and q=1
+            if merged <= max(1.0, 4 * total * q * (1 - q) / self.compression):
+                mean += (point_mean - mean) * point_weight / merged
+                weight = merged
+            else:
+                means.append(mean)
+                weights.append(weight)
+                weight_before += weight
+                mean, weight = point_mean, point_weight
+        means.append(mean)
+        weights.append(weight)
+        self._means, self._weights = means, weights
+
+    def _centers(self) -> List[float]:
+        """Cumulative weight at each centroid's midpoint."""
+        centers = []
+        cumulative = 0.0
+        for weight in self._weights:
+            centers.append(cumulative + weight / 2)
+            cumulative += weight
+        return centers
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate the value at quantile q (0-1), or None when empty."""
+        self._compress()
+        if not self.count:
+            return None
+        if len(self._means) == 1:
+            return self._means[0]
+        target = q * self.count
+        centers = self._centers()
+        # Tails interpolate towards the exact min and max
+        if target <= centers[0]:
+            return _interpolate(target, 0.0, centers[0], self.min, self._means[0])
+        if target >= centers[-1]:
+            return _interpolate(target, centers[-1], float(self.count), self._means[-1], self.max)
+        index = bisect.bisect_right(centers, target) - 1
+        return _interpolate(target, centers[index], centers[index + 1], self._means[index], self._means[index + 1])
+
+    def cdf(self, value: float, inclusive: bool = False) -> float:
+        """Estimate the fraction of values below value (at or below it when inclusive)."""
+        self._compress()
+        if not self.count or value < self.min or (value == self.min and not inclusive):
+            return 0.0
+        if value > self.max or (value == self.max and inclusive):
+            return 1.0
+        # Centroids of values tied with value fall wholly on one side
+        tied = sum(weight for mean, weight in zip(self._means, self._weights) if mean == value)
+        if tied:
+            below = sum(weight for mean, weight in zip(self._means, self._weights) if mean < value)
+            return (below + (tied if inclusive else 0)) / self.count
+        if len(self._means) == 1:
+            return 0.5
+        centers = self._centers()
+        if value <= self._means[0]:
+            rank = _interpolate(value, self.min, self._means[0], 0.0, centers[0])
+        elif value >= self._means[-1]:
+            rank = _interpolate(value, self._means[-1], self.max, centers[-1], float(self.count))
+        else:
+            index = bisect.bisect_right(self._means, value) - 1
+            rank = _interpolate(value, self._means[index], self._means[index + 1], centers[index], centers[index + 1])
+        return rank / self.count
+
+
+def _interpolate(x: float, x0: float, x1: float, y0: float, y1: float) -> float:
+    if x1 <= x0:
+        return y0
+    return y0 + (y1 - y0) * (x - x0) / (x1 - x0)
+
+
+class RunningStats:
+    """Count, total, min and max of one group, with an optional median sketch."""
+
+    def __init__(self, sketch: Optional[QuantileSketch] = None):
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.sketch = sketch
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        if self.sketch is not None:
+            self.sketch.add(value)
+
+    def summary(self) -> Dict[str, Any]:
+        result = {
+            "count": self.count,
+            "average_price": _round(self.total / self.count),
+            "min_price": _round(self.min),
+            "max_price": _round(self.max)
+        }
+        if self.sketch is not None:
+            result["median_price"] = _round(self.sketch.quantile(0.5))
+        return result
+
+
+def _round(value: Optional[float]) -> Optional[float]:
+    return None if value is None else round(value, 2)
+
+
+def _bucket_index(price: float) -> Optional[int]:
+    """Log-scale histogram bucket for a price; None for zero prices."""
+    if price <= 0:
+        return None
+    return math.floor(math.log10(price) * BUCKETS_PER_DECADE)
+
+
+def _bucket_bounds(index: Optional[int]) -> Tuple[float, float]:
+    if index is None:
+        return 0.0, 0.0
+    return 10 ** (index / BUCKETS_PER_DECADE), 10 ** ((index + 1) / BUCKETS_PER_DECADE)
+
+
+class SalesStatistics:
+    """Streaming aggregates over sold item prices."""
+
+    def __init__(self, compression: int = 100):
+        self.currency: Optional[str] = None
+        self.skipped_currency = 0
+        self.sketch = QuantileSketch(compression)
+        self.overall = RunningStats()
+        self._sum_squares = 0.0
+        self._buckets: Dict[Optional[int], int] = {}
+        self._conditions: Dict[str, RunningStats] = {}
+        self._days: Dict[str, RunningStats] = {}
+
+    def __len__(self) -> int:
+        return self.overall.count
+
+    def add(
+        self,
+        price: float,
+        currency: Optional[str] = None,
+        condition: Optional[str] = None,
+        sold_date: Optional[str] = None
+    ) -> bool:
+        """
+        Fold in one sale.
+
+        Sales priced in a different currency from the first one seen are
+        counted as skipped rather than mixed in.
+
+        Returns:
+            Whether the sale was included
+        """
+        if currency:
+            if self.currency is None:
+                self.currency = currency
+            elif currency != self.currency:
+                self.skipped_currency += 1
+                return False
+
+        self.overall.add(price)
+        self.sketch.add(price)
+        self._sum_squares += price * price
+        bucket = _bucket_index(price)
+        self._buckets[bucket] = self._buckets.get(bucket, 0) + 1
+
+        condition_stats = self._conditions.get(condition or "Unspecified")
+        if condition_stats is None:
+            condition_stats = self._conditions[condition or "Unspecified"] = RunningStats(QuantileSketch(50))
+        condition_stats.add(price)
+
+        if sold_date:
+            day_stats = self._days.get(sold_date[:10])
+            if day_stats is None:
+                day_stats = self._days[sold_date[:10]] = RunningStats()
+            day_stats.add(price)
+        return True
+
+    def histogram(self) -> List[Dict[str, Any]]:
+        """Non-empty log-scale price buckets in ascending order."""
+        buckets = []
+        for index in sorted(self._buckets, key=lambda bucket: -math.inf if bucket is None else bucket):
+            low, high = _bucket_bounds(index)
+            buckets.append({"min": _round(low), "max": _round(high), "count": self._buckets[index]})
+        return buckets
+
+    def outliers(self) -> Dict[str, Any]:
+        """Estimated sales outside the Tukey fences around the interquartile range."""
+        q1, q3 = self.sketch.quantile(0.25), self.sketch.quantile(0.75)
+        iqr = q3 - q1
+        low_fence = q1 - OUTLIER_IQR_FACTOR * iqr
+        high_fence = q3 + OUTLIER_IQR_FACTOR * iqr
+        return {
+            "low_fence": _round(low_fence),
+            "high_fence": _round(high_fence),
+            "low_count": round(self.sketch.cdf(low_fence) * len(self)),
+            "high_count": round((1 - self.sketch.cdf(high_fence, inclusive=True)) * len(self))
+        }
+
+    def summary(self) -> Dict[str, Any]:
+        """Statistics over everything folded in so far."""
+        count = len(self)
+        if not count:
+            return {"total_items": 0, "skipped_other_currency": self.skipped_currency}
+        mean = self.overall.total / count
+        variance = max(self._sum_squares / count - mean * mean, 0.0)
+        return {
+            "total_items": count,
+            "price_currency": self.currency or "USD",
+            "average_price": _round(mean),
+            "min_price": _round(self.overall.min),
+            "max_price": _round(self.overall.max),
+            "median_price": _round(self.sketch.quantile(0.5)),
+            "stddev_price": _round(math.sqrt(variance)),
+            "percentiles": {
+                f"p{round(q * 100)}": _round(self.sketch.quantile(q)) for q in REPORTED_QUANTILES
+            },
+            "outliers": self.outliers(),
+            "histogram": self.histogram(),
+            "by_condition": {
+                condition: stats.summary()
+                for condition, stats in sorted(self._conditions.items(), key=lambda entry: -entry[1].count)
+            },
+            "by_day": [{"date": day, **self._days[day].summary()} for day in sorted(self._days)],
+            "skipped_other_currency": self.skipped_currency
+        }
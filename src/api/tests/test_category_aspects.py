@@ -0,0 +1,146 @@
+"""
+Tests for bulk item aspects (fetch_item_aspects) parsing and caching.
+"""
+import gzip
+import json
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from api.cache import HybridCacheManager
+from api.category_aspects import CategoryAspectsIndex, ItemAspectsStreamParser
+from api.category_cache import get_category_aspects, refresh_category_tree
+
+FIXTURE = Path(__file__).parent / "fixtures" / "fetch_item_aspects.json"
+
+TREE = {
+    "categoryTreeId": "0",
+    "categoryTreeVersion": "130",
+    "applicableMarketplaceIds": ["EBAY_US"],
+    "rootCategoryNode": {
+        "category": {"categoryId": "0", "categoryName": "Root"},
+        "childCategoryTreeNodes": [
+            {"category": {"categoryId": "9355", "categoryName": "Cell Phones & Smartphones"}, "leafCategoryTreeNode": True}
+        ]
+    }
+}
+
+
+def bulk_file(version="130"):
+    """The fixture as eBay serves it: gzipped JSON."""
+    data = json.loads(FIXTURE.read_text(encoding="utf-8"))
+    data["categoryTreeVersion"] = version
+    return gzip.compress(json.dumps(data, ensure_ascii=False).encode("utf-8"))
+
+
+def parse(body: bytes, chunk_size: int) -> CategoryAspectsIndex:
+    parser = ItemAspectsStreamParser()
+    for start in range(0, len(body), chunk_size):
+        parser.feed(body[start:start + chunk_size])
+    return parser.close()
+
+
+class TestItemAspectsStreamParser:
+    """Test decoding the bulk file chunk by chunk."""
+
+    @pytest.mark.parametrize("chunk_size", [1, 7, 4096])
+    def test_gzip_in_chunks(self, chunk_size):
+        expected = json.loads(FIXTURE.read_text(encoding="utf-8"))
+        index = parse(bulk_file(), chunk_size)
+
+        assert index.category_tree_id == "0"
+        assert index.version == "130"
+        assert len(index) == len(expected["categoryAspects"])
+        for entry in expected["categoryAspects"]:
+            assert index.get_aspects(entry["category"]["categoryId"]) == entry["aspects"]
+        assert index.get_aspects("1") is None
+
+    def test_plain_json_accepted(self):
+        index = parse(FIXTURE.read_bytes(), 64)
+        assert [aspect["localizedAspectName"] for aspect in index.get_aspects("20349")] == ["Compatible Model", "Matériau"]
+
+    def test_truncated_file_rejected(self):
+        body = gzip.decompress(bulk_file())
+        with pytest.raises(ValueError):
+            parse(gzip.compress(body[:len(body) // 2]), 512)
+
+    def test_buffer_round_trip(self):
+        index = parse(bulk_file(), 4096)
+        copy = CategoryAspectsIndex(index.to_bytes())
+        assert copy.version == "130"
+        assert copy.get_aspects("9355") == index.get_aspects("9355")
+        assert index.nbytes < len(gzip.decompress(bulk_file()))
+
+
+def taxonomy_client(version):
+    """Mock REST client serving the tree, the version check and the bulk file."""
+    async def get(endpoint, params=None, stream_parser=None, **kwargs):
+        if endpoint.endswith("get_default_category_tree_id"):
+            return {"body": {"categoryTreeId": "0", "categoryTreeVersion": version}}
+        if endpoint.endswith("fetch_item_aspects"):
+            parser = stream_parser()
+            body = bulk_file(version)
+            for start in range(0, len(body), 100):
+                parser.feed(body[start:start + 100])
+            return {"body": parser.close()}
+        return {"body": {**TREE, "categoryTreeVersion": version}}
+
+    client = AsyncMock()
+    client.get = AsyncMock(side_effect=get)
+    return client
+
+
+def aspects_calls(client):
+    return [call for call in client.get.call_args_list if call.args[0].endswith("fetch_item_aspects")]
+
+
+@pytest.fixture
+def cache_manager():
+    """Memory-only cache manager and empty in-process registries."""
+    manager = HybridCacheManager()
+    with patch("api.category_cache.get_cache_manager", return_value=manager), \
+         patch("api.category_cache.get_category_snapshots", return_value=None), \
+         patch.dict("api.category_aspects._aspect_indexes", clear=True):
+        yield manager
+
+
+class TestCategoryAspectsCache:
+    """Test that aspects are served locally and follow the tree version."""
+
+    @pytest.mark.asyncio
+    async def test_downloaded_once_then_served_locally(self, cache_manager):
+        client = taxonomy_client("130")
+
+        index = await get_category_aspects(None, client, "0")
+        assert index.get_aspects("9355")[0]["localizedAspectName"] == "Brand"
+        assert len(aspects_calls(client)) == 1
+
+        assert await get_category_aspects(None, client, "0") is index
+        assert len(aspects_calls(client)) == 1
+
+    @pytest.mark.asyncio
+    async def test_loaded_from_cache_in_new_process(self, cache_manager):
+        await get_category_aspects(None, taxonomy_client("130"), "0")
+
+        with patch.dict("api.category_aspects._aspect_indexes", clear=True):
+            client = taxonomy_client("130")
+            index = await get_category_aspects(None, client, "0")
+            assert index.get_aspects("15032") == []
+            assert aspects_calls(client) == []
+
+    @pytest.mark.asyncio
+    async def test_refetched_when_tree_version_moves(self, cache_manager):
+        await get_category_aspects(None, taxonomy_client("130"), "0")
+
+        client = taxonomy_client("130")
+        assert await refresh_category_tree(client, "0") is False
+        assert aspects_calls(client) == []
+
+        client = taxonomy_client("131")
+        assert await refresh_category_tree(client, "0") is True
+        assert len(aspects_calls(client)) == 1
+
+        index = await get_category_aspects(None, client, "0")
+        assert index.version == "131"
+        assert len(aspects_calls(client)) == 1
@@ -0,0 +1,151 @@
+"""
+Tests for the pre-serialized category tree cache.
+"""
+import json
+import zlib
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from api.cache import HybridCacheManager
+from api.category_cache import (
+    cache_serialized_category_json,
+    get_category_tree_json,
+    get_serialized_category_json,
+    refresh_category_tree,
+)
+from api.compact_tree import CompactCategoryTree
+from data_types import success_response, success_response_raw
+
+TREE = {
+    "categoryTreeId": "0",
+    "categoryTreeVersion": "130",
+    "applicableMarketplaceIds": ["EBAY_FR"],
+    "rootCategoryNode": {
+        "category": {"categoryId": "0", "categoryName": "Root"},
+        "childCategoryTreeNodes": [
+            {"category": {"categoryId": "58058", "categoryName": "Électronique"}, "leafCategoryTreeNode": True}
+        ]
+    }
+}
+
+
+@pytest.fixture
+def cache_manager():
+    """Memory-only cache manager installed as the global one."""
+    manager = HybridCacheManager()
+    with patch("api.category_cache.get_cache_manager", return_value=manager):
+        yield manager
+
+
+class TestSerializedCategoryCache:
+    """Test caching serialized tree output by tree ID and version."""
+
+    @pytest.mark.asyncio
+    async def test_round_trip_by_version(self, cache_manager):
+        assert await get_serialized_category_json(TREE, "0") is None
+
+        serialized = await cache_serialized_category_json(TREE, TREE, "0")
+        assert json.loads(serialized) == TREE
+        assert await get_serialized_category_json(TREE, "0") is serialized
+
+        # A new tree version never serves the old bytes
+        newer = {**TREE, "categoryTreeVersion": "131"}
+        assert await get_serialized_category_json(newer, "0") is None
+
+    @pytest.mark.asyncio
+    async def test_subtrees_cached_separately(self, cache_manager):
+        subtree = TREE["rootCategoryNode"]["childCategoryTreeNodes"][0]
+        await cache_serialized_category_json(subtree, TREE, "0", "58058")
+
+        assert await get_serialized_category_json(TREE, "0") is None
+        assert json.loads(await get_serialized_category_json(TREE, "0", "58058")) == subtree
+
+    @pytest.mark.asyncio
+    async def test_unversioned_tree_not_cached(self, cache_manager):
+        tree = {"categoryTreeId": "0"}
+        await cache_serialized_category_json(tree, tree, "0")
+        assert cache_manager.memory_cache.size() == 0
+
+    def test_raw_response_matches_model_serialization(self):
+        serialized = json.dumps(TREE, separators=(",", ":"), ensure_ascii=False).encode()
+        raw = json.loads(success_response_raw(serialized, message="tree"))
+        model = json.loads(success_response(data=TREE, message="tree").to_json_string())
+
+        assert raw.keys() == model.keys()
+        assert raw["data"] == model["data"]
+        assert raw["message"] == model["message"]
+
+
+class TestCompressedL2:
+    """Test that the Redis tier stores compressed bytes."""
+
+    @pytest.mark.asyncio
+    async def test_l2_compressed_and_backfills_l1(self):
+        manager = HybridCacheManager()
+        manager.redis_cache = AsyncMock()
+        manager.redis_cache.set_bytes = AsyncMock(return_value=True)
+        data = json.dumps(TREE).encode() * 50
+
+        await manager.set_bytes("CATEGORY_JSON_0_130", data, 3600)
+        stored = manager.redis_cache.set_bytes.call_args.args[1]
+        assert len(stored) < len(data)
+        assert zlib.decompress(stored) == data
+
+        await manager.memory_cache.clear()
+        manager.redis_cache.get_bytes = AsyncMock(return_value=stored)
+        assert await manager.get_bytes("CATEGORY_JSON_0_130") == data
+        assert await manager.memory_cache.get("CATEGORY_JSON_0_130") == data
+
+
+def taxonomy_client(current_version, tree):
+    """Mock REST client answering the version check and the tree download."""
+    async def get(endpoint, params=None, **kwargs):
+        if endpoint.endswith("get_default_category_tree_id"):
+            return {"body": {"categoryTreeId": "0", "categoryTreeVersion": current_version}}
+        return {"body": tree}
+
+    client = AsyncMock()
+    client.get = AsyncMock(side_effect=get)
+    return client
+
+
+class TestVersionAwareRefresh:
+    """Test that cached trees are re-downloaded only when the version moves."""
+
+    @pytest.mark.asyncio
+    async def test_unchanged_version_extends_ttl(self, cache_manager):
+        await cache_manager.set_bytes("CATEGORY_LIST_0", CompactCategoryTree.from_json(TREE).to_bytes(), 60)
+        await cache_serialized_category_json(TREE, TREE, "0")
+        client = taxonomy_client("130", TREE)
+
+        assert await refresh_category_tree(client, "0") is False
+        assert client.get.call_count == 1
+        assert client.get.call_args.kwargs["params"] == {"marketplace_id": "EBAY_FR"}
+        entry = cache_manager.memory_cache._cache["CATEGORY_LIST_0"]
+        assert (entry.expires_at - entry.created_at).total_seconds() > 86400
+        assert await cache_manager.get("CATEGORY_CHECKED_0")
+
+    @pytest.mark.asyncio
+    async def test_changed_version_downloads_and_serializes(self, cache_manager):
+        await cache_manager.set_bytes("CATEGORY_LIST_0", CompactCategoryTree.from_json(TREE).to_bytes(), 60)
+        newer = {**TREE, "categoryTreeVersion": "131"}
+        client = taxonomy_client("131", newer)
+
+        assert await refresh_category_tree(client, "0") is True
+        assert client.get.call_count == 2
+        assert CompactCategoryTree(await cache_manager.get_bytes("CATEGORY_LIST_0")).to_json() == newer
+        assert json.loads(await get_serialized_category_json(newer, "0")) == newer
+
+    @pytest.mark.asyncio
+    async def test_stale_hit_schedules_background_refresh(self, cache_manager):
+        await cache_manager.set_bytes("CATEGORY_LIST_0", CompactCategoryTree.from_json(TREE).to_bytes(), 60)
+        client = taxonomy_client("130", TREE)
+
+        with patch("api.category_cache.schedule_category_tree_refresh") as schedule:
+            assert (await get_category_tree_json(None, client, "0")).to_json() == TREE
+            schedule.assert_called_once()
+            client.get.assert_not_called()
+
+            await cache_manager.set("CATEGORY_CHECKED_0", True, 60)
+            await get_category_tree_json(None, client, "0")
+            schedule.assert_called_once()
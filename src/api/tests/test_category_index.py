@@ -0,0 +1,92 @@
+"""
+Tests for the indexed category tree.
+"""
+import sys
+
+from api.category_cache import find_category_subtree
+from api.category_index import CategoryIndex, get_category_index
+
+
+def node(category_id, name, children=None):
+    """Build a raw getCategoryTree node."""
+    result = {"category": {"categoryId": category_id, "categoryName": name}}
+    if children:
+        result["childCategoryTreeNodes"] = children
+    else:
+        result["leafCategoryTreeNode"] = True
+    return result
+
+
+TREE = {
+    "categoryTreeId": "0",
+    "categoryTreeVersion": "130",
+    "rootCategoryNode": node("0", "Root", [
+        node("293", "Consumer Electronics", [
+            node("15032", "Cell Phones & Accessories", [
+                node("9355", "Cell Phones & Smartphones")
+            ]),
+            node("175672", "Laptops & Netbooks")
+        ]),
+        node("20081", "Antiques")
+    ])
+}
+
+
+class TestCategoryIndex:
+    """Test index lookups."""
+
+    def test_lookup_parent_depth_leaf(self):
+        index = CategoryIndex(TREE)
+
+        assert len(index) == 6
+        assert index.get_node("15032")["category"]["categoryName"] == "Cell Phones & Accessories"
+        assert index.get_parent_id("9355") == "15032"
+        assert index.get_depth("9355") == 3
+        assert index.is_leaf("9355")
+        assert not index.is_leaf("293")
+        assert index.get_node("missing") is None
+
+    def test_paths_and_breadcrumbs(self):
+        index = CategoryIndex(TREE)
+
+        assert index.get_path("9355") == "Consumer Electronics > Cell Phones & Accessories > Cell Phones & Smartphones"
+        assert index.get_ancestor_ids("9355") == ["293", "15032"]
+        assert [crumb["categoryId"] for crumb in index.get_breadcrumbs("9355")] == ["293", "15032", "9355"]
+        assert index.get_breadcrumbs("0") == []
+
+    def test_is_descendant(self):
+        index = CategoryIndex(TREE)
+
+        assert index.is_descendant("9355", "293")
+        assert index.is_descendant("9355", "0")
+        assert index.is_descendant("293", "293")
+        assert not index.is_descendant("175672", "15032")
+        assert not index.is_descendant("20081", "293")
+        assert not index.is_descendant("293", "9355")
+
+    def test_deep_tree_does_not_recurse(self):
+        depth = sys.getrecursionlimit() + 100
+        current = node(str(depth), f"Level {depth}")
+        for level in range(depth - 1, -1, -1):
+            current = node(str(level), f"Level {level}", [current])
+
+        index = CategoryIndex({"categoryTreeId": "9", "rootCategoryNode": current})
+        assert index.get_depth(str(depth)) == depth
+        assert index.is_descendant(str(depth), "1")
+
+
+class TestIndexVersioning:
+    """Test that indexes are rebuilt only when the version changes."""
+
+    def test_reused_for_same_version(self):
+        assert get_category_index(TREE) is get_category_index(dict(TREE))
+
+    def test_rebuilt_for_new_version(self):
+        first = get_category_index(TREE)
+        newer = get_category_index({**TREE, "categoryTreeVersion": "131"})
+        assert newer is not first
+        assert newer.version == "131"
+
+    def test_find_category_subtree_uses_index(self):
+        assert find_category_subtree(TREE, "15032") == TREE["rootCategoryNode"]["childCategoryTreeNodes"][0]["childCategoryTreeNodes"][0]
+        assert find_category_subtree(TREE, "missing") is None
@@ -0,0 +1,88 @@
+"""
+Tests for the expired category remapping index and its cache.
+"""
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from api.cache import HybridCacheManager
+from api.category_cache import get_expired_category_map
+from api.category_remap import ExpiredCategoryMap
+
+RESPONSE = {
+    "expiredCategories": [
+        {"fromCategoryId": "100", "toCategoryId": "200"},
+        {"fromCategoryId": "200", "toCategoryId": "300"},
+        {"fromCategoryId": "400", "toCategoryId": "500"},
+        {"fromCategoryId": "600", "toCategoryId": "700"},
+        {"fromCategoryId": "700", "toCategoryId": "600"}
+    ]
+}
+
+
+class TestExpiredCategoryMap:
+    """Test resolving expired categories."""
+
+    def test_resolve_follows_chains(self):
+        expired_map = ExpiredCategoryMap(RESPONSE)
+
+        assert len(expired_map) == 5
+        assert expired_map.resolve("100") == "300"
+        assert expired_map.resolve("400") == "500"
+        assert expired_map.resolve("300") is None
+
+    def test_resolve_stops_on_cycles(self):
+        assert ExpiredCategoryMap(RESPONSE).resolve("600") in ("600", "700")
+
+    def test_remap_batch(self):
+        remapped = ExpiredCategoryMap(RESPONSE).remap(["100", "999", "100", "400"])
+        assert remapped == [
+            {"categoryId": "100", "expired": True, "replacementCategoryId": "300"},
+            {"categoryId": "999", "expired": False, "replacementCategoryId": None},
+            {"categoryId": "400", "expired": True, "replacementCategoryId": "500"}
+        ]
+
+    def test_empty_response(self):
+        expired_map = ExpiredCategoryMap({})
+        assert len(expired_map) == 0
+        assert expired_map.remap(["1"])[0]["expired"] is False
+
+
+@pytest.fixture
+def cache_manager():
+    """Memory-only cache manager and an empty in-process registry."""
+    manager = HybridCacheManager()
+    with patch("api.category_cache.get_cache_manager", return_value=manager), \
+         patch.dict("api.category_remap._expired_maps", clear=True):
+        yield manager
+
+
+class TestExpiredCategoryMapCache:
+    """Test the map is fetched once per tree and marketplace."""
+
+    @pytest.mark.asyncio
+    async def test_fetched_once(self, cache_manager):
+        client = AsyncMock()
+        client.get = AsyncMock(return_value={"body": RESPONSE})
+
+        expired_map = await get_expired_category_map(client, "0", "EBAY_US")
+        assert await get_expired_category_map(client, "0", "EBAY_US") is expired_map
+        assert client.get.call_count == 1
+        assert client.get.call_args.kwargs["params"] == {"marketplace_id": "EBAY_US"}
+
+        await get_expired_category_map(client, "0", "EBAY_MOTORS_US")
+        assert client.get.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_loaded_from_cache_in_new_process(self, cache_manager):
+        client = AsyncMock()
+        client.get = AsyncMock(return_value={"body": RESPONSE})
+        await get_expired_category_map(client, "0", "EBAY_US")
+
+        with patch.dict("api.category_remap._expired_maps", clear=True):
+            expired_map = await get_expired_category_map(client, "0", "EBAY_US")
+            assert expired_map.resolve("100") == "300"
+            assert client.get.call_count == 1
+
+        await get_expired_category_map(client, "0", "EBAY_US", force_refresh=True)
+        assert client.get.call_count == 2
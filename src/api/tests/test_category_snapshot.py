@@ -0,0 +1,107 @@
+"""
+Tests for memory-mapped category tree snapshots.
+"""
+import mmap
+import os
+import time
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from api.cache import HybridCacheManager
+from api.category_cache import get_category_tree_json, refresh_category_tree
+from api.category_snapshot import CategorySnapshotStore
+from api.compact_tree import CompactCategoryTree
+
+TREE = {
+    "categoryTreeId": "3",
+    "categoryTreeVersion": "130",
+    "applicableMarketplaceIds": ["EBAY_GB"],
+    "rootCategoryNode": {
+        "category": {"categoryId": "0", "categoryName": "Root"},
+        "childCategoryTreeNodes": [
+            {"category": {"categoryId": "625", "categoryName": "Cameras & Photography"}, "leafCategoryTreeNode": True}
+        ]
+    }
+}
+
+
+class TestCategorySnapshotStore:
+    """Test writing and mapping snapshots."""
+
+    def test_write_and_map(self, tmp_path):
+        store = CategorySnapshotStore(str(tmp_path))
+        store.write(CompactCategoryTree.from_json(TREE))
+
+        tree = store.open("3")
+        assert isinstance(tree._buffer, mmap.mmap)
+        assert tree.to_json() == TREE
+        assert store.current_version("3") == "130"
+        # Written atomically: no temporary files left behind
+        assert sorted(path.name for path in tmp_path.iterdir()) == [
+            "category_tree_3.current", "category_tree_3_130.lct"
+        ]
+
+    def test_new_version_replaces_old(self, tmp_path):
+        store = CategorySnapshotStore(str(tmp_path))
+        store.write(CompactCategoryTree.from_json(TREE))
+        old = store.open("3")
+        store.write(CompactCategoryTree.from_json({**TREE, "categoryTreeVersion": "131"}))
+
+        assert store.current_version("3") == "131"
+        assert not store.snapshot_path("3", "130").exists()
+        # Mappings taken before the swap stay readable
+        assert old.to_json() == TREE
+
+    def test_expired_and_corrupt_snapshots_ignored(self, tmp_path):
+        store = CategorySnapshotStore(str(tmp_path), max_age=60)
+        store.write(CompactCategoryTree.from_json(TREE))
+        pointer = tmp_path / "category_tree_3.current"
+        os.utime(pointer, (time.time() - 120, time.time() - 120))
+        assert store.open("3") is None
+
+        store.touch("3")
+        store.snapshot_path("3", "130").write_bytes(b"garbage")
+        assert store.open("3") is None
+
+    def test_unversioned_tree_rejected(self, tmp_path):
+        with pytest.raises(ValueError):
+            CategorySnapshotStore(str(tmp_path)).write(CompactCategoryTree.from_json({"categoryTreeId": "3"}))
+
+
+class TestSnapshotBackedCache:
+    """Test that a second process starts from the snapshot instead of downloading."""
+
+    @pytest.mark.asyncio
+    async def test_download_writes_snapshot_for_other_processes(self, tmp_path):
+        store = CategorySnapshotStore(str(tmp_path))
+        client = AsyncMock()
+        client.get = AsyncMock(return_value={"body": TREE})
+
+        with patch("api.category_cache.get_category_snapshots", return_value=store), \
+             patch("api.category_cache.get_cache_manager", return_value=HybridCacheManager()):
+            tree = await get_category_tree_json(None, client, "3")
+        assert isinstance(tree._buffer, mmap.mmap)
+        assert client.get.call_count == 1
+
+        # Fresh process: empty memory cache and no in-process index
+        manager = HybridCacheManager()
+        await manager.set("CATEGORY_CHECKED_3", True, 60)
+        with patch("api.category_cache.get_category_snapshots", return_value=store), \
+             patch("api.category_cache.get_cache_manager", return_value=manager), \
+             patch("api.category_cache.find_category_index", return_value=None):
+            tree = await get_category_tree_json(None, client, "3")
+        assert tree.to_json() == TREE
+        assert client.get.call_count == 1
+        assert manager.memory_cache.size() == 1
+
+    @pytest.mark.asyncio
+    async def test_refresh_unchanged_snapshot_without_cache_manager(self, tmp_path):
+        store = CategorySnapshotStore(str(tmp_path))
+        store.write(CompactCategoryTree.from_json(TREE))
+        client = AsyncMock()
+        client.get = AsyncMock(return_value={"body": {"categoryTreeId": "3", "categoryTreeVersion": "130"}})
+
+        with patch("api.category_cache.get_category_snapshots", return_value=store), \
+             patch("api.category_cache.get_cache_manager", return_value=None):
+            assert await refresh_category_tree(client, "3") is False
+        assert client.get.call_count == 1
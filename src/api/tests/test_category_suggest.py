@@ -0,0 +1,53 @@
+"""
+Tests for the offline category suggestion engine.
+"""
+import json
+from pathlib import Path
+
+from api.category_index import CategoryIndex
+from api.category_suggest import CategorySuggester, suggest_categories, tokenize
+
+DATASET = Path(__file__).parents[3] / "scripts" / "fixtures" / "category_suggestions_standin.json"
+TREE = json.loads(DATASET.read_text())["tree"]
+
+
+class TestTokenize:
+    """Test query normalization."""
+
+    def test_plurals_possessives_and_stopwords(self):
+        assert tokenize("Men's Cell Phones & Accessories") == ["men", "cell", "phone", "accessory"]
+        assert tokenize("Cases, Covers and Skins") == ["case", "cover", "skin"]
+
+
+class TestCategorySuggester:
+    """Test ranking and confidence."""
+
+    def test_leaf_categories_ranked_by_name(self):
+        suggester = CategorySuggester(CategoryIndex(TREE))
+        suggestions = suggester.suggest("lego minifigures", limit=3)
+
+        assert suggestions[0]["categoryId"] == "183448"
+        assert all(CategoryIndex(TREE).is_leaf(s["categoryId"]) for s in suggestions)
+
+    def test_unknown_terms_give_no_suggestions(self):
+        suggester = CategorySuggester(CategoryIndex(TREE))
+        assert suggester.suggest("iphone 13 pro max") == []
+
+    def test_ambiguous_match_has_lower_confidence(self):
+        suggester = CategorySuggester(CategoryIndex(TREE))
+        clear = suggester.suggest("cordless power drill")[0]["confidence"]
+        ambiguous = suggester.suggest("gaming laptop")[0]["confidence"]
+        assert clear > ambiguous
+
+    def test_response_matches_ebay_shape(self):
+        response = suggest_categories(CategoryIndex(TREE), "phone charger")
+
+        top = response["categorySuggestions"][0]
+        assert top["category"] == {"categoryId": "123417", "categoryName": "Chargers & Cradles"}
+        assert top["categoryTreeNodeLevel"] == 3
+        # Ancestors are listed from the immediate parent upwards
+        assert [a["categoryId"] for a in top["categoryTreeNodeAncestors"]] == ["9394", "15032"]
+        assert response["categoryTreeVersion"] == "standin-1"
+
+    def test_low_confidence_returns_none(self):
+        assert suggest_categories(CategoryIndex(TREE), "gaming laptop", min_confidence=0.99) is None
@@ -0,0 +1,95 @@
+"""
+Tests for depth-limited, projected and paginated category tree views.
+"""
+import pytest
+
+from api.category_views import CategoryNotFoundError, category_rows_view, category_tree_view
+from api.compact_tree import CompactCategoryTree
+
+
+def node(category_id, name, children=None):
+    """Build a raw getCategoryTree node."""
+    result = {"category": {"categoryId": category_id, "categoryName": name}}
+    if children:
+        result["childCategoryTreeNodes"] = children
+    else:
+        result["leafCategoryTreeNode"] = True
+    return result
+
+
+TREE = CompactCategoryTree.from_json({
+    "categoryTreeId": "0",
+    "categoryTreeVersion": "130",
+    "rootCategoryNode": node("0", "Root", [
+        node("293", "Consumer Electronics", [
+            node("15032", "Cell Phones & Accessories", [
+                node("9355", "Cell Phones & Smartphones")
+            ]),
+            node("175672", "Laptops & Netbooks")
+        ]),
+        node("20081", "Antiques")
+    ])
+})
+
+
+class TestTreeView:
+    """Test the nested view."""
+
+    def test_max_depth_cuts_children(self):
+        view = category_tree_view(TREE, max_depth=1)
+        assert [child["category"]["categoryId"] for child in view["childCategoryTreeNodes"]] == ["293", "20081"]
+        assert "childCategoryTreeNodes" not in view["childCategoryTreeNodes"][0]
+
+    def test_root_and_projection(self):
+        view = category_tree_view(TREE, root_category_id="293", fields=["id", "name", "leaf"])
+        assert view == {
+            "id": "293", "name": "Consumer Electronics", "leaf": False,
+            "children": [
+                {"id": "15032", "name": "Cell Phones & Accessories", "leaf": False,
+                 "children": [{"id": "9355", "name": "Cell Phones & Smartphones", "leaf": True}]},
+                {"id": "175672", "name": "Laptops & Netbooks", "leaf": True}
+            ]
+        }
+
+    def test_unknown_root(self):
+        with pytest.raises(CategoryNotFoundError):
+            category_tree_view(TREE, root_category_id="404")
+
+
+class TestRowsView:
+    """Test flat pages and cursors."""
+
+    def test_cursor_walks_every_row_once(self):
+        ids, cursor = [], None
+        while True:
+            page = category_rows_view(TREE, limit=2, cursor=cursor)
+            ids += [row["id"] for row in page["categories"]]
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+        assert ids == ["0", "293", "15032", "9355", "175672", "20081"]
+
+    def test_table_with_depth_and_root(self):
+        page = category_rows_view(TREE, root_category_id="293", max_depth=1, tabular=True)
+        assert page["columns"] == ["id", "parent_id", "name", "leaf"]
+        assert page["rows"] == [
+            ["293", "0", "Consumer Electronics", False],
+            ["15032", "293", "Cell Phones & Accessories", False],
+            ["175672", "293", "Laptops & Netbooks", True],
+        ]
+        assert page["next_cursor"] is None
+
+    def test_cursor_rejected_for_new_version_or_other_query(self):
+        cursor = category_rows_view(TREE, limit=1)["next_cursor"]
+        newer = CompactCategoryTree.from_json({**TREE.to_json(), "categoryTreeVersion": "131"})
+
+        with pytest.raises(ValueError, match="version"):
+            category_rows_view(newer, limit=1, cursor=cursor)
+        with pytest.raises(ValueError):
+            category_rows_view(TREE, max_depth=1, limit=1, cursor=cursor)
+        with pytest.raises(ValueError):
+            category_rows_view(TREE, cursor="not-a-cursor")
+
+    def test_unknown_field(self):
+        with pytest.raises(ValueError):
+            category_rows_view(TREE, fields=["id", "price"])
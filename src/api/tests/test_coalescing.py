@@ -0,0 +1,127 @@
+"""
+Tests for single-flight coalescing of identical GET requests.
+"""
+import asyncio
+import pytest
+from unittest.mock import Mock
+
+from api.coalescing import RequestCoalescer, make_request_key
+from api.rest_client import EbayRestClient, RestConfig
+
+
+@pytest.fixture
+def client():
+    """REST client with a private coalescer and a slow fake transport."""
+    rest_client = EbayRestClient(Mock(), RestConfig(), coalescer=RequestCoalescer())
+    rest_client.sent = []
+
+    async def fake_send(method, endpoint, params, json, headers):
+        rest_client.sent.append((method, endpoint, params))
+        await asyncio.sleep(0.01)
+        return {"body": {"endpoint": endpoint}, "headers": {}}
+
+    rest_client._send_request = fake_send
+    return rest_client
+
+
+class TestRequestKey:
+    """Test key normalization."""
+
+    def test_param_order_is_ignored(self):
+        first = make_request_key("get", "https://x/a", {"q": "ipod", "limit": 10})
+        second = make_request_key("GET", "https://x/a", {"limit": "10", "q": "ipod"})
+        assert first == second
+
+    def test_marketplace_is_part_of_key(self):
+        us = make_request_key("GET", "https://x/a", {"q": "ipod"}, marketplace_id="EBAY_US")
+        gb = make_request_key("GET", "https://x/a", {"q": "ipod"}, marketplace_id="EBAY_GB")
+        assert us != gb
+
+
+class TestRequestCoalescing:
+    """Test coalescing through EbayRestClient.request."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_gets_share_one_call(self, client):
+        results = await asyncio.gather(*[
+            client.get("/buy/browse/v1/item/1", params={"fieldgroups": "COMPACT"})
+            for _ in range(5)
+        ])
+
+        assert len(client.sent) == 1
+        assert all(result is results[0] for result in results)
+        stats = client.coalescer.get_stats()
+        assert stats["requests_sent"] == 1
+        assert stats["requests_coalesced"] == 4
+        assert stats["in_flight"] == 0
+
+    @pytest.mark.asyncio
+    async def test_different_marketplaces_not_coalesced(self, client):
+        await asyncio.gather(
+            client.get("/buy/browse/v1/item/1", headers={"X-EBAY-C-MARKETPLACE-ID": "EBAY_US"}),
+            client.get("/buy/browse/v1/item/1", headers={"X-EBAY-C-MARKETPLACE-ID": "EBAY_GB"})
+        )
+        assert len(client.sent) == 2
+
+    @pytest.mark.asyncio
+    async def test_different_credentials_not_coalesced(self):
+        coalescer = RequestCoalescer()
+        sent = []
+
+        def make_client(client_id):
+            oauth = Mock()
+            oauth.config.client_id = client_id
+            rest_client = EbayRestClient(oauth, RestConfig(), coalescer=coalescer)
+
+            async def fake_send(method, endpoint, params, json, headers):
+                sent.append(client_id)
+                await asyncio.sleep(0.01)
+                return {"body": {"client_id": client_id}, "headers": {}}
+
+            rest_client._send_request = fake_send
+            return rest_client
+
+        first, second = await asyncio.gather(
+            make_client("app-a").get("/buy/browse/v1/item/1"),
+            make_client("app-b").get("/buy/browse/v1/item/1")
+        )
+
+        assert sorted(sent) == ["app-a", "app-b"]
+        assert first["body"]["client_id"] == "app-a"
+        assert second["body"]["client_id"] == "app-b"
+
+    @pytest.mark.asyncio
+    async def test_mutating_requests_pass_through(self, client):
+        await asyncio.gather(*[
+            client.put("/sell/inventory/v1/inventory_item/SKU1", json={"a": 1})
+            for _ in range(3)
+        ])
+        assert len(client.sent) == 3
+        assert client.coalescer.get_stats()["requests_coalesced"] == 0
+
+    @pytest.mark.asyncio
+    async def test_sequential_gets_are_not_coalesced(self, client):
+        await client.get("/buy/browse/v1/item/1")
+        await client.get("/buy/browse/v1/item/1")
+        assert len(client.sent) == 2
+
+    @pytest.mark.asyncio
+    async def test_errors_propagate_to_all_callers(self):
+        coalescer = RequestCoalescer()
+        calls = 0
+
+        async def failing_fetch():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            raise RuntimeError("boom")
+
+        key = make_request_key("GET", "https://x/a")
+        results = await asyncio.gather(
+            coalescer.run(key, failing_fetch),
+            coalescer.run(key, failing_fetch),
+            return_exceptions=True
+        )
+
+        assert calls == 1
+        assert all(isinstance(result, RuntimeError) for result in results)
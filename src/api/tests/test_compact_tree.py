@@ -0,0 +1,148 @@
+"""
+Tests for the compact array-backed category tree.
+"""
+import json
+import tracemalloc
+import pytest
+
+from api.compact_tree import CompactCategoryTree, CompactTreeStreamParser
+
+HREF = "https://api.ebay.com/commerce/taxonomy/v1/category_tree/0/get_category_subtree?category_id="
+
+TREE = {
+    "categoryTreeId": "0",
+    "categoryTreeVersion": "130",
+    "applicableMarketplaceIds": ["EBAY_US"],
+    "rootCategoryNode": {
+        "category": {"categoryId": "0", "categoryName": "Root"},
+        "categoryTreeNodeLevel": 0,
+        "childCategoryTreeNodes": [
+            {
+                "category": {"categoryId": "293", "categoryName": "Consumer Electronics"},
+                "parentCategoryTreeNodeHref": HREF + "0",
+                "categoryTreeNodeLevel": 1,
+                "childCategoryTreeNodes": [
+                    {
+                        "category": {"categoryId": "9355", "categoryName": "Other"},
+                        "parentCategoryTreeNodeHref": HREF + "293",
+                        "categoryTreeNodeLevel": 2,
+                        "leafCategoryTreeNode": True
+                    }
+                ]
+            },
+            {
+                "category": {"categoryId": "20081", "categoryName": "Other"},
+                "parentCategoryTreeNodeHref": "https://example.com/odd",
+                "categoryTreeNodeLevel": 7,
+                "leafCategoryTreeNode": True,
+                "unexpectedField": {"kept": True}
+            }
+        ]
+    }
+}
+
+
+class TestCompactCategoryTree:
+    """Test encoding, lookups and lossless reconstruction."""
+
+    def test_round_trip_is_lossless(self):
+        tree = CompactCategoryTree.from_json(TREE)
+
+        assert tree.to_json() == TREE
+        assert CompactCategoryTree(tree.to_bytes()).to_json() == TREE
+        assert tree["categoryTreeVersion"] == "130"
+        assert tree.get("missing") is None
+
+    def test_lookups_and_views(self):
+        tree = CompactCategoryTree.from_json(TREE)
+        node = tree.node("9355")
+
+        assert node.name == "Other"
+        assert node.depth == 2
+        assert node.is_leaf
+        assert node.parent.category_id == "293"
+        assert [child.category_id for child in tree.node("0").children] == ["293", "20081"]
+        assert tree.node("missing") is None
+        assert tree.find("12345") == -1
+
+    def test_names_are_interned(self):
+        tree = CompactCategoryTree.from_json(TREE)
+        # "", Root, Consumer Electronics and Other, plus the end offset
+        assert tree.header["string_offsets"] == 5
+
+    def test_subtree_json(self):
+        tree = CompactCategoryTree.from_json(TREE)
+        assert tree.node("293").to_json() == TREE["rootCategoryNode"]["childCategoryTreeNodes"][0]
+
+    def test_rejects_foreign_buffer(self):
+        with pytest.raises(ValueError):
+            CompactCategoryTree(b"not a tree")
+
+
+def synthetic_tree(nodes=17000, fanout=12):
+    """Build a getCategoryTree-shaped response with `nodes` categories."""
+    root = {"category": {"categoryId": "0", "categoryName": "Root"}, "categoryTreeNodeLevel": 0}
+    frontier = [(root, 0)]
+    next_id = 1
+    while next_id < nodes:
+        parent, level = frontier.pop(0)
+        children = parent["childCategoryTreeNodes"] = []
+        for _ in range(min(fanout, nodes - next_id)):
+            child = {
+                "category": {"categoryId": str(next_id), "categoryName": f"Category {next_id} Collectibles"},
+                "parentCategoryTreeNodeHref": HREF + parent["category"]["categoryId"],
+                "categoryTreeNodeLevel": level + 1,
+                "leafCategoryTreeNode": True
+            }
+            children.append(child)
+            frontier.append((child, level + 1))
+            next_id += 1
+        parent.pop("leafCategoryTreeNode", None)
+    return {"categoryTreeId": "0", "categoryTreeVersion": "130", "rootCategoryNode": root}
+
+
+def stream(body, chunk_size):
+    """Feed a body to the stream parser in fixed-size chunks."""
+    parser = CompactTreeStreamParser()
+    for start in range(0, len(body), chunk_size):
+        parser.feed(body[start:start + chunk_size])
+    return parser.close()
+
+
+class TestStreamParser:
+    """Test building the compact tree from streamed response chunks."""
+
+    @pytest.mark.parametrize("chunk_size", [1, 7, 64, 65536])
+    def test_matches_full_parse(self, chunk_size):
+        body = json.dumps(TREE, indent=2, ensure_ascii=False).encode()
+        assert stream(body, chunk_size).to_json() == TREE
+
+    def test_multibyte_names_split_across_chunks(self):
+        tree = {**TREE, "rootCategoryNode": {"category": {"categoryId": "0", "categoryName": "Électronique ☕"}}}
+        assert stream(json.dumps(tree, ensure_ascii=False).encode(), 1).to_json() == tree
+
+    def test_truncated_body_raises(self):
+        body = json.dumps(TREE).encode()
+        with pytest.raises(ValueError):
+            stream(body[:-3], 64)
+
+    def test_lower_peak_allocation_than_full_parse(self):
+        tree = synthetic_tree()
+        body = json.dumps(tree).encode()
+        del tree
+
+        tracemalloc.start()
+        try:
+            full = CompactCategoryTree.from_json(json.loads(body))
+            full_peak = tracemalloc.get_traced_memory()[1]
+            del full
+
+            tracemalloc.reset_peak()
+            streamed = stream(body, 65536)
+            stream_peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+        assert len(streamed) and streamed.size == 17000
+        # Measured at roughly 16 MB vs 5 MB; require at least a 2x reduction
+        assert stream_peak * 2 < full_peak
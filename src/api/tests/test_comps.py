@@ -0,0 +1,93 @@
+"""
+Tests for the comparable sales engine.
+"""
+import pytest
+
+from api.comps import CompsSet, condition_group
+
+
+def sale(price, condition_id="3000", currency="USD"):
+    """A sale as converted by _convert_item_sale."""
+    return {"price": {"value": float(price), "currency": currency}, "condition_id": condition_id}
+
+
+def listing(price, condition="Used", shipping=None):
+    """A listing as formatted by _format_search_response."""
+    return {
+        "price": {"value": str(price), "currency": "USD"},
+        "condition": condition,
+        "shipping_options": [] if shipping is None else [{"shippingCost": {"value": str(shipping), "currency": "USD"}}]
+    }
+
+
+class TestConditionGroup:
+
+    @pytest.mark.parametrize("condition_id,condition,expected", [
+        ("1000", None, "NEW"),
+        ("1500", None, "NEW"),
+        ("2500", None, "REFURBISHED"),
+        ("2750", None, "USED"),
+        ("7000", None, "FOR_PARTS"),
+        (None, "New with tags", "NEW"),
+        (None, "Used - Like New", "USED"),
+        (None, "Certified - Refurbished", "REFURBISHED"),
+        (None, "For parts or not working", "FOR_PARTS"),
+        (None, None, None),
+    ])
+    def test_groups(self, condition_id, condition, expected):
+        assert condition_group(condition_id, condition) == expected
+
+
+class TestCompsSet:
+
+    @pytest.fixture
+    def comps(self):
+        sales = [sale(price) for price in range(100, 201)] + [sale(500, "1000"), sale(80, currency="EUR")]
+        listings = [listing(150, shipping=10), listing(170, shipping=0), listing(190), listing(900, "New")]
+        return CompsSet.from_records(sales, listings)
+
+    def test_loaded_columns(self, comps):
+        assert comps.sold_count == 102
+        assert comps.active_count == 4
+        assert comps.skipped == 1
+
+    def test_positions_and_band(self, comps):
+        result = comps.evaluate([100, 150, 200, 250], "USED")
+
+        assert result["sold_comps"] == 101
+        assert result["active_comps"] == 3
+        assert result["sold_quantiles"]["p50"] == 150
+        assert result["suggested_price_band"] == {"low": 125.0, "target": 150.0, "high": 175.0}
+        # Listing prices include their cheapest shipping
+        assert result["active_quantiles"]["p50"] == 170.0
+
+        positions = [entry["sold_position"] for entry in result["results"]]
+        assert positions == [0.5, 50.0, 99.5, 100.0]
+        assert [entry["deal_score"] for entry in result["results"]] == [100, 50, 0, 0]
+        assert [entry["verdict"] for entry in result["results"]] == [
+            "below_market", "within_market", "above_market", "above_market"
+        ]
+
+    def test_shipping_added_to_prices(self, comps):
+        result = comps.evaluate([140], "USED", shipping_cost=10)
+        assert result["results"][0]["landed_price"] == 150
+        assert result["results"][0]["sold_position"] == 50.0
+
+    def test_all_conditions(self, comps):
+        result = comps.evaluate([500])
+        assert result["sold_comps"] == 102
+        assert result["results"][0]["sold_position"] > 99
+
+    def test_no_comps_in_group(self, comps):
+        result = comps.evaluate([100], "FOR_PARTS")
+        assert result["suggested_price_band"] is None
+        assert result["results"][0] == {
+            "price": 100, "landed_price": 100, "sold_position": None,
+            "active_position": None, "deal_score": None, "verdict": None
+        }
+
+    def test_falls_back_to_active_band(self):
+        comps = CompsSet.from_records([], [listing(price) for price in (10, 20, 30)])
+        result = comps.evaluate([15])
+        assert result["suggested_price_band"]["target"] == 20
+        assert result["results"][0]["deal_score"] == round((1 - 1 / 3) * 100)
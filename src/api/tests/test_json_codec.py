@@ -0,0 +1,120 @@
+"""
+Tests for single-read JSON decoding of API responses.
+"""
+import pytest
+from unittest.mock import AsyncMock, MagicMock, Mock
+
+from api import json_codec
+from api.coalescing import RequestCoalescer
+from api.compact_tree import CompactCategoryTree, CompactTreeStreamParser
+from api.errors import EbayApiError
+from api.rest_client import EbayRestClient, RestConfig
+
+
+class FakeResponse:
+    """aiohttp response stand-in that only supports a single read()."""
+
+    def __init__(self, status: int, body: bytes):
+        self.status = status
+        self.headers = {}
+        self._body = body
+        self.text = AsyncMock(side_effect=AssertionError("text() must not be called"))
+        self.json = AsyncMock(side_effect=AssertionError("json() must not be called"))
+        self.reads = 0
+        self.content = Mock()
+        self.content.iter_chunked = self._iter_chunked
+
+    async def _iter_chunked(self, size: int):
+        for start in range(0, len(self._body), size):
+            yield self._body[start:start + size]
+
+    async def read(self) -> bytes:
+        self.reads += 1
+        return self._body
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+def make_client(response: FakeResponse) -> EbayRestClient:
+    """REST client whose shared session always returns `response`."""
+    session = MagicMock()
+    session.request = Mock(return_value=response)
+    oauth = Mock()
+    oauth.get_token = AsyncMock(return_value="token")
+
+    async def provider():
+        return session
+
+    return EbayRestClient(
+        oauth,
+        RestConfig(max_retries=1),
+        session_provider=provider,
+        coalescer=RequestCoalescer()
+    )
+
+
+class TestJsonCodec:
+    """Test the codec backends."""
+
+    def test_round_trip(self):
+        data = {"title": "Café ☕", "price": {"value": "9.99"}, "items": [1, 2]}
+        assert json_codec.loads(json_codec.dumps_bytes(data)) == data
+        assert json_codec.loads(json_codec.dumps(data)) == data
+
+    def test_invalid_json_raises_value_error(self):
+        with pytest.raises(ValueError):
+            json_codec.loads(b"<html>oops</html>")
+
+
+class TestResponseDecoding:
+    """Test that EbayRestClient reads and parses each body once."""
+
+    @pytest.mark.asyncio
+    async def test_success_body_parsed_from_bytes(self):
+        response = FakeResponse(200, b'{"categoryTreeId": "0"}')
+        result = await make_client(response).get("/commerce/taxonomy/v1/category_tree/0")
+
+        assert result["body"] == {"categoryTreeId": "0"}
+        assert response.reads == 1
+
+    @pytest.mark.asyncio
+    async def test_empty_body(self):
+        response = FakeResponse(204, b"")
+        result = await make_client(response).delete("/sell/inventory/v1/inventory_item/SKU1")
+        assert result["body"] == {}
+
+    @pytest.mark.asyncio
+    async def test_non_json_error_body(self):
+        response = FakeResponse(400, b"Bad Request")
+        with pytest.raises(EbayApiError) as exc_info:
+            await make_client(response).get("/buy/browse/v1/item/1")
+
+        assert exc_info.value.status_code == 400
+        assert response.reads == 1
+
+    @pytest.mark.asyncio
+    async def test_streamed_body_goes_to_parser(self):
+        body = b'{"categoryTreeId": "0", "rootCategoryNode": {"category": {"categoryId": "0", "categoryName": "Root"}}}'
+        response = FakeResponse(200, body)
+        result = await make_client(response).get(
+            "/commerce/taxonomy/v1/category_tree/0",
+            stream_parser=CompactTreeStreamParser
+        )
+
+        assert isinstance(result["body"], CompactCategoryTree)
+        assert result["body"].to_json()["rootCategoryNode"]["category"]["categoryName"] == "Root"
+        assert response.reads == 0
+
+    @pytest.mark.asyncio
+    async def test_streamed_error_body_still_read(self):
+        response = FakeResponse(400, b"Bad Request")
+        with pytest.raises(EbayApiError):
+            await make_client(response).get(
+                "/commerce/taxonomy/v1/category_tree/0",
+                stream_parser=CompactTreeStreamParser
+            )
+        assert response.reads == 1
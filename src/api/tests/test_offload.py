@@ -0,0 +1,54 @@
+"""
+Tests for the size-threshold serialization offload policy.
+"""
+import json
+import threading
+import pytest
+
+from api.offload import OffloadExecutor, count_items
+from data_types import success_response
+
+
+class TestSizePolicy:
+    """Test the size threshold checks."""
+
+    def test_count_items_stops_at_limit(self):
+        tree = {"nodes": [{"id": i} for i in range(100000)]}
+        assert count_items(tree, 10) == 11
+
+    def test_is_large(self):
+        executor = OffloadExecutor(threshold_bytes=10, threshold_items=5)
+        assert executor.is_large(b"x" * 10)
+        assert not executor.is_large("short")
+        assert executor.is_large([1, 2, 3, 4, 5, 6])
+        assert not executor.is_large({"a": 1})
+
+
+class TestOffload:
+    """Test that large work leaves the event loop thread."""
+
+    @pytest.mark.asyncio
+    async def test_small_payload_runs_inline(self):
+        executor = OffloadExecutor(threshold_bytes=1024)
+        assert await executor.loads(b'{"a": 1}') == {"a": 1}
+        assert executor.get_stats()["inline_calls"] == 1
+        assert executor.get_stats()["offloaded_calls"] == 0
+
+    @pytest.mark.asyncio
+    async def test_large_payload_runs_on_pool(self):
+        executor = OffloadExecutor(threshold_bytes=16)
+        loop_thread = threading.get_ident()
+
+        def parse(data):
+            return threading.get_ident(), json.loads(data)
+
+        thread_id, parsed = await executor.run(True, parse, b'{"categoryTreeId": "0"}')
+        executor.close()
+
+        assert parsed == {"categoryTreeId": "0"}
+        assert thread_id != loop_thread
+
+    @pytest.mark.asyncio
+    async def test_async_response_matches_sync(self):
+        response = success_response(data={"nodes": list(range(10000))}, message="tree")
+        assert await response.to_json_string_async() == response.to_json_string()
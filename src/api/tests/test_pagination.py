@@ -0,0 +1,116 @@
+"""
+Tests for concurrent offset pagination.
+"""
+import asyncio
+
+import pytest
+
+from api.pagination import DEFAULT_MAX_PAGES, MAX_OFFSET, PageMerger, fetch_pages, plan_pages
+
+
+def search_backend(total, duplicate_shift=0):
+    """Fake search endpoint; results from offset 400 on repeat `duplicate_shift` earlier IDs."""
+    calls = []
+    in_flight = {"now": 0, "max": 0}
+
+    async def fetch_page(offset, limit):
+        calls.append((offset, limit))
+        in_flight["now"] += 1
+        in_flight["max"] = max(in_flight["max"], in_flight["now"])
+        # Later pages finish first
+        await asyncio.sleep(0.001 * (10 - offset // 200 % 10))
+        in_flight["now"] -= 1
+        end = min(offset + limit, total, MAX_OFFSET)
+        shift = duplicate_shift if offset >= 400 else 0
+        return {
+            "total": total,
+            "itemSummaries": [{"itemId": f"v1|{index - shift}|0"} for index in range(offset, end)]
+        }
+
+    return fetch_page, calls, in_flight
+
+
+class TestPlanPages:
+    """Test splitting result ranges into requests."""
+
+    def test_plan(self):
+        assert plan_pages(0, 450) == [(0, 200), (200, 200), (400, 50)]
+        assert plan_pages(100, 150, page_size=50) == [(100, 50), (150, 50), (200, 50)]
+
+    def test_known_total(self):
+        assert plan_pages(0, 1000, total=250) == [(0, 200), (200, 50)]
+
+    def test_offset_cap(self):
+        assert plan_pages(9900, 500) == [(9900, 100)]
+        assert plan_pages(MAX_OFFSET, 10) == []
+
+
+class TestFetchPages:
+    """Test concurrent fetching and merging."""
+
+    @pytest.mark.asyncio
+    async def test_merged_in_offset_order(self):
+        fetch_page, calls, in_flight = search_backend(total=5000)
+        merger = PageMerger()
+        async for page in fetch_pages(fetch_page, 0, 1000, concurrency=3):
+            merger.add(page)
+
+        items = merger.items()
+        assert [item["itemId"] for item in items] == [f"v1|{index}|0" for index in range(1000)]
+        assert calls[0] == (0, 200)
+        assert sorted(calls) == [(offset, 200) for offset in range(0, 1000, 200)]
+        assert 1 < in_flight["max"] <= 3
+
+    @pytest.mark.asyncio
+    async def test_stops_at_total(self):
+        fetch_page, calls, _ = search_backend(total=300)
+        merger = PageMerger()
+        async for page in fetch_pages(fetch_page, 0, 2000):
+            merger.add(page)
+
+        assert len(merger.items()) == 300
+        assert calls == [(0, 200), (200, 100)]
+
+    @pytest.mark.asyncio
+    async def test_honors_offset_cap(self):
+        fetch_page, calls, _ = search_backend(total=50000)
+        async for _ in fetch_pages(fetch_page, 9500, 2000):
+            pass
+
+        assert max(offset + limit for offset, limit in calls) == MAX_OFFSET
+
+    @pytest.mark.asyncio
+    async def test_page_budget(self):
+        fetch_page, calls, _ = search_backend(total=50000)
+        async for _ in fetch_pages(fetch_page, 0, MAX_OFFSET):
+            pass
+        assert len(calls) == DEFAULT_MAX_PAGES
+
+        calls.clear()
+        async for _ in fetch_pages(fetch_page, 0, 1000, max_pages=2):
+            pass
+        assert sorted(calls) == [(0, 200), (200, 200)]
+
+    @pytest.mark.asyncio
+    async def test_duplicates_dropped(self):
+        fetch_page, _, _ = search_backend(total=600, duplicate_shift=5)
+        merger = PageMerger()
+        async for page in fetch_pages(fetch_page, 0, 600):
+            unique = merger.add(page)
+
+        assert unique == 595
+        assert merger.duplicates == 5
+        assert len(merger.items()) == 595
+
+    @pytest.mark.asyncio
+    async def test_failed_page_raises(self):
+        fetch_page, _, _ = search_backend(total=1000)
+
+        async def failing(offset, limit):
+            if offset == 400:
+                raise RuntimeError("page failed")
+            return await fetch_page(offset, limit)
+
+        with pytest.raises(RuntimeError):
+            async for _ in fetch_pages(failing, 0, 1000):
+                pass
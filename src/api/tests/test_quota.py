@@ -0,0 +1,83 @@
+"""
+Tests for process-wide daily quota enforcement.
+"""
+import pytest
+from unittest.mock import AsyncMock
+
+from api.errors import RateLimitError
+from api.quota import QuotaManager, resolve_api_family
+
+
+class TestResolveApiFamily:
+    """Test endpoint to API family mapping."""
+
+    def test_known_families(self):
+        assert resolve_api_family("/buy/browse/v1/item_summary/search") == "browse"
+        assert resolve_api_family("/buy/marketplace_insights/v1_beta/item_sales/search") == "marketplace_insights"
+        assert resolve_api_family("/commerce/taxonomy/v1/category_tree/0") == "taxonomy"
+        assert resolve_api_family("/sell/inventory/v1/inventory_item/SKU1") == "sell.inventory"
+        assert resolve_api_family("/sell/account/v1/return_policy") == "sell.account"
+
+    def test_unknown_family_uses_path_segments(self):
+        assert resolve_api_family("/commerce/catalog/v1_beta/product/1") == "commerce.catalog"
+
+
+class TestQuotaManager:
+    """Test quota accounting and enforcement."""
+
+    @pytest.mark.asyncio
+    async def test_acquire_counts_per_family(self):
+        quota = QuotaManager(default_daily_limit=3, daily_limits={"taxonomy": 10})
+
+        assert await quota.acquire("browse") == 2
+        assert await quota.acquire("browse") == 1
+        assert await quota.acquire("taxonomy") == 9
+
+        assert await quota.remaining("browse") == 1
+        assert await quota.remaining("taxonomy") == 9
+        assert await quota.remaining("sell.account") == 3
+
+    @pytest.mark.asyncio
+    async def test_exhausted_quota_fails_fast(self):
+        quota = QuotaManager(default_daily_limit=1)
+        await quota.acquire("browse")
+
+        with pytest.raises(RateLimitError) as exc_info:
+            await quota.acquire("browse")
+
+        assert exc_info.value.details["limit"] == 1
+        assert exc_info.value.retry_after > 0
+        assert await quota.remaining("browse") == 0
+
+    @pytest.mark.asyncio
+    async def test_has_headroom_reserves_share(self):
+        quota = QuotaManager(default_daily_limit=10)
+        for _ in range(8):
+            await quota.acquire("browse")
+
+        assert await quota.has_headroom("browse", reserve_fraction=0.1)
+        await quota.acquire("browse")
+        assert not await quota.has_headroom("browse", reserve_fraction=0.1)
+
+    @pytest.mark.asyncio
+    async def test_redis_errors_fall_back_to_memory(self):
+        quota = QuotaManager(default_daily_limit=5)
+        quota.redis_ledger = AsyncMock()
+        quota.redis_ledger.incr = AsyncMock(side_effect=ConnectionError("down"))
+        quota.redis_ledger.get = AsyncMock(side_effect=ConnectionError("down"))
+
+        assert await quota.acquire("browse") == 4
+        usage = await quota.get_usage("browse")
+        assert usage["calls_today"] == 1
+        assert usage["remaining"] == 4
+
+    @pytest.mark.asyncio
+    async def test_redis_ledger_used_when_available(self):
+        quota = QuotaManager(default_daily_limit=100)
+        quota.redis_ledger = AsyncMock()
+        quota.redis_ledger.incr = AsyncMock(return_value=42)
+
+        assert await quota.acquire("browse") == 58
+        key, ttl = quota.redis_ledger.incr.call_args.args
+        assert key.startswith("browse:")
+        assert ttl > 3600
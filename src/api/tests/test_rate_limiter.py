@@ -0,0 +1,207 @@
+"""
+Tests for the per-API-family token bucket rate limiter.
+"""
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
+
+import pytest
+
+from api.coalescing import RequestCoalescer
+from api.errors import EbayApiError, RateLimitError
+from api.quota import QuotaManager
+from api.rate_limiter import TokenBucket, TokenBucketLimiter, _parse_reset
+from api.rest_client import EbayRestClient, RestConfig
+
+
+class TestTokenBucket:
+    """Test token bucket mechanics."""
+
+    def test_burst_then_fail_fast(self):
+        bucket = TokenBucket(capacity=2, refill_rate=0.001)
+
+        assert bucket.reserve(max_wait=0) == 0
+        assert bucket.reserve(max_wait=0) == 0
+        with pytest.raises(RateLimitError) as exc_info:
+            bucket.reserve(max_wait=0)
+
+        assert exc_info.value.retry_after > 0
+        # A rejected reservation must not consume a token
+        assert bucket.tokens == pytest.approx(0, abs=0.01)
+
+    def test_queue_within_deadline(self):
+        bucket = TokenBucket(capacity=1, refill_rate=10)
+        bucket.reserve(max_wait=0)
+
+        wait = bucket.reserve(max_wait=1)
+        assert 0 < wait <= 0.1
+
+    def test_calibrate_spreads_remaining(self):
+        bucket = TokenBucket(capacity=100, refill_rate=1)
+        bucket.calibrate(remaining=3600, window_seconds=3600)
+
+        assert bucket.refill_rate == pytest.approx(1.0)
+        bucket.calibrate(remaining=5, window_seconds=3600)
+        assert bucket.tokens <= 5
+
+
+class TestTokenBucketLimiter:
+    """Test limiter keyed by API family."""
+
+    @pytest.mark.asyncio
+    async def test_families_are_independent(self):
+        limiter = TokenBucketLimiter(default_daily_limit=100, min_burst=1, burst_fraction=0.01)
+
+        await limiter.acquire("browse")
+        with pytest.raises(RateLimitError):
+            await limiter.acquire("browse")
+        await limiter.acquire("taxonomy")
+
+    def test_update_from_headers(self):
+        limiter = TokenBucketLimiter(default_daily_limit=5000)
+        limiter.update_from_headers("browse", {
+            "X-EBAY-C-LIMIT": "5000",
+            "X-EBAY-C-REMAINING": "100",
+            "X-EBAY-C-LIMIT-RESET": "1000"
+        })
+
+        status = limiter.get_status()["browse"]
+        assert status["refill_per_second"] == pytest.approx(0.1)
+        assert status["capacity"] == 100
+
+    def test_malformed_headers_ignored(self):
+        limiter = TokenBucketLimiter(default_daily_limit=8640)
+        limiter.update_from_headers("browse", {
+            "X-EBAY-C-REMAINING": "not-a-number",
+            "X-EBAY-C-LIMIT-RESET": "1000"
+        })
+
+        assert limiter.get_status() == {}
+
+    def test_update_from_rate_limits_response(self):
+        limiter = TokenBucketLimiter(default_daily_limit=5000)
+        calibrated = limiter.update_from_rate_limits({
+            "rateLimits": [{
+                "apiContext": "buy",
+                "apiName": "Browse",
+                "resources": [{
+                    "name": "buy.browse",
+                    "rates": [
+                        {"limit": 50, "remaining": 50, "reset": "30", "timeWindow": 60},
+                        {"limit": 10000, "remaining": 8640, "reset": "86400", "timeWindow": 86400}
+                    ]
+                }]
+            }]
+        })
+
+        assert calibrated == 1
+        assert limiter.daily_limits["browse"] == 10000
+        assert limiter.get_status()["browse"]["refill_per_second"] == pytest.approx(0.1)
+
+    @pytest.mark.asyncio
+    async def test_penalize_drains_bucket(self):
+        limiter = TokenBucketLimiter(default_daily_limit=5000)
+        await limiter.acquire("browse")
+        limiter.penalize("browse")
+
+        with pytest.raises(RateLimitError):
+            await limiter.acquire("browse")
+
+
+class FakeResponse:
+    """aiohttp response stand-in."""
+
+    def __init__(self, status: int, body: bytes = b"{}", headers=None):
+        self.status = status
+        self.headers = headers or {}
+        self._body = body
+
+    async def read(self) -> bytes:
+        return self._body
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+def make_client(responses, limiter, quota, max_retries=3):
+    """REST client whose shared session returns `responses` in order."""
+    session = MagicMock()
+    session.request = Mock(side_effect=responses)
+    oauth = Mock()
+    oauth.get_token = AsyncMock(return_value="token")
+
+    async def provider():
+        return session
+
+    client = EbayRestClient(
+        oauth,
+        RestConfig(max_retries=max_retries, rate_limit_max_wait=0),
+        session_provider=provider,
+        quota_manager=quota,
+        rate_limiter=limiter,
+        coalescer=RequestCoalescer()
+    )
+    return client, session
+
+
+class TestRestClientRateLimiting:
+    """Test how EbayRestClient spends tokens and handles 429s."""
+
+    def test_parse_reset_iso_timestamp(self):
+        reset_at = datetime.now(timezone.utc) + timedelta(seconds=120)
+        assert _parse_reset(reset_at.strftime("%Y-%m-%dT%H:%M:%S.000Z")) == pytest.approx(120, abs=2)
+        assert _parse_reset("30") == 30.0
+
+    @pytest.mark.asyncio
+    async def test_429_fails_fast_without_retry(self):
+        limiter = TokenBucketLimiter(default_daily_limit=5000)
+        quota = QuotaManager(default_daily_limit=5000)
+        reset_at = (datetime.now(timezone.utc) + timedelta(hours=1)).strftime("%Y-%m-%dT%H:%M:%S.000Z")
+        client, session = make_client(
+            [FakeResponse(429, b'{"message": "Too many requests"}', {"X-EBAY-C-LIMIT-RESET": reset_at})],
+            limiter, quota
+        )
+
+        with patch("api.rest_client.asyncio.sleep", new=AsyncMock()) as sleep:
+            with pytest.raises(EbayApiError) as exc_info:
+                await client.get("/buy/browse/v1/item_summary/search", params={"q": "x"})
+
+        assert exc_info.value.status_code == 429
+        assert session.request.call_count == 1
+        sleep.assert_not_awaited()
+        assert limiter.get_status()["browse"]["tokens"] < 1
+
+    @pytest.mark.asyncio
+    async def test_retries_spend_tokens_and_quota(self):
+        limiter = TokenBucketLimiter(default_daily_limit=5000)
+        quota = QuotaManager(default_daily_limit=5000)
+        client, session = make_client(
+            [FakeResponse(500, b'{"message": "Internal error"}'), FakeResponse(200, b'{"total": 0}')],
+            limiter, quota
+        )
+        capacity = limiter._get_bucket("browse").capacity
+
+        with patch("api.rest_client.asyncio.sleep", new=AsyncMock()):
+            result = await client.get("/buy/browse/v1/item_summary/search", params={"q": "x"})
+
+        assert result["body"] == {"total": 0}
+        assert session.request.call_count == 2
+        assert (await quota.get_usage("browse"))["calls_today"] == 2
+        assert limiter.get_status()["browse"]["tokens"] == pytest.approx(capacity - 2, abs=0.1)
+
+    @pytest.mark.asyncio
+    async def test_retry_without_token_raises_rate_limit_error(self):
+        limiter = TokenBucketLimiter(default_daily_limit=100, min_burst=1, burst_fraction=0.01)
+        quota = QuotaManager(default_daily_limit=5000)
+        client, session = make_client(
+            [FakeResponse(500, b'{"message": "Internal error"}'), FakeResponse(200)],
+            limiter, quota
+        )
+
+        with patch("api.rest_client.asyncio.sleep", new=AsyncMock()):
+            with pytest.raises(RateLimitError):
+                await client.get("/buy/browse/v1/item_summary/search", params={"q": "x"})
+
+        assert session.request.call_count == 1
@@ -0,0 +1,100 @@
+"""
+Tests for the read-through response cache in EbayRestClient.
+"""
+import pytest
+from unittest.mock import Mock
+
+from api.cache import CacheTTL, HybridCacheManager
+from api.coalescing import RequestCoalescer
+from api.response_cache import ResponseCache, resolve_resource_family, resolve_ttl
+from api.rest_client import EbayRestClient, RestConfig
+
+
+@pytest.fixture
+def client():
+    """REST client with a memory-backed response cache and a fake transport."""
+    rest_client = EbayRestClient(
+        Mock(),
+        RestConfig(),
+        coalescer=RequestCoalescer(),
+        response_cache=ResponseCache(HybridCacheManager())
+    )
+    rest_client.sent = []
+
+    async def fake_send(method, endpoint, params, json, headers):
+        rest_client.sent.append((method, endpoint, params))
+        return {"body": {"call": len(rest_client.sent)}, "headers": {}}
+
+    rest_client._send_request = fake_send
+    return rest_client
+
+
+class TestTtlPolicy:
+    """Test endpoint to TTL and resource family mapping."""
+
+    def test_ttl_by_endpoint(self):
+        assert resolve_ttl("/buy/browse/v1/item_summary/search") == CacheTTL.SEARCH_RESULTS
+        assert resolve_ttl("/buy/browse/v1/item/v1|123|0") == CacheTTL.SEARCH_RESULTS
+        assert resolve_ttl("/sell/account/v1/return_policy/42") == CacheTTL.BUSINESS_POLICIES
+        assert resolve_ttl("/sell/account/v1/privilege") == CacheTTL.SELLER_STANDARDS
+
+    def test_uncached_endpoints(self):
+        assert resolve_ttl("/sell/inventory/v1/inventory_item/SKU1") is None
+        # The full tree is cached by api.category_cache
+        assert resolve_ttl("/commerce/taxonomy/v1/category_tree/0") is None
+
+    def test_resource_family(self):
+        assert resolve_resource_family("/sell/account/v1/return_policy/42") == "/sell/account/v1/return_policy"
+        assert resolve_resource_family("/sell/account/v1/return_policy") == "/sell/account/v1/return_policy"
+
+
+class TestReadThrough:
+    """Test caching through EbayRestClient.request."""
+
+    @pytest.mark.asyncio
+    async def test_repeated_get_served_from_cache(self, client):
+        first = await client.get("/buy/browse/v1/item_summary/search", params={"q": "ipod", "limit": 10})
+        second = await client.get("/buy/browse/v1/item_summary/search", params={"limit": "10", "q": "ipod"})
+
+        assert len(client.sent) == 1
+        assert second == first
+        assert client.response_cache.get_stats()["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_marketplace_is_part_of_key(self, client):
+        await client.get("/buy/browse/v1/item/1", headers={"X-EBAY-C-MARKETPLACE-ID": "EBAY_US"})
+        await client.get("/buy/browse/v1/item/1", headers={"X-EBAY-C-MARKETPLACE-ID": "EBAY_GB"})
+        assert len(client.sent) == 2
+
+    @pytest.mark.asyncio
+    async def test_uncached_endpoint_always_sent(self, client):
+        await client.get("/sell/inventory/v1/inventory_item/SKU1")
+        await client.get("/sell/inventory/v1/inventory_item/SKU1")
+        assert len(client.sent) == 2
+
+    @pytest.mark.asyncio
+    async def test_bypass(self, client):
+        await client.get("/sell/account/v1/privilege")
+        fresh = await client.get("/sell/account/v1/privilege", use_cache=False)
+        assert len(client.sent) == 2
+        # The fresh response replaces the cached one
+        assert await client.get("/sell/account/v1/privilege") == fresh
+        assert len(client.sent) == 2
+
+    @pytest.mark.asyncio
+    async def test_write_invalidates_family(self, client):
+        await client.get("/sell/account/v1/return_policy", params={"marketplace_id": "EBAY_US"})
+        await client.get("/sell/account/v1/payment_policy", params={"marketplace_id": "EBAY_US"})
+        await client.delete("/sell/account/v1/return_policy/42")
+
+        await client.get("/sell/account/v1/return_policy", params={"marketplace_id": "EBAY_US"})
+        await client.get("/sell/account/v1/payment_policy", params={"marketplace_id": "EBAY_US"})
+
+        endpoints = [endpoint for _, endpoint, _ in client.sent]
+        assert endpoints.count("/sell/account/v1/return_policy") == 2
+        assert endpoints.count("/sell/account/v1/payment_policy") == 1
+
+    @pytest.mark.asyncio
+    async def test_disabled_without_cache(self):
+        rest_client = EbayRestClient(Mock(), RestConfig(), coalescer=RequestCoalescer())
+        assert rest_client.response_cache is None
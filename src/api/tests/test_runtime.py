@@ -0,0 +1,72 @@
+"""
+Tests for the process-wide eBay runtime.
+
+Verifies that the pooled HTTP session and OAuth managers are shared between
+clients and that shutdown releases the session.
+"""
+import pytest
+
+from api.oauth import OAuthConfig
+from api.rest_client import EbayRestClient, RestConfig
+from api.runtime import EbayRuntime, ConnectionPoolConfig
+
+
+@pytest.fixture
+def oauth_config():
+    """Create OAuth configuration for testing."""
+    return OAuthConfig(
+        client_id="test_client_id",
+        client_secret="test_client_secret",
+        sandbox=True
+    )
+
+
+class TestEbayRuntime:
+    """Test shared runtime behavior."""
+
+    def test_oauth_manager_shared_per_credentials(self, oauth_config):
+        """Same credentials reuse one manager, different credentials do not."""
+        runtime = EbayRuntime()
+
+        first = runtime.get_oauth_manager(oauth_config)
+        second = runtime.get_oauth_manager(oauth_config.model_copy())
+        other = runtime.get_oauth_manager(
+            oauth_config.model_copy(update={"client_id": "other_client_id"})
+        )
+
+        assert first is second
+        assert other is not first
+        assert runtime.get_stats()["oauth_managers"] == 2
+
+    @pytest.mark.asyncio
+    async def test_session_reused_and_tuned(self):
+        """Session is created once with the configured connector limits."""
+        runtime = EbayRuntime(ConnectionPoolConfig(limit=50, limit_per_host=5))
+        try:
+            session = await runtime.get_session()
+            assert await runtime.get_session() is session
+            assert session.connector.limit == 50
+            assert session.connector.limit_per_host == 5
+        finally:
+            await runtime.close()
+
+        assert session.closed
+        assert runtime.get_stats()["session_open"] is False
+
+    @pytest.mark.asyncio
+    async def test_client_close_keeps_shared_session(self, oauth_config):
+        """Closing a client borrowing the shared session leaves it open."""
+        runtime = EbayRuntime()
+        try:
+            client = EbayRestClient(
+                runtime.get_oauth_manager(oauth_config),
+                RestConfig(),
+                session_provider=runtime.get_session
+            )
+            async with client._get_session() as session:
+                assert session is await runtime.get_session()
+
+            await client.close()
+            assert not session.closed
+        finally:
+            await runtime.close()
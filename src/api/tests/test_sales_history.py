@@ -0,0 +1,118 @@
+"""
+Tests for the local sales history store.
+"""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from api.sales_history import SalesHistoryStore, series_key
+
+NOW = datetime(2026, 9, 10, 12, 0, tzinfo=timezone.utc)
+
+
+def sale(item_id, sold_date, price, quantity=1):
+    """A sale as converted by _convert_item_sale."""
+    return {
+        "item_id": item_id,
+        "sold_date": sold_date,
+        "price": {"value": price, "currency": "USD"},
+        "quantity_sold": quantity,
+        "condition_id": "3000"
+    }
+
+
+@pytest.fixture
+def store(tmp_path):
+    return SalesHistoryStore(str(tmp_path / "sales"))
+
+
+KEY = series_key("iphone 13", "9355", None)
+
+
+class TestSalesHistoryStore:
+
+    def test_new_series_starts_at_insights_window(self, store):
+        assert store.get_series(KEY) is None
+        assert store.refresh_start(KEY, NOW) == "2026-06-12T12:00:00.000Z"
+
+    def test_top_up_starts_at_newest_sale(self, store):
+        store.record_refresh(KEY, "iphone 13", "9355", None, [
+            sale("v1|1|0", "2026-09-08T09:30:00.000Z", 300.0),
+            sale("v1|2|0", "2026-09-09T15:00:00.000Z", 320.0)
+        ], now=NOW)
+
+        # Refreshed recently: served as stored
+        assert store.refresh_start(KEY, NOW + timedelta(minutes=30)) is None
+        # Due again: fetch from a day before the newest stored sale
+        assert store.refresh_start(KEY, NOW + timedelta(hours=2)) == "2026-09-08T15:00:00.000Z"
+
+    def test_overlapping_refreshes_are_deduplicated(self, store):
+        first = [sale("v1|1|0", "2026-09-08T09:30:00.000Z", 300.0), sale("v1|2|0", "2026-09-09T15:00:00.000Z", 320.0)]
+        assert store.record_refresh(KEY, "iphone 13", "9355", None, first, now=NOW) == 2
+        second = first[1:] + [sale("v1|3|0", "2026-09-10T08:00:00.000Z", 310.0)]
+        assert store.record_refresh(KEY, "iphone 13", "9355", None, second, now=NOW) == 1
+
+        assert store.get_series(KEY)["newest_sold_date"] == "2026-09-10T08:00:00.000Z"
+        assert sum(period["sales"] for period in store.aggregate(KEY)) == 3
+
+    def test_incomplete_refresh_resumes_where_it_stopped(self, store):
+        store.record_refresh(KEY, "iphone 13", "9355", None, [sale("v1|1|0", "2026-09-01T09:30:00.000Z", 300.0)], now=NOW)
+        later = NOW + timedelta(hours=2)
+
+        # Read through 09-05 only: sales stored past it do not move the series on
+        store.record_refresh(KEY, "iphone 13", "9355", None, [
+            sale("v1|2|0", "2026-09-04T10:00:00.000Z", 310.0),
+            sale("v1|3|0", "2026-09-09T10:00:00.000Z", 320.0)
+        ], now=later, complete=False, complete_through="2026-09-05T00:00:00.000Z")
+        state = store.get_series(KEY)
+        assert state["newest_sold_date"] == "2026-09-05T00:00:00.000Z"
+        assert state["refreshed_at"] == NOW.isoformat()
+        assert store.refresh_start(KEY, later) == "2026-09-04T00:00:00.000Z"
+
+        # Nothing read in full: the series keeps its previous state
+        store.record_refresh(KEY, "iphone 13", "9355", None, [], now=later, complete=False)
+        assert store.get_series(KEY)["newest_sold_date"] == "2026-09-05T00:00:00.000Z"
+        assert sum(period["sales"] for period in store.aggregate(KEY)) == 3
+
+    def test_daily_and_weekly_aggregates(self, store):
+        store.record_refresh(KEY, "iphone 13", "9355", None, [
+            sale("v1|1|0", "2026-09-07T09:00:00.000Z", 100.0),  # Monday
+            sale("v1|2|0", "2026-09-07T18:00:00.000Z", 300.0, quantity=2),
+            sale("v1|3|0", "2026-09-13T10:00:00.000Z", 200.0),  # Sunday
+            sale("v1|4|0", "2026-09-14T10:00:00.000Z", 400.0)   # next Monday
+        ], active_total=16, now=NOW)
+
+        daily = store.aggregate(KEY, "day")
+        assert [period["period"] for period in daily] == ["2026-09-07", "2026-09-13", "2026-09-14"]
+        assert daily[0] == {
+            "period": "2026-09-07",
+            "sales": 2,
+            "units_sold": 3,
+            "average_price": 200.0,
+            "median_price": 200.0,
+            "min_price": 100.0,
+            "max_price": 300.0,
+            "sell_through": None
+        }
+
+        weekly = store.aggregate(KEY, "week")
+        assert [(period["period"], period["units_sold"]) for period in weekly] == [("2026-09-07", 4), ("2026-09-14", 1)]
+        # Active listings were recorded on 2026-09-10, in the first week
+        assert weekly[0]["sell_through"] == 0.2
+        assert weekly[0]["median_price"] == 200.0
+
+        assert [period["period"] for period in store.aggregate(KEY, "day", since="2026-09-13")] == ["2026-09-13", "2026-09-14"]
+
+    def test_series_are_separate(self, store):
+        store.record_refresh(KEY, "iphone 13", "9355", None, [sale("v1|1|0", "2026-09-08T09:30:00.000Z", 300.0)], now=NOW)
+        other = series_key("iphone 13", "9355", "conditionIds:{1000}")
+        assert store.aggregate(other) == []
+        assert store.refresh_start(other, NOW) == "2026-06-12T12:00:00.000Z"
+
+    def test_invalid_interval(self, store):
+        with pytest.raises(ValueError):
+            store.aggregate(KEY, "month")
+
+    def test_shared_between_instances(self, store):
+        store.record_refresh(KEY, "iphone 13", "9355", None, [sale("v1|1|0", "2026-09-08T09:30:00.000Z", 300.0)], now=NOW)
+        assert SalesHistoryStore(str(store.directory)).aggregate(KEY)[0]["sales"] == 1
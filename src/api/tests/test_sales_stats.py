@@ -0,0 +1,88 @@
+"""
+Tests for streaming sold price statistics.
+"""
+import random
+
+import pytest
+
+from api.sales_stats import QuantileSketch, SalesStatistics
+
+
+class TestQuantileSketch:
+    """Test quantile and rank estimates against exact values."""
+
+    def test_small_stream_is_exact(self):
+        sketch = QuantileSketch()
+        for value in [5, 1, 4, 2, 3]:
+            sketch.add(value)
+        assert sketch.quantile(0.5) == 3
+        assert sketch.quantile(0) == 1
+        assert sketch.quantile(1) == 5
+
+    def test_empty(self):
+        sketch = QuantileSketch()
+        assert sketch.quantile(0.5) is None
+        assert sketch.cdf(10) == 0.0
+
+    @pytest.mark.parametrize("q", [0.01, 0.1, 0.25, 0.5, 0.75, 0.9, 0.99])
+    def test_large_stream_within_tolerance(self, q):
+        rng = random.Random(7)
+        values = [rng.lognormvariate(4, 0.8) for _ in range(50000)]
+        sketch = QuantileSketch()
+        for value in values:
+            sketch.add(value)
+        values.sort()
+
+        estimate = sketch.quantile(q)
+        # Compare by rank: the estimate must sit within 1% of the true quantile
+        rank = sum(1 for value in values if value < estimate) / len(values)
+        assert abs(rank - q) < 0.01
+        assert abs(sketch.cdf(estimate) - q) < 0.01
+
+    def test_memory_bounded(self):
+        sketch = QuantileSketch(compression=100)
+        for index in range(100000):
+            sketch.add(float(index))
+        sketch.quantile(0.5)
+        assert len(sketch._means) < 1000
+        assert len(sketch._buffer) == 0
+
+
+class TestSalesStatistics:
+    """Test grouped aggregates."""
+
+    def test_groups_and_currency(self):
+        statistics = SalesStatistics()
+        statistics.add(10.0, "USD", "New", "2026-09-01T10:00:00.000Z")
+        statistics.add(30.0, "USD", "Used", "2026-09-01T18:00:00.000Z")
+        statistics.add(20.0, "USD", "New", "2026-09-02T10:00:00.000Z")
+        assert statistics.add(99.0, "EUR", "New", "2026-09-02T10:00:00.000Z") is False
+
+        summary = statistics.summary()
+        assert summary["total_items"] == 3
+        assert summary["average_price"] == 20.0
+        assert summary["skipped_other_currency"] == 1
+        assert summary["by_condition"]["New"] == {
+            "count": 2, "average_price": 15.0, "min_price": 10.0, "max_price": 20.0, "median_price": 15.0
+        }
+        assert [(day["date"], day["count"]) for day in summary["by_day"]] == [("2026-09-01", 2), ("2026-09-02", 1)]
+        assert summary["histogram"] == [
+            {"min": 10.0, "max": 17.78, "count": 1},
+            {"min": 17.78, "max": 31.62, "count": 2}
+        ]
+
+    @pytest.mark.parametrize("prices, low, high", [
+        ([10.0] * 100, 0, 0),
+        ([10.0], 0, 0),
+        ([10.0] * 99 + [1000.0], 0, 1),
+        ([1.0] + [10.0] * 99, 1, 0)
+    ])
+    def test_tied_prices_are_not_outliers(self, prices, low, high):
+        statistics = SalesStatistics()
+        for price in prices:
+            statistics.add(price, "USD")
+        outliers = statistics.summary()["outliers"]
+        assert (outliers["low_count"], outliers["high_count"]) == (low, high)
+
+    def test_empty_summary(self):
+        assert SalesStatistics().summary() == {"total_items": 0, "skipped_other_currency": 0}
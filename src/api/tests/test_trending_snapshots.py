@@ -0,0 +1,99 @@
+"""
+Tests for precomputed trending snapshots and their background refresher.
+"""
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from api.cache import HybridCacheManager
+from api.trending_snapshots import (
+    TrendingSnapshotRefresher,
+    read_trending_snapshot,
+    write_trending_snapshot,
+)
+
+
+@pytest.fixture
+def cache_manager():
+    """Memory-only cache manager."""
+    manager = HybridCacheManager()
+    with patch("api.trending_snapshots.get_cache_manager", return_value=manager):
+        yield manager
+
+
+class TestTrendingSnapshots:
+    """Test storing and reading snapshots."""
+
+    @pytest.mark.asyncio
+    async def test_round_trip_with_age(self, cache_manager):
+        assert await read_trending_snapshot("9355") is None
+
+        written = await write_trending_snapshot("9355", [{"item_id": "v1|1|0"}])
+        snapshot = await read_trending_snapshot("9355")
+
+        assert snapshot["items"] == [{"item_id": "v1|1|0"}]
+        assert snapshot["generated_at"] == written["generated_at"]
+        assert 0 <= snapshot["age_seconds"] <= 1
+        assert await read_trending_snapshot("11450") is None
+
+    @pytest.mark.asyncio
+    async def test_snapshot_without_items_is_ignored(self, cache_manager):
+        await write_trending_snapshot("9355", [])
+        assert await read_trending_snapshot("9355") is None
+
+    @pytest.mark.asyncio
+    async def test_no_cache_manager(self):
+        with patch("api.trending_snapshots.get_cache_manager", return_value=None):
+            await write_trending_snapshot("9355", [])
+            assert await read_trending_snapshot("9355") is None
+
+
+class TestTrendingSnapshotRefresher:
+    """Test refreshing categories concurrently and in the background."""
+
+    @pytest.mark.asyncio
+    async def test_refresh_all_counts_failures(self):
+        async def refresh(category_id):
+            if category_id == "bad":
+                raise RuntimeError("search failed")
+
+        refresher = TrendingSnapshotRefresher(["9355", "bad", "11450", "9355"])
+        assert await refresher.refresh_all(refresh) == 2
+
+        stats = refresher.get_stats()
+        assert stats["categories"] == 3
+        assert stats["refreshes"] == 2
+        assert stats["failures"] == 1
+
+    @pytest.mark.asyncio
+    async def test_refresh_all_runs_concurrently(self):
+        in_flight = 0
+        peak = 0
+
+        async def refresh(category_id):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+
+        await TrendingSnapshotRefresher(["1", "2", "3"]).refresh_all(refresh)
+        assert peak == 3
+
+    @pytest.mark.asyncio
+    async def test_start_refreshes_immediately_and_stops(self):
+        refresh = AsyncMock()
+        refresher = TrendingSnapshotRefresher(["9355"], interval=3600)
+
+        task = refresher.start(refresh)
+        assert refresher.start(refresh) is task
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+
+        refresh.assert_awaited_once_with("9355")
+        assert refresher.get_stats()["running"] is True
+
+        await refresher.stop()
+        assert task.cancelled()
+        assert refresher.get_stats()["running"] is False
@@ -0,0 +1,147 @@
+"""
+Precomputed trending item snapshots.
+
+Trending results change slowly, so TrendingSnapshotRefresher recomputes
+them for a configured set of categories in the background on a fixed
+interval and stores each one in the cache manager under
+CacheTTL.MARKET_TRENDS. Tools then answer from the stored snapshot and
+report when it was generated.
+"""
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from .cache import CacheTTL, get_cache_manager
+
+logger = logging.getLogger(__name__)
+
+# Refresh twice per TTL so a running refresher never lets a snapshot expire
+DEFAULT_REFRESH_INTERVAL = CacheTTL.MARKET_TRENDS // 2
+
+# Items kept per snapshot; requests for fewer are sliced from it
+SNAPSHOT_SIZE = 100
+
+
+def _snapshot_key(category_id: str) -> str:
+    """Cache key for a category's trending snapshot."""
+    return f"TRENDING_SNAPSHOT_{category_id}"
+
+
+async def read_trending_snapshot(category_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Get the stored snapshot for a category.
+
+    Returns:
+        Snapshot with items, generated_at and age_seconds, or None when
+        there is none or it holds no items
+    """
+    cache_manager = get_cache_manager()
+    snapshot = await cache_manager.get(_snapshot_key(category_id)) if cache_manager else None
+    if snapshot is None or not snapshot.get("items"):
+        return None
+    generated_at = datetime.fromisoformat(snapshot["generated_at"])
+    age = (datetime.now(timezone.utc) - generated_at).total_seconds()
+    return {**snapshot, "age_seconds": round(age)}
+
+
+async def write_trending_snapshot(category_id: str, items: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Store a category's trending items with the current time."""
+    snapshot = {
+        "category_id": category_id,
+        "items": items,
+        "generated_at": datetime.now(timezone.utc).isoformat()
+    }
+    cache_manager = get_cache_manager()
+    if cache_manager:
+        await cache_manager.set(_snapshot_key(category_id), snapshot, CacheTTL.MARKET_TRENDS)
+    return snapshot
+
+
+class TrendingSnapshotRefresher:
+    """Recomputes trending snapshots for a set of categories on an interval."""
+
+    def __init__(self, category_ids: List[str], interval: int = DEFAULT_REFRESH_INTERVAL):
+        self.category_ids = list(dict.fromkeys(category_ids))
+        self.interval = interval
+        self.refreshes = 0
+        self.failures = 0
+        self._task: Optional[asyncio.Task] = None
+
+    async def refresh_all(self, refresh: Callable[[str], Awaitable[Any]]) -> int:
+        """
+        Refresh every category concurrently.
+
+        Args:
+            refresh: Coroutine computing and storing one category's snapshot
+
+        Returns:
+            Number of categories refreshed successfully
+        """
+        results = await asyncio.gather(
+            *(refresh(category_id) for category_id in self.category_ids),
+            return_exceptions=True
+        )
+        succeeded = 0
+        for category_id, result in zip(self.category_ids, results):
+            if isinstance(result, Exception):
+                self.failures += 1
+                logger.warning(f"Trending snapshot refresh failed for category {category_id}: {result}")
+            else:
+                succeeded += 1
+        self.refreshes += succeeded
+        logger.info(f"Refreshed {succeeded}/{len(self.category_ids)} trending snapshots")
+        return succeeded
+
+    def start(self, refresh: Callable[[str], Awaitable[Any]]) -> asyncio.Task:
+        """Start refreshing in the background, first run immediately."""
+        if self._task is not None and not self._task.done():
+            return self._task
+
+        async def run() -> None:
+            while True:
+                await self.refresh_all(refresh)
+                await asyncio.sleep(self.interval)
+
+        self._task = asyncio.create_task(run())
+        return self._task
+
+    async def stop(self) -> None:
+        """Stop the background refresh."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get refresher statistics."""
+        return {
+            "categories": len(self.category_ids),
+            "interval_seconds": self.interval,
+            "running": self._task is not None and not self._task.done(),
+            "refreshes": self.refreshes,
+            "failures": self.failures
+        }
+
+
+# Global refresher; None unless enabled with init_trending_refresher
+trending_refresher: Optional[TrendingSnapshotRefresher] = None
+
+
+def get_trending_refresher() -> Optional[TrendingSnapshotRefresher]:
+    """Get the global trending snapshot refresher."""
+    return trending_refresher
+
+
+def init_trending_refresher(
+    category_ids: List[str],
+    interval: int = DEFAULT_REFRESH_INTERVAL
+) -> TrendingSnapshotRefresher:
+    """Initialize the global trending snapshot refresher."""
+    global trending_refresher
+    trending_refresher = TrendingSnapshotRefresher(category_ids, interval)
+    return trending_refresher
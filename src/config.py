@@ -1,9 +1,19 @@
 """Configuration for eBay MCP server."""
 import os
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from pydantic import BaseModel, Field
 
 
+def _parse_limits(value: str) -> Dict[str, int]:
+    """Parse "family=limit,family=limit" into a dict."""
+    limits = {}
+    for entry in value.split(","):
+        if "=" in entry:
+            family, limit = entry.split("=", 1)
+            limits[family.strip()] = int(limit)
+    return limits
+
+
 class EbayConfig(BaseModel):
     """Configuration for eBay API integration."""
     
@@ -30,13 +40,36 @@ class EbayConfig(BaseModel):
     timeout: int = Field(30, description="API request timeout in seconds")
     max_retries: int = Field(3, description="Maximum retry attempts")
     
+    # HTTP connection pool settings
+    http_pool_limit: int = Field(100, description="Maximum pooled HTTP connections")
+    http_pool_limit_per_host: int = Field(20, description="Maximum pooled HTTP connections per host")
+    http_keepalive_timeout: float = Field(60.0, description="Idle keep-alive timeout in seconds")
+    
+    # Serialization settings
+    serialize_workers: int = Field(2, description="Threads for parsing/serializing large payloads off the event loop")
+    serialize_offload_bytes: int = Field(262144, description="JSON payloads at least this large are parsed off the event loop")
+    
     # Cache settings
     cache_ttl: int = Field(300, description="Cache TTL in seconds (5 minutes)")
     redis_url: Optional[str] = Field(None, description="Redis URL for distributed caching")
     cache_memory_max_size: int = Field(1000, description="Maximum in-memory cache entries")
+    http_cache_enabled: bool = Field(False, description="Cache GET responses in the REST client with per-endpoint TTLs")
+    category_snapshot_dir: Optional[str] = Field(None, description="Directory for memory-mapped category tree snapshots shared by worker processes")
+    sales_history_dir: Optional[str] = Field(None, description="Directory for the local sales history database")
     
     # Rate limiting settings
     rate_limit_per_day: int = Field(5000, description="API calls per day limit")
+    api_daily_limits: Dict[str, int] = Field(
+        default_factory=dict,
+        description="Per API family daily limits overriding rate_limit_per_day (e.g. sell.inventory)"
+    )
+    
+    # Trending snapshot settings
+    trending_snapshot_categories: List[str] = Field(
+        default_factory=list,
+        description="Category IDs whose trending items are precomputed in the background"
+    )
+    trending_refresh_interval: int = Field(10800, description="Seconds between trending snapshot refreshes")
     
     # Pagination settings
     page_size: int = Field(50, description="Default page size for listings")
@@ -58,10 +91,25 @@ class EbayConfig(BaseModel):
             api_version=os.environ.get("EBAY_API_VERSION", "1.13.0"),
             timeout=int(os.environ.get("EBAY_TIMEOUT", "30")),
             max_retries=int(os.environ.get("EBAY_MAX_RETRIES", "3")),
+            http_pool_limit=int(os.environ.get("EBAY_HTTP_POOL_LIMIT", "100")),
+            http_pool_limit_per_host=int(os.environ.get("EBAY_HTTP_POOL_LIMIT_PER_HOST", "20")),
+            http_keepalive_timeout=float(os.environ.get("EBAY_HTTP_KEEPALIVE_TIMEOUT", "60")),
+            serialize_workers=int(os.environ.get("LOOTLY_SERIALIZE_WORKERS", "2")),
+            serialize_offload_bytes=int(os.environ.get("LOOTLY_SERIALIZE_OFFLOAD_BYTES", "262144")),
             cache_ttl=int(os.environ.get("EBAY_CACHE_TTL", "300")),
             redis_url=os.environ.get("REDIS_URL"),
             cache_memory_max_size=int(os.environ.get("CACHE_MEMORY_MAX_SIZE", "1000")),
+            http_cache_enabled=os.environ.get("EBAY_HTTP_CACHE", "false").lower() == "true",
+            category_snapshot_dir=os.environ.get("LOOTLY_CATEGORY_SNAPSHOT_DIR") or None,
+            sales_history_dir=os.environ.get("LOOTLY_SALES_HISTORY_DIR") or None,
             rate_limit_per_day=int(os.environ.get("EBAY_RATE_LIMIT_PER_DAY", "5000")),
+            api_daily_limits=_parse_limits(os.environ.get("EBAY_API_DAILY_LIMITS", "")),
+            trending_snapshot_categories=[
+                category_id.strip()
+                for category_id in os.environ.get("LOOTLY_TRENDING_CATEGORIES", "").split(",")
+                if category_id.strip()
+            ],
+            trending_refresh_interval=int(os.environ.get("LOOTLY_TRENDING_REFRESH_SECONDS", "10800")),
             page_size=int(os.environ.get("EBAY_PAGE_SIZE", "50")),
             max_pages=int(os.environ.get("EBAY_MAX_PAGES", "10")),
         )
@@ -6,12 +6,15 @@ for all MCP servers built with this template.
 """
 
 import json
+from functools import partial
 from datetime import datetime
 from enum import Enum
 from typing import Any, Dict, List, Optional
 
 from pydantic import BaseModel, Field, field_validator, field_serializer
 
+from api.offload import get_offload_executor
+
 
 class ResponseStatus(str, Enum):
     """Standard response status values."""
@@ -60,6 +63,14 @@ class MCPToolResponse(BaseModel):
         """Convert response to JSON string."""
         return self.model_dump_json(exclude_none=True, **kwargs)
 
+    async def to_json_string_async(self, **kwargs) -> str:
+        """Convert response to JSON string, off the event loop when data is large."""
+        executor = get_offload_executor()
+        return await executor.run(
+            executor.is_large(self.data),
+            partial(self.model_dump_json, exclude_none=True, **kwargs)
+        )
+
 
 class MCPErrorResponse(BaseModel):
     """
@@ -321,6 +332,24 @@ def partial_response(
     )
 
 
+def success_response_raw(
+    data_json: bytes,
+    message: str = "Operation completed successfully",
+    metadata: Optional[Dict[str, Any]] = None,
+) -> str:
+    """
+    Create a success response JSON string around pre-serialized data.
+
+    Produces the same output as success_response(data).to_json_string()
+    without re-encoding data, for large payloads cached in serialized form.
+    """
+    envelope = success_response(message=message, metadata=metadata).to_json_string()
+    head = '{"status":"success"'
+    if not envelope.startswith(head):
+        raise ValueError("Unexpected MCPToolResponse field order")
+    return f'{head},"data":{data_json.decode()}{envelope[len(head):]}'
+
+
 # Type conversion utilities
 
 
@@ -1,10 +1,23 @@
 """Lootly MCP Server implementation."""
+import asyncio
+import logging
+from contextlib import asynccontextmanager
 from dotenv import load_dotenv
 from fastmcp import FastMCP
 from config import EbayConfig
 from logging_config import setup_mcp_logging
 from __version__ import __version__
 from api.cache import init_cache_manager
+from api.runtime import init_runtime, ConnectionPoolConfig
+from api.quota import init_quota_manager
+from api.rate_limiter import init_rate_limiter, refresh_rate_limits
+from api.oauth import OAuthConfig
+from api.rest_client import EbayRestClient, RestConfig
+from api.response_cache import init_response_cache
+from api.offload import init_offload_executor
+from api.category_snapshot import init_category_snapshots
+from api.trending_snapshots import init_trending_refresher
+from api.sales_history import init_sales_history_store
 
 # Load environment variables
 load_dotenv()
@@ -33,19 +46,111 @@ else:
 # Setup logging
 logger = setup_mcp_logging(config)
 
+# Initialize the bounded pool that parses/serializes large payloads off the event loop
+offload_executor = init_offload_executor(
+    max_workers=config.serialize_workers,
+    threshold_bytes=config.serialize_offload_bytes
+)
+
 # Initialize cache manager
 cache_manager = init_cache_manager(config.redis_url)
 
+# Opt-in read-through cache for GET responses in the REST client
+response_cache = init_response_cache(cache_manager) if config.http_cache_enabled else None
+
+# Opt-in category tree snapshots, memory-mapped and shared by every process on the host
+category_snapshots = init_category_snapshots(config.category_snapshot_dir) if config.category_snapshot_dir else None
+
+# Opt-in local sales history, kept past the 90-day Marketplace Insights window
+sales_history_store = init_sales_history_store(config.sales_history_dir) if config.sales_history_dir else None
+
+# Initialize process-wide daily quota ledger (shared via Redis when configured)
+quota_manager = init_quota_manager(
+    default_daily_limit=config.rate_limit_per_day,
+    daily_limits=config.api_daily_limits,
+    redis_url=config.redis_url
+)
+
+# Initialize per API family token buckets that smooth bursts across the day
+rate_limiter = init_rate_limiter(
+    default_daily_limit=config.rate_limit_per_day,
+    daily_limits=config.api_daily_limits
+)
+
+# Initialize shared eBay runtime (pooled HTTP session, OAuth managers)
+runtime = init_runtime(ConnectionPoolConfig(
+    limit=config.http_pool_limit,
+    limit_per_host=config.http_pool_limit_per_host,
+    keepalive_timeout=config.http_keepalive_timeout
+))
+
+# Opt-in background refresh of trending snapshots for the configured categories
+trending_refresher = init_trending_refresher(
+    config.trending_snapshot_categories,
+    config.trending_refresh_interval
+) if config.trending_snapshot_categories else None
+
+
+async def calibrate_rate_limits() -> None:
+    """Calibrate the rate limiter from eBay's getRateLimits; configured limits stay on failure."""
+    oauth_manager = runtime.get_oauth_manager(OAuthConfig(
+        client_id=config.app_id,
+        client_secret=config.cert_id,
+        sandbox=config.sandbox_mode
+    ))
+    rest_client = EbayRestClient(
+        oauth_manager,
+        RestConfig(sandbox=config.sandbox_mode, rate_limit_per_day=config.rate_limit_per_day),
+        session_provider=runtime.get_session
+    )
+    try:
+        await refresh_rate_limits(rest_client, rate_limiter)
+    except Exception as e:
+        logging.getLogger(__name__).warning(f"Rate limit calibration failed, using configured limits: {e}")
+    finally:
+        await rest_client.close()
+
+
+@asynccontextmanager
+async def lootly_lifespan(server):
+    """Start background refreshers and release shared connections on shutdown."""
+    calibration = None
+    if config.app_id and config.cert_id:
+        calibration = asyncio.create_task(calibrate_rate_limits())
+    if trending_refresher:
+        from tools.trending_api import refresh_trending_snapshot
+        trending_refresher.start(refresh_trending_snapshot)
+    try:
+        yield
+    finally:
+        if calibration and not calibration.done():
+            calibration.cancel()
+        if trending_refresher:
+            await trending_refresher.stop()
+        await runtime.close()
+        await quota_manager.close()
+        await cache_manager.close()
+        offload_executor.close()
+
+
 # Create global MCP instance
 mcp = FastMCP(
     "Lootly - eBay Integration Server", 
-    version=__version__
+    version=__version__,
+    lifespan=lootly_lifespan
 )
 
-# Store config, logger, and cache manager for tool access
+# Store shared services for tool access
 mcp.config = config
 mcp.logger = logger
 mcp.cache_manager = cache_manager
+mcp.response_cache = response_cache
+mcp.category_snapshots = category_snapshots
+mcp.trending_refresher = trending_refresher
+mcp.sales_history_store = sales_history_store
+mcp.quota_manager = quota_manager
+mcp.rate_limiter = rate_limiter
+mcp.runtime = runtime
 
 
 def create_lootly_server():
@@ -63,6 +168,7 @@ def create_lootly_server():
     import tools.marketing_api  # New Marketing API for merchandising
     import tools.marketplace_insights_api  # Marketplace Insights API for sales data
     import tools.trending_api  # Trending items using Browse API
+    import tools.comps_api  # Price comps over recent sales and active listings
     import tools.return_policy_api  # Return Policy API for managing return policies
     import tools.payment_policy_api  # Payment Policy API for managing payment policies
     import tools.fulfillment_policy_api  # Fulfillment Policy API for managing shipping policies
@@ -132,13 +132,13 @@ async def get_seller_standards(
         client_secret=mcp.config.cert_id,
         sandbox=mcp.config.sandbox_mode
     )
-    oauth_manager = OAuthManager(oauth_config)
+    oauth_manager = mcp.runtime.get_oauth_manager(oauth_config)
     
     rest_config = RestConfig(
         sandbox=mcp.config.sandbox_mode,
         rate_limit_per_day=mcp.config.rate_limit_per_day
     )
-    rest_client = EbayRestClient(oauth_manager, rest_config)
+    rest_client = EbayRestClient(oauth_manager, rest_config, session_provider=mcp.runtime.get_session)
     
     try:
         await ctx.report_progress(0.3, "🌐 Fetching seller standards from Analytics API...")
@@ -18,7 +18,7 @@ from typing import Optional
 from fastmcp import Context
 from pydantic import BaseModel, Field, ConfigDict
 
-from api.oauth import OAuthManager, OAuthConfig, ConsentRequiredException
+from api.oauth import OAuthConfig, ConsentRequiredException
 from api.rest_client import EbayRestClient, RestConfig
 from api.errors import EbayApiError, extract_ebay_error_details
 from api.ebay_enums import CurrencyCodeEnum
@@ -93,13 +93,13 @@ async def get_privileges(ctx: Context) -> str:
         client_secret=mcp.config.cert_id,
         sandbox=mcp.config.sandbox_mode
     )
-    oauth_manager = OAuthManager(oauth_config)
+    oauth_manager = mcp.runtime.get_oauth_manager(oauth_config)
     
     rest_config = RestConfig(
         sandbox=mcp.config.sandbox_mode,
         rate_limit_per_day=mcp.config.rate_limit_per_day
     )
-    rest_client = EbayRestClient(oauth_manager, rest_config)
+    rest_client = EbayRestClient(oauth_manager, rest_config, session_provider=mcp.runtime.get_session)
     
     try:
         await ctx.info("Fetching account privileges from eBay API")
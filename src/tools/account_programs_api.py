@@ -18,7 +18,7 @@ from typing import List, Optional
 from fastmcp import Context
 from pydantic import BaseModel, Field, field_validator, ConfigDict
 
-from api.oauth import OAuthManager, OAuthConfig, ConsentRequiredException
+from api.oauth import OAuthConfig, ConsentRequiredException
 from api.rest_client import EbayRestClient, RestConfig
 from api.errors import EbayApiError, extract_ebay_error_details
 from api.ebay_enums import ProgramTypeEnum
@@ -94,13 +94,13 @@ async def get_opted_in_programs(ctx: Context) -> str:
         client_secret=mcp.config.cert_id,
         sandbox=mcp.config.sandbox_mode
     )
-    oauth_manager = OAuthManager(oauth_config)
+    oauth_manager = mcp.runtime.get_oauth_manager(oauth_config)
     
     rest_config = RestConfig(
         sandbox=mcp.config.sandbox_mode,
         rate_limit_per_day=mcp.config.rate_limit_per_day
     )
-    rest_client = EbayRestClient(oauth_manager, rest_config)
+    rest_client = EbayRestClient(oauth_manager, rest_config, session_provider=mcp.runtime.get_session)
     
     try:
         await ctx.info("Fetching opted-in programs from eBay API")
@@ -203,13 +203,13 @@ async def opt_in_to_program(
         client_secret=mcp.config.cert_id,
         sandbox=mcp.config.sandbox_mode
     )
-    oauth_manager = OAuthManager(oauth_config)
+    oauth_manager = mcp.runtime.get_oauth_manager(oauth_config)
     
     rest_config = RestConfig(
         sandbox=mcp.config.sandbox_mode,
         rate_limit_per_day=mcp.config.rate_limit_per_day
     )
-    rest_client = EbayRestClient(oauth_manager, rest_config)
+    rest_client = EbayRestClient(oauth_manager, rest_config, session_provider=mcp.runtime.get_session)
     
     try:
         await ctx.info(f"Opting into {input_data.program_type.value} program")
@@ -303,13 +303,13 @@ async def opt_out_of_program(
         client_secret=mcp.config.cert_id,
         sandbox=mcp.config.sandbox_mode
     )
-    oauth_manager = OAuthManager(oauth_config)
+    oauth_manager = mcp.runtime.get_oauth_manager(oauth_config)
     
     rest_config = RestConfig(
         sandbox=mcp.config.sandbox_mode,
         rate_limit_per_day=mcp.config.rate_limit_per_day
     )
-    rest_client = EbayRestClient(oauth_manager, rest_config)
+    rest_client = EbayRestClient(oauth_manager, rest_config, session_provider=mcp.runtime.get_session)
     
     try:
         await ctx.info(f"Opting out of {input_data.program_type.value} program")
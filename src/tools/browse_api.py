@@ -11,16 +11,19 @@ IMPLEMENTATION FOLLOWS: PYDANTIC-FIRST DEVELOPMENT METHODOLOGY
 - Validation through Pydantic models only
 - Zero manual validation code
 """
-from typing import Optional, Dict, Any, Union
+from typing import Optional, Dict, Any, List, Tuple, Union
+import asyncio
 from decimal import Decimal
 import decimal
 import json
 from fastmcp import Context
 from pydantic import BaseModel, Field, field_validator, ConfigDict, ValidationError
 
-from api.oauth import OAuthManager, OAuthConfig
+from api.cache import CacheTTL, get_cache_manager
+from api.oauth import OAuthConfig
 from api.rest_client import EbayRestClient, RestConfig
-from api.errors import EbayApiError, extract_ebay_error_details
+from api.errors import EbayApiError, RateLimitError, extract_ebay_error_details
+from api.pagination import DEFAULT_MAX_PAGES, MAX_OFFSET, MAX_PAGE_SIZE, PageMerger, fetch_pages, plan_pages
 from data_types import success_response, error_response, ErrorCode
 from lootly_server import mcp
 from utils.input_converter import preprocess_claude_json, COMMON_FIELD_SPECS, ConversionError
@@ -45,6 +48,12 @@ class BrowseSearchInput(BaseModel):
     sort: str = Field("relevance", description="Sort order: relevance, price, -price, distance, -distance, newlyListed, -newlyListed")
     limit: int = Field(50, ge=1, le=200, description="Results per page")
     offset: int = Field(0, ge=0, description="Result offset for pagination")
+    max_results: Optional[int] = Field(
+        None,
+        ge=1,
+        le=MAX_OFFSET,
+        description=f"Fetch pages concurrently until this many results (eBay serves at most the first 10,000, and at most {DEFAULT_MAX_PAGES} pages are read); limit, if given, sets the page size"
+    )
     
     @field_validator('price_min', 'price_max', mode='before')
     @classmethod
@@ -81,6 +90,14 @@ class BrowseSearchInput(BaseModel):
         return v
 
 
+class BatchSearchInput(BaseModel):
+    """Input validation for running many searches at once."""
+    model_config = ConfigDict(str_strip_whitespace=True)
+    
+    searches: List[BrowseSearchInput] = Field(..., min_length=1, max_length=50, description="Searches to run (max 50)")
+    concurrency: int = Field(8, ge=1, le=20, description="Searches in flight at once")
+
+
 class ItemDetailsInput(BaseModel):
     """Input validation for item details requests."""
     model_config = ConfigDict(str_strip_whitespace=True)
@@ -97,6 +114,23 @@ class ItemDetailsInput(BaseModel):
         return v
 
 
+class BulkItemDetailsInput(BaseModel):
+    """Input validation for bulk item details requests."""
+    model_config = ConfigDict(str_strip_whitespace=True)
+    
+    item_ids: List[str] = Field(..., min_length=1, max_length=500, description="RESTful item IDs (v1|...|...), max 500")
+    concurrency: int = Field(5, ge=1, le=10, description="getItems requests in flight at once")
+    
+    @field_validator('item_ids')
+    @classmethod
+    def validate_item_ids(cls, v):
+        """Drop blanks and duplicates, keeping order."""
+        item_ids = list(dict.fromkeys(item_id.strip() for item_id in v if item_id and item_id.strip()))
+        if not item_ids:
+            raise ValueError("item_ids must contain at least one item ID")
+        return item_ids
+
+
 class CategoryBrowseInput(BaseModel):
     """Input validation for category browsing."""
     model_config = ConfigDict(str_strip_whitespace=True)
@@ -107,6 +141,16 @@ class CategoryBrowseInput(BaseModel):
     offset: int = Field(0, ge=0, description="Result offset")
     price_min: Optional[Decimal] = Field(None, ge=0, description="Minimum price filter")
     price_max: Optional[Decimal] = Field(None, ge=0, description="Maximum price filter")
+    refinements_only: bool = Field(
+        False,
+        description="Return facet histograms (aspects such as brand, conditions, subcategories) instead of items"
+    )
+    price_buckets: Optional[List[Decimal]] = Field(
+        None,
+        min_length=1,
+        max_length=10,
+        description="Ascending price edges for a price histogram in refinements_only mode; each bucket costs one small request"
+    )
     
     @field_validator('price_min', 'price_max', mode='before')
     @classmethod
@@ -130,10 +174,49 @@ class CategoryBrowseInput(BaseModel):
             if price_min is not None and v <= price_min:
                 raise ValueError("price_max must be greater than price_min")
         return v
+    
+    @field_validator('price_buckets')
+    @classmethod
+    def validate_price_buckets(cls, v):
+        """Price edges must be non-negative and strictly ascending."""
+        if v is not None:
+            if v[0] < 0:
+                raise ValueError("price_buckets must not be negative")
+            if any(high <= low for low, high in zip(v, v[1:])):
+                raise ValueError("price_buckets must be strictly ascending")
+        return v
+
+
+# Search result facets requested in refinements_only mode. Without
+# MATCHING_ITEMS eBay returns the distributions but no item summaries.
+REFINEMENT_FIELDGROUPS = "ASPECT_REFINEMENTS,CATEGORY_REFINEMENTS,CONDITION_REFINEMENTS"
+
+# Comma-separated fields accepted as lists or strings in JSON search input
+SEARCH_FIELD_SPECS = {
+    'conditions': COMMON_FIELD_SPECS['conditions'],
+    'sellers': COMMON_FIELD_SPECS['sellers'],
+    'category_ids': COMMON_FIELD_SPECS['category_ids'],
+}
+
+
+# getItems accepts at most this many item IDs per call
+GET_ITEMS_BATCH_SIZE = 20
 
 
 # CONVERSION FUNCTIONS
 
+def _price_filter(price_min: Optional[Decimal], price_max: Optional[Decimal]) -> Optional[str]:
+    """Browse price range filter, or None without bounds."""
+    if price_min is None and price_max is None:
+        return None
+    price_filter = "price:["
+    price_filter += str(price_min) if price_min is not None else "*"
+    price_filter += ".."
+    price_filter += str(price_max) if price_max is not None else "*"
+    price_filter += "]"
+    return price_filter
+
+
 def _build_search_params(input_data: BrowseSearchInput) -> Dict[str, Any]:
     """Convert Pydantic model to Browse API search parameters."""
     params = {
@@ -149,12 +232,8 @@ def _build_search_params(input_data: BrowseSearchInput) -> Dict[str, Any]:
     if input_data.category_ids:
         filters.append(f"categoryIds:{{{input_data.category_ids}}}")
     
-    if input_data.price_min is not None or input_data.price_max is not None:
-        price_filter = "price:["
-        price_filter += str(input_data.price_min) if input_data.price_min is not None else "*"
-        price_filter += ".."
-        price_filter += str(input_data.price_max) if input_data.price_max is not None else "*"
-        price_filter += "]"
+    price_filter = _price_filter(input_data.price_min, input_data.price_max)
+    if price_filter:
         filters.append(price_filter)
     
     if input_data.conditions:
@@ -247,6 +326,80 @@ def _format_item_details_response(item_data: Dict[str, Any]) -> Dict[str, Any]:
     return formatted
 
 
+async def _search_all_pages(
+    rest_client: EbayRestClient,
+    input_data: BrowseSearchInput,
+    ctx: Optional[Context] = None,
+    max_pages: int = DEFAULT_MAX_PAGES
+) -> Dict[str, Any]:
+    """Fetch up to max_results search results concurrently and merge them."""
+    params = _build_search_params(input_data)
+    # Largest pages unless a page size was asked for
+    page_size = input_data.limit if "limit" in input_data.model_fields_set else MAX_PAGE_SIZE
+    
+    async def fetch_page(offset: int, limit: int) -> Dict[str, Any]:
+        response = await rest_client.get(
+            "/buy/browse/v1/item_summary/search",
+            params={**params, "offset": offset, "limit": limit}
+        )
+        return response["body"]
+    
+    merger = PageMerger()
+    rate_limited = False
+    try:
+        async for page in fetch_pages(fetch_page, input_data.offset, input_data.max_results, page_size, max_pages=max_pages):
+            unique = merger.add(page)
+            if ctx is None:
+                continue
+            available = min(merger.total, MAX_OFFSET) - input_data.offset
+            target = max(min(input_data.max_results, available), 1)
+            await ctx.report_progress(
+                0.3 + 0.5 * min(unique / target, 1.0),
+                f"Fetched {unique} of {target} results ({len(merger.pages)} pages)"
+            )
+    except RateLimitError:
+        # Keep the pages already fetched; without any there is nothing to return
+        if not merger.pages:
+            raise
+        rate_limited = True
+    
+    items = merger.items()[:input_data.max_results]
+    formatted = _format_search_response({"itemSummaries": items})
+    formatted.update({
+        "total": merger.total,
+        "limit": page_size,
+        "offset": input_data.offset,
+        "max_results": input_data.max_results,
+        "pages_fetched": len(merger.pages),
+        "duplicates_removed": merger.duplicates,
+        # More results exist than eBay serves by offset
+        "offset_capped": input_data.offset + input_data.max_results > MAX_OFFSET and merger.total > MAX_OFFSET,
+        # Pages left unread by the page budget or the rate limit
+        "incomplete": len(merger.pages) < len(plan_pages(input_data.offset, input_data.max_results, page_size, merger.total)),
+        "rate_limited": rate_limited
+    })
+    return formatted
+
+
+async def _execute_search(
+    rest_client: EbayRestClient,
+    input_data: BrowseSearchInput,
+    ctx: Optional[Context] = None,
+    max_pages: int = DEFAULT_MAX_PAGES
+) -> Dict[str, Any]:
+    """Run one search: a single page, or every page up to max_results (and max_pages)."""
+    if input_data.max_results:
+        # Auto-paginate: pages fetched concurrently, merged and deduplicated
+        return await _search_all_pages(rest_client, input_data, ctx, max_pages)
+    
+    # Make API request - Browse API uses client credentials with api_scope
+    response = await rest_client.get(
+        "/buy/browse/v1/item_summary/search",
+        params=_build_search_params(input_data)
+    )
+    return _format_search_response(response["body"])
+
+
 # MCP TOOLS - Using Pydantic Models
 
 
@@ -259,7 +412,12 @@ async def search_items(
     Search for items on eBay using the Browse API.
     
     This tool provides access to eBay's Browse API with advanced filtering
-    and sorting capabilities for item search.
+    and sorting capabilities for item search. Set max_results to fetch more
+    than one page: pages of 200 results (or `limit`, if given) are fetched
+    concurrently from `offset` on and merged in order without duplicate
+    items, up to eBay's 10,000-result offset cap and at most 25 pages per
+    search. If the rate limit runs out mid-way the pages already fetched are
+    returned with rate_limited and incomplete set.
     
     Args:
         search_input: Either a JSON string or BrowseSearchInput object with search parameters
@@ -269,13 +427,6 @@ async def search_items(
         JSON response with search results and pagination info
     """
     
-    # Define field specs for this tool
-    field_specs = {
-        'conditions': COMMON_FIELD_SPECS['conditions'],
-        'sellers': COMMON_FIELD_SPECS['sellers'],
-        'category_ids': COMMON_FIELD_SPECS['category_ids'],
-    }
-    
     # Parse input - handles both JSON strings (from Claude) and Pydantic objects (from tests)
     
     parsed_input = None
@@ -285,7 +436,7 @@ async def search_items(
             raw_data = json.loads(search_input)
             
             # Preprocess Claude's input formats
-            processed_data = preprocess_claude_json(raw_data, field_specs)
+            processed_data = preprocess_claude_json(raw_data, SEARCH_FIELD_SPECS)
             
             # Create Pydantic object
             parsed_input = BrowseSearchInput(**processed_data)
@@ -348,31 +499,18 @@ async def search_items(
         client_secret=mcp.config.cert_id,
         sandbox=mcp.config.sandbox_mode
     )
-    oauth_manager = OAuthManager(oauth_config)
+    oauth_manager = mcp.runtime.get_oauth_manager(oauth_config)
     
     rest_config = RestConfig(
         sandbox=mcp.config.sandbox_mode,
         rate_limit_per_day=mcp.config.rate_limit_per_day
     )
-    rest_client = EbayRestClient(oauth_manager, rest_config)
+    rest_client = EbayRestClient(oauth_manager, rest_config, session_provider=mcp.runtime.get_session)
     
     try:
         await ctx.report_progress(0.3, "Searching eBay marketplace...")
         
-        # Convert Pydantic model to API parameters
-        params = _build_search_params(parsed_input)
-        
-        # Make API request - Browse API uses client credentials with api_scope
-        response = await rest_client.get(
-            "/buy/browse/v1/item_summary/search",
-            params=params
-        )
-        response_body = response["body"]
-        
-        await ctx.report_progress(0.8, "Processing search results...")
-        
-        # Format response
-        formatted_response = _format_search_response(response_body)
+        formatted_response = await _execute_search(rest_client, parsed_input, ctx)
         
         await ctx.report_progress(1.0, "Complete")
         await ctx.info(f"Found {formatted_response['total']} items, returning {len(formatted_response['items'])}")
@@ -392,6 +530,13 @@ async def search_items(
             e.get_comprehensive_message(),
             extract_ebay_error_details(e)
         ).to_json_string()
+    except RateLimitError as e:
+        await ctx.error(f"Rate limit reached: {e.message}")
+        return error_response(
+            ErrorCode.RATE_LIMIT_EXCEEDED,
+            e.message,
+            e.get_full_error_details()
+        ).to_json_string()
     except Exception as e:
         await ctx.error(f"Failed to search items: {str(e)}")
         return error_response(
@@ -402,6 +547,171 @@ async def search_items(
         await rest_client.close()
 
 
+# Pages one batch reads at most across its searches (see DEFAULT_MAX_PAGES);
+# each search gets an equal share and at least its first page
+BATCH_MAX_PAGES = 2 * DEFAULT_MAX_PAGES
+
+
+def _merge_search_results(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Merge per-search items, keeping each item once with the searches that found it."""
+    merged: Dict[str, Dict[str, Any]] = {}
+    found = 0
+    for result in results:
+        for item in result.get("items", []):
+            found += 1
+            key = item.get("item_id") or id(item)
+            if key in merged:
+                merged[key]["matched_searches"].append(result["index"])
+            else:
+                merged[key] = {**item, "matched_searches": [result["index"]]}
+    return {
+        "items": list(merged.values()),
+        "unique_items": len(merged),
+        "duplicates_removed": found - len(merged)
+    }
+
+
+@mcp.tool
+async def batch_search_items(
+    ctx: Context,
+    batch_input: Union[str, BatchSearchInput]
+) -> str:
+    """
+    Run many item searches concurrently in one call.
+    
+    Each search takes the same parameters as search_items (including
+    max_results). Searches run concurrently, at most `concurrency` at a time,
+    over one shared HTTP session, response cache and rate limiter, so a batch
+    takes about as long as its slowest search. Paginated searches share a
+    budget of 50 pages per batch. A failing search is reported in its own
+    result without failing the batch; once the rate limit runs out, searches
+    not yet started are reported as RATE_LIMIT_EXCEEDED without being sent.
+    
+    Args:
+        batch_input: JSON string or BatchSearchInput with "searches" (list of
+            search_items parameters) and optional "concurrency"; a bare JSON
+            list of searches is accepted too
+        ctx: MCP context
+    
+    Returns:
+        JSON response with per-search results, a merged view with duplicate
+        items removed (each tagged with the indexes of the searches that
+        found it) and a summary
+    """
+    try:
+        if isinstance(batch_input, str):
+            await ctx.info("Parsing JSON batch search parameters...")
+            raw_data = json.loads(batch_input)
+            if isinstance(raw_data, list):
+                raw_data = {"searches": raw_data}
+            raw_data["searches"] = [
+                preprocess_claude_json(search, SEARCH_FIELD_SPECS) if isinstance(search, dict) else search
+                for search in raw_data.get("searches") or []
+            ]
+            batch_input = BatchSearchInput(**raw_data)
+        elif not isinstance(batch_input, BatchSearchInput):
+            raise ValueError(f"Expected JSON string or BatchSearchInput object, got {type(batch_input)}")
+    except json.JSONDecodeError as e:
+        await ctx.error(f"Invalid JSON in batch_input: {str(e)}")
+        return error_response(
+            ErrorCode.VALIDATION_ERROR,
+            f"Invalid JSON in batch_input: {str(e)}. Please provide valid JSON with a searches list."
+        ).to_json_string()
+    except (ConversionError, ValidationError, ValueError) as e:
+        await ctx.error(f"Invalid batch search parameters: {str(e)}")
+        return error_response(
+            ErrorCode.VALIDATION_ERROR,
+            f"Invalid batch search parameters: {str(e)}"
+        ).to_json_string()
+    
+    searches = batch_input.searches
+    await ctx.info(f"Running {len(searches)} searches, {batch_input.concurrency} at a time")
+    
+    # Check credentials
+    if not mcp.config.app_id or not mcp.config.cert_id:
+        return error_response(
+            ErrorCode.CONFIGURATION_ERROR,
+            "eBay App ID and Cert ID must be configured"
+        ).to_json_string()
+    
+    # Initialize API clients
+    oauth_config = OAuthConfig(
+        client_id=mcp.config.app_id,
+        client_secret=mcp.config.cert_id,
+        sandbox=mcp.config.sandbox_mode
+    )
+    oauth_manager = mcp.runtime.get_oauth_manager(oauth_config)
+    
+    rest_config = RestConfig(
+        sandbox=mcp.config.sandbox_mode,
+        rate_limit_per_day=mcp.config.rate_limit_per_day
+    )
+    rest_client = EbayRestClient(oauth_manager, rest_config, session_provider=mcp.runtime.get_session)
+    
+    semaphore = asyncio.Semaphore(batch_input.concurrency)
+    max_pages = max(BATCH_MAX_PAGES // len(searches), 1)
+    completed = 0
+    rate_limited = False
+    
+    async def run_search(index: int, search: BrowseSearchInput) -> Dict[str, Any]:
+        nonlocal completed, rate_limited
+        result: Dict[str, Any] = {"index": index, "query": search.query}
+        try:
+            async with semaphore:
+                if rate_limited:
+                    raise RateLimitError("Rate limit reached earlier in the batch; search not sent")
+                result.update(await _execute_search(rest_client, search, max_pages=max_pages))
+            result["status"] = "success"
+            rate_limited = rate_limited or result.get("rate_limited", False)
+        except RateLimitError as e:
+            rate_limited = True
+            result.update({
+                "status": "error",
+                "error_code": ErrorCode.RATE_LIMIT_EXCEEDED.value,
+                "error_message": e.message
+            })
+        except EbayApiError as e:
+            result.update({
+                "status": "error",
+                "error_code": ErrorCode.EXTERNAL_API_ERROR.value,
+                "error_message": e.get_comprehensive_message()
+            })
+        except Exception as e:
+            result.update({
+                "status": "error",
+                "error_code": ErrorCode.INTERNAL_ERROR.value,
+                "error_message": str(e)
+            })
+        completed += 1
+        await ctx.report_progress(completed / len(searches), f"Completed {completed}/{len(searches)} searches")
+        return result
+    
+    try:
+        results = await asyncio.gather(*(run_search(index, search) for index, search in enumerate(searches)))
+        
+        failed = [result for result in results if result["status"] == "error"]
+        merged = _merge_search_results([result for result in results if result["status"] == "success"])
+        summary = {
+            "searches": len(results),
+            "succeeded": len(results) - len(failed),
+            "failed": len(failed),
+            "unique_items": merged["unique_items"],
+            "concurrency": batch_input.concurrency,
+            "rate_limited": rate_limited
+        }
+        
+        if failed:
+            await ctx.error(f"{len(failed)} of {len(results)} searches failed")
+        await ctx.info(f"Batch found {merged['unique_items']} unique items")
+        
+        return success_response(
+            data={"results": results, "merged": merged, "summary": summary},
+            message=f"Completed {summary['succeeded']}/{len(results)} searches"
+        ).to_json_string()
+    finally:
+        await rest_client.close()
+
+
 @mcp.tool
 async def get_item_details(
     ctx: Context,
@@ -472,13 +782,13 @@ async def get_item_details(
         client_secret=mcp.config.cert_id,
         sandbox=mcp.config.sandbox_mode
     )
-    oauth_manager = OAuthManager(oauth_config)
+    oauth_manager = mcp.runtime.get_oauth_manager(oauth_config)
     
     rest_config = RestConfig(
         sandbox=mcp.config.sandbox_mode,
         rate_limit_per_day=mcp.config.rate_limit_per_day
     )
-    rest_client = EbayRestClient(oauth_manager, rest_config)
+    rest_client = EbayRestClient(oauth_manager, rest_config, session_provider=mcp.runtime.get_session)
     
     try:
         await ctx.report_progress(0.3, "Fetching item details from eBay...")
@@ -538,6 +848,286 @@ async def get_item_details(
         await rest_client.close()
 
 
+def _item_cache_key(item_id: str) -> str:
+    """Cache key for one item returned by getItems."""
+    return f"BROWSE_ITEM_{item_id}"
+
+
+async def _get_items_batch(
+    rest_client: EbayRestClient,
+    item_ids: List[str]
+) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, str]]:
+    """
+    Fetch up to GET_ITEMS_BATCH_SIZE items with one getItems call.
+    
+    Returns:
+        Items by ID, and an error message for each requested ID not returned
+    """
+    response = await rest_client.get(
+        "/buy/browse/v1/item/",
+        params={"item_ids": ",".join(item_ids)}
+    )
+    response_body = response["body"]
+    
+    found = {item["itemId"]: item for item in response_body.get("items") or [] if item.get("itemId")}
+    errors: Dict[str, str] = {}
+    # Warnings name the item IDs they concern in their parameters
+    for warning in response_body.get("warnings") or []:
+        for parameter in warning.get("parameters") or []:
+            item_id = parameter.get("value")
+            if item_id in item_ids and item_id not in found:
+                errors[item_id] = warning.get("message") or "Item not returned"
+    for item_id in item_ids:
+        if item_id not in found and item_id not in errors:
+            errors[item_id] = "Item not returned"
+    return found, errors
+
+
+@mcp.tool
+async def bulk_get_item_details(
+    ctx: Context,
+    item_ids: List[str],
+    concurrency: int = 5
+) -> str:
+    """
+    Get details for many eBay items at once.
+    
+    Item IDs are fetched 20 per request through the Browse getItems endpoint,
+    with several requests running concurrently. Each item is cached on its
+    own, so repeated or overlapping batches only fetch the items not seen
+    recently. Items that cannot be retrieved are reported individually and
+    do not fail the batch. At most 25 requests are made (500 items), well
+    within the rate limiter's burst; if it runs out anyway, the remaining
+    requests are not sent and their items are reported as rate limited.
+    
+    Args:
+        item_ids: RESTful item IDs (v1|...|...) as returned by search_items, max 500
+        concurrency: getItems requests in flight at once (1-10)
+        ctx: MCP context
+    
+    Returns:
+        JSON response with item details in request order, per-item errors
+        and a summary
+    """
+    try:
+        input_data = BulkItemDetailsInput(item_ids=item_ids, concurrency=concurrency)
+    except ValidationError as e:
+        await ctx.error(f"Invalid bulk item details parameters: {str(e)}")
+        return error_response(
+            ErrorCode.VALIDATION_ERROR,
+            f"Invalid bulk item details parameters: {str(e)}"
+        ).to_json_string()
+    
+    item_ids = input_data.item_ids
+    await ctx.info(f"Getting details for {len(item_ids)} items")
+    
+    # Check credentials
+    if not mcp.config.app_id or not mcp.config.cert_id:
+        return error_response(
+            ErrorCode.CONFIGURATION_ERROR,
+            "eBay App ID and Cert ID must be configured"
+        ).to_json_string()
+    
+    # Initialize API clients
+    oauth_config = OAuthConfig(
+        client_id=mcp.config.app_id,
+        client_secret=mcp.config.cert_id,
+        sandbox=mcp.config.sandbox_mode
+    )
+    oauth_manager = mcp.runtime.get_oauth_manager(oauth_config)
+    
+    rest_config = RestConfig(
+        sandbox=mcp.config.sandbox_mode,
+        rate_limit_per_day=mcp.config.rate_limit_per_day
+    )
+    rest_client = EbayRestClient(oauth_manager, rest_config, session_provider=mcp.runtime.get_session)
+    
+    try:
+        cache_manager = get_cache_manager()
+        items: Dict[str, Dict[str, Any]] = {}
+        if cache_manager:
+            for item_id in item_ids:
+                cached = await cache_manager.get(_item_cache_key(item_id))
+                if cached is not None:
+                    items[item_id] = cached
+        cached_count = len(items)
+        
+        missing = [item_id for item_id in item_ids if item_id not in items]
+        batches = [missing[start:start + GET_ITEMS_BATCH_SIZE] for start in range(0, len(missing), GET_ITEMS_BATCH_SIZE)]
+        errors: Dict[str, str] = {}
+        semaphore = asyncio.Semaphore(input_data.concurrency)
+        completed = 0
+        rate_limited = False
+        
+        async def fetch_batch(batch: List[str]) -> None:
+            nonlocal completed, rate_limited
+            try:
+                async with semaphore:
+                    if rate_limited:
+                        raise RateLimitError("Rate limit reached; item not requested")
+                    found, batch_errors = await _get_items_batch(rest_client, batch)
+            except RateLimitError as e:
+                # Stop sending: the remaining batches would be rejected too
+                rate_limited = True
+                found, batch_errors = {}, {item_id: e.message for item_id in batch}
+            except Exception as e:
+                # A failed request fails its own items only
+                message = e.get_comprehensive_message() if isinstance(e, EbayApiError) else str(e)
+                found, batch_errors = {}, {item_id: message for item_id in batch}
+            items.update(found)
+            errors.update(batch_errors)
+            if cache_manager:
+                for item_id, item in found.items():
+                    await cache_manager.set(_item_cache_key(item_id), item, CacheTTL.SEARCH_RESULTS)
+            completed += 1
+            await ctx.report_progress(completed / len(batches), f"Fetched {completed}/{len(batches)} item batches")
+        
+        await asyncio.gather(*(fetch_batch(batch) for batch in batches))
+        
+        result_data = {
+            "items": [_format_item_details_response(items[item_id]) for item_id in item_ids if item_id in items],
+            "errors": [{"item_id": item_id, "error": errors[item_id]} for item_id in item_ids if item_id in errors],
+            "summary": {
+                "requested": len(item_ids),
+                "found": sum(1 for item_id in item_ids if item_id in items),
+                "failed": len(errors),
+                "from_cache": cached_count,
+                "requests": len(batches),
+                "rate_limited": rate_limited
+            }
+        }
+        
+        if errors:
+            await ctx.error(f"{len(errors)} of {len(item_ids)} items could not be retrieved")
+        await ctx.info(f"Retrieved {result_data['summary']['found']} items with {len(batches)} requests")
+        
+        return success_response(
+            data=result_data,
+            message=f"Retrieved {result_data['summary']['found']}/{len(item_ids)} items"
+        ).to_json_string()
+        
+    except Exception as e:
+        await ctx.error(f"Failed to get item details: {str(e)}")
+        return error_response(
+            ErrorCode.INTERNAL_ERROR,
+            f"Failed to get item details: {str(e)}"
+        ).to_json_string()
+    finally:
+        await rest_client.close()
+
+
+def _format_refinements(response: Dict[str, Any]) -> Dict[str, Any]:
+    """Condense a Browse search refinement into facet histograms."""
+    refinement = response.get("refinement") or {}
+    aspects = {
+        distribution.get("localizedAspectName"): {
+            value.get("localizedAspectValue"): value.get("matchCount", 0)
+            for value in distribution.get("aspectValueDistributions") or []
+        }
+        for distribution in refinement.get("aspectDistributions") or []
+    }
+    return {
+        "total": response.get("total", 0),
+        "dominant_category_id": refinement.get("dominantCategoryId"),
+        "subcategories": [
+            {
+                "category_id": distribution.get("categoryId"),
+                "category_name": distribution.get("categoryName"),
+                "count": distribution.get("matchCount", 0)
+            }
+            for distribution in refinement.get("categoryDistributions") or []
+        ],
+        "conditions": [
+            {
+                "condition": distribution.get("condition"),
+                "condition_id": distribution.get("conditionId"),
+                "count": distribution.get("matchCount", 0)
+            }
+            for distribution in refinement.get("conditionDistributions") or []
+        ],
+        "brands": aspects.get("Brand", {}),
+        "aspects": aspects
+    }
+
+
+def _price_bucket_ranges(
+    edges: List[Decimal],
+    price_min: Optional[Decimal],
+    price_max: Optional[Decimal]
+) -> List[Tuple[Optional[Decimal], Optional[Decimal]]]:
+    """Split the price range at the given edges; None is an open end."""
+    bounds = [price_min] + [edge for edge in edges
+                            if (price_min is None or edge > price_min) and (price_max is None or edge < price_max)] + [price_max]
+    return list(zip(bounds, bounds[1:]))
+
+
+def _category_search_params(category_id: str, price_min: Optional[Decimal], price_max: Optional[Decimal]) -> Dict[str, Any]:
+    """Single-result category search parameters, without keywords."""
+    params = {"category_ids": category_id, "limit": 1}
+    price_filter = _price_filter(price_min, price_max)
+    if price_filter:
+        params["filter"] = price_filter
+    return params
+
+
+def _refinements_cache_key(params: Dict[str, Any], price_buckets: Optional[List[Decimal]]) -> str:
+    """Cache key for a category's facets under the given filters."""
+    edges = ",".join(str(edge) for edge in price_buckets or [])
+    return f"BROWSE_REFINEMENTS_{params['category_ids']}_{params.get('filter', '')}_{edges}"
+
+
+async def _get_category_refinements(
+    rest_client: EbayRestClient,
+    category_input: CategoryBrowseInput
+) -> Tuple[Dict[str, Any], bool]:
+    """
+    Get facet histograms for a category without fetching items.
+    
+    One refinement request, plus one single-result request per price bucket
+    (run concurrently) whose total is the bucket count. Requests filter by
+    category_ids alone, without keywords. Results are cached for
+    CacheTTL.MARKET_TRENDS.
+    
+    Returns:
+        Facets, and whether they came from the cache
+    """
+    params = _category_search_params(category_input.category_id, category_input.price_min, category_input.price_max)
+    price_buckets = category_input.price_buckets
+    cache_key = _refinements_cache_key(params, price_buckets)
+    cache_manager = get_cache_manager()
+    if cache_manager:
+        cached = await cache_manager.get(cache_key)
+        if cached is not None:
+            return cached, True
+    
+    async def count_bucket(low: Optional[Decimal], high: Optional[Decimal]) -> Dict[str, Any]:
+        response = await rest_client.get(
+            "/buy/browse/v1/item_summary/search",
+            params=_category_search_params(category_input.category_id, low, high)
+        )
+        return {
+            "min": str(low) if low is not None else None,
+            "max": str(high) if high is not None else None,
+            "count": response["body"].get("total", 0)
+        }
+    
+    bucket_ranges = _price_bucket_ranges(price_buckets, category_input.price_min, category_input.price_max) if price_buckets else []
+    response, *buckets = await asyncio.gather(
+        rest_client.get(
+            "/buy/browse/v1/item_summary/search",
+            params={**params, "fieldgroups": REFINEMENT_FIELDGROUPS}
+        ),
+        *(count_bucket(low, high) for low, high in bucket_ranges)
+    )
+    
+    refinements = _format_refinements(response["body"])
+    if price_buckets:
+        refinements["price_buckets"] = buckets
+    if cache_manager:
+        await cache_manager.set(cache_key, refinements, CacheTTL.MARKET_TRENDS)
+    return refinements, False
+
+
 @mcp.tool
 async def get_items_by_category(
     ctx: Context,
@@ -547,7 +1137,10 @@ async def get_items_by_category(
     Browse items within a specific eBay category.
     
     Retrieves items from a category without requiring search keywords.
-    Useful for browsing category listings.
+    Useful for browsing category listings. With refinements_only set it
+    returns facet histograms instead (brands and other aspects, conditions,
+    subcategories and optional price buckets), cached per category, which
+    answers market-shape questions with one small request.
     
     Args:
         category_input: Either a JSON string or CategoryBrowseInput object with category parameters
@@ -608,17 +1201,27 @@ async def get_items_by_category(
         client_secret=mcp.config.cert_id,
         sandbox=mcp.config.sandbox_mode
     )
-    oauth_manager = OAuthManager(oauth_config)
+    oauth_manager = mcp.runtime.get_oauth_manager(oauth_config)
     
     rest_config = RestConfig(
         sandbox=mcp.config.sandbox_mode,
         rate_limit_per_day=mcp.config.rate_limit_per_day
     )
-    rest_client = EbayRestClient(oauth_manager, rest_config)
+    rest_client = EbayRestClient(oauth_manager, rest_config, session_provider=mcp.runtime.get_session)
     
     try:
         await ctx.report_progress(0.3, "Browsing category...")
         
+        if category_input.refinements_only:
+            refinements, from_cache = await _get_category_refinements(rest_client, category_input)
+            await ctx.report_progress(1.0, "Complete")
+            await ctx.info(f"Category {category_input.category_id} has {refinements['total']} items")
+            return success_response(
+                data={"category_id": category_input.category_id, **refinements},
+                message=f"Retrieved refinements for category {category_input.category_id}",
+                metadata={"from_cache": from_cache}
+            ).to_json_string()
+        
         # Use search with category filter and minimal query
         # For category browsing, we need a more specific query to avoid "too large" errors
         search_input = BrowseSearchInput(
@@ -0,0 +1,277 @@
+"""
+Comparable sales ("comps") pricing tool.
+
+Loads recent sales (Marketplace Insights) and active listings (Browse) for
+a search into an in-process CompsSet once, then positions any number of
+candidate prices against them without sending the raw listings back.
+"""
+from typing import Dict, Any, Optional, List, Tuple
+import asyncio
+from fastmcp import Context
+from pydantic import BaseModel, Field, ConfigDict, ValidationError, model_validator
+
+from api.oauth import OAuthConfig
+from api.rest_client import EbayRestClient, RestConfig
+from api.errors import EbayApiError, RateLimitError
+from api.coalescing import get_request_coalescer
+from api.comps import COMPS_BACKEND, CompsSet, condition_group, find_comps, register_comps
+from api.pagination import DEFAULT_MAX_PAGES, MAX_OFFSET, MAX_PAGE_SIZE, fetch_pages, plan_pages
+from data_types import success_response, error_response, ErrorCode
+from lootly_server import mcp
+from tools.browse_api import _format_search_response
+from tools.marketplace_insights_api import _convert_item_sale
+
+
+class PriceCompsInput(BaseModel):
+    """Input validation for price comps."""
+    model_config = ConfigDict(str_strip_whitespace=True)
+
+    prices: List[float] = Field(..., min_length=1, max_length=5000, description="Item prices to evaluate")
+    q: Optional[str] = Field(None, max_length=100, description="Keywords describing the item")
+    category_ids: Optional[str] = Field(None, description="Comma-separated category IDs")
+    condition: Optional[str] = Field(None, description="Condition name or ID to compare within (e.g. New, Used, 3000)")
+    shipping_cost: float = Field(0.0, ge=0, description="Shipping charged with each price")
+    currency: str = Field("USD", min_length=3, max_length=3, description="Currency of the prices")
+    max_sales: int = Field(1000, ge=0, le=MAX_OFFSET, description="Recent sales to load")
+    max_listings: int = Field(200, ge=0, le=MAX_OFFSET, description="Active listings to load")
+
+    @model_validator(mode='after')
+    def validate_search_criteria(self):
+        if not self.q and not self.category_ids:
+            raise ValueError("At least one search criterion is required (q or category_ids)")
+        if not self.max_sales and not self.max_listings:
+            raise ValueError("max_sales and max_listings cannot both be 0")
+        if any(price < 0 for price in self.prices):
+            raise ValueError("prices must not be negative")
+        return self
+
+
+async def _load_pages(
+    rest_client: EbayRestClient,
+    endpoint: str,
+    params: Dict[str, Any],
+    count: int,
+    items_key: str
+) -> Tuple[List[Dict[str, Any]], bool, bool]:
+    """
+    Fetch up to count results of a search, pages concurrently, reading at
+    most DEFAULT_MAX_PAGES pages.
+
+    Returns:
+        The results, whether the page budget left results unread, and
+        whether the rate limiter stopped the load after the first page
+        (RateLimitError is raised when no page was read)
+    """
+    async def fetch_page(offset: int, limit: int) -> Dict[str, Any]:
+        response = await rest_client.get(endpoint, params={**params, "offset": offset, "limit": limit})
+        return response["body"]
+
+    results = []
+    pages = 0
+    total = 0
+    rate_limited = False
+    try:
+        async for page in fetch_pages(fetch_page, 0, count, MAX_PAGE_SIZE, items_key=items_key):
+            results.extend(page.items)
+            total = max(total, page.total)
+            pages += 1
+    except RateLimitError:
+        if not pages:
+            raise
+        rate_limited = True
+    truncated = len(plan_pages(0, count, MAX_PAGE_SIZE, total)) > DEFAULT_MAX_PAGES
+    return results, truncated, rate_limited
+
+
+async def _load_comps(rest_client: EbayRestClient, input_data: PriceCompsInput) -> Tuple[CompsSet, bool]:
+    """
+    Load sales and active listings concurrently into a CompsSet.
+
+    Returns:
+        The comps (truncated when the page budget cut either load short),
+        and whether the rate limiter cut either load short
+    """
+    params = {}
+    if input_data.q:
+        params["q"] = input_data.q
+    if input_data.category_ids:
+        params["category_ids"] = input_data.category_ids
+
+    async def load_sales() -> Tuple[List[Dict[str, Any]], bool, bool]:
+        if not input_data.max_sales:
+            return [], False, False
+        sales, truncated, rate_limited = await _load_pages(
+            rest_client, "/buy/marketplace_insights/v1_beta/item_sales/search",
+            params, input_data.max_sales, "itemSales"
+        )
+        return [_convert_item_sale(sale) for sale in sales], truncated, rate_limited
+
+    async def load_listings() -> Tuple[List[Dict[str, Any]], bool, bool]:
+        if not input_data.max_listings:
+            return [], False, False
+        summaries, truncated, rate_limited = await _load_pages(
+            rest_client, "/buy/browse/v1/item_summary/search",
+            params, input_data.max_listings, "itemSummaries"
+        )
+        return _format_search_response({"itemSummaries": summaries})["items"], truncated, rate_limited
+
+    (sales, sales_truncated, sales_limited), (listings, listings_truncated, listings_limited) = await asyncio.gather(
+        load_sales(), load_listings()
+    )
+    comps = CompsSet.from_records(sales, listings, input_data.currency)
+    comps.truncated = sales_truncated or listings_truncated
+    return comps, sales_limited or listings_limited
+
+
+def _comps_key(input_data: PriceCompsInput) -> Tuple:
+    return ("COMPS", input_data.q, input_data.category_ids, input_data.currency, input_data.max_sales, input_data.max_listings)
+
+
+@mcp.tool
+async def get_price_comps(
+    ctx: Context,
+    prices: List[float],
+    q: Optional[str] = None,
+    category_ids: Optional[str] = None,
+    condition: Optional[str] = None,
+    shipping_cost: float = 0.0,
+    currency: str = "USD",
+    max_sales: int = 1000,
+    max_listings: int = 200
+) -> str:
+    """
+    Compare item prices against recent sales and active listings.
+
+    Sales and listings for the search are loaded once and kept in memory
+    for 30 minutes, so repeated comparisons for the same search cost no
+    API calls. Each of sales and listings reads at most 5000 results;
+    more are flagged truncated in the metadata. Comps cut short by the
+    rate limit are used but not kept, and are flagged rate_limited.
+    Prices are compared as landed prices (plus shipping_cost; listings
+    include their cheapest shipping) within the condition group.
+
+    Args:
+        prices: Item prices to evaluate (up to 5000 at once)
+        q: Keywords describing the item (e.g., "iphone 13 128gb")
+        category_ids: Comma-separated category IDs
+        condition: Condition name or ID (e.g., "New", "Used", "3000") to compare within
+        shipping_cost: Shipping charged with each price
+        currency: Currency of the prices; comps in other currencies are skipped
+        max_sales: Recent sales to load (0-10000, default 1000)
+        max_listings: Active listings to load (0-10000, default 200)
+        ctx: MCP context
+
+    Returns:
+        JSON response with sold and active quantiles, a suggested price band
+        and, per price, its position among comps (0-100), a deal score
+        (0-100, higher is a better deal for a buyer) and a verdict
+    """
+    try:
+        input_data = PriceCompsInput(
+            prices=prices,
+            q=q,
+            category_ids=category_ids,
+            condition=condition,
+            shipping_cost=shipping_cost,
+            currency=currency,
+            max_sales=max_sales,
+            max_listings=max_listings
+        )
+    except ValidationError as e:
+        await ctx.error(f"Invalid price comps parameters: {str(e)}")
+        return error_response(
+            ErrorCode.VALIDATION_ERROR,
+            f"Invalid price comps parameters: {str(e)}"
+        ).to_json_string()
+
+    group = None
+    if input_data.condition:
+        group = condition_group(
+            input_data.condition if input_data.condition.isdigit() else None,
+            input_data.condition.replace("_", " ")
+        )
+
+    # Check credentials
+    if not mcp.config.app_id or not mcp.config.cert_id:
+        return error_response(
+            ErrorCode.CONFIGURATION_ERROR,
+            "eBay App ID and Cert ID must be configured"
+        ).to_json_string()
+
+    key = _comps_key(input_data)
+    comps = find_comps(key)
+    from_cache = comps is not None
+    rate_limited = False
+
+    if comps is None:
+        await ctx.info(f"Loading comps: q='{input_data.q}', categories={input_data.category_ids}")
+
+        # Initialize API clients
+        oauth_config = OAuthConfig(
+            client_id=mcp.config.app_id,
+            client_secret=mcp.config.cert_id,
+            sandbox=mcp.config.sandbox_mode
+        )
+        oauth_manager = mcp.runtime.get_oauth_manager(oauth_config)
+
+        rest_config = RestConfig(
+            sandbox=mcp.config.sandbox_mode,
+            rate_limit_per_day=mcp.config.rate_limit_per_day
+        )
+        rest_client = EbayRestClient(oauth_manager, rest_config, session_provider=mcp.runtime.get_session)
+
+        try:
+            await ctx.report_progress(0.2, "Loading sales and listings...")
+
+            async def load() -> Tuple[CompsSet, bool]:
+                loaded, limited = await _load_comps(rest_client, input_data)
+                # Partial comps would skew later comparisons for 30 minutes
+                if not limited:
+                    register_comps(key, loaded)
+                return loaded, limited
+
+            # Concurrent calls for the same search share one load
+            comps, rate_limited = await get_request_coalescer().run(key, load)
+            if rate_limited:
+                await ctx.warning("Rate limit reached; comparing against the comps loaded so far")
+        except RateLimitError as e:
+            await ctx.error(f"Rate limit reached: {e.message}")
+            return error_response(
+                ErrorCode.RATE_LIMIT_EXCEEDED,
+                e.message,
+                e.get_full_error_details()
+            ).to_json_string()
+        except EbayApiError as e:
+            await ctx.error(f"eBay API error: {e.get_comprehensive_message()}")
+            return error_response(
+                ErrorCode.EXTERNAL_API_ERROR,
+                e.get_comprehensive_message(),
+                e.get_full_error_details()
+            ).to_json_string()
+        except Exception as e:
+            await ctx.error(f"Failed to load comps: {str(e)}")
+            return error_response(
+                ErrorCode.INTERNAL_ERROR,
+                f"Failed to load comps: {str(e)}"
+            ).to_json_string()
+        finally:
+            await rest_client.close()
+
+    result = comps.evaluate(input_data.prices, group, input_data.shipping_cost)
+
+    await ctx.report_progress(1.0, "Complete")
+    await ctx.info(f"Compared {len(input_data.prices)} prices with {result['sold_comps']} sales and {result['active_comps']} listings")
+
+    return success_response(
+        data=result,
+        message=f"Compared {len(input_data.prices)} prices with {result['sold_comps'] + result['active_comps']} comps",
+        metadata={
+            "from_cache": from_cache,
+            "backend": COMPS_BACKEND,
+            "sold_loaded": comps.sold_count,
+            "active_loaded": comps.active_count,
+            "skipped": comps.skipped,
+            "truncated": comps.truncated,
+            "rate_limited": rate_limited
+        }
+    ).to_json_string()
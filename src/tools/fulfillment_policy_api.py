@@ -18,7 +18,7 @@ from typing import Optional, Dict, Any, List
 from fastmcp import Context
 from pydantic import BaseModel, Field, model_validator, ConfigDict
 
-from api.oauth import OAuthManager, OAuthConfig, ConsentRequiredException
+from api.oauth import OAuthConfig, ConsentRequiredException
 from api.rest_client import EbayRestClient, RestConfig
 from api.errors import EbayApiError, extract_ebay_error_details
 from api.ebay_enums import (
@@ -488,13 +488,13 @@ async def create_fulfillment_policy(
         client_secret=mcp.config.cert_id,
         sandbox=mcp.config.sandbox_mode
     )
-    oauth_manager = OAuthManager(oauth_config)
+    oauth_manager = mcp.runtime.get_oauth_manager(oauth_config)
     
     rest_config = RestConfig(
         sandbox=mcp.config.sandbox_mode,
         rate_limit_per_day=mcp.config.rate_limit_per_day
     )
-    rest_client = EbayRestClient(oauth_manager, rest_config)
+    rest_client = EbayRestClient(oauth_manager, rest_config, session_provider=mcp.runtime.get_session)
     
     try:
         await ctx.report_progress(0.3, "Converting input to eBay API format...")
@@ -602,13 +602,13 @@ async def get_fulfillment_policies(
         client_secret=mcp.config.cert_id,
         sandbox=mcp.config.sandbox_mode
     )
-    oauth_manager = OAuthManager(oauth_config)
+    oauth_manager = mcp.runtime.get_oauth_manager(oauth_config)
     
     rest_config = RestConfig(
         sandbox=mcp.config.sandbox_mode,
         rate_limit_per_day=mcp.config.rate_limit_per_day
     )
-    rest_client = EbayRestClient(oauth_manager, rest_config)
+    rest_client = EbayRestClient(oauth_manager, rest_config, session_provider=mcp.runtime.get_session)
     
     try:
         await ctx.report_progress(0.5, "Fetching fulfillment policies...")
@@ -730,13 +730,13 @@ async def get_fulfillment_policy(
         client_secret=mcp.config.cert_id,
         sandbox=mcp.config.sandbox_mode
     )
-    oauth_manager = OAuthManager(oauth_config)
+    oauth_manager = mcp.runtime.get_oauth_manager(oauth_config)
     
     rest_config = RestConfig(
         sandbox=mcp.config.sandbox_mode,
         rate_limit_per_day=mcp.config.rate_limit_per_day
     )
-    rest_client = EbayRestClient(oauth_manager, rest_config)
+    rest_client = EbayRestClient(oauth_manager, rest_config, session_provider=mcp.runtime.get_session)
     
     try:
         await ctx.report_progress(0.5, f"Fetching fulfillment policy {policy_id}...")
@@ -830,13 +830,13 @@ async def get_fulfillment_policy_by_name(
         client_secret=mcp.config.cert_id,
         sandbox=mcp.config.sandbox_mode
     )
-    oauth_manager = OAuthManager(oauth_config)
+    oauth_manager = mcp.runtime.get_oauth_manager(oauth_config)
     
     rest_config = RestConfig(
         sandbox=mcp.config.sandbox_mode,
         rate_limit_per_day=mcp.config.rate_limit_per_day
     )
-    rest_client = EbayRestClient(oauth_manager, rest_config)
+    rest_client = EbayRestClient(oauth_manager, rest_config, session_provider=mcp.runtime.get_session)
     
     try:
         await ctx.report_progress(0.5, f"Searching for fulfillment policy '{name}'...")
@@ -940,13 +940,13 @@ async def update_fulfillment_policy(
         client_secret=mcp.config.cert_id,
         sandbox=mcp.config.sandbox_mode
     )
-    oauth_manager = OAuthManager(oauth_config)
+    oauth_manager = mcp.runtime.get_oauth_manager(oauth_config)
     
     rest_config = RestConfig(
         sandbox=mcp.config.sandbox_mode,
         rate_limit_per_day=mcp.config.rate_limit_per_day
     )
-    rest_client = EbayRestClient(oauth_manager, rest_config)
+    rest_client = EbayRestClient(oauth_manager, rest_config, session_provider=mcp.runtime.get_session)
     
     try:
         await ctx.report_progress(0.3, "Converting input to eBay API format...")
@@ -1046,13 +1046,13 @@ async def delete_fulfillment_policy(
         client_secret=mcp.config.cert_id,
         sandbox=mcp.config.sandbox_mode
     )
-    oauth_manager = OAuthManager(oauth_config)
+    oauth_manager = mcp.runtime.get_oauth_manager(oauth_config)
     
     rest_config = RestConfig(
         sandbox=mcp.config.sandbox_mode,
         rate_limit_per_day=mcp.config.rate_limit_per_day
     )
-    rest_client = EbayRestClient(oauth_manager, rest_config)
+    rest_client = EbayRestClient(oauth_manager, rest_config, session_provider=mcp.runtime.get_session)
     
     try:
         await ctx.report_progress(0.5, f"Deleting fulfillment policy {policy_id}...")
@@ -9,7 +9,7 @@ from fastmcp import Context
 from pydantic import BaseModel, Field, field_validator, ConfigDict
 import json
 
-from api.oauth import OAuthManager, OAuthConfig
+from api.oauth import OAuthConfig
 from api.rest_client import EbayRestClient, RestConfig
 from api.errors import EbayApiError, extract_ebay_error_details, ValidationError as ApiValidationError
 from data_types import success_response, error_response, ErrorCode
@@ -144,13 +144,13 @@ async def get_merchandised_products(
         client_secret=mcp.config.cert_id,
         sandbox=mcp.config.sandbox_mode
     )
-    oauth_manager = OAuthManager(oauth_config)
+    oauth_manager = mcp.runtime.get_oauth_manager(oauth_config)
     
     rest_config = RestConfig(
         sandbox=mcp.config.sandbox_mode,
         rate_limit_per_day=mcp.config.rate_limit_per_day
     )
-    rest_client = EbayRestClient(oauth_manager, rest_config)
+    rest_client = EbayRestClient(oauth_manager, rest_config, session_provider=mcp.runtime.get_session)
     
     try:
         await ctx.report_progress(0.3, "🌐 Calling eBay Marketing API...")
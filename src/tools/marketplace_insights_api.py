@@ -5,17 +5,21 @@ Provides access to eBay's Buy Marketplace Insights API to retrieve
 historical sales data and market trends for specific items.
 """
 from typing import Dict, Any, Optional, List, Union, Literal
+import asyncio
 import json
 from fastmcp import Context
 from pydantic import BaseModel, Field, field_validator, ConfigDict
 import json
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from enum import Enum
 from urllib.parse import quote
 
-from api.oauth import OAuthManager, OAuthConfig, OAuthScopes
+from api.oauth import OAuthConfig, OAuthScopes
 from api.rest_client import EbayRestClient, RestConfig
-from api.errors import EbayApiError, extract_ebay_error_details, ValidationError as ApiValidationError
+from api.errors import EbayApiError, EbayApiException, RateLimitError, extract_ebay_error_details, ValidationError as ApiValidationError
+from api.pagination import DEFAULT_MAX_PAGES, MAX_OFFSET, MAX_PAGE_SIZE, FetchPage, fetch_pages, plan_pages
+from api.sales_stats import SalesStatistics
+from api.sales_history import INTERVALS, format_filter_date, get_sales_history_store, parse_date, series_key
 from data_types import success_response, error_response, ErrorCode
 from lootly_server import mcp
 
@@ -276,6 +280,10 @@ class FilterBuilder:
         return self.build() or ""
 
 
+# Sales read in statistics mode by default: DEFAULT_MAX_PAGES full pages
+DEFAULT_STATISTICS_SALES = DEFAULT_MAX_PAGES * MAX_PAGE_SIZE
+
+
 class ItemSalesSearchInput(BaseModel):
     """Input validation for item sales search request."""
     model_config = ConfigDict(str_strip_whitespace=True)
@@ -286,6 +294,8 @@ class ItemSalesSearchInput(BaseModel):
     sort: Optional[str] = Field(default=None, description="Sort order: 'price' (ascending) or '-price' (descending). If not specified, results are sorted by Best Match.")
     limit: int = Field(default=50, ge=1, le=200, description="Number of results to return")
     offset: int = Field(default=0, ge=0, description="Pagination offset")
+    statistics_mode: bool = Field(default=False, description="Return statistics over every page instead of one page of sales")
+    max_sales: int = Field(default=DEFAULT_STATISTICS_SALES, ge=1, le=MAX_OFFSET, description="Sales read in statistics mode")
     
     @field_validator('q')
     @classmethod
@@ -680,6 +690,70 @@ async def build_marketplace_filter(
     ).to_json_string()
 
 
+async def _collect_sales_statistics(
+    rest_client: EbayRestClient,
+    params: Dict[str, Any],
+    input_data: ItemSalesSearchInput,
+    ctx: Context
+) -> Dict[str, Any]:
+    """
+    Fold every page of an item sales search into streaming statistics.
+    
+    Pages are fetched concurrently (api.pagination) and each is reduced into
+    SalesStatistics as it arrives, so no page is kept once counted. If the
+    rate limiter runs out after the first page, the statistics cover the
+    pages read so far and are marked rate_limited.
+    """
+    async def fetch_page(offset: int, limit: int) -> Dict[str, Any]:
+        response = await rest_client.get(
+            "/buy/marketplace_insights/v1_beta/item_sales/search",
+            params={**params, "offset": offset, "limit": limit}
+        )
+        return response["body"]
+    
+    statistics = SalesStatistics()
+    total = 0
+    pages = 0
+    read = 0
+    rate_limited = False
+    # An explicit max_sales above the default is honored page for page
+    max_pages = -(-input_data.max_sales // MAX_PAGE_SIZE)
+    try:
+        async for page in fetch_pages(
+            fetch_page, input_data.offset, input_data.max_sales, MAX_PAGE_SIZE,
+            items_key="itemSales", max_pages=max_pages
+        ):
+            total = max(total, page.total)
+            pages += 1
+            for sale in page.items:
+                converted = _convert_item_sale(sale)
+                if "price" in converted:
+                    statistics.add(
+                        converted["price"]["value"],
+                        converted["price"]["currency"],
+                        converted.get("condition_name") or converted.get("condition"),
+                        converted.get("sold_date")
+                    )
+            read += len(page.items)
+            target = max(min(input_data.max_sales, min(total, MAX_OFFSET) - input_data.offset), 1)
+            await ctx.report_progress(0.3 + 0.6 * min(read / target, 1.0), f"📊 Read {read} sales")
+    except RateLimitError:
+        if not pages:
+            raise
+        rate_limited = True
+        await ctx.warning(f"Rate limit reached; statistics cover the first {read} sales read")
+    
+    return {
+        "statistics": statistics.summary(),
+        "total": total,
+        "sales_analyzed": read,
+        "pages_fetched": pages,
+        # eBay serves nothing past offset 10,000
+        "offset_capped": total > MAX_OFFSET and input_data.offset + input_data.max_sales >= MAX_OFFSET,
+        "rate_limited": rate_limited
+    }
+
+
 @mcp.tool
 async def search_item_sales(
     ctx: Context,
@@ -701,7 +775,9 @@ async def search_item_sales(
     item_location_country: Optional[str] = None,
     delivery_country: Optional[str] = None,
     charity_only: bool = False,
-    authenticity_guarantee: bool = False
+    authenticity_guarantee: bool = False,
+    statistics_mode: bool = False,
+    max_sales: int = DEFAULT_STATISTICS_SALES
 ) -> str:
     """
     Search for historical sales data of items on eBay.
@@ -757,6 +833,13 @@ async def search_item_sales(
         delivery_country: Delivery country filter
         charity_only: True to show only charity listings
         authenticity_guarantee: True to show only items with authenticity guarantee
+        statistics_mode: True to read every page (concurrently, from offset) and
+            return only statistics over the whole result set: p10/p25/p50/p75/p90,
+            outlier counts, a price histogram and per-condition and per-day groups.
+            limit is ignored in this mode.
+        max_sales: Sales to read in statistics mode (1-10000, default 5000). If the
+            rate limit runs out part way, statistics cover the sales read and
+            rate_limited is set
         ctx: MCP context
     
     Returns:
@@ -867,7 +950,9 @@ async def search_item_sales(
             filter=filter,
             sort=sort,
             limit=limit,
-            offset=offset
+            offset=offset,
+            statistics_mode=statistics_mode,
+            max_sales=max_sales
         )
         input_data.validate_search_criteria()
     except Exception as e:
@@ -891,13 +976,13 @@ async def search_item_sales(
         client_secret=mcp.config.cert_id,
         sandbox=mcp.config.sandbox_mode
     )
-    oauth_manager = OAuthManager(oauth_config)
+    oauth_manager = mcp.runtime.get_oauth_manager(oauth_config)
     
     rest_config = RestConfig(
         sandbox=mcp.config.sandbox_mode,
         rate_limit_per_day=mcp.config.rate_limit_per_day
     )
-    rest_client = EbayRestClient(oauth_manager, rest_config)
+    rest_client = EbayRestClient(oauth_manager, rest_config, session_provider=mcp.runtime.get_session)
     
     try:
         await ctx.report_progress(0.3, "🌐 Calling eBay Marketplace Insights API...")
@@ -918,6 +1003,22 @@ async def search_item_sales(
         if input_data.sort is not None:
             params["sort"] = input_data.sort
         
+        search_criteria = {
+            "q": input_data.q,
+            "category_ids": input_data.category_ids,
+            "filter": input_data.filter,
+            "sort": input_data.sort
+        }
+        
+        if input_data.statistics_mode:
+            result_data = await _collect_sales_statistics(rest_client, params, input_data, ctx)
+            await ctx.report_progress(1.0, "✅ Complete")
+            await ctx.info(f"📈 Analyzed {result_data['sales_analyzed']} of {result_data['total']} item sales")
+            return success_response(
+                data={**result_data, "search_criteria": search_criteria},
+                message=f"Computed statistics over {result_data['sales_analyzed']} item sales"
+            ).to_json_string()
+        
         # Make API request
         response = await rest_client.get(
             "/buy/marketplace_insights/v1_beta/item_sales/search",
@@ -957,12 +1058,7 @@ async def search_item_sales(
                 "limit": input_data.limit,
                 "offset": input_data.offset,
                 "statistics": stats,
-                "search_criteria": {
-                    "q": input_data.q,
-                    "category_ids": input_data.category_ids,
-                    "filter": input_data.filter,
-                    "sort": input_data.sort
-                },
+                "search_criteria": search_criteria,
                 "href": response_body.get("href"),
                 "next": response_body.get("next"),
                 "prev": response_body.get("prev")
@@ -1003,6 +1099,13 @@ async def search_item_sales(
                 e.get_full_error_details()
             ).to_json_string()
             
+    except RateLimitError as e:
+        await ctx.error(f"Rate limit reached: {e.message}")
+        return error_response(
+            ErrorCode.RATE_LIMIT_EXCEEDED,
+            e.message,
+            e.get_full_error_details()
+        ).to_json_string()
     except Exception as e:
         await ctx.error(f"Unexpected error: {str(e)}")
         return error_response(
@@ -1013,4 +1116,268 @@ async def search_item_sales(
     finally:
         # Clean up
         if 'rest_client' in locals():
-            await rest_client.close()
\ No newline at end of file
+            await rest_client.close()
+
+
+# Sales read per sold-date window of a history top-up; busier windows are
+# split in two, since eBay serves nothing past offset 10,000
+HISTORY_WINDOW_SALES = DEFAULT_MAX_PAGES * MAX_PAGE_SIZE
+
+# Pages read per top-up at most, across its date windows (see DEFAULT_MAX_PAGES)
+HISTORY_TOP_UP_PAGES = 2 * DEFAULT_MAX_PAGES
+
+# Windows shorter than this are read up to HISTORY_WINDOW_SALES rather than split
+HISTORY_MIN_WINDOW = timedelta(hours=1)
+
+
+async def _top_up_sales_history(
+    rest_client: EbayRestClient,
+    input_data: ItemSalesSearchInput,
+    key: str,
+    start: str
+) -> Dict[str, Any]:
+    """
+    Fetch sales sold since start into the sales history store.
+    
+    The sold-date range is read in windows, oldest first: a window whose
+    first page reports more than HISTORY_WINDOW_SALES sales is split in
+    two. Reading stops at HISTORY_TOP_UP_PAGES pages or when the rate
+    limiter runs out; the series is then recorded as complete only through
+    the last window read in full, so the next refresh resumes there. The
+    active listing count (a one-result Browse search on q and category_ids)
+    is fetched alongside.
+    """
+    params = {}
+    if input_data.q:
+        params["q"] = input_data.q
+    if input_data.category_ids:
+        params["category_ids"] = input_data.category_ids
+    
+    def window_fetcher(window_start: str, window_end: str) -> FetchPage:
+        date_filter = FilterBuilder().add_last_sold_date_range(window_start, window_end).build()
+        sales_params = {**params, "filter": ",".join(part for part in (input_data.filter, date_filter) if part)}
+        
+        async def fetch_page(offset: int, limit: int) -> Dict[str, Any]:
+            response = await rest_client.get(
+                "/buy/marketplace_insights/v1_beta/item_sales/search",
+                params={**sales_params, "offset": offset, "limit": limit}
+            )
+            return response["body"]
+        return fetch_page
+    
+    async def fetch_sales() -> Dict[str, Any]:
+        sales = []
+        # Later windows sit below earlier ones, so pop() reads the oldest next
+        windows = [(start, format_filter_date(datetime.now(timezone.utc)))]
+        pages = 0
+        truncated = 0
+        complete_through = None
+        rate_limited = False
+        try:
+            while windows and pages < HISTORY_TOP_UP_PAGES:
+                window_start, window_end = windows[-1]
+                fetch_page = window_fetcher(window_start, window_end)
+                first = await fetch_page(0, MAX_PAGE_SIZE)
+                pages += 1
+                total = first.get("total", 0)
+                
+                span = parse_date(window_end) - parse_date(window_start)
+                if total > HISTORY_WINDOW_SALES and span > HISTORY_MIN_WINDOW:
+                    middle = format_filter_date(parse_date(window_start) + span / 2)
+                    windows[-1:] = [(middle, window_end), (window_start, middle)]
+                    continue
+                
+                sales.extend(_convert_item_sale(sale) for sale in first.get("itemSales") or [])
+                remaining = min(total, HISTORY_WINDOW_SALES) - MAX_PAGE_SIZE
+                if remaining > 0:
+                    if pages + len(plan_pages(MAX_PAGE_SIZE, remaining)) > HISTORY_TOP_UP_PAGES:
+                        break
+                    async for page in fetch_pages(fetch_page, MAX_PAGE_SIZE, remaining, MAX_PAGE_SIZE, items_key="itemSales"):
+                        pages += 1
+                        sales.extend(_convert_item_sale(sale) for sale in page.items)
+                
+                if total > HISTORY_WINDOW_SALES:
+                    truncated += 1
+                complete_through = window_end
+                windows.pop()
+        except RateLimitError:
+            if not pages:
+                raise
+            rate_limited = True
+        
+        return {
+            "sales": sales,
+            "pages_fetched": pages,
+            "complete": not windows,
+            "complete_through": complete_through,
+            "truncated_windows": truncated,
+            "rate_limited": rate_limited
+        }
+    
+    async def fetch_active_total() -> Optional[int]:
+        if not params:
+            return None
+        try:
+            response = await rest_client.get("/buy/browse/v1/item_summary/search", params={**params, "limit": 1})
+            return response["body"].get("total", 0)
+        except EbayApiException:
+            # Sell-through is optional; the sales are what matter
+            return None
+    
+    fetched, active_total = await asyncio.gather(fetch_sales(), fetch_active_total())
+    new_sales = await get_sales_history_store().record_refresh_async(
+        key, input_data.q, input_data.category_ids, input_data.filter, fetched["sales"], active_total,
+        complete=fetched["complete"], complete_through=fetched["complete_through"]
+    )
+    return {
+        "from": start,
+        "fetched": len(fetched["sales"]),
+        "new_sales": new_sales,
+        "active_listings": active_total,
+        "pages_fetched": fetched["pages_fetched"],
+        # False when reading stopped early; the next refresh resumes after complete_through
+        "complete": fetched["complete"],
+        "complete_through": fetched["complete_through"],
+        # Windows of an hour or less holding more than HISTORY_WINDOW_SALES sales, read in part
+        "truncated_windows": fetched["truncated_windows"],
+        "rate_limited": fetched["rate_limited"]
+    }
+
+
+@mcp.tool
+async def get_sales_history(
+    ctx: Context,
+    q: Optional[str] = None,
+    category_ids: Optional[str] = None,
+    filter: Optional[str] = None,
+    interval: str = "day",
+    since: Optional[str] = None,
+    refresh: bool = True
+) -> str:
+    """
+    Get daily or weekly sales aggregates from the local sales history.
+    
+    Sales for a search are kept in a local store (LOOTLY_SALES_HISTORY_DIR),
+    so history reaches back past Marketplace Insights' 90-day window. A
+    refresh fetches only sales newer than the latest stored one, at most
+    once an hour per search; repeated calls are answered from the store.
+    A refresh cut short by the page budget or the rate limit reports
+    complete=False and the next call picks up where it stopped.
+    
+    Args:
+        q: Keyword search query (max 100 chars)
+        category_ids: Comma-separated category IDs
+        filter: Filter string, e.g. from build_marketplace_filter
+        interval: "day" or "week" (weeks start on Monday)
+        since: Earliest sold date to include (e.g. "2026-01-01")
+        refresh: Top up the store from eBay first if it is due
+        ctx: MCP context
+    
+    Returns:
+        JSON response with per-period sales, units sold, average, median,
+        min and max price and sell-through (units sold against active
+        listings recorded at each refresh)
+    """
+    try:
+        input_data = ItemSalesSearchInput(q=q, category_ids=category_ids, filter=filter)
+        input_data.validate_search_criteria()
+        if interval not in INTERVALS:
+            raise ValueError(f"Invalid interval. Must be one of: {', '.join(INTERVALS)}")
+    except Exception as e:
+        await ctx.error(f"Invalid input: {str(e)}")
+        return error_response(
+            ErrorCode.VALIDATION_ERROR,
+            f"Invalid input: {str(e)}"
+        ).to_json_string()
+    
+    store = get_sales_history_store()
+    if store is None:
+        return error_response(
+            ErrorCode.CONFIGURATION_ERROR,
+            "Sales history is not enabled. Please set LOOTLY_SALES_HISTORY_DIR environment variable."
+        ).to_json_string()
+    
+    key = series_key(input_data.q, input_data.category_ids, input_data.filter)
+    refresh_result = None
+    
+    start = await store.refresh_start_async(key) if refresh else None
+    if start:
+        # Check credentials
+        if not mcp.config.app_id:
+            await ctx.error("No eBay credentials configured")
+            return error_response(
+                ErrorCode.CONFIGURATION_ERROR,
+                "eBay App ID not configured. Please set EBAY_APP_ID environment variable."
+            ).to_json_string()
+        
+        # Initialize API clients
+        oauth_config = OAuthConfig(
+            client_id=mcp.config.app_id,
+            client_secret=mcp.config.cert_id,
+            sandbox=mcp.config.sandbox_mode
+        )
+        oauth_manager = mcp.runtime.get_oauth_manager(oauth_config)
+        
+        rest_config = RestConfig(
+            sandbox=mcp.config.sandbox_mode,
+            rate_limit_per_day=mcp.config.rate_limit_per_day
+        )
+        rest_client = EbayRestClient(oauth_manager, rest_config, session_provider=mcp.runtime.get_session)
+        
+        try:
+            await ctx.report_progress(0.2, f"🌐 Fetching sales since {start}...")
+            refresh_result = await _top_up_sales_history(rest_client, input_data, key, start)
+            await ctx.info(f"📥 Stored {refresh_result['new_sales']} new sales")
+            if not refresh_result["complete"]:
+                await ctx.warning(f"Sales read through {refresh_result['complete_through'] or start} only; the next refresh continues from there")
+        except RateLimitError as e:
+            await ctx.error(f"Rate limit reached: {e.message}")
+            return error_response(
+                ErrorCode.RATE_LIMIT_EXCEEDED,
+                e.message,
+                e.get_full_error_details()
+            ).to_json_string()
+        except EbayApiError as e:
+            await ctx.error(f"eBay API error: {e.get_comprehensive_message()}")
+            return error_response(
+                ErrorCode.EXTERNAL_API_ERROR,
+                e.get_comprehensive_message(),
+                e.get_full_error_details()
+            ).to_json_string()
+        except Exception as e:
+            await ctx.error(f"Unexpected error: {str(e)}")
+            return error_response(
+                ErrorCode.INTERNAL_ERROR,
+                f"Failed to refresh sales history: {str(e)}"
+            ).to_json_string()
+        finally:
+            await rest_client.close()
+    
+    try:
+        periods = await store.aggregate_async(key, interval, since)
+    except Exception as e:
+        await ctx.error(f"Unexpected error: {str(e)}")
+        return error_response(
+            ErrorCode.INTERNAL_ERROR,
+            f"Failed to read sales history: {str(e)}"
+        ).to_json_string()
+    
+    series = await asyncio.to_thread(store.get_series, key)
+    
+    await ctx.report_progress(1.0, "✅ Complete")
+    
+    return success_response(
+        data={
+            "interval": interval,
+            "periods": periods,
+            "search_criteria": {
+                "q": input_data.q,
+                "category_ids": input_data.category_ids,
+                "filter": input_data.filter
+            },
+            "newest_sold_date": series["newest_sold_date"] if series else None,
+            "refreshed_at": series["refreshed_at"] if series else None,
+            "refresh": refresh_result
+        },
+        message=f"Retrieved {len(periods)} {interval}s of sales history"
+    ).to_json_string()
@@ -15,16 +15,35 @@ IMPLEMENTATION FOLLOWS: PYDANTIC-FIRST DEVELOPMENT METHODOLOGY
 API Documentation: https://developer.ebay.com/api-docs/commerce/taxonomy/resources/methods
 OAuth Scope Required: https://api.ebay.com/oauth/api_scope/commerce.taxonomy (basic scope)
 """
-from typing import Optional
+import asyncio
+from typing import Any, Dict, List, Literal, Optional
 from fastmcp import Context
-from pydantic import BaseModel, Field, field_validator, ConfigDict
+from pydantic import BaseModel, Field, field_validator, model_validator, ConfigDict
 
-from api.oauth import OAuthManager, OAuthConfig, OAuthScopes
+from api.oauth import OAuthConfig, OAuthScopes, ConsentRequiredException
 from api.rest_client import EbayRestClient, RestConfig
-from api.errors import EbayApiError, extract_ebay_error_details
-from api.category_cache import get_category_tree_json, find_category_subtree
+from api.errors import EbayApiError, EbayApiException, RateLimitError, extract_ebay_error_details
+from api.category_cache import (
+    get_category_aspects,
+    get_category_tree_json,
+    get_expired_category_map,
+    find_category_subtree,
+    get_serialized_category_json,
+    cache_serialized_category_json
+)
+from api.category_index import get_category_index
+from api.category_remap import ExpiredCategoryMap
+from api.category_views import (
+    CATEGORY_FIELDS,
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    CategoryNotFoundError,
+    category_rows_view,
+    category_tree_view
+)
+from api.category_suggest import suggest_categories
 from api.ebay_enums import MarketplaceIdEnum
-from data_types import success_response, error_response, ErrorCode
+from data_types import success_response, success_response_raw, error_response, ErrorCode
 from lootly_server import mcp
 
 
@@ -41,6 +60,16 @@ class GetDefaultCategoryTreeIdInput(BaseModel):
     )
 
 
+def _validate_category_fields(v):
+    """Check a field projection against the available row fields."""
+    if v is None:
+        return v
+    unknown = [field for field in v if field not in CATEGORY_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown fields {unknown}; choose from {list(CATEGORY_FIELDS)}")
+    return v
+
+
 class GetCategoryTreeInput(BaseModel):
     """Input validation for getting category tree."""
     model_config = ConfigDict(str_strip_whitespace=True)
@@ -49,6 +78,52 @@ class GetCategoryTreeInput(BaseModel):
         default="0",
         description="Category tree ID (default '0' for US marketplace)"
     )
+    root_category_id: Optional[str] = Field(
+        default=None,
+        description="Only return the branch under this category"
+    )
+    max_depth: Optional[int] = Field(
+        default=None,
+        ge=0,
+        description="Levels below the root to include (0 = root only)"
+    )
+    fields: Optional[List[str]] = Field(
+        default=None,
+        description=f"Field projection, any of {list(CATEGORY_FIELDS)}"
+    )
+    output_format: Literal["tree", "rows", "table"] = Field(
+        default="tree",
+        description="tree: nested JSON; rows: flat page of objects; table: flat page of columns + rows"
+    )
+    limit: Optional[int] = Field(
+        default=None,
+        ge=1,
+        le=MAX_PAGE_SIZE,
+        description=f"Rows per page for rows/table output (default {DEFAULT_PAGE_SIZE})"
+    )
+    cursor: Optional[str] = Field(
+        default=None,
+        description="next_cursor from the previous rows/table page"
+    )
+    
+    @field_validator('fields')
+    @classmethod
+    def validate_fields(cls, v):
+        return _validate_category_fields(v)
+    
+    @model_validator(mode='after')
+    def validate_pagination(self):
+        if self.output_format == "tree" and (self.limit is not None or self.cursor):
+            raise ValueError("limit and cursor apply to rows/table output only")
+        return self
+    
+    @property
+    def is_full_tree(self) -> bool:
+        """Whether the complete raw tree was requested (no view options)."""
+        return (
+            self.root_category_id is None and self.max_depth is None
+            and not self.fields and self.output_format == "tree"
+        )
 
 
 class GetCategorySubtreeInput(BaseModel):
@@ -57,6 +132,20 @@ class GetCategorySubtreeInput(BaseModel):
     
     category_tree_id: str = Field(..., description="Category tree ID")
     category_id: str = Field(..., description="Parent category ID to get subtree from")
+    max_depth: Optional[int] = Field(
+        default=None,
+        ge=0,
+        description="Levels below the category to include (0 = category only)"
+    )
+    fields: Optional[List[str]] = Field(
+        default=None,
+        description=f"Field projection, any of {list(CATEGORY_FIELDS)}"
+    )
+    
+    @field_validator('fields')
+    @classmethod
+    def validate_fields(cls, v):
+        return _validate_category_fields(v)
     
     @field_validator('category_id')
     @classmethod
@@ -72,6 +161,10 @@ class GetCategorySuggestionsInput(BaseModel):
     
     category_tree_id: str = Field(..., description="Category tree ID")
     q: str = Field(..., description="Query string for category search", min_length=1)
+    use_local_index: bool = Field(
+        default=True,
+        description="Answer from the cached category tree when confident, calling eBay only otherwise"
+    )
     
     @field_validator('q')
     @classmethod
@@ -81,6 +174,25 @@ class GetCategorySuggestionsInput(BaseModel):
         return v.strip()
 
 
+class GetItemAspectsForCategoryInput(BaseModel):
+    """Input validation for getting item aspects for a category."""
+    model_config = ConfigDict(str_strip_whitespace=True)
+    
+    category_tree_id: str = Field(..., description="Category tree ID")
+    category_id: str = Field(..., description="Leaf category ID")
+    use_local_index: bool = Field(
+        default=True,
+        description="Answer from the cached bulk aspects file, calling eBay only on a miss"
+    )
+    
+    @field_validator('category_id')
+    @classmethod
+    def validate_category_id(cls, v):
+        if not v or not v.strip():
+            raise ValueError("Category ID cannot be empty")
+        return v.strip()
+
+
 class GetExpiredCategoriesInput(BaseModel):
     """Input validation for getting expired categories."""
     model_config = ConfigDict(str_strip_whitespace=True)
@@ -92,6 +204,110 @@ class GetExpiredCategoriesInput(BaseModel):
     )
 
 
+class RemapExpiredCategoriesInput(BaseModel):
+    """Input validation for batch remapping of expired categories."""
+    model_config = ConfigDict(str_strip_whitespace=True)
+    
+    category_tree_id: str = Field(..., description="Category tree ID")
+    category_ids: Optional[List[str]] = Field(
+        default=None,
+        max_length=50000,
+        description="Category IDs to remap"
+    )
+    skus: Optional[List[str]] = Field(
+        default=None,
+        max_length=50000,
+        description="Inventory SKUs whose offers should be checked"
+    )
+    marketplace_id: MarketplaceIdEnum = Field(
+        default=MarketplaceIdEnum.EBAY_US,
+        description="eBay marketplace ID"
+    )
+    apply_updates: bool = Field(
+        default=False,
+        description="Update offers in expired categories to their replacements"
+    )
+    
+    @model_validator(mode='after')
+    def validate_targets(self):
+        if not self.category_ids and not self.skus:
+            raise ValueError("Provide category_ids and/or skus to remap")
+        if self.apply_updates and not self.skus:
+            raise ValueError("apply_updates requires skus")
+        return self
+
+
+# Offers looked up (and updated) concurrently per chunk of SKUs
+REMAP_CHUNK_SIZE = 25
+
+# getOffer fields that updateOffer does not accept
+_OFFER_READ_ONLY_FIELDS = ("offerId", "sku", "marketplaceId", "format", "status", "listing")
+
+
+def _error_message(e: Exception) -> str:
+    """Readable message for a per-SKU failure."""
+    if isinstance(e, EbayApiError):
+        return e.get_comprehensive_message()
+    if isinstance(e, EbayApiException):
+        return e.message
+    return str(e)
+
+
+async def _remap_sku_offers(
+    rest_client: EbayRestClient,
+    sku: str,
+    marketplace_id: str,
+    expired_map: ExpiredCategoryMap,
+    apply_updates: bool
+) -> List[Dict[str, Any]]:
+    """
+    Find a SKU's offers listed in expired categories, updating them if asked.
+    
+    Raises:
+        RateLimitError: The offer lookup was rejected by the rate limiter, so
+            the SKU was not checked
+    """
+    try:
+        response = await rest_client.get(
+            "/sell/inventory/v1/offer",
+            params={"sku": sku, "marketplace_id": marketplace_id}
+        )
+    except RateLimitError:
+        raise
+    except EbayApiException as e:
+        return [{"sku": sku, "error": _error_message(e)}]
+    
+    results = []
+    for offer in response["body"].get("offers") or []:
+        changes = {
+            field: expired_map.resolve(offer[field])
+            for field in ("categoryId", "secondaryCategoryId")
+            if offer.get(field) in expired_map
+        }
+        if not changes:
+            continue
+        
+        result = {
+            "sku": sku,
+            "offerId": offer.get("offerId"),
+            "from": {field: offer[field] for field in changes},
+            "to": changes,
+            "updated": False
+        }
+        if apply_updates:
+            offer_data = {key: value for key, value in offer.items() if key not in _OFFER_READ_ONLY_FIELDS}
+            offer_data.update(changes)
+            try:
+                await rest_client.put(f"/sell/inventory/v1/offer/{offer['offerId']}", json=offer_data)
+                result["updated"] = True
+            except EbayApiException as e:
+                result["error"] = _error_message(e)
+                if isinstance(e, RateLimitError):
+                    result["rate_limited"] = True
+        results.append(result)
+    return results
+
+
 # MCP TOOLS - Pydantic Models → MCP Tools → API Integration
 
 
@@ -139,13 +355,13 @@ async def get_default_category_tree_id(
         client_secret=mcp.config.cert_id,
         sandbox=mcp.config.sandbox_mode
     )
-    oauth_manager = OAuthManager(oauth_config)
+    oauth_manager = mcp.runtime.get_oauth_manager(oauth_config)
     
     rest_config = RestConfig(
         sandbox=mcp.config.sandbox_mode,
         rate_limit_per_day=mcp.config.rate_limit_per_day
     )
-    rest_client = EbayRestClient(oauth_manager, rest_config)
+    rest_client = EbayRestClient(oauth_manager, rest_config, session_provider=mcp.runtime.get_session)
     
     try:
         # Get default category tree ID
@@ -191,36 +407,58 @@ async def get_default_category_tree_id(
 @mcp.tool
 async def get_category_tree(
     ctx: Context,
-    category_tree_id: str = "0"
+    category_tree_id: str = "0",
+    root_category_id: Optional[str] = None,
+    max_depth: Optional[int] = None,
+    fields: Optional[List[str]] = None,
+    output_format: Literal["tree", "rows", "table"] = "tree",
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None
 ) -> str:
     """
-    Get the complete eBay category tree as raw JSON for LLM analysis.
+    Get the eBay category tree as raw JSON for LLM analysis.
     
-    Returns complete category hierarchy (17,000+ categories). LLMs can process 
-    this JSON directly to find the best category match or understand the hierarchy 
-    structure. Uses efficient caching with 24-hour TTL.
+    With no options, returns the complete category hierarchy (17,000+
+    categories) as raw JSON. That is megabytes of output, so prefer walking
+    the tree incrementally with the options below. Uses efficient caching
+    with version-aware refresh.
     
     To use this tool:
     1. First call get_default_category_tree_id with your marketplace
     2. Then call this tool with the category_tree_id from step 1
     
     Usage for LLMs:
-    - Process the raw JSON to find best category matches
-    - Use the hierarchy to understand parent/child relationships
-    - All 17k+ categories included for comprehensive search
+    - Start with max_depth=1 to see the top-level categories
+    - Drill into a branch with root_category_id and a small max_depth
+    - Use output_format="table" with fields to page through many categories
+      cheaply, passing next_cursor back as cursor until it is null
     
     Args:
         category_tree_id: Category tree ID from get_default_category_tree_id
+        root_category_id: Only return the branch under this category
+        max_depth: Levels below the root to include (0 = root only)
+        fields: Projection, any of id, parent_id, name, leaf, depth
+        output_format: tree (nested), rows (flat objects) or table (columns + rows)
+        limit: Rows per page for rows/table output (default 500, max 5000)
+        cursor: next_cursor from the previous rows/table page
         ctx: MCP context
     
     Returns:
-        Raw JSON with complete category data for LLM processing
+        Raw JSON category data, or a page of rows with next_cursor
     """
-    await ctx.info(f"Getting full category tree {category_tree_id}")
+    await ctx.info(f"Getting category tree {category_tree_id}")
     
     # Validate input
     try:
-        input_data = GetCategoryTreeInput(category_tree_id=category_tree_id)
+        input_data = GetCategoryTreeInput(
+            category_tree_id=category_tree_id,
+            root_category_id=root_category_id,
+            max_depth=max_depth,
+            fields=fields,
+            output_format=output_format,
+            limit=limit,
+            cursor=cursor
+        )
     except Exception as e:
         await ctx.error(f"Validation error: {str(e)}")
         return error_response(
@@ -242,13 +480,13 @@ async def get_category_tree(
             client_secret=mcp.config.cert_id,
             sandbox=mcp.config.sandbox_mode
         )
-        oauth_manager = OAuthManager(oauth_config)
+        oauth_manager = mcp.runtime.get_oauth_manager(oauth_config)
         
         rest_config = RestConfig(
             sandbox=mcp.config.sandbox_mode,
             rate_limit_per_day=mcp.config.rate_limit_per_day
         )
-        rest_client = EbayRestClient(oauth_manager, rest_config)
+        rest_client = EbayRestClient(oauth_manager, rest_config, session_provider=mcp.runtime.get_session)
         
         try:
             # Get raw category tree JSON from cache or API
@@ -258,12 +496,24 @@ async def get_category_tree(
                 category_tree_id=input_data.category_tree_id
             )
             
-            await ctx.info(f"Retrieved full category tree with {len(str(category_tree_json))} characters")
+            if not input_data.is_full_tree:
+                return await _category_tree_view_response(ctx, input_data, category_tree_json)
             
-            return success_response(
-                data=category_tree_json,  # Complete raw JSON
+            # Reuse the serialized tree for this version when available
+            serialized = await get_serialized_category_json(
+                category_tree_json, input_data.category_tree_id
+            )
+            if serialized is None:
+                serialized = await cache_serialized_category_json(
+                    category_tree_json, category_tree_json, input_data.category_tree_id
+                )
+            
+            await ctx.info(f"Retrieved full category tree with {len(serialized)} bytes")
+            
+            return success_response_raw(
+                serialized,  # Complete raw JSON
                 message="Complete eBay category tree for LLM processing"
-            ).to_json_string()
+            )
         
         finally:
             await rest_client.close()
@@ -276,11 +526,46 @@ async def get_category_tree(
         ).to_json_string()
 
 
+async def _category_tree_view_response(ctx: Context, input_data: GetCategoryTreeInput, category_tree_json) -> str:
+    """Build a depth-limited, projected or paginated category tree response."""
+    compact_tree = get_category_index(category_tree_json).tree
+    try:
+        if input_data.output_format == "tree":
+            data = category_tree_view(
+                compact_tree,
+                root_category_id=input_data.root_category_id,
+                max_depth=input_data.max_depth,
+                fields=input_data.fields
+            )
+        else:
+            data = category_rows_view(
+                compact_tree,
+                root_category_id=input_data.root_category_id,
+                max_depth=input_data.max_depth,
+                fields=input_data.fields,
+                limit=input_data.limit or DEFAULT_PAGE_SIZE,
+                cursor=input_data.cursor,
+                tabular=input_data.output_format == "table"
+            )
+    except CategoryNotFoundError as e:
+        return error_response(ErrorCode.RESOURCE_NOT_FOUND, str(e)).to_json_string()
+    except ValueError as e:
+        return error_response(ErrorCode.VALIDATION_ERROR, str(e)).to_json_string()
+    
+    await ctx.info(f"Retrieved {input_data.output_format} view of category tree {input_data.category_tree_id}")
+    return await success_response(
+        data=data,
+        message=f"Category tree {input_data.output_format} view"
+    ).to_json_string_async()
+
+
 @mcp.tool
 async def get_category_subtree(
     ctx: Context,
     category_tree_id: str,
-    category_id: str
+    category_id: str,
+    max_depth: Optional[int] = None,
+    fields: Optional[List[str]] = None
 ) -> str:
     """
     Get a specific category subtree for efficient navigation.
@@ -296,6 +581,8 @@ async def get_category_subtree(
     Args:
         category_tree_id: Category tree ID from get_default_category_tree_id
         category_id: Parent category ID to get subtree from
+        max_depth: Levels below the category to include (0 = category only)
+        fields: Projection, any of id, parent_id, name, leaf, depth
         ctx: MCP context
     
     Returns:
@@ -307,7 +594,9 @@ async def get_category_subtree(
     try:
         input_data = GetCategorySubtreeInput(
             category_tree_id=category_tree_id,
-            category_id=category_id
+            category_id=category_id,
+            max_depth=max_depth,
+            fields=fields
         )
     except Exception as e:
         await ctx.error(f"Validation error: {str(e)}")
@@ -330,13 +619,13 @@ async def get_category_subtree(
             client_secret=mcp.config.cert_id,
             sandbox=mcp.config.sandbox_mode
         )
-        oauth_manager = OAuthManager(oauth_config)
+        oauth_manager = mcp.runtime.get_oauth_manager(oauth_config)
         
         rest_config = RestConfig(
             sandbox=mcp.config.sandbox_mode,
             rate_limit_per_day=mcp.config.rate_limit_per_day
         )
-        rest_client = EbayRestClient(oauth_manager, rest_config)
+        rest_client = EbayRestClient(oauth_manager, rest_config, session_provider=mcp.runtime.get_session)
         
         try:
             # First get the full tree from cache
@@ -346,20 +635,44 @@ async def get_category_subtree(
                 category_tree_id=input_data.category_tree_id
             )
             
-            # Find subtree for specific category
-            subtree_json = find_category_subtree(category_tree_json, input_data.category_id)
-            if not subtree_json:
-                return error_response(
-                    ErrorCode.NOT_FOUND_ERROR,
-                    f"Category {input_data.category_id} not found in tree"
-                ).to_json_string()
+            if input_data.max_depth is not None or input_data.fields:
+                return await _category_tree_view_response(
+                    ctx,
+                    GetCategoryTreeInput(
+                        category_tree_id=input_data.category_tree_id,
+                        root_category_id=input_data.category_id,
+                        max_depth=input_data.max_depth,
+                        fields=input_data.fields
+                    ),
+                    category_tree_json
+                )
+            
+            # Reuse the serialized subtree for this version when available
+            serialized = await get_serialized_category_json(
+                category_tree_json, input_data.category_tree_id, input_data.category_id
+            )
+            if serialized is None:
+                # Find subtree for specific category
+                subtree_json = find_category_subtree(category_tree_json, input_data.category_id)
+                if not subtree_json:
+                    return error_response(
+                        ErrorCode.RESOURCE_NOT_FOUND,
+                        f"Category {input_data.category_id} not found in tree"
+                    ).to_json_string()
+                
+                serialized = await cache_serialized_category_json(
+                    subtree_json,
+                    category_tree_json,
+                    input_data.category_tree_id,
+                    input_data.category_id
+                )
             
             await ctx.info(f"Retrieved subtree for category {input_data.category_id}")
             
-            return success_response(
-                data=subtree_json,  # Raw JSON subtree
+            return success_response_raw(
+                serialized,  # Raw JSON subtree
                 message=f"Category subtree for {input_data.category_id}"
-            ).to_json_string()
+            )
         
         finally:
             await rest_client.close()
@@ -376,13 +689,17 @@ async def get_category_subtree(
 async def get_category_suggestions(
     ctx: Context,
     category_tree_id: str,
-    q: str
+    q: str,
+    use_local_index: bool = True
 ) -> str:
     """
     Get category suggestions based on a search query.
     
     Returns suggested categories that match the search query. This helps sellers 
     find the most appropriate category for their items by searching with keywords.
+    Suggestions are answered from a local index over the cached category tree;
+    eBay's get_category_suggestions endpoint is only called when the local
+    match is not confident (metadata.source tells which one answered).
     
     To use this tool:
     1. First call get_default_category_tree_id with your marketplace
@@ -391,6 +708,7 @@ async def get_category_suggestions(
     Args:
         category_tree_id: Category tree ID from get_default_category_tree_id
         q: Query string for category search
+        use_local_index: Set False to always ask eBay's live endpoint
         ctx: MCP context
     
     Returns:
@@ -402,7 +720,8 @@ async def get_category_suggestions(
     try:
         input_data = GetCategorySuggestionsInput(
             category_tree_id=category_tree_id,
-            q=q
+            q=q,
+            use_local_index=use_local_index
         )
     except Exception as e:
         await ctx.error(f"Validation error: {str(e)}")
@@ -424,15 +743,38 @@ async def get_category_suggestions(
         client_secret=mcp.config.cert_id,
         sandbox=mcp.config.sandbox_mode
     )
-    oauth_manager = OAuthManager(oauth_config)
+    oauth_manager = mcp.runtime.get_oauth_manager(oauth_config)
     
     rest_config = RestConfig(
         sandbox=mcp.config.sandbox_mode,
         rate_limit_per_day=mcp.config.rate_limit_per_day
     )
-    rest_client = EbayRestClient(oauth_manager, rest_config)
+    rest_client = EbayRestClient(oauth_manager, rest_config, session_provider=mcp.runtime.get_session)
     
     try:
+        if input_data.use_local_index:
+            local_suggestions = None
+            try:
+                category_tree_json = await get_category_tree_json(
+                    oauth_manager,
+                    rest_client,
+                    category_tree_id=input_data.category_tree_id
+                )
+                local_suggestions = suggest_categories(
+                    get_category_index(category_tree_json),
+                    input_data.q
+                )
+            except Exception as e:
+                await ctx.info(f"Local category index unavailable, using eBay: {str(e)}")
+            
+            if local_suggestions:
+                await ctx.info(f"Found {len(local_suggestions['categorySuggestions'])} category suggestions locally")
+                return success_response(
+                    data=local_suggestions,
+                    message=f"Category suggestions for '{input_data.q}'",
+                    metadata={"source": "local_index"}
+                ).to_json_string()
+        
         # Get category suggestions
         response = await rest_client.get(
             f"/commerce/taxonomy/v1/category_tree/{input_data.category_tree_id}/get_category_suggestions",
@@ -444,7 +786,8 @@ async def get_category_suggestions(
         
         return success_response(
             data=response_body,  # Raw API response
-            message=f"Category suggestions for '{input_data.q}'"
+            message=f"Category suggestions for '{input_data.q}'",
+            metadata={"source": "ebay_api"}
         ).to_json_string()
         
     except EbayApiError as e:
@@ -520,21 +863,22 @@ async def get_expired_categories(
         client_secret=mcp.config.cert_id,
         sandbox=mcp.config.sandbox_mode
     )
-    oauth_manager = OAuthManager(oauth_config)
+    oauth_manager = mcp.runtime.get_oauth_manager(oauth_config)
     
     rest_config = RestConfig(
         sandbox=mcp.config.sandbox_mode,
         rate_limit_per_day=mcp.config.rate_limit_per_day
     )
-    rest_client = EbayRestClient(oauth_manager, rest_config)
+    rest_client = EbayRestClient(oauth_manager, rest_config, session_provider=mcp.runtime.get_session)
     
     try:
-        # Get expired categories
-        response = await rest_client.get(
-            f"/commerce/taxonomy/v1/category_tree/{input_data.category_tree_id}/get_expired_categories",
-            params={"marketplace_id": input_data.marketplace_id.value}
+        # Get expired categories (cached per tree and marketplace)
+        expired_map = await get_expired_category_map(
+            rest_client,
+            input_data.category_tree_id,
+            input_data.marketplace_id.value
         )
-        response_body = response["body"]
+        response_body = expired_map.response
         
         expired_count = len(response_body.get("expiredCategories", []))
         await ctx.info(f"Found {expired_count} expired categories")
@@ -561,4 +905,312 @@ async def get_expired_categories(
             f"Failed to get expired categories: {str(e)}"
         ).to_json_string()
     finally:
-        await rest_client.close()
\ No newline at end of file
+        await rest_client.close()
+
+
+@mcp.tool
+async def remap_expired_categories(
+    ctx: Context,
+    category_tree_id: str,
+    category_ids: Optional[List[str]] = None,
+    skus: Optional[List[str]] = None,
+    marketplace_id: MarketplaceIdEnum = MarketplaceIdEnum.EBAY_US,
+    apply_updates: bool = False
+) -> str:
+    """
+    Remap many categories or SKUs from expired categories to their replacements.
+    
+    Category IDs are remapped in one pass against the cached expired category
+    map, following chains of replacements. For SKUs, each SKU's offers are
+    looked up in chunks of 25 concurrent calls and those listed in an
+    expired primary or secondary category are reported; with apply_updates
+    they are also updated to the replacement category. When the rate limit
+    runs out no further chunks are sent; the SKUs left are returned in
+    unchecked_skus to submit again later.
+    
+    To use this tool:
+    1. First call get_default_category_tree_id with your marketplace
+    2. Then call this tool with the category_tree_id from step 1
+    
+    Args:
+        category_tree_id: Category tree ID from get_default_category_tree_id
+        category_ids: Category IDs to remap
+        skus: Inventory SKUs whose offers should be checked (needs sell.inventory consent)
+        marketplace_id: eBay marketplace ID
+        apply_updates: Update the affected offers instead of only reporting them
+        ctx: MCP context
+    
+    Returns:
+        JSON response with remapped categories, affected offers and a summary
+    """
+    await ctx.info(f"Remapping expired categories for tree {category_tree_id} in {marketplace_id.value}")
+    
+    # Validate input
+    try:
+        input_data = RemapExpiredCategoriesInput(
+            category_tree_id=category_tree_id,
+            category_ids=category_ids,
+            skus=skus,
+            marketplace_id=marketplace_id,
+            apply_updates=apply_updates
+        )
+    except Exception as e:
+        await ctx.error(f"Validation error: {str(e)}")
+        return error_response(
+            ErrorCode.VALIDATION_ERROR,
+            str(e)
+        ).to_json_string()
+    
+    # Check credentials
+    if not mcp.config.app_id or not mcp.config.cert_id:
+        return error_response(
+            ErrorCode.CONFIGURATION_ERROR,
+            "eBay API credentials required for category tree access. Get credentials from https://developer.ebay.com/my/keys"
+        ).to_json_string()
+    
+    # Initialize API clients
+    oauth_config = OAuthConfig(
+        client_id=mcp.config.app_id,
+        client_secret=mcp.config.cert_id,
+        sandbox=mcp.config.sandbox_mode
+    )
+    oauth_manager = mcp.runtime.get_oauth_manager(oauth_config)
+    
+    rest_config = RestConfig(
+        sandbox=mcp.config.sandbox_mode,
+        rate_limit_per_day=mcp.config.rate_limit_per_day
+    )
+    rest_client = EbayRestClient(oauth_manager, rest_config, session_provider=mcp.runtime.get_session)
+    
+    try:
+        expired_map = await get_expired_category_map(
+            rest_client,
+            input_data.category_tree_id,
+            input_data.marketplace_id.value
+        )
+        
+        categories = expired_map.remap(input_data.category_ids or [])
+        summary = {
+            "expired_categories_known": len(expired_map),
+            "categories_checked": len(categories),
+            "categories_expired": sum(1 for category in categories if category["expired"])
+        }
+        
+        offers = []
+        unchecked_skus = []
+        if input_data.skus:
+            skus = list(dict.fromkeys(input_data.skus))
+            rate_limited = False
+            for start in range(0, len(skus), REMAP_CHUNK_SIZE):
+                chunk = skus[start:start + REMAP_CHUNK_SIZE]
+                results = await asyncio.gather(*(
+                    _remap_sku_offers(
+                        rest_client,
+                        sku,
+                        input_data.marketplace_id.value,
+                        expired_map,
+                        input_data.apply_updates
+                    )
+                    for sku in chunk
+                ), return_exceptions=True)
+                
+                # Every other SKU would fail the same way; the tool returns the consent URL
+                consent_error = next((result for result in results if isinstance(result, ConsentRequiredException)), None)
+                if consent_error is not None:
+                    raise consent_error
+                
+                # Every SKU gets a result, so offers already updated are always reported
+                for sku, result in zip(chunk, results):
+                    if isinstance(result, RateLimitError):
+                        rate_limited = True
+                        unchecked_skus.append(sku)
+                    elif isinstance(result, Exception):
+                        offers.append({"sku": sku, "error": _error_message(result)})
+                    else:
+                        rate_limited = rate_limited or any(offer.get("rate_limited") for offer in result)
+                        offers.extend(result)
+                done = start + len(chunk)
+                await ctx.report_progress(done / len(skus), f"Checked offers for {done}/{len(skus)} SKUs")
+                
+                # Out of rate limit tokens: stop instead of failing every remaining call
+                if rate_limited:
+                    unchecked_skus.extend(skus[done:])
+                    await ctx.warning(f"Rate limit reached; {len(unchecked_skus)} SKUs left unchecked")
+                    break
+            
+            summary.update({
+                "skus_checked": len(skus) - len(unchecked_skus),
+                "skus_unchecked": len(unchecked_skus),
+                "offers_in_expired_categories": sum(1 for offer in offers if "offerId" in offer),
+                "offers_updated": sum(1 for offer in offers if offer.get("updated")),
+                "errors": sum(1 for offer in offers if "error" in offer),
+                "rate_limited": rate_limited
+            })
+        
+        message = f"{summary['categories_expired']} of {summary['categories_checked']} categories expired"
+        if input_data.skus:
+            message += f", {summary['offers_in_expired_categories']} offers in expired categories"
+        if unchecked_skus:
+            message += f", {len(unchecked_skus)} SKUs unchecked (rate limited)"
+        await ctx.info(message)
+        
+        return success_response(
+            data={"categories": categories, "offers": offers, "unchecked_skus": unchecked_skus, "summary": summary},
+            message=message
+        ).to_json_string()
+        
+    except ConsentRequiredException as e:
+        await ctx.warning("User consent required for sell.inventory scope")
+        return error_response(
+            ErrorCode.AUTHENTICATION_ERROR,
+            "User consent required for sell.inventory scope",
+            {"consent_url": str(e), "scope_required": "sell.inventory"}
+        ).to_json_string()
+    except EbayApiError as e:
+        await ctx.error(f"eBay API error: {e.get_comprehensive_message()}")
+        error_details = e.get_full_error_details()
+        error_details["marketplace_id"] = input_data.marketplace_id.value
+        
+        return error_response(
+            ErrorCode.EXTERNAL_API_ERROR,
+            e.get_comprehensive_message(),
+            error_details
+        ).to_json_string()
+    except RateLimitError as e:
+        await ctx.error(f"Rate limit reached: {e.message}")
+        return error_response(
+            ErrorCode.RATE_LIMIT_EXCEEDED,
+            e.message,
+            e.get_full_error_details()
+        ).to_json_string()
+    except Exception as e:
+        await ctx.error(f"Failed to remap expired categories: {str(e)}")
+        return error_response(
+            ErrorCode.INTERNAL_ERROR,
+            f"Failed to remap expired categories: {str(e)}"
+        ).to_json_string()
+    finally:
+        await rest_client.close()
+
+
+@mcp.tool
+async def get_item_aspects_for_category(
+    ctx: Context,
+    category_tree_id: str,
+    category_id: str,
+    use_local_index: bool = True
+) -> str:
+    """
+    Get the item aspects (item specifics) for a leaf category.
+    
+    Returns the aspects eBay defines for listings in the category, with their
+    required/recommended usage, data types and allowed values. Aspects for
+    every leaf of the tree are downloaded once from eBay's fetch_item_aspects
+    bulk file and served locally until the category tree version changes;
+    eBay's get_item_aspects_for_category endpoint is only called when the
+    category is missing locally (metadata.source tells which one answered).
+    
+    To use this tool:
+    1. First call get_default_category_tree_id with your marketplace
+    2. Then call this tool with the category_tree_id from step 1
+    
+    Args:
+        category_tree_id: Category tree ID from get_default_category_tree_id
+        category_id: Leaf category ID
+        use_local_index: Set False to always ask eBay's live endpoint
+        ctx: MCP context
+    
+    Returns:
+        JSON response with the category's aspects
+    """
+    await ctx.info(f"Getting item aspects for category {category_id} in tree {category_tree_id}")
+    
+    # Validate input
+    try:
+        input_data = GetItemAspectsForCategoryInput(
+            category_tree_id=category_tree_id,
+            category_id=category_id,
+            use_local_index=use_local_index
+        )
+    except Exception as e:
+        await ctx.error(f"Validation error: {str(e)}")
+        return error_response(
+            ErrorCode.VALIDATION_ERROR,
+            str(e)
+        ).to_json_string()
+    
+    # Check credentials
+    if not mcp.config.app_id or not mcp.config.cert_id:
+        return error_response(
+            ErrorCode.CONFIGURATION_ERROR,
+            "eBay API credentials required for category tree access. Get credentials from https://developer.ebay.com/my/keys"
+        ).to_json_string()
+    
+    # Initialize API clients
+    oauth_config = OAuthConfig(
+        client_id=mcp.config.app_id,
+        client_secret=mcp.config.cert_id,
+        sandbox=mcp.config.sandbox_mode
+    )
+    oauth_manager = mcp.runtime.get_oauth_manager(oauth_config)
+    
+    rest_config = RestConfig(
+        sandbox=mcp.config.sandbox_mode,
+        rate_limit_per_day=mcp.config.rate_limit_per_day
+    )
+    rest_client = EbayRestClient(oauth_manager, rest_config, session_provider=mcp.runtime.get_session)
+    
+    try:
+        if input_data.use_local_index:
+            aspects = None
+            try:
+                aspects_index = await get_category_aspects(
+                    oauth_manager,
+                    rest_client,
+                    category_tree_id=input_data.category_tree_id
+                )
+                aspects = aspects_index.get_aspects(input_data.category_id)
+            except Exception as e:
+                await ctx.info(f"Bulk item aspects unavailable, using eBay: {str(e)}")
+            
+            if aspects is not None:
+                await ctx.info(f"Found {len(aspects)} aspects locally")
+                return success_response(
+                    data={"aspects": aspects},
+                    message=f"Item aspects for category {input_data.category_id}",
+                    metadata={"source": "local_index", "categoryTreeVersion": aspects_index.version}
+                ).to_json_string()
+        
+        # Get item aspects for the category
+        response = await rest_client.get(
+            f"/commerce/taxonomy/v1/category_tree/{input_data.category_tree_id}/get_item_aspects_for_category",
+            params={"category_id": input_data.category_id}
+        )
+        response_body = response["body"]
+        
+        await ctx.info(f"Found {len(response_body.get('aspects', []))} aspects")
+        
+        return success_response(
+            data=response_body,  # Raw API response
+            message=f"Item aspects for category {input_data.category_id}",
+            metadata={"source": "ebay_api"}
+        ).to_json_string()
+        
+    except EbayApiError as e:
+        await ctx.error(f"eBay API error: {e.get_comprehensive_message()}")
+        error_details = e.get_full_error_details()
+        error_details["category_id"] = input_data.category_id
+        
+        return error_response(
+            ErrorCode.EXTERNAL_API_ERROR,
+            e.get_comprehensive_message(),
+            error_details
+        ).to_json_string()
+    except Exception as e:
+        await ctx.error(f"Failed to get item aspects: {str(e)}")
+        return error_response(
+            ErrorCode.INTERNAL_ERROR,
+            f"Failed to get item aspects: {str(e)}"
+        ).to_json_string()
+    finally:
+        await rest_client.close()
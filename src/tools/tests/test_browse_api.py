@@ -19,6 +19,7 @@ TEST METHODOLOGY:
 
 Professional implementation - no emojis, professional output only.
 """
+import asyncio
 import json
 import pytest
 import os
@@ -27,13 +28,18 @@ from unittest.mock import AsyncMock, patch
 
 from tools.browse_api import (
     search_items,
+    batch_search_items,
+    bulk_get_item_details,
     get_item_details,
     get_items_by_category,
     BrowseSearchInput,
+    BatchSearchInput,
     ItemDetailsInput,
     CategoryBrowseInput
 )
 from api.errors import EbayApiError
+from api.pagination import DEFAULT_MAX_PAGES
+from api.rate_limiter import TokenBucketLimiter
 from tools.tests.test_data import (
     TestDataBrowse,
     TestDataError
@@ -183,6 +189,10 @@ class TestBrowseAPI:
                 price_min=Decimal("200.00"),
                 price_max=Decimal("100.00")
             )
+        
+        # Price bucket edges must ascend
+        with pytest.raises(ValueError, match="price_buckets must be strictly ascending"):
+            CategoryBrowseInput(category_id="9355", price_buckets=["100", "50"])
     
     # ==============================================================================
     # SEARCH ITEMS TESTS
@@ -360,7 +370,6 @@ class TestBrowseAPI:
         else:
             # Unit test with empty response
             with patch('tools.browse_api.EbayRestClient') as MockClient, \
-                 patch('tools.browse_api.OAuthManager') as MockOAuth, \
                  patch('tools.browse_api.mcp.config') as MockConfig:
                 
                 # Setup all mocks
@@ -640,6 +649,374 @@ class TestBrowseAPI:
                 assert "categoryIds:{9355}" in filter_str
                 assert "price:[100.00..500.00]" in filter_str
     
+    @pytest.mark.asyncio
+    async def test_get_items_by_category_refinements_only(self, mock_context):
+        """Test refinements mode returns compact facets without items and caches them."""
+        if self.is_integration_mode:
+            pytest.skip("Refinement caching is unit test only")
+        
+        from api.cache import HybridCacheManager
+        category_input = CategoryBrowseInput(
+            category_id="9355",
+            refinements_only=True,
+            price_buckets=[Decimal("100"), Decimal("500")]
+        )
+        refinement_body = {
+            "total": 1200,
+            "refinement": {
+                "dominantCategoryId": "9355",
+                "aspectDistributions": [{
+                    "localizedAspectName": "Brand",
+                    "aspectValueDistributions": [
+                        {"localizedAspectValue": "Apple", "matchCount": 700},
+                        {"localizedAspectValue": "Samsung", "matchCount": 400}
+                    ]
+                }],
+                "categoryDistributions": [{"categoryId": "9355", "categoryName": "Cell Phones & Smartphones", "matchCount": 1200}],
+                "conditionDistributions": [{"condition": "New", "conditionId": "1000", "matchCount": 300}]
+            }
+        }
+        bucket_totals = {"price:[*..100]": 500, "price:[100..500]": 600, "price:[500..*]": 100}
+        
+        async def get(endpoint, params=None, **kwargs):
+            if "fieldgroups" in params:
+                return {"body": refinement_body, "headers": {}}
+            return {"body": {"total": bucket_totals[params["filter"]], "itemSummaries": [{}]}, "headers": {}}
+        
+        with patch('tools.browse_api.EbayRestClient') as MockClient, \
+             patch('tools.browse_api.get_cache_manager', return_value=HybridCacheManager()), \
+             patch('tools.browse_api.mcp.config') as MockConfig:
+            mock_client = MockClient.return_value
+            mock_client.get = AsyncMock(side_effect=get)
+            mock_client.close = AsyncMock()
+            
+            MockConfig.app_id = "test_app"
+            MockConfig.cert_id = "test_cert"
+            MockConfig.sandbox_mode = True
+            MockConfig.rate_limit_per_day = 5000
+            
+            result = await get_items_by_category.fn(ctx=mock_context, category_input=category_input)
+            response = json.loads(result)
+            
+            assert response["status"] == "success"
+            data = response["data"]
+            assert "items" not in data
+            assert data["total"] == 1200
+            assert data["brands"] == {"Apple": 700, "Samsung": 400}
+            assert data["conditions"] == [{"condition": "New", "condition_id": "1000", "count": 300}]
+            assert data["subcategories"][0]["category_id"] == "9355"
+            assert [bucket["count"] for bucket in data["price_buckets"]] == [500, 600, 100]
+            assert response["metadata"]["from_cache"] is False
+            
+            refinement_calls = [call for call in mock_client.get.call_args_list if "fieldgroups" in call.kwargs["params"]]
+            assert len(refinement_calls) == 1
+            params = refinement_calls[0].kwargs["params"]
+            assert params["fieldgroups"] == "ASPECT_REFINEMENTS,CATEGORY_REFINEMENTS,CONDITION_REFINEMENTS"
+            assert mock_client.get.call_count == 4
+            # Category only: no placeholder keywords narrowing the facets
+            for call in mock_client.get.call_args_list:
+                assert "q" not in call.kwargs["params"]
+                assert call.kwargs["params"]["category_ids"] == "9355"
+                assert call.kwargs["params"]["limit"] == 1
+            
+            # Served from the cache the second time
+            result = await get_items_by_category.fn(ctx=mock_context, category_input=category_input)
+            response = json.loads(result)
+            assert response["metadata"]["from_cache"] is True
+            assert response["data"]["brands"] == {"Apple": 700, "Samsung": 400}
+            assert mock_client.get.call_count == 4
+    
+    @pytest.mark.asyncio
+    async def test_search_items_auto_paginate(self, mock_context):
+        """Test max_results fetches pages concurrently and merges them without duplicates."""
+        if self.is_integration_mode:
+            pytest.skip("Auto-pagination paging plan is unit test only")
+        
+        search_input = BrowseSearchInput(query="iPhone", max_results=450)
+        
+        async def get(endpoint, params=None, **kwargs):
+            offset, limit = params["offset"], params["limit"]
+            # The item at offset 200 repeats the last one of the first page
+            ids = [index - 1 if index == 200 else index for index in range(offset, offset + limit)]
+            return {
+                "body": {"total": 20000, "itemSummaries": [{"itemId": f"v1|{index}|0"} for index in ids]},
+                "headers": {}
+            }
+        
+        with patch('tools.browse_api.EbayRestClient') as MockClient, \
+             patch('tools.browse_api.mcp.config') as MockConfig:
+            mock_client = MockClient.return_value
+            mock_client.get = AsyncMock(side_effect=get)
+            mock_client.close = AsyncMock()
+            
+            MockConfig.app_id = "test_app"
+            MockConfig.cert_id = "test_cert"
+            MockConfig.sandbox_mode = True
+            MockConfig.rate_limit_per_day = 5000
+            
+            result = await search_items.fn(ctx=mock_context, search_input=search_input)
+            response = json.loads(result)
+            
+            assert response["status"] == "success"
+            data = response["data"]
+            assert data["pages_fetched"] == 3
+            assert data["duplicates_removed"] == 1
+            assert len(data["items"]) == 449
+            assert data["items"][0]["item_id"] == "v1|0|0"
+            assert data["offset_capped"] is False
+            
+            pages = sorted((call.kwargs["params"]["offset"], call.kwargs["params"]["limit"])
+                           for call in mock_client.get.call_args_list)
+            assert pages == [(0, 200), (200, 200), (400, 50)]
+            assert all(call.kwargs["params"]["q"] == "iPhone" for call in mock_client.get.call_args_list)
+    
+    @pytest.mark.asyncio
+    async def test_search_items_auto_paginate_rate_limited(self, mock_context):
+        """Test pages fetched before the rate limiter runs dry are returned, and none at all is an error."""
+        if self.is_integration_mode:
+            pytest.skip("Rate limiter exhaustion is unit test only")
+        
+        limiter = TokenBucketLimiter(default_daily_limit=500, min_burst=1, burst_fraction=0.01)
+        
+        async def get(endpoint, params=None, **kwargs):
+            await limiter.acquire("browse")
+            offset, limit = params["offset"], params["limit"]
+            return {
+                "body": {"total": 20000, "itemSummaries": [{"itemId": f"v1|{index}|0"} for index in range(offset, offset + limit)]},
+                "headers": {}
+            }
+        
+        with patch('tools.browse_api.EbayRestClient') as MockClient, \
+             patch('tools.browse_api.mcp.config') as MockConfig:
+            mock_client = MockClient.return_value
+            mock_client.get = AsyncMock(side_effect=get)
+            mock_client.close = AsyncMock()
+            
+            MockConfig.app_id = "test_app"
+            MockConfig.cert_id = "test_cert"
+            MockConfig.sandbox_mode = True
+            MockConfig.rate_limit_per_day = 5000
+            
+            result = await search_items.fn(ctx=mock_context, search_input=BrowseSearchInput(query="iPhone", max_results=10000))
+            response = json.loads(result)
+            
+            assert response["status"] == "success"
+            data = response["data"]
+            assert data["rate_limited"] is True
+            assert data["incomplete"] is True
+            assert data["pages_fetched"] == 5
+            assert len(data["items"]) == 1000
+            # The page budget bounds the fan-out even when tokens are plentiful
+            assert mock_client.get.call_count <= DEFAULT_MAX_PAGES
+            
+            result = await search_items.fn(ctx=mock_context, search_input=BrowseSearchInput(query="iPhone", max_results=400))
+            response = json.loads(result)
+            assert response["status"] == "error"
+            assert response["error_code"] == "RATE_LIMIT_EXCEEDED"
+    
+    @pytest.mark.asyncio
+    async def test_batch_search_items(self, mock_context):
+        """Test searches run concurrently with per-search results and a merged view."""
+        if self.is_integration_mode:
+            pytest.skip("Batch concurrency is unit test only")
+        
+        in_flight = {"now": 0, "max": 0}
+        items_by_query = {
+            "iphone 14": ["v1|1|0", "v1|2|0"],
+            "iphone 15": ["v1|2|0", "v1|3|0"],
+            "iphone 16": ["v1|4|0"]
+        }
+        
+        async def get(endpoint, params=None, **kwargs):
+            in_flight["now"] += 1
+            in_flight["max"] = max(in_flight["max"], in_flight["now"])
+            await asyncio.sleep(0.01)
+            in_flight["now"] -= 1
+            if params["q"] == "broken":
+                raise EbayApiError(status_code=400, error_response=TestDataError.ERROR_INVALID_CATEGORY)
+            ids = items_by_query[params["q"]]
+            return {
+                "body": {"total": len(ids), "itemSummaries": [{"itemId": item_id} for item_id in ids]},
+                "headers": {}
+            }
+        
+        batch_input = json.dumps({
+            "searches": [{"query": query, "limit": 10} for query in [*items_by_query, "broken"]],
+            "concurrency": 2
+        })
+        
+        with patch('tools.browse_api.EbayRestClient') as MockClient, \
+             patch('tools.browse_api.mcp.config') as MockConfig:
+            mock_client = MockClient.return_value
+            mock_client.get = AsyncMock(side_effect=get)
+            mock_client.close = AsyncMock()
+            
+            MockConfig.app_id = "test_app"
+            MockConfig.cert_id = "test_cert"
+            MockConfig.sandbox_mode = True
+            MockConfig.rate_limit_per_day = 5000
+            
+            result = await batch_search_items.fn(ctx=mock_context, batch_input=batch_input)
+            response = json.loads(result)
+            
+            assert response["status"] == "success"
+            data = response["data"]
+            assert [result["status"] for result in data["results"]] == ["success", "success", "success", "error"]
+            assert data["results"][3]["error_code"] == "EXTERNAL_API_ERROR"
+            assert [item["item_id"] for item in data["merged"]["items"]] == ["v1|1|0", "v1|2|0", "v1|3|0", "v1|4|0"]
+            assert data["merged"]["items"][1]["matched_searches"] == [0, 1]
+            assert data["merged"]["duplicates_removed"] == 1
+            assert data["summary"]["failed"] == 1
+            assert in_flight["max"] == 2
+            MockClient.assert_called_once()
+    
+    @pytest.mark.asyncio
+    async def test_batch_search_items_rate_limit(self, mock_context):
+        """Test the batch page budget and that searches stop once the rate limiter runs dry."""
+        if self.is_integration_mode:
+            pytest.skip("Rate limiter exhaustion is unit test only")
+        
+        limiter = TokenBucketLimiter(default_daily_limit=5000)
+        
+        async def get(endpoint, params=None, **kwargs):
+            await limiter.acquire("browse")
+            offset, limit = params["offset"], params["limit"]
+            return {
+                "body": {"total": 5000, "itemSummaries": [{"itemId": f"{params['q']}|{index}"} for index in range(offset, offset + limit)]},
+                "headers": {}
+            }
+        
+        with patch('tools.browse_api.EbayRestClient') as MockClient, \
+             patch('tools.browse_api.mcp.config') as MockConfig:
+            mock_client = MockClient.return_value
+            mock_client.get = AsyncMock(side_effect=get)
+            mock_client.close = AsyncMock()
+            
+            MockConfig.app_id = "test_app"
+            MockConfig.cert_id = "test_cert"
+            MockConfig.sandbox_mode = True
+            MockConfig.rate_limit_per_day = 5000
+            
+            # 30 searches of 5000 results each stay within one page apiece
+            batch_input = json.dumps([{"query": f"q{index}", "max_results": 5000} for index in range(30)])
+            response = json.loads(await batch_search_items.fn(ctx=mock_context, batch_input=batch_input))
+            
+            assert response["data"]["summary"]["succeeded"] == 30
+            assert response["data"]["summary"]["rate_limited"] is False
+            assert mock_client.get.call_count == 30
+            
+            # A bucket of 5 tokens: searches after the first rejection are not sent
+            limiter = TokenBucketLimiter(default_daily_limit=500, min_burst=1, burst_fraction=0.01)
+            mock_client.get.reset_mock()
+            batch_input = json.dumps({"searches": [{"query": f"r{index}"} for index in range(50)], "concurrency": 5})
+            response = json.loads(await batch_search_items.fn(ctx=mock_context, batch_input=batch_input))
+            
+            data = response["data"]
+            assert response["status"] == "success"
+            assert data["summary"]["succeeded"] == 5
+            assert data["summary"]["rate_limited"] is True
+            assert {result["error_code"] for result in data["results"] if result["status"] == "error"} == {"RATE_LIMIT_EXCEEDED"}
+            assert mock_client.get.call_count <= 10
+    
+    def test_batch_search_input_validation(self):
+        """Test batch size and concurrency limits."""
+        with pytest.raises(ValueError):
+            BatchSearchInput(searches=[])
+        with pytest.raises(ValueError):
+            BatchSearchInput(searches=[BrowseSearchInput(query="a")], concurrency=0)
+        assert BatchSearchInput(searches=[{"query": "a"}]).concurrency == 8
+    
+    @pytest.mark.asyncio
+    async def test_bulk_get_item_details(self, mock_context):
+        """Test items are fetched 20 per getItems call, cached, with per-item errors."""
+        if self.is_integration_mode:
+            pytest.skip("Bulk item batching is unit test only")
+        
+        from api.cache import HybridCacheManager
+        item_ids = [f"v1|{index}|0" for index in range(45)]
+        
+        async def get(endpoint, params=None, **kwargs):
+            requested = params["item_ids"].split(",")
+            if "v1|40|0" in requested:
+                raise EbayApiError(status_code=500, error_response=TestDataError.ERROR_INVALID_CATEGORY)
+            missing = "v1|7|0"
+            return {
+                "body": {
+                    "items": [{"itemId": item_id, "title": f"Item {item_id}"} for item_id in requested if item_id != missing],
+                    "warnings": [{
+                        "errorId": 11001,
+                        "message": "The item ID is invalid.",
+                        "parameters": [{"name": "itemIds", "value": missing}]
+                    }] if missing in requested else []
+                },
+                "headers": {}
+            }
+        
+        with patch('tools.browse_api.EbayRestClient') as MockClient, \
+             patch('tools.browse_api.get_cache_manager', return_value=HybridCacheManager()), \
+             patch('tools.browse_api.mcp.config') as MockConfig:
+            mock_client = MockClient.return_value
+            mock_client.get = AsyncMock(side_effect=get)
+            mock_client.close = AsyncMock()
+            
+            MockConfig.app_id = "test_app"
+            MockConfig.cert_id = "test_cert"
+            MockConfig.sandbox_mode = True
+            MockConfig.rate_limit_per_day = 5000
+            
+            result = await bulk_get_item_details.fn(ctx=mock_context, item_ids=item_ids)
+            response = json.loads(result)
+            
+            assert response["status"] == "success"
+            data = response["data"]
+            assert mock_client.get.call_count == 3
+            assert all(len(call.kwargs["params"]["item_ids"].split(",")) <= 20 for call in mock_client.get.call_args_list)
+            assert data["summary"]["found"] == 39
+            assert data["items"][0]["item_id"] == "v1|0|0"
+            assert {"item_id": "v1|7|0", "error": "The item ID is invalid."} in data["errors"]
+            assert len(data["errors"]) == 6
+            
+            # Found items are cached individually
+            result = await bulk_get_item_details.fn(ctx=mock_context, item_ids=item_ids[:20])
+            data = json.loads(result)["data"]
+            assert data["summary"]["from_cache"] == 19
+            assert data["summary"]["requests"] == 1
+            assert mock_client.get.call_args.kwargs["params"]["item_ids"] == "v1|7|0"
+    
+    @pytest.mark.asyncio
+    async def test_bulk_get_item_details_rate_limited(self, mock_context):
+        """Test items fetched before the rate limiter runs dry are returned and later requests not sent."""
+        if self.is_integration_mode:
+            pytest.skip("Rate limiter exhaustion is unit test only")
+        
+        limiter = TokenBucketLimiter(default_daily_limit=500, min_burst=1, burst_fraction=0.01)
+        item_ids = [f"v1|{index}|0" for index in range(500)]
+        
+        async def get(endpoint, params=None, **kwargs):
+            await limiter.acquire("browse")
+            return {"body": {"items": [{"itemId": item_id} for item_id in params["item_ids"].split(",")]}, "headers": {}}
+        
+        with patch('tools.browse_api.EbayRestClient') as MockClient, \
+             patch('tools.browse_api.get_cache_manager', return_value=None), \
+             patch('tools.browse_api.mcp.config') as MockConfig:
+            mock_client = MockClient.return_value
+            mock_client.get = AsyncMock(side_effect=get)
+            mock_client.close = AsyncMock()
+            
+            MockConfig.app_id = "test_app"
+            MockConfig.cert_id = "test_cert"
+            MockConfig.sandbox_mode = True
+            MockConfig.rate_limit_per_day = 5000
+            
+            response = json.loads(await bulk_get_item_details.fn(ctx=mock_context, item_ids=item_ids, concurrency=2))
+            
+            assert response["status"] == "success"
+            summary = response["data"]["summary"]
+            assert summary["found"] == 100
+            assert summary["failed"] == 400
+            assert summary["rate_limited"] is True
+            assert mock_client.get.call_count <= 7
+    
     # ==============================================================================
     # ERROR HANDLING TESTS
     # ==============================================================================
@@ -670,7 +1047,6 @@ class TestBrowseAPI:
         else:
             # Unit test - mock API error
             with patch('tools.browse_api.EbayRestClient') as MockClient, \
-                 patch('tools.browse_api.OAuthManager') as MockOAuth, \
                  patch('tools.browse_api.mcp.config') as MockConfig:
                 
                 # Setup all mocks
@@ -720,7 +1096,6 @@ class TestBrowseAPI:
         else:
             # Unit test - mock 404 error
             with patch('tools.browse_api.EbayRestClient') as MockClient, \
-                 patch('tools.browse_api.OAuthManager') as MockOAuth, \
                  patch('tools.browse_api.mcp.config') as MockConfig:
                 
                 # Setup all mocks
@@ -0,0 +1,156 @@
+"""
+Tests for the price comps tool.
+"""
+import json
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from tools.tests.base_test import BaseApiTest, TestMode
+from tools.comps_api import get_price_comps, PriceCompsInput
+from api.rate_limiter import TokenBucketLimiter
+from api.pagination import DEFAULT_MAX_PAGES
+
+
+class TestCompsApi(BaseApiTest):
+    """Test loading comps once and evaluating prices against them."""
+
+    def test_price_comps_input_validation(self):
+        with pytest.raises(ValueError, match="At least one search criterion"):
+            PriceCompsInput(prices=[10])
+        with pytest.raises(ValueError):
+            PriceCompsInput(prices=[], q="iphone")
+        with pytest.raises(ValueError, match="prices must not be negative"):
+            PriceCompsInput(prices=[-1], q="iphone")
+
+    @TestMode.skip_in_integration("Comps loading is unit test only")
+    @pytest.mark.asyncio
+    async def test_get_price_comps(self, mock_context, mock_credentials):
+        async def get(endpoint, params=None, **kwargs):
+            if "item_sales" in endpoint:
+                return {"body": {"total": 300, "itemSales": [
+                    {"itemPrice": {"value": str(100 + index % 101), "currency": "USD"}, "conditionId": "3000"}
+                    for index in range(params["offset"], params["offset"] + params["limit"])
+                ]}, "headers": {}}
+            return {"body": {"total": 2, "itemSummaries": [
+                {"itemId": "v1|1|0", "price": {"value": "140.00", "currency": "USD"}, "condition": "Used",
+                 "shippingOptions": [{"shippingCost": {"value": "10.00", "currency": "USD"}}]},
+                {"itemId": "v1|2|0", "price": {"value": "300.00", "currency": "USD"}, "condition": "New"}
+            ]}, "headers": {}}
+
+        with patch('tools.comps_api.EbayRestClient') as MockClient, \
+             patch.dict('api.comps._comps_sets', clear=True), \
+             patch('tools.comps_api.mcp.config.app_id', mock_credentials["app_id"]), \
+             patch('tools.comps_api.mcp.config.cert_id', mock_credentials["cert_id"]):
+            mock_client = MockClient.return_value
+            mock_client.get = AsyncMock(side_effect=get)
+            mock_client.close = AsyncMock()
+
+            result = await get_price_comps.fn(
+                ctx=mock_context,
+                prices=[90, 150, 260],
+                q="iphone 13",
+                condition="Used",
+                max_sales=300
+            )
+            response = json.loads(result)
+
+            assert response["status"] == "success"
+            data = response["data"]
+            assert data["condition_group"] == "USED"
+            assert data["sold_comps"] == 300
+            assert data["active_comps"] == 1
+            assert data["active_quantiles"]["p50"] == 150.0
+            assert [entry["verdict"] for entry in data["results"]] == ["below_market", "within_market", "above_market"]
+            assert "items" not in data
+            assert response["metadata"]["from_cache"] is False
+
+            sales_pages = [call for call in mock_client.get.call_args_list if "item_sales" in call.args[0]]
+            assert sorted(call.kwargs["params"]["offset"] for call in sales_pages) == [0, 200]
+            calls = mock_client.get.call_count
+
+            # The same search is answered from the loaded comps
+            result = await get_price_comps.fn(
+                ctx=mock_context,
+                prices=[120],
+                q="iphone 13",
+                condition="3000",
+                max_sales=300
+            )
+            response = json.loads(result)
+            assert response["metadata"]["from_cache"] is True
+            assert response["data"]["condition_group"] == "USED"
+            assert mock_client.get.call_count == calls
+
+    @TestMode.skip_in_integration("Rate limiter exhaustion is unit test only")
+    @pytest.mark.asyncio
+    async def test_get_price_comps_rate_limited(self, mock_context, mock_credentials):
+        """Comps cut short by the rate limiter are used but not kept; none at all is an error."""
+        limiter = TokenBucketLimiter(default_daily_limit=500, min_burst=1, burst_fraction=0.01)
+
+        async def get(endpoint, params=None, **kwargs):
+            await limiter.acquire("marketplace_insights")
+            return {"body": {"total": 5000, "itemSales": [
+                {"itemPrice": {"value": "100.00", "currency": "USD"}, "conditionId": "3000"}
+                for _ in range(params["limit"])
+            ]}, "headers": {}}
+
+        with patch('tools.comps_api.EbayRestClient') as MockClient, \
+             patch.dict('api.comps._comps_sets', clear=True), \
+             patch('tools.comps_api.mcp.config.app_id', mock_credentials["app_id"]), \
+             patch('tools.comps_api.mcp.config.cert_id', mock_credentials["cert_id"]):
+            mock_client = MockClient.return_value
+            mock_client.get = AsyncMock(side_effect=get)
+            mock_client.close = AsyncMock()
+
+            result = await get_price_comps.fn(ctx=mock_context, prices=[90], q="iphone 13", max_sales=2000, max_listings=0)
+            response = json.loads(result)
+
+            assert response["status"] == "success"
+            assert response["data"]["sold_comps"] == 1000
+            assert response["metadata"]["rate_limited"] is True
+            assert response["metadata"]["sold_loaded"] == 1000
+
+            # Partial comps were not kept, so the next call loads again and finds no tokens
+            result = await get_price_comps.fn(ctx=mock_context, prices=[90], q="iphone 13", max_sales=2000, max_listings=0)
+            response = json.loads(result)
+            assert response["status"] == "error"
+            assert response["error_code"] == "RATE_LIMIT_EXCEEDED"
+
+    @TestMode.skip_in_integration("Comps loading is unit test only")
+    @pytest.mark.asyncio
+    async def test_get_price_comps_page_budget(self, mock_context, mock_credentials):
+        """Each load reads at most DEFAULT_MAX_PAGES pages and reports the rest as truncated."""
+        async def get(endpoint, params=None, **kwargs):
+            if "item_sales" in endpoint:
+                return {"body": {"total": 50000, "itemSales": [
+                    {"itemPrice": {"value": "100.00", "currency": "USD"}} for _ in range(params["limit"])
+                ]}, "headers": {}}
+            return {"body": {"total": 50000, "itemSummaries": [
+                {"itemId": f"v1|{params['offset'] + index}|0", "price": {"value": "120.00", "currency": "USD"}}
+                for index in range(params["limit"])
+            ]}, "headers": {}}
+
+        with patch('tools.comps_api.EbayRestClient') as MockClient, \
+             patch.dict('api.comps._comps_sets', clear=True), \
+             patch('tools.comps_api.mcp.config.app_id', mock_credentials["app_id"]), \
+             patch('tools.comps_api.mcp.config.cert_id', mock_credentials["cert_id"]):
+            mock_client = MockClient.return_value
+            mock_client.get = AsyncMock(side_effect=get)
+            mock_client.close = AsyncMock()
+
+            result = await get_price_comps.fn(ctx=mock_context, prices=[90], q="iphone 13", max_sales=10000, max_listings=10000)
+            response = json.loads(result)
+
+            assert response["status"] == "success"
+            assert mock_client.get.call_count == 2 * DEFAULT_MAX_PAGES
+            assert response["metadata"]["sold_loaded"] == DEFAULT_MAX_PAGES * 200
+            assert response["metadata"]["active_loaded"] == DEFAULT_MAX_PAGES * 200
+            assert response["metadata"]["truncated"] is True
+            assert response["metadata"]["rate_limited"] is False
+
+            # Truncated comps are still kept; only rate limited ones are not
+            result = await get_price_comps.fn(ctx=mock_context, prices=[90], q="iphone 13", max_sales=10000, max_listings=10000)
+            response = json.loads(result)
+            assert response["metadata"]["from_cache"] is True
+            assert response["metadata"]["truncated"] is True
@@ -301,7 +301,6 @@ class TestFulfillmentPolicyApi(BaseApiTest):
         else:
             # Unit test - mocked dependencies
             with patch('tools.fulfillment_policy_api.EbayRestClient') as MockClient, \
-                 patch('tools.fulfillment_policy_api.OAuthManager') as MockOAuth, \
                  patch('tools.fulfillment_policy_api.mcp.config') as MockConfig:
                 
                 # Setup all mocks
@@ -390,7 +389,6 @@ class TestFulfillmentPolicyApi(BaseApiTest):
         else:
             # Unit test - mocked dependencies
             with patch('tools.fulfillment_policy_api.EbayRestClient') as MockClient, \
-                 patch('tools.fulfillment_policy_api.OAuthManager') as MockOAuth, \
                  patch('tools.fulfillment_policy_api.mcp.config') as MockConfig:
                 
                 # Setup mocks with Pydantic-based test data
@@ -489,7 +487,6 @@ class TestFulfillmentPolicyApi(BaseApiTest):
         else:
             # Unit test - mocked dependencies
             with patch('tools.fulfillment_policy_api.EbayRestClient') as MockClient, \
-                 patch('tools.fulfillment_policy_api.OAuthManager') as MockOAuth, \
                  patch('tools.fulfillment_policy_api.mcp.config') as MockConfig:
                 
                 # Setup mocks
@@ -605,7 +602,6 @@ class TestFulfillmentPolicyApi(BaseApiTest):
         else:
             # Unit test - mocked dependencies
             with patch('tools.fulfillment_policy_api.EbayRestClient') as MockClient, \
-                 patch('tools.fulfillment_policy_api.OAuthManager') as MockOAuth, \
                  patch('tools.fulfillment_policy_api.mcp.config') as MockConfig:
                 
                 # Setup mocks
@@ -678,7 +674,6 @@ class TestFulfillmentPolicyApi(BaseApiTest):
         else:
             # Unit test - mocked dependencies
             with patch('tools.fulfillment_policy_api.EbayRestClient') as MockClient, \
-                 patch('tools.fulfillment_policy_api.OAuthManager') as MockOAuth, \
                  patch('tools.fulfillment_policy_api.mcp.config') as MockConfig:
                 
                 # Setup mocks
@@ -760,7 +755,6 @@ class TestFulfillmentPolicyApi(BaseApiTest):
             pytest.skip("eBay API error simulation only in unit mode")
         
         with patch('tools.fulfillment_policy_api.EbayRestClient') as MockClient, \
-             patch('tools.fulfillment_policy_api.OAuthManager') as MockOAuth, \
              patch('tools.fulfillment_policy_api.mcp.config') as MockConfig:
             
             # Setup mocks with API error
@@ -303,7 +303,6 @@ class TestInventoryItemApi(BaseApiTest):
         else:
             # Unit test - mocked dependencies
             with patch('tools.inventory_item_api.EbayRestClient') as MockClient, \
-                 patch('tools.inventory_item_api.OAuthManager') as MockOAuth, \
                  patch('tools.inventory_item_api.mcp.config') as MockConfig:
                 
                 # Setup all mocks
@@ -353,7 +352,6 @@ class TestInventoryItemApi(BaseApiTest):
         else:
             # Unit test - mocked dependencies
             with patch('tools.inventory_item_api.EbayRestClient') as MockClient, \
-                 patch('tools.inventory_item_api.OAuthManager') as MockOAuth, \
                  patch('tools.inventory_item_api.mcp.config') as MockConfig:
                 
                 # Setup mocks
@@ -418,7 +416,6 @@ class TestInventoryItemApi(BaseApiTest):
         else:
             # Unit test - mocked dependencies
             with patch('tools.inventory_item_api.EbayRestClient') as MockClient, \
-                 patch('tools.inventory_item_api.OAuthManager') as MockOAuth, \
                  patch('tools.inventory_item_api.mcp.config') as MockConfig:
                 
                 # Setup mocks
@@ -466,7 +463,6 @@ class TestInventoryItemApi(BaseApiTest):
         else:
             # Unit test - mocked dependencies
             with patch('tools.inventory_item_api.EbayRestClient') as MockClient, \
-                 patch('tools.inventory_item_api.OAuthManager') as MockOAuth, \
                  patch('tools.inventory_item_api.mcp.config') as MockConfig:
                 
                 # Setup mocks
@@ -540,7 +536,6 @@ class TestInventoryItemApi(BaseApiTest):
         else:
             # Unit test - mocked dependencies
             with patch('tools.inventory_item_api.EbayRestClient') as MockClient, \
-                 patch('tools.inventory_item_api.OAuthManager') as MockOAuth, \
                  patch('tools.inventory_item_api.mcp.config') as MockConfig:
                 
                 # Setup mocks
@@ -610,7 +605,6 @@ class TestInventoryItemApi(BaseApiTest):
         else:
             # Unit test - mocked dependencies
             with patch('tools.inventory_item_api.EbayRestClient') as MockClient, \
-                 patch('tools.inventory_item_api.OAuthManager') as MockOAuth, \
                  patch('tools.inventory_item_api.mcp.config') as MockConfig:
                 
                 # Setup mocks
@@ -695,7 +689,6 @@ class TestInventoryItemApi(BaseApiTest):
         else:
             # Unit test - mocked dependencies
             with patch('tools.inventory_item_api.EbayRestClient') as MockClient, \
-                 patch('tools.inventory_item_api.OAuthManager') as MockOAuth, \
                  patch('tools.inventory_item_api.mcp.config') as MockConfig:
                 
                 # Setup mocks
@@ -804,7 +797,6 @@ class TestInventoryItemApi(BaseApiTest):
             pytest.skip("eBay API error simulation only in unit mode")
         
         with patch('tools.inventory_item_api.EbayRestClient') as MockClient, \
-             patch('tools.inventory_item_api.OAuthManager') as MockOAuth, \
              patch('tools.inventory_item_api.mcp.config') as MockConfig:
             
             # Setup mocks with API error
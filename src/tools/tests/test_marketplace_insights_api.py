@@ -8,6 +8,8 @@ Environment Variables:
 import pytest
 from unittest.mock import patch, AsyncMock
 import json
+import re
+from datetime import datetime, timedelta, timezone
 
 from tools.tests.base_test import BaseApiTest, TestMode
 from tools.tests.test_data import TestDataGood, TestDataBad
@@ -18,11 +20,15 @@ from tools.tests.test_helpers import (
     assert_api_response_success
 )
 from tools.marketplace_insights_api import (
+    get_sales_history,
     search_item_sales,
     ItemSalesSearchInput,
     _convert_item_sale
 )
 from api.errors import EbayApiError
+from api.pagination import DEFAULT_MAX_PAGES
+from api.rate_limiter import TokenBucketLimiter
+from api.sales_history import SalesHistoryStore, format_filter_date, series_key
 
 
 class TestMarketplaceInsightsApi(BaseApiTest):
@@ -571,6 +577,232 @@ class TestMarketplaceInsightsApi(BaseApiTest):
                     assert call_args[1]["params"]["limit"] == 20
                     assert call_args[1]["params"]["offset"] == 20
     
+    @TestMode.skip_in_integration("Statistics paging plan is unit test only")
+    @pytest.mark.asyncio
+    async def test_search_item_sales_statistics_mode(self, mock_context, mock_credentials):
+        """Test statistics mode reads every page and returns whole-set percentiles."""
+        total = 1000
+        
+        async def get(endpoint, params=None, **kwargs):
+            offset, limit = params["offset"], params["limit"]
+            return {
+                "body": {
+                    "total": total,
+                    "itemSales": [
+                        {
+                            "itemId": f"v1|{index}|0",
+                            # Prices 1..1000, plus one extreme sale
+                            "itemPrice": {"value": str(100000 if index == 999 else index + 1), "currency": "USD"},
+                            "conditionId": "1000" if index % 2 else "3000",
+                            "itemSoldDate": f"2026-09-0{1 + index % 3}T12:00:00.000Z"
+                        }
+                        for index in range(offset, min(offset + limit, total))
+                    ]
+                },
+                "headers": {}
+            }
+        
+        with patch('tools.marketplace_insights_api.EbayRestClient') as MockClient:
+            mock_client = MockClient.return_value
+            mock_client.get = AsyncMock(side_effect=get)
+            mock_client.close = AsyncMock()
+            
+            with patch('tools.marketplace_insights_api.mcp.config.app_id', mock_credentials["app_id"]), \
+                 patch('tools.marketplace_insights_api.mcp.config.cert_id', mock_credentials["cert_id"]):
+                
+                result = await search_item_sales.fn(
+                    ctx=mock_context,
+                    category_ids="9355",
+                    statistics_mode=True
+                )
+                
+                data = assert_api_response_success(result)["data"]
+                assert "item_sales" not in data
+                assert data["sales_analyzed"] == 1000
+                assert data["pages_fetched"] == 5
+                assert sorted(call[1]["params"]["offset"] for call in mock_client.get.call_args_list) == [0, 200, 400, 600, 800]
+                
+                stats = data["statistics"]
+                assert stats["total_items"] == 1000
+                assert stats["max_price"] == 100000
+                for name, expected in {"p10": 100, "p25": 250, "p50": 500, "p75": 750, "p90": 900}.items():
+                    assert abs(stats["percentiles"][name] - expected) <= 5
+                assert stats["outliers"]["high_count"] == 1
+                assert stats["outliers"]["low_count"] == 0
+                assert stats["by_condition"]["New"]["count"] == 500
+                assert [day["date"] for day in stats["by_day"]] == ["2026-09-01", "2026-09-02", "2026-09-03"]
+                assert sum(bucket["count"] for bucket in stats["histogram"]) == 1000
+    
+    @TestMode.skip_in_integration("Rate limiter exhaustion is unit test only")
+    @pytest.mark.asyncio
+    async def test_search_item_sales_statistics_rate_limited(self, mock_context, mock_credentials):
+        """Test statistics cover the pages read before the rate limiter runs dry, and none at all is an error."""
+        limiter = TokenBucketLimiter(default_daily_limit=500, min_burst=1, burst_fraction=0.01)
+        
+        async def get(endpoint, params=None, **kwargs):
+            await limiter.acquire("marketplace_insights")
+            offset, limit = params["offset"], params["limit"]
+            return {
+                "body": {
+                    "total": 20000,
+                    "itemSales": [
+                        {"itemId": f"v1|{index}|0", "itemPrice": {"value": "10.00", "currency": "USD"}}
+                        for index in range(offset, offset + limit)
+                    ]
+                },
+                "headers": {}
+            }
+        
+        with patch('tools.marketplace_insights_api.EbayRestClient') as MockClient:
+            mock_client = MockClient.return_value
+            mock_client.get = AsyncMock(side_effect=get)
+            mock_client.close = AsyncMock()
+            
+            with patch('tools.marketplace_insights_api.mcp.config.app_id', mock_credentials["app_id"]), \
+                 patch('tools.marketplace_insights_api.mcp.config.cert_id', mock_credentials["cert_id"]):
+                
+                result = await search_item_sales.fn(ctx=mock_context, category_ids="9355", statistics_mode=True)
+                
+                data = assert_api_response_success(result)["data"]
+                assert data["rate_limited"] is True
+                assert data["pages_fetched"] == 5
+                assert data["sales_analyzed"] == 1000
+                assert data["statistics"]["total_items"] == 1000
+                # The default page budget bounds the fan-out even when tokens are plentiful
+                assert mock_client.get.call_count <= DEFAULT_MAX_PAGES
+                
+                result = await search_item_sales.fn(ctx=mock_context, category_ids="9355", statistics_mode=True)
+                response = json.loads(result)
+                assert response["status"] == "error"
+                assert response["error_code"] == "RATE_LIMIT_EXCEEDED"
+    
+    @TestMode.skip_in_integration("Sales history store is unit test only")
+    @pytest.mark.asyncio
+    async def test_get_sales_history(self, mock_context, mock_credentials, tmp_path):
+        """Test sales are topped up into the local store and aggregated from it."""
+        store = SalesHistoryStore(str(tmp_path))
+        
+        async def get(endpoint, params=None, **kwargs):
+            if "browse" in endpoint:
+                return {"body": {"total": 6, "itemSummaries": []}, "headers": {}}
+            return {"body": {"total": 3, "itemSales": [
+                {"itemId": "v1|1|0", "itemPrice": {"value": "100.00", "currency": "USD"}, "itemSoldDate": "2026-09-07T09:00:00.000Z"},
+                {"itemId": "v1|2|0", "itemPrice": {"value": "300.00", "currency": "USD"}, "itemSoldDate": "2026-09-07T18:00:00.000Z"},
+                {"itemId": "v1|3|0", "itemPrice": {"value": "200.00", "currency": "USD"}, "itemSoldDate": "2026-09-08T10:00:00.000Z", "quantitySold": 2}
+            ]}, "headers": {}}
+        
+        with patch('tools.marketplace_insights_api.EbayRestClient') as MockClient, \
+             patch('tools.marketplace_insights_api.get_sales_history_store', return_value=store):
+            mock_client = MockClient.return_value
+            mock_client.get = AsyncMock(side_effect=get)
+            mock_client.close = AsyncMock()
+            
+            with patch('tools.marketplace_insights_api.mcp.config.app_id', mock_credentials["app_id"]), \
+                 patch('tools.marketplace_insights_api.mcp.config.cert_id', mock_credentials["cert_id"]):
+                
+                result = await get_sales_history.fn(
+                    ctx=mock_context,
+                    q="iphone 13",
+                    category_ids="9355",
+                    filter="conditionIds:{3000}"
+                )
+                
+                data = assert_api_response_success(result)["data"]
+                assert data["refresh"]["new_sales"] == 3
+                assert data["refresh"]["active_listings"] == 6
+                assert [(period["period"], period["units_sold"]) for period in data["periods"]] == [
+                    ("2026-09-07", 2), ("2026-09-08", 2)
+                ]
+                assert data["periods"][0]["median_price"] == 200.0
+                assert data["newest_sold_date"] == "2026-09-08T10:00:00.000Z"
+                
+                sales_call = next(call for call in mock_client.get.call_args_list if "item_sales" in call.args[0])
+                sales_filter = sales_call.kwargs["params"]["filter"]
+                assert sales_filter.startswith("conditionIds:{3000},lastSoldDate:[")
+                assert re.fullmatch(r".*lastSoldDate:\[[^\]]+Z\.\.[^\]]+Z\]", sales_filter)
+                assert data["refresh"]["complete"] is True
+                calls = mock_client.get.call_count
+                
+                # Refreshed within the hour: answered from the store
+                result = await get_sales_history.fn(
+                    ctx=mock_context,
+                    q="iphone 13",
+                    category_ids="9355",
+                    filter="conditionIds:{3000}",
+                    interval="week"
+                )
+                data = assert_api_response_success(result)["data"]
+                assert data["refresh"] is None
+                assert data["periods"][0]["period"] == "2026-09-07"
+                assert data["periods"][0]["sales"] == 3
+                assert mock_client.get.call_count == calls
+    
+    @TestMode.skip_in_integration("Sales history store is unit test only")
+    @pytest.mark.asyncio
+    async def test_get_sales_history_splits_busy_windows(self, mock_context, mock_credentials, tmp_path):
+        """Test a top-up past one window's worth of sales splits the date range and reads every sale."""
+        store = SalesHistoryStore(str(tmp_path))
+        now = datetime.now(timezone.utc)
+        sold_dates = [format_filter_date(now - timedelta(days=89) + index * timedelta(days=88) / 9000) for index in range(9000)]
+        limiter = None
+        
+        async def get(endpoint, params=None, **kwargs):
+            if "browse" in endpoint:
+                return {"body": {"total": 50, "itemSummaries": []}, "headers": {}}
+            if limiter:
+                await limiter.acquire("marketplace_insights")
+            window_start, window_end = re.search(r"lastSoldDate:\[(.+)\.\.(.+)\]", params["filter"]).groups()
+            window = [(index, date) for index, date in enumerate(sold_dates) if window_start <= date <= window_end]
+            offset, limit = params["offset"], params["limit"]
+            return {"body": {"total": len(window), "itemSales": [
+                {"itemId": f"v1|{index}|0", "itemPrice": {"value": "10.00", "currency": "USD"}, "itemSoldDate": date}
+                for index, date in window[offset:offset + limit]
+            ]}, "headers": {}}
+        
+        with patch('tools.marketplace_insights_api.EbayRestClient') as MockClient, \
+             patch('tools.marketplace_insights_api.get_sales_history_store', return_value=store), \
+             patch('tools.marketplace_insights_api.mcp.config.app_id', mock_credentials["app_id"]), \
+             patch('tools.marketplace_insights_api.mcp.config.cert_id', mock_credentials["cert_id"]):
+            mock_client = MockClient.return_value
+            mock_client.get = AsyncMock(side_effect=get)
+            mock_client.close = AsyncMock()
+            
+            result = await get_sales_history.fn(ctx=mock_context, q="iphone 13")
+            refresh = assert_api_response_success(result)["data"]["refresh"]
+            # One probe of the whole range, then two halves of 4,500 sales
+            assert refresh["new_sales"] == 9000
+            assert refresh["complete"] is True
+            assert refresh["truncated_windows"] == 0
+            assert refresh["pages_fetched"] == 47
+            
+            # Rate limited part way through a new series: nothing is marked read
+            limiter = TokenBucketLimiter(default_daily_limit=500, min_burst=1, burst_fraction=0.01)
+            result = await get_sales_history.fn(ctx=mock_context, q="iphone 14")
+            refresh = assert_api_response_success(result)["data"]["refresh"]
+            assert refresh["rate_limited"] is True
+            assert refresh["complete"] is False
+            assert refresh["complete_through"] is None
+            assert refresh["fetched"] == 800
+            state = store.get_series(series_key("iphone 14", None, None))
+            assert state["newest_sold_date"] is None
+            assert state["refreshed_at"] is None
+            
+            # Still due, but the limiter is dry
+            result = await get_sales_history.fn(ctx=mock_context, q="iphone 14")
+            response = json.loads(result)
+            assert response["status"] == "error"
+            assert response["error_code"] == "RATE_LIMIT_EXCEEDED"
+    
+    @pytest.mark.asyncio
+    async def test_get_sales_history_not_configured(self, mock_context):
+        """Test the tool explains how to enable the store."""
+        with patch('tools.marketplace_insights_api.get_sales_history_store', return_value=None):
+            result = await get_sales_history.fn(ctx=mock_context, q="iphone 13")
+            data = json.loads(result)
+            assert data["status"] == "error"
+            assert data["error_code"] == "CONFIGURATION_ERROR"
+            assert "LOOTLY_SALES_HISTORY_DIR" in data["error_message"]
+    
     # ==============================================================================
     # No Credentials Test
     # ==============================================================================
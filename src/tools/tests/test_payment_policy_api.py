@@ -176,7 +176,6 @@ class TestPaymentPolicyAPI:
         else:
             # Unit test - mocked dependencies
             with patch('tools.payment_policy_api.EbayRestClient') as MockClient, \
-                 patch('tools.payment_policy_api.OAuthManager') as MockOAuth, \
                  patch('tools.payment_policy_api.mcp.config') as MockConfig:
                 
                 # Setup all mocks
@@ -278,7 +277,6 @@ class TestPaymentPolicyAPI:
         else:
             # Unit test - mocked dependencies
             with patch('tools.payment_policy_api.EbayRestClient') as MockClient, \
-                 patch('tools.payment_policy_api.OAuthManager') as MockOAuth, \
                  patch('tools.payment_policy_api.mcp.config') as MockConfig:
                 
                 # Setup all mocks
@@ -383,7 +381,6 @@ class TestPaymentPolicyAPI:
         else:
             # Unit test - mocked dependencies
             with patch('tools.payment_policy_api.EbayRestClient') as MockClient, \
-                 patch('tools.payment_policy_api.OAuthManager') as MockOAuth, \
                  patch('tools.payment_policy_api.mcp.config') as MockConfig:
                 
                 # Setup all mocks
@@ -466,7 +463,6 @@ class TestPaymentPolicyAPI:
         else:
             # Unit test - mocked dependencies
             with patch('tools.payment_policy_api.EbayRestClient') as MockClient, \
-                 patch('tools.payment_policy_api.OAuthManager') as MockOAuth, \
                  patch('tools.payment_policy_api.mcp.config') as MockConfig:
                 
                 # Setup all mocks
@@ -539,7 +535,6 @@ class TestPaymentPolicyAPI:
         else:
             # Unit test - mocked dependencies
             with patch('tools.payment_policy_api.EbayRestClient') as MockClient, \
-                 patch('tools.payment_policy_api.OAuthManager') as MockOAuth, \
                  patch('tools.payment_policy_api.mcp.config') as MockConfig:
                 
                 mock_client = MockClient.return_value
@@ -606,7 +601,6 @@ class TestPaymentPolicyAPI:
         else:
             # Unit test mode
             with patch('tools.payment_policy_api.EbayRestClient') as MockClient, \
-                 patch('tools.payment_policy_api.OAuthManager') as MockOAuth, \
                  patch('tools.payment_policy_api.mcp.config') as MockConfig:
                 
                 mock_client = MockClient.return_value
@@ -649,7 +643,6 @@ class TestPaymentPolicyAPI:
         # Unit test mode
         if not self.is_integration_mode:
             with patch('tools.payment_policy_api.EbayRestClient') as MockClient, \
-                 patch('tools.payment_policy_api.OAuthManager') as MockOAuth, \
                  patch('tools.payment_policy_api.mcp.config') as MockConfig:
                 
                 mock_client = MockClient.return_value
@@ -733,7 +726,6 @@ class TestPaymentPolicyAPI:
         else:
             # Unit test mode
             with patch('tools.payment_policy_api.EbayRestClient') as MockClient, \
-                 patch('tools.payment_policy_api.OAuthManager') as MockOAuth, \
                  patch('tools.payment_policy_api.mcp.config') as MockConfig:
                 
                 mock_client = MockClient.return_value
@@ -812,7 +804,6 @@ class TestPaymentPolicyAPI:
         else:
             # Unit test mode
             with patch('tools.payment_policy_api.EbayRestClient') as MockClient, \
-                 patch('tools.payment_policy_api.OAuthManager') as MockOAuth, \
                  patch('tools.payment_policy_api.mcp.config') as MockConfig:
                 
                 mock_client = MockClient.return_value
@@ -889,7 +880,6 @@ class TestPaymentPolicyAPI:
         else:
             # Unit test mode
             with patch('tools.payment_policy_api.EbayRestClient') as MockClient, \
-                 patch('tools.payment_policy_api.OAuthManager') as MockOAuth, \
                  patch('tools.payment_policy_api.mcp.config') as MockConfig:
                 
                 mock_client = MockClient.return_value
@@ -940,7 +930,6 @@ class TestPaymentPolicyAPI:
             pytest.skip("User consent test only runs in unit mode")
         
         with patch('tools.payment_policy_api.EbayRestClient') as MockClient, \
-             patch('tools.payment_policy_api.OAuthManager') as MockOAuth, \
              patch('tools.payment_policy_api.mcp.config') as MockConfig:
             
             # Mock the REST client to raise ConsentRequiredException
@@ -973,7 +962,6 @@ class TestPaymentPolicyAPI:
         else:
             # Unit test mode
             with patch('tools.payment_policy_api.EbayRestClient') as MockClient, \
-                 patch('tools.payment_policy_api.OAuthManager') as MockOAuth, \
                  patch('tools.payment_policy_api.mcp.config') as MockConfig:
                 
                 mock_client = MockClient.return_value
@@ -235,7 +235,6 @@ class TestReturnPolicyApi(BaseApiTest):
         else:
             # Unit test - mocked dependencies
             with patch('tools.return_policy_api.EbayRestClient') as MockClient, \
-                 patch('tools.return_policy_api.OAuthManager') as MockOAuth, \
                  patch('tools.return_policy_api.mcp.config') as MockConfig:
                 
                 # Setup all mocks
@@ -313,7 +312,6 @@ class TestReturnPolicyApi(BaseApiTest):
         else:
             # Unit test
             with patch('tools.return_policy_api.EbayRestClient') as MockClient, \
-                 patch('tools.return_policy_api.OAuthManager'), \
                  patch('tools.return_policy_api.mcp.config') as MockConfig:
                 
                 mock_client = MockClient.return_value
@@ -367,7 +365,6 @@ class TestReturnPolicyApi(BaseApiTest):
         else:
             # Unit test
             with patch('tools.return_policy_api.EbayRestClient') as MockClient, \
-                 patch('tools.return_policy_api.OAuthManager'), \
                  patch('tools.return_policy_api.mcp.config') as MockConfig:
                 
                 mock_client = MockClient.return_value
@@ -425,7 +422,6 @@ class TestReturnPolicyApi(BaseApiTest):
         else:
             # Unit test
             with patch('tools.return_policy_api.EbayRestClient') as MockClient, \
-                 patch('tools.return_policy_api.OAuthManager'), \
                  patch('tools.return_policy_api.mcp.config') as MockConfig:
                 
                 mock_client = MockClient.return_value
@@ -560,7 +556,6 @@ class TestReturnPolicyApi(BaseApiTest):
         if not self.is_integration_mode:
             # Unit test only - simulate API error
             with patch('tools.return_policy_api.EbayRestClient') as MockClient, \
-                 patch('tools.return_policy_api.OAuthManager'), \
                  patch('tools.return_policy_api.mcp.config') as MockConfig:
                 
                 mock_client = MockClient.return_value
@@ -688,7 +683,6 @@ class TestReturnPolicyApi(BaseApiTest):
         else:
             # Unit test
             with patch('tools.return_policy_api.EbayRestClient') as MockClient, \
-                 patch('tools.return_policy_api.OAuthManager'), \
                  patch('tools.return_policy_api.mcp.config') as MockConfig:
                 
                 mock_client = MockClient.return_value
@@ -763,7 +757,6 @@ class TestReturnPolicyApi(BaseApiTest):
         else:
             # Unit test
             with patch('tools.return_policy_api.EbayRestClient') as MockClient, \
-                 patch('tools.return_policy_api.OAuthManager'), \
                  patch('tools.return_policy_api.mcp.config') as MockConfig:
                 
                 mock_client = MockClient.return_value
@@ -803,7 +796,6 @@ class TestReturnPolicyApi(BaseApiTest):
             pytest.skip("Not found test only runs in unit mode")
         
         with patch('tools.return_policy_api.EbayRestClient') as MockClient, \
-             patch('tools.return_policy_api.OAuthManager'), \
              patch('tools.return_policy_api.mcp.config') as MockConfig:
             
             mock_client = MockClient.return_value
@@ -885,7 +877,6 @@ class TestReturnPolicyApi(BaseApiTest):
         else:
             # Unit test
             with patch('tools.return_policy_api.EbayRestClient') as MockClient, \
-                 patch('tools.return_policy_api.OAuthManager'), \
                  patch('tools.return_policy_api.mcp.config') as MockConfig:
                 
                 mock_client = MockClient.return_value
@@ -963,7 +954,6 @@ class TestReturnPolicyApi(BaseApiTest):
         else:
             # Unit test
             with patch('tools.return_policy_api.EbayRestClient') as MockClient, \
-                 patch('tools.return_policy_api.OAuthManager'), \
                  patch('tools.return_policy_api.mcp.config') as MockConfig:
                 
                 mock_client = MockClient.return_value
@@ -1000,7 +990,6 @@ class TestReturnPolicyApi(BaseApiTest):
             pytest.skip("Conflict test only runs in unit mode")
         
         with patch('tools.return_policy_api.EbayRestClient') as MockClient, \
-             patch('tools.return_policy_api.OAuthManager'), \
              patch('tools.return_policy_api.mcp.config') as MockConfig:
             
             mock_client = MockClient.return_value
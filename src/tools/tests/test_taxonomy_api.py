@@ -20,8 +20,14 @@ from tools.taxonomy_api import (
     get_category_tree,
     get_category_subtree,
     get_category_suggestions,
-    get_expired_categories
+    get_expired_categories,
+    get_item_aspects_for_category,
+    remap_expired_categories,
+    REMAP_CHUNK_SIZE
 )
+from api.category_aspects import ItemAspectsStreamParser
+from api.rate_limiter import TokenBucketLimiter
+from api.oauth import ConsentRequiredException
 from api.ebay_enums import MarketplaceIdEnum
 
 
@@ -341,6 +347,130 @@ class TestTaxonomyApi(BaseApiTest):
                     assert data["data"]["categorySuggestions"][0]["categoryId"] == "9355"
                     assert data["data"]["categorySuggestions"][0]["categoryName"] == "Cell Phones & Smartphones"
     
+    @pytest.mark.asyncio
+    @TestMode.skip_in_integration("Local index answers are unit test only")
+    async def test_get_category_suggestions_local_index(self, mock_context, mock_credentials):
+        """Test confident suggestions are answered from the cached tree without calling eBay."""
+        mock_tree_response = {
+            "categoryTreeId": "0",
+            "categoryTreeVersion": "123",
+            "rootCategoryNode": {
+                "category": {"categoryId": "0", "categoryName": "Root"},
+                "childCategoryTreeNodes": [TestDataGood.CATEGORY_NODE_ELECTRONICS]
+            }
+        }
+        leaf_name = TestDataGood.CATEGORY_NODE_ELECTRONICS["childCategoryTreeNodes"][0]["category"]["categoryName"]
+        
+        with patch('tools.taxonomy_api.EbayRestClient') as MockClient, \
+             patch('tools.taxonomy_api.get_category_tree_json', return_value=mock_tree_response):
+            mock_client = MockClient.return_value
+            mock_client.get = AsyncMock()
+            mock_client.close = AsyncMock()
+            
+            with patch('tools.taxonomy_api.mcp.config.app_id', mock_credentials["app_id"]), \
+                 patch('tools.taxonomy_api.mcp.config.cert_id', mock_credentials["cert_id"]):
+                
+                response = await get_category_suggestions.fn(
+                    ctx=mock_context,
+                    category_tree_id="0",
+                    q=leaf_name
+                )
+                
+                data = assert_api_response_success(response)
+                assert data["metadata"]["source"] == "local_index"
+                assert data["data"]["categorySuggestions"][0]["category"]["categoryName"] == leaf_name
+                mock_client.get.assert_not_called()
+    
+    @pytest.mark.asyncio
+    @TestMode.skip_in_integration("Tree views are unit test only")
+    async def test_get_category_tree_table_pages(self, mock_context, mock_credentials):
+        """Test walking the tree in table pages with a cursor."""
+        mock_tree_response = {
+            "categoryTreeId": "0",
+            "categoryTreeVersion": "124",
+            "rootCategoryNode": {
+                "category": {"categoryId": "0", "categoryName": "Root"},
+                "childCategoryTreeNodes": [TestDataGood.CATEGORY_NODE_ELECTRONICS]
+            }
+        }
+        
+        with patch('tools.taxonomy_api.EbayRestClient') as MockClient, \
+             patch('tools.taxonomy_api.get_category_tree_json', return_value=mock_tree_response):
+            MockClient.return_value.close = AsyncMock()
+            
+            with patch('tools.taxonomy_api.mcp.config.app_id', mock_credentials["app_id"]), \
+                 patch('tools.taxonomy_api.mcp.config.cert_id', mock_credentials["cert_id"]):
+                
+                rows, cursor = [], None
+                while True:
+                    response = await get_category_tree.fn(
+                        ctx=mock_context,
+                        category_tree_id="0",
+                        output_format="table",
+                        fields=["id", "parent_id"],
+                        limit=1,
+                        cursor=cursor
+                    )
+                    data = assert_api_response_success(response)
+                    assert data["data"]["columns"] == ["id", "parent_id"]
+                    rows += data["data"]["rows"]
+                    cursor = data["data"]["next_cursor"]
+                    if cursor is None:
+                        break
+                
+                assert rows[0] == ["0", None]
+                assert rows[1] == [TestDataGood.CATEGORY_NODE_ELECTRONICS["category"]["categoryId"], "0"]
+                
+                # Pagination only applies to flat output
+                response = await get_category_tree.fn(ctx=mock_context, category_tree_id="0", limit=10)
+                assert json.loads(response)["error_code"] == "VALIDATION_ERROR"
+                
+                response = await get_category_tree.fn(
+                    ctx=mock_context, category_tree_id="0", root_category_id="424242", output_format="rows"
+                )
+                assert json.loads(response)["error_code"] == "RESOURCE_NOT_FOUND"
+    
+    @pytest.mark.asyncio
+    @TestMode.skip_in_integration("Bulk aspects answers are unit test only")
+    async def test_get_item_aspects_for_category_local_index(self, mock_context, mock_credentials):
+        """Test aspects come from the bulk file index, with eBay only asked on a miss."""
+        aspects = [{"localizedAspectName": "Brand", "aspectValues": [{"localizedValue": "Apple"}]}]
+        parser = ItemAspectsStreamParser()
+        parser.feed(json.dumps({
+            "categoryTreeId": "0",
+            "categoryTreeVersion": "123",
+            "categoryAspects": [{"category": {"categoryId": "9355"}, "aspects": aspects}]
+        }).encode())
+        aspects_index = parser.close()
+        
+        with patch('tools.taxonomy_api.EbayRestClient') as MockClient, \
+             patch('tools.taxonomy_api.get_category_aspects', return_value=aspects_index):
+            mock_client = MockClient.return_value
+            mock_client.get = AsyncMock(return_value={"body": {"aspects": []}, "headers": {}})
+            mock_client.close = AsyncMock()
+            
+            with patch('tools.taxonomy_api.mcp.config.app_id', mock_credentials["app_id"]), \
+                 patch('tools.taxonomy_api.mcp.config.cert_id', mock_credentials["cert_id"]):
+                
+                response = await get_item_aspects_for_category.fn(
+                    ctx=mock_context,
+                    category_tree_id="0",
+                    category_id="9355"
+                )
+                data = assert_api_response_success(response)
+                assert data["metadata"]["source"] == "local_index"
+                assert data["data"]["aspects"] == aspects
+                mock_client.get.assert_not_called()
+                
+                response = await get_item_aspects_for_category.fn(
+                    ctx=mock_context,
+                    category_tree_id="0",
+                    category_id="20349"
+                )
+                data = assert_api_response_success(response)
+                assert data["metadata"]["source"] == "ebay_api"
+                assert mock_client.get.call_args.kwargs["params"] == {"category_id": "20349"}
+    
     # ==============================================================================
     # Get Expired Categories Tests (Both unit and integration)
     # ==============================================================================
@@ -398,6 +528,141 @@ class TestTaxonomyApi(BaseApiTest):
                     assert data["data"]["expiredCategories"][0]["fromCategoryId"] == "12345"
                     assert data["data"]["expiredCategories"][0]["toCategoryId"] == "67890"
     
+    @pytest.mark.asyncio
+    @TestMode.skip_in_integration("Offer updates are unit test only")
+    async def test_remap_expired_categories(self, mock_context, mock_credentials):
+        """Test remapping category IDs and updating SKU offers in expired categories."""
+        offers = {
+            "SKU-1": [{"offerId": "1", "sku": "SKU-1", "status": "PUBLISHED", "categoryId": "12345", "availableQuantity": 3}],
+            "SKU-2": [{"offerId": "2", "sku": "SKU-2", "categoryId": "99999"}]
+        }
+        
+        async def get(endpoint, params=None, **kwargs):
+            if endpoint.endswith("get_expired_categories"):
+                return {"body": {"expiredCategories": [{"fromCategoryId": "12345", "toCategoryId": "67890"}]}}
+            return {"body": {"offers": offers[params["sku"]]}}
+        
+        with patch('tools.taxonomy_api.EbayRestClient') as MockClient, \
+             patch.dict('api.category_remap._expired_maps', clear=True):
+            mock_client = MockClient.return_value
+            mock_client.get = AsyncMock(side_effect=get)
+            mock_client.put = AsyncMock(return_value={"body": {}})
+            mock_client.close = AsyncMock()
+            
+            with patch('tools.taxonomy_api.mcp.config.app_id', mock_credentials["app_id"]), \
+                 patch('tools.taxonomy_api.mcp.config.cert_id', mock_credentials["cert_id"]):
+                
+                response = await remap_expired_categories.fn(
+                    ctx=mock_context,
+                    category_tree_id="3",
+                    category_ids=["12345", "99999"],
+                    skus=["SKU-1", "SKU-2"],
+                    apply_updates=True
+                )
+                
+                data = assert_api_response_success(response)
+                assert data["data"]["categories"][0]["replacementCategoryId"] == "67890"
+                assert data["data"]["categories"][1]["expired"] is False
+                assert data["data"]["offers"] == [{
+                    "sku": "SKU-1",
+                    "offerId": "1",
+                    "from": {"categoryId": "12345"},
+                    "to": {"categoryId": "67890"},
+                    "updated": True
+                }]
+                assert data["data"]["summary"]["offers_updated"] == 1
+                
+                mock_client.put.assert_called_once()
+                assert mock_client.put.call_args.args[0] == "/sell/inventory/v1/offer/1"
+                assert mock_client.put.call_args.kwargs["json"] == {"categoryId": "67890", "availableQuantity": 3}
+                
+                # Updates need SKUs
+                response = await remap_expired_categories.fn(
+                    ctx=mock_context,
+                    category_tree_id="3",
+                    category_ids=["12345"],
+                    apply_updates=True
+                )
+                assert json.loads(response)["error_code"] == "VALIDATION_ERROR"
+    
+    @pytest.mark.asyncio
+    @TestMode.skip_in_integration("Rate limiter exhaustion is unit test only")
+    async def test_remap_expired_categories_past_rate_limit(self, mock_context, mock_credentials):
+        """Test that SKUs past the limiter burst come back unchecked instead of failing the batch."""
+        limiter = TokenBucketLimiter(default_daily_limit=5000)
+        skus = [f"SKU-{number}" for number in range(150)]
+        
+        async def get(endpoint, params=None, **kwargs):
+            if endpoint.endswith("get_expired_categories"):
+                return {"body": {"expiredCategories": [{"fromCategoryId": "12345", "toCategoryId": "67890"}]}}
+            await limiter.acquire("sell.inventory")
+            return {"body": {"offers": [{"offerId": params["sku"], "sku": params["sku"], "categoryId": "12345"}]}}
+        
+        async def put(endpoint, json=None, **kwargs):
+            await limiter.acquire("sell.inventory")
+            return {"body": {}}
+        
+        with patch('tools.taxonomy_api.EbayRestClient') as MockClient, \
+             patch.dict('api.category_remap._expired_maps', clear=True):
+            mock_client = MockClient.return_value
+            mock_client.get = AsyncMock(side_effect=get)
+            mock_client.put = AsyncMock(side_effect=put)
+            mock_client.close = AsyncMock()
+            
+            with patch('tools.taxonomy_api.mcp.config.app_id', mock_credentials["app_id"]), \
+                 patch('tools.taxonomy_api.mcp.config.cert_id', mock_credentials["cert_id"]):
+                
+                response = await remap_expired_categories.fn(
+                    ctx=mock_context,
+                    category_tree_id="3",
+                    skus=skus,
+                    apply_updates=True
+                )
+        
+        data = assert_api_response_success(response)
+        summary = data["data"]["summary"]
+        assert summary["rate_limited"] is True
+        assert summary["offers_updated"] == mock_client.put.call_count - summary["errors"]
+        assert summary["offers_updated"] > 0
+        assert summary["skus_checked"] + summary["skus_unchecked"] == 150
+        assert data["data"]["unchecked_skus"][-1] == "SKU-149"
+        
+        updated = {offer["sku"] for offer in data["data"]["offers"] if offer.get("updated")}
+        assert not updated & set(data["data"]["unchecked_skus"])
+        # Nothing is sent once the limiter runs dry
+        assert mock_client.get.call_count < 150
+    
+    @pytest.mark.asyncio
+    @TestMode.skip_in_integration("Remap with mocked consent is unit test only")
+    async def test_remap_expired_categories_consent_required(self, mock_context, mock_credentials):
+        """Test that missing user consent stops the SKU lookups and returns the consent URL."""
+        async def get(endpoint, params=None, **kwargs):
+            if endpoint.endswith("get_expired_categories"):
+                return {"body": {"expiredCategories": [{"fromCategoryId": "12345", "toCategoryId": "67890"}]}}
+            raise ConsentRequiredException("https://auth.ebay.com/oauth2/authorize?scope=sell.inventory")
+        
+        with patch('tools.taxonomy_api.EbayRestClient') as MockClient, \
+             patch.dict('api.category_remap._expired_maps', clear=True):
+            mock_client = MockClient.return_value
+            mock_client.get = AsyncMock(side_effect=get)
+            mock_client.close = AsyncMock()
+            
+            with patch('tools.taxonomy_api.mcp.config.app_id', mock_credentials["app_id"]), \
+                 patch('tools.taxonomy_api.mcp.config.cert_id', mock_credentials["cert_id"]):
+                
+                response = await remap_expired_categories.fn(
+                    ctx=mock_context,
+                    category_tree_id="3",
+                    skus=[f"SKU-{number}" for number in range(150)]
+                )
+        
+        data = json.loads(response)
+        assert data["status"] == "error"
+        assert data["error_code"] == "AUTHENTICATION_ERROR"
+        assert data["details"]["consent_url"].startswith("https://auth.ebay.com/")
+        # The first chunk fails; no later chunk is sent
+        assert mock_client.get.call_count <= 1 + REMAP_CHUNK_SIZE
+    
     # ==============================================================================
     # Error Handling Tests
     # ==============================================================================
@@ -23,9 +23,12 @@ from tools.trending_api import (
     get_trending_items_by_category,
     TrendingItemsInput,
     _search_trending_items,
-    _convert_trending_item
+    _convert_trending_item,
+    refresh_trending_snapshot
 )
+from api.cache import HybridCacheManager
 from api.errors import EbayApiError
+from api.trending_snapshots import TrendingSnapshotRefresher, read_trending_snapshot, write_trending_snapshot
 
 
 class TestTrendingApi(BaseApiTest):
@@ -357,6 +360,95 @@ class TestTrendingApi(BaseApiTest):
                     max_results=15
                 )
     
+    @TestMode.skip_in_integration("Snapshot serving is unit test only")
+    @pytest.mark.asyncio
+    async def test_get_trending_items_by_category_from_snapshot(self, mock_context):
+        """Test that a precomputed snapshot is served without searching."""
+        cache_manager = HybridCacheManager()
+        items = [{"item_id": f"v1|{n}|0", "title": f"Item {n}"} for n in range(30)]
+        
+        with patch('api.trending_snapshots.get_cache_manager', return_value=cache_manager), \
+             patch('tools.trending_api.get_most_watched_items.fn') as mock_get_watched:
+            await write_trending_snapshot("9355", items)
+            
+            response = await get_trending_items_by_category.fn(
+                ctx=mock_context,
+                category_id="9355",
+                max_results=10
+            )
+            
+            data = assert_api_response_success(response)
+            assert [item["item_id"] for item in data["data"]["items"]] == [f"v1|{n}|0" for n in range(10)]
+            assert data["data"]["category_id"] == "9355"
+            assert data["data"]["snapshot_generated_at"]
+            assert data["data"]["snapshot_age_seconds"] >= 0
+            mock_get_watched.assert_not_called()
+    
+    @TestMode.skip_in_integration("Snapshot refresh is unit test only")
+    @pytest.mark.asyncio
+    async def test_refresh_trending_snapshot(self, mock_credentials):
+        """Test that a refresh runs every strategy and stores the merged items."""
+        cache_manager = HybridCacheManager()
+        
+        async def search(endpoint, params=None, **kwargs):
+            # Both strategies find item 2; it is kept once
+            first = 1 if params["sort"] == "newlyListed" else 2
+            return {"body": {"itemSummaries": [
+                {"itemId": f"v1|{n}|0", "title": f"Item {n}", "price": {"value": "10.00", "currency": "USD"}}
+                for n in (first, first + 1)
+            ]}, "headers": {}}
+        
+        with patch('tools.trending_api.EbayRestClient') as MockClient, \
+             patch('api.trending_snapshots.get_cache_manager', return_value=cache_manager), \
+             patch('tools.trending_api.mcp.config.app_id', mock_credentials["app_id"]), \
+             patch('tools.trending_api.mcp.config.cert_id', mock_credentials["cert_id"]):
+            mock_client = MockClient.return_value
+            mock_client.get = AsyncMock(side_effect=search)
+            mock_client.close = AsyncMock()
+            
+            await refresh_trending_snapshot("9355")
+            
+            assert mock_client.get.call_count == 2
+            for call in mock_client.get.call_args_list:
+                assert "categoryIds:{9355}" in call[1]["params"]["filter"]
+            mock_client.close.assert_called_once()
+            
+            snapshot = await read_trending_snapshot("9355")
+            assert [item["item_id"] for item in snapshot["items"]] == ["v1|1|0", "v1|2|0", "v1|3|0"]
+    
+    @TestMode.skip_in_integration("Snapshot refresh is unit test only")
+    @pytest.mark.asyncio
+    async def test_failed_refresh_keeps_snapshot(self, mock_credentials):
+        """Test that an API error or an empty result does not overwrite a good snapshot."""
+        cache_manager = HybridCacheManager()
+        
+        with patch('tools.trending_api.EbayRestClient') as MockClient, \
+             patch('api.trending_snapshots.get_cache_manager', return_value=cache_manager), \
+             patch('tools.trending_api.mcp.config.app_id', mock_credentials["app_id"]), \
+             patch('tools.trending_api.mcp.config.cert_id', mock_credentials["cert_id"]):
+            mock_client = MockClient.return_value
+            mock_client.close = AsyncMock()
+            good = await write_trending_snapshot("9355", [{"item_id": "v1|1|0"}])
+            
+            # Refresher counts the API error as a failure
+            mock_client.get = AsyncMock(side_effect=EbayApiError(status_code=500, error_response={"message": "Internal error"}))
+            refresher = TrendingSnapshotRefresher(["9355"])
+            assert await refresher.refresh_all(refresh_trending_snapshot) == 0
+            assert refresher.get_stats()["failures"] == 1
+            
+            snapshot = await read_trending_snapshot("9355")
+            assert snapshot["items"] == [{"item_id": "v1|1|0"}]
+            assert snapshot["generated_at"] == good["generated_at"]
+            
+            # Searches that succeed with no items keep the snapshot too
+            mock_client.get = AsyncMock(return_value={"body": {"itemSummaries": []}, "headers": {}})
+            assert (await refresh_trending_snapshot("9355"))["generated_at"] == good["generated_at"]
+            assert (await read_trending_snapshot("9355"))["items"] == [{"item_id": "v1|1|0"}]
+            
+            # With no prior snapshot, an empty result stores nothing and the tool searches live
+            assert await refresh_trending_snapshot("11450") is None
+            assert await cache_manager.get("TRENDING_SNAPSHOT_11450") is None
+    
     # ==============================================================================
     # Helper Function Tests (Unit tests only)
     # ==============================================================================
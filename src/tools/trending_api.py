@@ -2,21 +2,36 @@
 Trending Items API using Browse API for merchandising functionality.
 
 Since eBay doesn't provide a direct "most watched" API, this module uses
-strategic Browse API searches to find trending and popular items.
+strategic Browse API searches to find trending and popular items. The
+search strategies run concurrently, and trending snapshots for configured
+categories are precomputed in the background (api.trending_snapshots).
 """
+import asyncio
+import logging
 from typing import Dict, Any, Optional, List
 from fastmcp import Context
 from pydantic import BaseModel, Field, field_validator
 from decimal import Decimal
 from datetime import datetime
 
-from api.oauth import OAuthManager, OAuthConfig, OAuthScopes
+from api.oauth import OAuthConfig, OAuthScopes
 from api.rest_client import EbayRestClient, RestConfig
 from api.models import MarketplaceId
 from api.errors import EbayApiError, extract_ebay_error_details
+from api.trending_snapshots import SNAPSHOT_SIZE, read_trending_snapshot, write_trending_snapshot
 from data_types import success_response, error_response, ErrorCode
 from lootly_server import mcp
 
+logger = logging.getLogger(__name__)
+
+# Strategic searches: (search terms, sort order)
+TRENDING_STRATEGIES = [
+    # Newly listed items (likely to be trending)
+    ("trending popular hot new", "newlyListed"),
+    # Best Match for popular terms
+    ("must have popular trending viral", "relevance"),
+]
+
 
 class TrendingItemsInput(BaseModel):
     """Input validation for trending items."""
@@ -87,53 +102,23 @@ async def get_most_watched_items(
         client_secret=mcp.config.cert_id,
         sandbox=mcp.config.sandbox_mode
     )
-    oauth_manager = OAuthManager(oauth_config)
+    oauth_manager = mcp.runtime.get_oauth_manager(oauth_config)
     
     rest_config = RestConfig(
         sandbox=mcp.config.sandbox_mode,
         rate_limit_per_day=mcp.config.rate_limit_per_day
     )
-    rest_client = EbayRestClient(oauth_manager, rest_config)
+    rest_client = EbayRestClient(oauth_manager, rest_config, session_provider=mcp.runtime.get_session)
     
     try:
         await ctx.report_progress(0.3, "🌐 Searching for trending items...")
         
-        # Strategy: Use multiple search approaches to find trending items
-        all_items = []
-        
-        # Search 1: Newly listed items (likely to be trending)
-        items_1 = await _search_trending_items(
-            rest_client, 
-            ctx,
-            "trending popular hot new",
-            input_data.category_id,
-            "newlyListed",
-            max_results=input_data.max_results // 2
-        )
-        all_items.extend(items_1)
-        
-        # Search 2: Best Match for popular terms
-        items_2 = await _search_trending_items(
+        trending_items = await _compute_trending_items(
             rest_client,
             ctx,
-            "must have popular trending viral",
             input_data.category_id,
-            "relevance",
-            max_results=input_data.max_results - len(items_1)
+            input_data.max_results
         )
-        all_items.extend(items_2)
-        
-        # Remove duplicates while preserving order
-        seen_ids = set()
-        unique_items = []
-        for item in all_items:
-            item_id = item.get("item_id")
-            if item_id and item_id not in seen_ids:
-                seen_ids.add(item_id)
-                unique_items.append(item)
-        
-        # Limit to requested number
-        trending_items = unique_items[:input_data.max_results]
         
         await ctx.report_progress(1.0, "✅ Complete")
         await ctx.info(f"🎆 Found {len(trending_items)} trending items")
@@ -191,6 +176,24 @@ async def get_trending_items_by_category(
     """
     await ctx.info(f"🔥 Getting trending items for category: {category_id}")
     
+    # Serve the background-precomputed snapshot when there is one
+    snapshot = await read_trending_snapshot(category_id.strip()) if category_id and category_id.strip() else None
+    if snapshot is not None and 1 <= max_results <= SNAPSHOT_SIZE:
+        trending_items = snapshot["items"][:max_results]
+        await ctx.info(f"🎆 Found {len(trending_items)} trending items in snapshot from {snapshot['generated_at']}")
+        return success_response(
+            data={
+                "items": trending_items,
+                "total_count": len(trending_items),
+                "category_id": snapshot["category_id"],
+                "search_strategy": "multi_search_trending",
+                "api_used": "browse_api_strategic",
+                "snapshot_generated_at": snapshot["generated_at"],
+                "snapshot_age_seconds": snapshot["age_seconds"]
+            },
+            message=f"Retrieved {len(trending_items)} trending items from snapshot"
+        ).to_json_string()
+    
     # Use the same implementation as get_most_watched_items with category filter
     return await get_most_watched_items.fn(
         ctx=ctx,
@@ -199,15 +202,87 @@ async def get_trending_items_by_category(
     )
 
 
+async def _compute_trending_items(
+    rest_client: EbayRestClient,
+    ctx: Optional[Context],
+    category_id: Optional[str],
+    max_results: int,
+    raise_errors: bool = False
+) -> List[Dict[str, Any]]:
+    """
+    Run the trending search strategies concurrently and merge their items.
+    
+    A failed strategy contributes no items, or raises with raise_errors.
+    """
+    # The first strategy fills about half; the rest can make up any shortfall
+    limits = [max(max_results // 2, 1)] + [max_results] * (len(TRENDING_STRATEGIES) - 1)
+    results = await asyncio.gather(*(
+        _search_trending_items(
+            rest_client, ctx, search_terms, category_id, sort_order,
+            max_results=limit, raise_errors=raise_errors
+        )
+        for (search_terms, sort_order), limit in zip(TRENDING_STRATEGIES, limits)
+    ))
+    
+    # Remove duplicates while preserving strategy order
+    seen_ids = set()
+    unique_items = []
+    for items in results:
+        for item in items:
+            item_id = item.get("item_id")
+            if item_id and item_id not in seen_ids:
+                seen_ids.add(item_id)
+                unique_items.append(item)
+    
+    # Limit to requested number
+    return unique_items[:max_results]
+
+
+async def refresh_trending_snapshot(category_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Recompute and store the trending snapshot for one category.
+    
+    Used by the background TrendingSnapshotRefresher, outside any tool call.
+    A failed search raises so the refresher counts it, and an empty result
+    is never stored; the current snapshot (None if there is none) stays.
+    """
+    oauth_config = OAuthConfig(
+        client_id=mcp.config.app_id,
+        client_secret=mcp.config.cert_id,
+        sandbox=mcp.config.sandbox_mode
+    )
+    oauth_manager = mcp.runtime.get_oauth_manager(oauth_config)
+    
+    rest_config = RestConfig(
+        sandbox=mcp.config.sandbox_mode,
+        rate_limit_per_day=mcp.config.rate_limit_per_day
+    )
+    rest_client = EbayRestClient(oauth_manager, rest_config, session_provider=mcp.runtime.get_session)
+    
+    try:
+        items = await _compute_trending_items(rest_client, None, category_id, SNAPSHOT_SIZE, raise_errors=True)
+        if not items:
+            current = await read_trending_snapshot(category_id)
+            logger.warning(
+                f"Trending refresh for category {category_id} found no items; "
+                + (f"keeping the snapshot from {current['generated_at']}" if current else "nothing stored")
+            )
+            return current
+        return await write_trending_snapshot(category_id, items)
+    finally:
+        await rest_client.close()
+
+
 async def _search_trending_items(
     rest_client: EbayRestClient,
-    ctx: Context,
+    ctx: Optional[Context],
     search_terms: str,
     category_id: Optional[str],
     sort_order: str,
-    max_results: int = 10
+    max_results: int = 10,
+    raise_errors: bool = False
 ) -> List[Dict[str, Any]]:
-    """Execute a strategic search for trending items."""
+    """Execute a strategic search for trending items; a failed search returns no items unless raise_errors."""
     
     # Build search parameters
     params = {
@@ -247,13 +322,21 @@ async def _search_trending_items(
                 item = _convert_trending_item(item_summary)
                 items.append(item)
             except Exception as e:
-                await ctx.error(f"Error parsing trending item: {str(e)}")
+                if ctx:
+                    await ctx.error(f"Error parsing trending item: {str(e)}")
+                else:
+                    logger.warning(f"Error parsing trending item: {e}")
                 continue
         
         return items
         
     except Exception as e:
-        await ctx.error(f"Trending search failed for '{search_terms}': {str(e)}")
+        if raise_errors:
+            raise
+        if ctx:
+            await ctx.error(f"Trending search failed for '{search_terms}': {str(e)}")
+        else:
+            logger.warning(f"Trending search failed for '{search_terms}': {e}")
         return []
 
 